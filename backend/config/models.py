@@ -227,6 +227,7 @@ MLX_MODELS_INFO = {
         "best_for": "Tests rapides, extraction",
         "recommended": False,  # Non dans le top 3
         "tools_support": False,  # ⚠️ Problème tool calling (voir Ollama phi3)
+        "context_budget": 3500,  # Fenêtre de 4K tokens
     },
     "mlx-community/Qwen2.5-7B-Instruct-4bit": {
         "name": "Qwen 2.5 7B (4-bit)",
@@ -313,10 +314,60 @@ DEFAULT_GOOGLE_MODEL: GoogleModel = "gemini-1.5-pro"
 # Le code vLLM est conservé pour usage manuel si nécessaire
 
 
+# ========================================
+# Budgets de contexte du tuteur
+# ========================================
+# Tokens du prompt complet (instructions, extraits de documents, historique,
+# message) par fournisseur. Les modèles locaux traitent le prompt lentement:
+# leur budget reste proche de la fenêtre par défaut du serveur. Un modèle peut
+# le redéfinir avec la clé "context_budget" de sa fiche. Ollama tronque
+# le prompt à sa fenêtre (num_ctx), souvent 2048 ou 4096 tokens par défaut:
+# model_factory la fixe au budget plus la place de la réponse.
+
+PROVIDER_CONTEXT_BUDGETS = {
+    "ollama": 8000,
+    "mlx": 8000,
+    "vllm": 16000,
+    "anthropic": 32000,
+    "openai": 32000,
+    "google": 32000,
+}
+
+DEFAULT_CONTEXT_BUDGET = 8000
+
+# Tokens réservés à la réponse dans la fenêtre Ollama (num_ctx)
+OLLAMA_ANSWER_TOKENS = 2048
+
+_MODELS_INFO_BY_PROVIDER = {
+    "ollama": OLLAMA_MODELS_INFO,
+    "anthropic": CLAUDE_MODELS_INFO,
+    "mlx": MLX_MODELS_INFO,
+    "google": GOOGLE_MODELS_INFO,
+}
+
+
 # ========================================
 # Helpers
 # ========================================
 
+def get_context_budget(model_id: str) -> int:
+    """
+    Retourne le budget de tokens du prompt pour un modèle.
+
+    Args:
+        model_id: ID au format provider:model (ex: "ollama:qwen2.5:7b")
+    """
+    provider, _, model = model_id.partition(":")
+    provider = provider.lower()
+    # Alias acceptés par model_factory
+    provider = {"huggingface": "vllm", "gemini": "google"}.get(provider, provider)
+
+    info = _MODELS_INFO_BY_PROVIDER.get(provider, {}).get(model, {})
+    if "context_budget" in info:
+        return info["context_budget"]
+    return PROVIDER_CONTEXT_BUDGETS.get(provider, DEFAULT_CONTEXT_BUDGET)
+
+
 def get_recommended_ollama_models() -> list[str]:
     """Retourne la liste des modèles Ollama recommandés pour M1 Pro 16 Go."""
     return [
@@ -148,6 +148,39 @@ class Settings(BaseSettings):
         default="",
         description="Clé API OpenAI pour embeddings (si provider=openai)"
     )
+    embedding_batch_size: int = Field(
+        default=32,
+        description="Nombre maximum de textes par lot d'embeddings"
+    )
+    embedding_batch_max_tokens: int = Field(
+        default=16000,
+        description="Budget approximatif de tokens par lot d'embeddings"
+    )
+    embedding_cache_size: int = Field(
+        default=1024,
+        description="Nombre maximum d'embeddings de requêtes en cache (0 pour désactiver)"
+    )
+    embedding_cache_ttl: int = Field(
+        default=3600,
+        description="Durée de vie des embeddings de requêtes en cache (secondes)"
+    )
+    embedding_cache_persist: bool = Field(
+        default=False,
+        description="Conserver le cache des embeddings de requêtes sur disque (SQLite)"
+    )
+
+    # ===== Index vectoriel pour la recherche sémantique =====
+    vector_index_backend: Literal["numpy", "hnsw", "surreal", "scan"] = Field(
+        default="numpy",
+        description=(
+            "Index vectoriel (numpy: exact en mémoire, hnsw: approximatif en mémoire, "
+            "surreal: index HNSW natif SurrealDB, scan: recherche exhaustive SurrealDB)"
+        )
+    )
+    vector_index_refresh_interval: int = Field(
+        default=300,
+        description="Intervalle de revérification des index vectoriels en mémoire (secondes)"
+    )
 
     # ===== Agno =====
     agno_log_level: str = Field(default="INFO", description="Niveau de log Agno")
@@ -165,6 +198,92 @@ class Settings(BaseSettings):
         default=True,
         description="Activer la synchronisation automatique des répertoires liés"
     )
+    auto_sync_watch: bool = Field(
+        default=True,
+        description="Surveiller les répertoires liés (événements du système de fichiers) au lieu de les rescanner à intervalle fixe"
+    )
+    auto_sync_debounce_ms: int = Field(
+        default=1500,
+        description="Délai de regroupement des événements de fichiers avant synchronisation (millisecondes)"
+    )
+    auto_sync_reconcile_interval: int = Field(
+        default=3600,
+        description="Intervalle de la resynchronisation complète de sécurité en mode surveillance (secondes)"
+    )
+
+    # ===== Ingestion des répertoires liés =====
+    ingestion_extract_workers: int = Field(
+        default=0,
+        description="Processus d'extraction de texte en parallèle (0 = nombre de coeurs)"
+    )
+    ingestion_finish_concurrency: int = Field(
+        default=2,
+        description="Documents extraits en Markdown et indexés simultanément"
+    )
+    ingestion_db_batch_size: int = Field(
+        default=50,
+        description="Nombre maximum de documents créés par requête"
+    )
+
+    # ===== Cache des extractions =====
+    extraction_cache_enabled: bool = Field(
+        default=True,
+        description="Conserver les résultats d'extraction (Markdown, OCR) par hash de fichier"
+    )
+    extraction_cache_max_mb: int = Field(
+        default=2048,
+        description="Taille maximale du cache d'extraction (Mo), au-delà les entrées les moins utilisées sont supprimées"
+    )
+
+    # ===== Génération par LLM =====
+    llm_provider_concurrency: dict[str, int] = Field(
+        default={"ollama": 2, "vllm": 8, "mlx": 1, "anthropic": 4, "openai": 4, "google": 4},
+        description="Appels LLM simultanés par fournisseur lors de la génération de fiches (selon les slots parallèles du serveur)"
+    )
+    model_registry_size: int = Field(
+        default=16,
+        description="Nombre maximum de modèles Agno réutilisés d'une requête à l'autre"
+    )
+    agent_registry_size: int = Field(
+        default=32,
+        description="Nombre maximum d'agents Agno réutilisés (par modèle, outils et instructions)"
+    )
+
+    # ===== Contexte du chat =====
+    chat_context_cache_size: int = Field(
+        default=64,
+        description="Nombre maximum de cours dont le contexte de chat est conservé en mémoire"
+    )
+    chat_context_cache_ttl: int = Field(
+        default=300,
+        description="Durée de vie d'un contexte de cours en cache (secondes, 0 = jusqu'à la prochaine modification)"
+    )
+
+    # ===== Clients HTTP (Ollama, OpenAI, serveurs MLX/vLLM) =====
+    http_max_connections_per_host: int = Field(
+        default=16,
+        description="Connexions HTTP simultanées maximum vers un même hôte"
+    )
+    http_keepalive_expiry: float = Field(
+        default=30.0,
+        description="Durée de conservation des connexions HTTP inactives (secondes)"
+    )
+    http2_enabled: bool = Field(
+        default=True,
+        description="Utiliser HTTP/2 avec les API HTTPS qui le supportent (nécessite h2)"
+    )
+
+    # ===== Résumés audio =====
+    audio_tts_concurrency: int = Field(
+        default=4,
+        description="Sections synthétisées simultanément par edge-tts lors de la génération d'un résumé audio"
+    )
+
+    # ===== OCR =====
+    ocr_page_workers: int = Field(
+        default=2,
+        description="Pages OCR rendues et reconnues simultanément (sur CPU, un processus par page, chacun avec son propre modèle; 1 = séquentiel)"
+    )
 
     # Configuration de Pydantic Settings
     model_config = SettingsConfigDict(
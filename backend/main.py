@@ -56,12 +56,38 @@ async def lifespan(app: FastAPI):
         logger.warning(f"Could not connect to SurrealDB: {e}")
         logger.warning("API will start but database features may not work")
 
+    # Reopen persisted vector indexes (memory-mapped .npy sidecars) and BM25 indexes
+    try:
+        from services.vector_index import get_vector_index_registry
+        from services.keyword_index import get_keyword_index_registry
+        get_vector_index_registry().warm_up()
+        get_keyword_index_registry().warm_up()
+    except Exception as e:
+        logger.warning(f"Could not open vector index sidecars: {e}")
+
+    # Native SurrealDB vector index for the current embedding model's dimension
+    if settings.vector_index_backend == "surreal":
+        try:
+            from services.document_indexing_service import get_document_indexing_service
+            index_name = await get_document_indexing_service().ensure_vector_index()
+            logger.info(f"Native vector index ready: {index_name}")
+        except Exception as e:
+            logger.warning(f"Could not define native vector index: {e}")
+
+    # Shared pooled HTTP clients (Ollama, OpenAI, MLX/vLLM servers)
+    from services.http_clients import get_http_clients
+    get_http_clients()
+
     # Start auto-sync service for linked directories
     if settings.auto_sync_enabled:
         try:
             from services.auto_sync_service import start_auto_sync
-            await start_auto_sync(interval_seconds=settings.auto_sync_interval)
-            logger.info(f"Auto-sync service started (interval: {settings.auto_sync_interval}s)")
+            await start_auto_sync(
+                interval_seconds=settings.auto_sync_interval,
+                watch=settings.auto_sync_watch,
+                reconcile_interval_seconds=settings.auto_sync_reconcile_interval,
+                debounce_ms=settings.auto_sync_debounce_ms,
+            )
         except Exception as e:
             logger.warning(f"Could not start auto-sync service: {e}")
     else:
@@ -80,6 +106,29 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Error stopping auto-sync service: {e}")
 
+    # Stop the linked-directory extraction processes
+    try:
+        from services.ingestion_pipeline import shutdown_extraction_pool
+        shutdown_extraction_pool()
+    except Exception as e:
+        logger.warning(f"Error stopping extraction pool: {e}")
+
+    # Stop the OCR worker processes
+    try:
+        from services.ocr_service import shutdown_ocr_page_pool
+        shutdown_ocr_page_pool()
+    except Exception as e:
+        logger.warning(f"Error stopping OCR worker pool: {e}")
+
+    # Persist pending vector and BM25 index updates
+    try:
+        from services.vector_index import get_vector_index_registry
+        from services.keyword_index import get_keyword_index_registry
+        get_vector_index_registry().flush()
+        get_keyword_index_registry().flush()
+    except Exception as e:
+        logger.warning(f"Error flushing vector index sidecars: {e}")
+
     # Shutdown all model servers (MLX, vLLM) if running
     try:
         from services.model_server_manager import shutdown_all_model_servers
@@ -88,6 +137,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Error stopping model servers: {e}")
 
+    # Close shared HTTP clients and their pooled connections
+    try:
+        from services.http_clients import close_http_clients
+        await close_http_clients()
+    except Exception as e:
+        logger.warning(f"Error closing HTTP clients: {e}")
+
     # Shutdown SurrealDB
     try:
         service = get_surreal_service()
@@ -133,6 +133,27 @@ class TableStats(BaseModel):
     size_mb: Optional[float] = Field(None, description="Taille en MB")
 
 
+class ExtractionCacheStats(BaseModel):
+    """Statistiques du cache des extractions."""
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    enabled: bool = Field(..., description="Cache activé")
+    entries: int = Field(..., description="Nombre d'extractions en cache")
+    size_bytes: int = Field(..., description="Taille du cache sur disque")
+    max_bytes: int = Field(..., description="Taille maximale avant éviction (LRU)")
+    hits: int = Field(..., description="Extractions servies depuis le cache depuis le démarrage")
+    misses: int = Field(..., description="Extractions recalculées depuis le démarrage")
+    hit_rate: float = Field(..., description="Proportion de hits")
+
+
+class ExtractionCachePurgeResult(BaseModel):
+    """Résultat du vidage du cache des extractions."""
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    message: str = Field(..., description="Message de confirmation")
+    removed: int = Field(..., description="Nombre d'entrées supprimées")
+
+
 # Mise à jour des forward references pour les modèles récursifs
 TableSchema.model_rebuild()
 DatabaseStats.model_rebuild()
@@ -28,6 +28,7 @@ class DocumentResponse(BaseModel):
     file_path: str
     created_at: str
     extracted_text: Optional[str] = None
+    has_extracted_text: Optional[bool] = None  # Set when extracted_text is omitted from listings
     file_exists: bool = True
     source_document_id: Optional[str] = None
     is_derived: Optional[bool] = None
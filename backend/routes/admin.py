@@ -6,10 +6,12 @@ Ce module fournit les endpoints pour:
 - Lister les tables avec leurs statistiques (Phase 1)
 - Consulter les données des tables (Phase 1)
 - Générer des mots de passe sécurisés
+- Consulter et vider le cache des extractions
 - Détecter les orphelins (Phase 2)
 - Nettoyer les orphelins (Phase 3)
 """
 
+import asyncio
 import hashlib
 import logging
 import secrets
@@ -20,9 +22,15 @@ from pydantic import BaseModel, EmailStr
 
 from auth.helpers import require_admin
 from services.admin_service import get_admin_service
+from services.extraction_cache import get_extraction_cache
 from services.password_generator_service import generate_passwords_batch
 from services.surreal_service import get_surreal_service
-from models.admin_models import TableInfo, TableDataResponse
+from models.admin_models import (
+    ExtractionCachePurgeResult,
+    ExtractionCacheStats,
+    TableDataResponse,
+    TableInfo,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -575,6 +583,66 @@ async def generate_passwords(
         )
 
 
+# ============================================================================
+# ENDPOINTS: CACHE DES EXTRACTIONS
+# ============================================================================
+
+
+@router.get("/extraction-cache", response_model=ExtractionCacheStats)
+async def get_extraction_cache_stats(
+    user_id: str = Depends(require_admin),
+) -> ExtractionCacheStats:
+    """
+    Statistiques du cache des extractions (taille, entrées, hits/misses).
+
+    Requiert rôle admin.
+
+    Raises:
+        401: Si non authentifié
+        403: Si non admin
+        500: Si erreur serveur
+    """
+    try:
+        stats = await asyncio.to_thread(get_extraction_cache().stats)
+        return ExtractionCacheStats(**stats)
+
+    except Exception as e:
+        logger.error(f"Erreur lors de la lecture du cache des extractions: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors de la lecture du cache: {str(e)}",
+        )
+
+
+@router.delete("/extraction-cache", response_model=ExtractionCachePurgeResult)
+async def purge_extraction_cache(
+    user_id: str = Depends(require_admin),
+) -> ExtractionCachePurgeResult:
+    """
+    Vide le cache des extractions.
+
+    Requiert rôle admin. Les prochaines extractions seront recalculées.
+
+    Raises:
+        401: Si non authentifié
+        403: Si non admin
+        500: Si erreur serveur
+    """
+    try:
+        removed = await asyncio.to_thread(get_extraction_cache().purge)
+        return ExtractionCachePurgeResult(
+            message=f"{removed} extractions supprimées du cache",
+            removed=removed,
+        )
+
+    except Exception as e:
+        logger.error(f"Erreur lors du vidage du cache des extractions: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors du vidage du cache: {str(e)}",
+        )
+
+
 # ============================================================================
 # ENDPOINTS PHASE 2: DÉTECTION D'ORPHELINS (À IMPLÉMENTER)
 # ============================================================================
@@ -296,6 +296,9 @@ async def delete_audio_summary(summary_id: str):
         except Exception as e:
             logger.warning(f"Error deleting audio file: {e}")
 
+    # Delete the cached section audio used for incremental re-rendering
+    get_audio_summary_service().purge_section_cache(summary_id)
+
     # Delete database record using direct delete (not WHERE clause)
     # This avoids type mismatch issues with type::thing() when ID is numeric
     await service.delete(record_id)
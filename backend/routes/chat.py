@@ -16,8 +16,9 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from agno.agent import Agent
+from agno.team import Team
 
-from services.model_factory import create_model
+from services.model_factory import get_agent, get_model
 from services.surreal_service import get_surreal_service
 from services.conversation_service import get_conversation_service
 from services.model_server_manager import ensure_model_server
@@ -28,14 +29,21 @@ from tools.entity_extraction_tool import extract_entities, find_entity
 from tools.semantic_search_tool import semantic_search, index_document_tool, get_index_stats
 from tools.caij_search_tool import search_caij_jurisprudence
 from tools.tutor_tools import generate_summary, generate_mindmap, generate_quiz, explain_concept
-from services.prompt_builder_service import build_tutor_system_prompt
+from services.prompt_builder_service import (
+    build_tutor_system_prompt,
+    build_tutor_prompt_prefix,
+    complete_tutor_system_prompt,
+)
+from services.course_context_cache import CourseContextSnapshot, get_course_context_cache
+from services.context_packer import pack_context, rank_snippets, render_snippets
+from services.text_chunker import estimate_tokens
+from config.models import get_context_budget
 from agents.legal_research_team import create_legal_research_team, is_legal_research_query
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["Chat"])
 
-
 class ChatMessage(BaseModel):
     """Chat message in history."""
     role: str  # "user" or "assistant"
@@ -154,6 +162,261 @@ def _parse_surreal_record(record: dict) -> Optional[dict]:
 
     return None
 
+
+async def _get_recent_activities(course_id: str) -> list:
+    """Recent user activity in a course (newest first), fetched once per request."""
+    try:
+        return await get_activity_service().get_recent_activities(
+            course_id=course_id,
+            limit=20  # Show last 20 activities for context
+        )
+    except Exception as e:
+        logger.warning(f"Could not get activity context: {e}")
+        return []
+
+
+async def _pack_context(
+    request: ChatRequest,
+    system_content: str,
+    snapshot: Optional[CourseContextSnapshot] = None
+) -> tuple[str, list[DocumentSource], list[ChatMessage]]:
+    """
+    Fit document excerpts and history into the model's token budget.
+
+    Excerpts are ranked against the user message; the most relevant ones
+    are appended to the system prompt and the most recent history turns
+    are kept.
+
+    Returns:
+        Tuple of (system prompt, sources of the packed excerpts, history turns to send)
+    """
+    budget = get_context_budget(request.model_id)
+    reserved = estimate_tokens(system_content) + estimate_tokens(request.message)
+
+    snippets = []
+    if snapshot is not None and snapshot.excerpts:
+        snippets = await rank_snippets(
+            snapshot.course_id, request.message, snapshot.documents, snapshot.excerpts
+        )
+
+    packed = pack_context(snippets, request.history, budget, reserved_tokens=reserved)
+    logger.info(
+        f"Context packed for {request.model_id}: {packed.used_tokens}/{budget} tokens, "
+        f"{len(packed.snippets)}/{len(snippets)} excerpts, "
+        f"{len(packed.history)}/{len(request.history)} history messages"
+    )
+
+    sources_list = []
+    if packed.snippets:
+        packed_documents = {snippet.document_id for snippet in packed.snippets}
+        sources_list = [
+            DocumentSource(**source)
+            for source in snapshot.sources
+            if source["document_id"] in packed_documents
+        ]
+
+    system_content += render_snippets(packed.snippets, request.language)
+    return system_content, sources_list, packed.history
+
+
+async def _render_course_prompt(
+    request: ChatRequest,
+    snapshot: CourseContextSnapshot,
+    tools_desc: str
+) -> str:
+    """Tutor system prompt for a course: snapshot, recent activity and open document or module."""
+    # Activities are fetched once: they feed both the activity context and
+    # the detection of the currently open document or module
+    activities = await _get_recent_activities(request.course_id)
+    activity_context = get_activity_service().format_activity_context(activities)
+    current_document_id = _get_current_document_from_activities(activities)
+    current_module = _get_current_module_from_activities(activities)
+
+    current_document = None
+    if current_document_id:
+        current_document = snapshot.find_document(current_document_id)
+        if current_document is None:
+            try:
+                service = get_surreal_service()
+                doc_result = await service.query(f"SELECT * FROM {current_document_id}")
+                if doc_result and len(doc_result) > 0:
+                    current_document = _parse_surreal_record(doc_result[0])
+            except Exception as e:
+                logger.warning(f"Could not fetch current document: {e}")
+
+    # Build the context-aware tutor system prompt; the course-wide prefix
+    # is rendered once per snapshot and language
+    if (current_document_id and current_document) or current_module:
+        prefix = build_tutor_prompt_prefix(
+            case_data=snapshot.case_data,
+            documents=snapshot.documents,
+            current_document_id=current_document_id,
+            current_document=current_document,
+            current_module=current_module,
+            language=request.language
+        )
+    else:
+        prefix = snapshot.prompt_prefix(request.language)
+    system_content = complete_tutor_system_prompt(
+        prefix, activity_context, tools_desc, request.language
+    )
+
+    logger.info(
+        f"Added case context for {snapshot.case_data.get('title')} "
+        f"with {len(snapshot.documents)} documents"
+    )
+    return system_content
+
+
+async def _build_tutor_context(
+    request: ChatRequest,
+    tools_desc: str
+) -> tuple[str, list[DocumentSource], list[ChatMessage]]:
+    """
+    Build the context-aware tutor system prompt for a chat request.
+
+    With a course_id, the prompt covers the course (from the cached course
+    context snapshot), recent activity, the currently open document or
+    module and the document excerpts most relevant to the message.
+
+    Returns:
+        Tuple of (system prompt, document sources included in the context,
+        history turns that fit in the model's budget)
+    """
+    if not request.course_id:
+        # No course_id provided - build tutor prompt without course context
+        system_content = build_tutor_system_prompt(
+            case_data=None,
+            documents=[],
+            activity_context="",
+            current_document_id=None,
+            current_document=None,
+            tools_desc=tools_desc,
+            current_module=None,
+            language=request.language
+        )
+        return await _pack_context(request, system_content)
+
+    system_content = ""
+    snapshot = None
+    try:
+        snapshot = await get_course_context_cache().get(request.course_id)
+        if snapshot is not None:
+            system_content = await _render_course_prompt(request, snapshot, tools_desc)
+        else:
+            logger.warning(f"No course found for course_id={request.course_id}")
+    except Exception as e:
+        logger.warning(f"Could not get case context: {e}", exc_info=True)
+
+    return await _pack_context(request, system_content, snapshot)
+
+
+def _build_conversation_prompt(
+    request: ChatRequest,
+    history: list[ChatMessage],
+    include_course_id: bool = False
+) -> str:
+    """Render the history (as packed for the model) and the user message as the agent's input."""
+    conversation_prompt = ""
+    is_english = request.language == "en"
+
+    # Add conversation history
+    for msg in history:
+        role_name = ("User" if msg.role == "user" else "Assistant") if is_english else ("Utilisateur" if msg.role == "user" else "Assistant")
+        conversation_prompt += f"\n{role_name}: {msg.content}\n"
+
+    # Add current user message
+    user_label = "User" if is_english else "Utilisateur"
+    conversation_prompt += f"\n{user_label}: {request.message}"
+
+    # Inject course_id into the tool's context by modifying the prompt
+    if include_course_id and request.course_id:
+        context_msg = f"Context: The current course identifier is '{request.course_id}'" if is_english else f"Contexte: L'identifiant du cours actuel est '{request.course_id}'"
+        conversation_prompt += f"\n\n[{context_msg}]"
+
+    return conversation_prompt
+
+
+# Tools of the single-agent tutor
+TUTOR_TOOLS = [
+    # Existing tools
+    transcribe_audio,
+    search_documents,
+    semantic_search,
+    list_documents,
+    extract_entities,
+    find_entity,
+    index_document_tool,  # Tool name: "index_document"
+    get_index_stats,
+    search_caij_jurisprudence,  # Recherche jurisprudence québécoise
+    # NEW: Tutor tools for pedagogical support
+    generate_summary,         # Generate pedagogical summaries
+    generate_mindmap,         # Create mind maps with emojis
+    generate_quiz,            # Generate interactive quizzes
+    explain_concept,          # Explain legal concepts in detail
+]
+
+
+def _create_tutor_agent(model_id: str, system_content: str) -> Agent:
+    """Single-agent tutor with all tools (copied from a cached template while the prompt is unchanged)."""
+    return get_agent(
+        model_id,
+        name="LegalAssistant",
+        instructions=system_content,
+        tools=TUTOR_TOOLS,
+        markdown=True,
+    )
+
+
+def _use_research_team(request: ChatRequest) -> bool:
+    """Whether the request goes to the multi-agent legal research team."""
+    return bool(
+        request.use_multi_agent
+        and request.course_id
+        and is_legal_research_query(request.message)
+    )
+
+
+async def _save_conversation(
+    request: ChatRequest,
+    assistant_message: str,
+    sources_list: list[DocumentSource]
+) -> None:
+    """Save the user message and the assistant response for the course."""
+    try:
+        conv_service = get_conversation_service()
+        # Save user message
+        await conv_service.save_message(
+            course_id=request.course_id,
+            role="user",
+            content=request.message
+        )
+        # Save assistant response
+        await conv_service.save_message(
+            course_id=request.course_id,
+            role="assistant",
+            content=assistant_message,
+            model_id=request.model_id,
+            metadata={
+                "sources": [s.dict() for s in sources_list] if sources_list else []
+            }
+        )
+        logger.info(f"Saved conversation to database for case {request.course_id}")
+    except Exception as e:
+        logger.warning(f"Failed to save conversation: {e}")
+
+
+def _is_document_created(assistant_message: str) -> bool:
+    """Detect a completed transcription (a new document) from the response text."""
+    # Check for successful transcription phrases in the response (French phrases for French UI)
+    transcription_success_phrases = [
+        "J'ai transcrit le fichier audio",
+        "Un document markdown",
+        "a été créé avec le contenu formaté",
+    ]
+    return any(phrase in assistant_message for phrase in transcription_success_phrases)
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
@@ -163,7 +426,6 @@ async def chat(request: ChatRequest):
     if a course_id is provided.
     """
     logger.info(f"Chat request: model={request.model_id}, course_id={request.course_id}, language={request.language}")
-    logger.info(f"DEBUG - Checking if model_id starts with mlx/vllm/huggingface...")
 
     sources_list = []  # Track sources used in RAG
 
@@ -189,315 +451,23 @@ async def chat(request: ChatRequest):
                 raise HTTPException(status_code=500, detail=error_msg)
 
         # Create the model
-        model = create_model(request.model_id)
+        model = get_model(request.model_id)
 
         # Get tools description
         tools_desc = get_tools_description()
 
-        # Get user activity context if we have a course_id
-        activity_context = ""
-        if request.course_id:
-            try:
-                activity_service = get_activity_service()
-                activity_context = await activity_service.get_activity_context(
-                    course_id=request.course_id,
-                    limit=20  # Show last 20 activities for context
-                )
-            except Exception as e:
-                logger.warning(f"Could not get activity context: {e}")
-
-        # Initialize variables for tutor mode
-        case_data = None
-        documents = []
-        current_document_id = None
-        current_document = None
-        system_content = ""  # Will be built later
-
-        # If we have a course_id, try to get case context
-        if request.course_id:
-            try:
-                service = get_surreal_service()
-                if not service.db:
-                    await service.connect()
-
-                logger.info(f"Fetching case context for course_id={request.course_id}")
-
-                # Normalize judgment ID (same pattern as documents.py)
-                course_id = request.course_id
-                if not course_id.startswith("course:"):
-                    course_id = f"course:{course_id}"
-
-                logger.info(f"Looking for case with course_id={course_id}")
-
-                # Get case info - use direct record access
-                case_result = await service.query(f"SELECT * FROM {course_id}")
-                logger.info(f"Case query result: {case_result}")
-
-                if case_result and len(case_result) > 0:
-                    # Parse result - handle different SurrealDB response formats
-                    case_data = None
-                    result = case_result[0]
-
-                    if isinstance(result, dict):
-                        if "result" in result and isinstance(result["result"], list) and len(result["result"]) > 0:
-                            case_data = result["result"][0]
-                        elif "id" in result or "title" in result:
-                            # Direct record result
-                            case_data = result
-                    elif isinstance(result, list) and len(result) > 0:
-                        case_data = result[0]
-
-                    logger.info(f"Parsed case_data: {case_data is not None}")
-
-                    if case_data:
-                        # Support both field names
-                        case_name = case_data.get("title") 
-                        case_desc = case_data.get("description", "")
-                        case_summary = case_data.get("summary") or case_data.get("resume", "")
-
-                        system_content += f"""
-
-Contexte actuel:
-- Titre: {case_name}
-- Description: {case_desc}"""
-
-                        if case_summary:
-                            system_content += f"""
-- Résumé: {case_summary}"""
-
-                        # Get documents for this case (same pattern as documents.py)
-                        docs_result = await service.query(
-                            "SELECT * FROM document WHERE course_id = $course_id ORDER BY created_at DESC",
-                            {"course_id": course_id}
-                        )
-                        documents = []
-                        if docs_result and len(docs_result) > 0:
-                            # Handle different SurrealDB response formats
-                            first_item = docs_result[0]
-                            if isinstance(first_item, dict):
-                                if "result" in first_item:
-                                    # Format: [{"result": [...]}]
-                                    documents = first_item["result"] if isinstance(first_item["result"], list) else []
-                                elif "id" in first_item or "nom_fichier" in first_item:
-                                    # Format: [{doc1}, {doc2}, ...] - direct list of documents
-                                    documents = docs_result
-                            elif isinstance(first_item, list):
-                                # Format: [[doc1, doc2, ...]]
-                                documents = first_item
-
-                        if documents:
-                            # Build relationship maps FIRST
-                            audio_transcription_map = {}  # audio_filename -> transcription_filename
-                            pdf_extraction_map = {}  # pdf_filename -> extraction_filename
-
-                            # Map transcriptions to audio sources
-                            for doc in documents:
-                                if doc.get("is_transcription") and doc.get("source_audio"):
-                                    source_audio = doc.get("source_audio")
-                                    audio_transcription_map[source_audio] = doc.get("nom_fichier")
-
-                            # Map markdown extractions to PDF sources (heuristic: same base name)
-                            from pathlib import Path
-                            md_files = [d for d in documents if d.get("nom_fichier", "").lower().endswith(".md") and not d.get("is_transcription")]
-                            pdf_files_list = [d for d in documents if d.get("nom_fichier", "").lower().endswith(".pdf")]
-                            for md_doc in md_files:
-                                md_name = md_doc.get("nom_fichier", "")
-                                md_base = Path(md_name).stem
-                                for pdf_doc in pdf_files_list:
-                                    pdf_name = pdf_doc.get("nom_fichier", "")
-                                    pdf_base = Path(pdf_name).stem
-                                    if md_base == pdf_base:
-                                        pdf_extraction_map[pdf_name] = md_name
-                                        break
-
-                            system_content += f"""
-- Number of documents: {len(documents)}
-
-**IMPORTANT - Understanding document relationships:**
-- .md files with "[Transcription de X]" are TEXT versions of audio files X - AUDIO HAS ALREADY BEEN TRANSCRIBED
-- Audio files with "[DÉJÀ TRANSCRIT → voir Y]" have been processed - DO NOT RE-TRANSCRIBE
-- PDF files with "[DÉJÀ EXTRAIT → voir Z]" have been processed - DO NOT RE-EXTRACT
-- If an audio file shows "[DÉJÀ TRANSCRIT → voir Y]", it means the audio content is available in Y
-- ABSOLUTE RULE: If you see "[DÉJÀ TRANSCRIT]" or "[DÉJÀ EXTRAIT]", NEVER offer to redo the operation
-
-- Documents (summary list - use `list_documents` tool for more details):"""
-                            # Collect document contents for context
-                            doc_contents = []
-                            sources_list = []  # Track sources for response
-                            for doc in documents:
-                                doc_name = doc.get("nom_fichier", "Document inconnu")
-                                doc_type = doc.get("type_fichier", "").upper()
-                                doc_size = doc.get("taille", 0)
-                                # Format file size
-                                if doc_size < 1024:
-                                    size_str = f"{doc_size} B"
-                                elif doc_size < 1024 * 1024:
-                                    size_str = f"{doc_size / 1024:.1f} KB"
-                                else:
-                                    size_str = f"{doc_size / (1024 * 1024):.1f} MB"
-
-                                # Check if this is a transcription or audio file
-                                is_transcription = doc.get("is_transcription", False)
-                                source_audio = doc.get("source_audio", "")
-                                is_audio = doc_type in ["MP3", "WAV", "M4A", "OGG", "WEBM"]
-                                is_pdf = doc_type == "PDF"
-                                texte_extrait = doc.get("texte_extrait", "")
-
-                                # Build status note showing document relationships
-                                if is_transcription and source_audio:
-                                    status_note = f" [Transcription de {source_audio}]"
-                                elif is_audio:
-                                    transcription_file = audio_transcription_map.get(doc_name)
-                                    if transcription_file:
-                                        status_note = f" [DÉJÀ TRANSCRIT → voir {transcription_file}]"
-                                    else:
-                                        status_note = " [Non transcrit]"
-                                elif is_pdf:
-                                    extraction_file = pdf_extraction_map.get(doc_name)
-                                    if extraction_file:
-                                        status_note = f" [DÉJÀ EXTRAIT → voir {extraction_file}]"
-                                    else:
-                                        status_note = " [PDF non extrait]"
-                                elif texte_extrait and doc_name in pdf_extraction_map.values():
-                                    # This is a PDF extraction
-                                    source_pdf = [k for k, v in pdf_extraction_map.items() if v == doc_name]
-                                    if source_pdf:
-                                        status_note = f" [Extraction de {source_pdf[0]}]"
-                                    else:
-                                        status_note = " [Contenu disponible]"
-                                elif texte_extrait:
-                                    status_note = " [Contenu disponible]"
-                                else:
-                                    status_note = ""
-
-                                system_content += f"""
-  - {doc_name} ({doc_type}, {size_str}){status_note}"""
-
-                                # Collect extracted text for context inclusion
-                                if texte_extrait:
-                                    word_count = len(texte_extrait.split())
-                                    doc_contents.append({
-                                        "name": doc_name,
-                                        "content": texte_extrait,
-                                        "is_transcription": is_transcription
-                                    })
-                                    # Track this source
-                                    sources_list.append(DocumentSource(
-                                        name=doc_name,
-                                        type=doc_type,
-                                        word_count=word_count,
-                                        is_transcription=is_transcription
-                                    ))
-                                elif is_audio:
-                                    # Add a note that this audio file hasn't been transcribed
-                                    doc_contents.append({
-                                        "name": doc_name,
-                                        "content": "[This audio file has not been transcribed yet. To get a summary, please first transcribe the audio file.]",
-                                        "is_transcription": False,
-                                        "is_pending": True
-                                    })
-
-                            # Add document contents to the context
-                            if doc_contents:
-                                system_content += """
-
-Document contents:"""
-                                for doc_info in doc_contents:
-                                    content_type = "Transcription" if doc_info["is_transcription"] else "Content"
-                                    # Limit content length to avoid context overflow
-                                    content = doc_info["content"]
-                                    if len(content) > 4000:
-                                        content = content[:4000] + "... [truncated]"
-                                    system_content += f"""
-
-### {doc_info["name"]} ({content_type}):
-{content}"""
-                        else:
-                            system_content += """
-- Number of documents: 0"""
-
-                        logger.info(f"Added case context for {case_name} with {len(documents)} documents")
-
-                        # Detect currently open document or module from activities
-                        current_document_id = None
-                        current_document = None
-                        current_module = None
-
-                        if activity_context:
-                            try:
-                                # Get raw activities to parse
-                                activities_raw = await activity_service.get_recent_activities(
-                                    course_id=request.course_id,
-                                    limit=20
-                                )
-                                current_document_id = _get_current_document_from_activities(activities_raw)
-                                current_module = _get_current_module_from_activities(activities_raw)
-
-                                # If a document is open, fetch the full document data
-                                if current_document_id:
-                                    doc_result = await service.query(f"SELECT * FROM {current_document_id}")
-                                    if doc_result and len(doc_result) > 0:
-                                        current_document = _parse_surreal_record(doc_result[0])
-                            except Exception as e:
-                                logger.warning(f"Could not detect current document/module: {e}")
-
-                        # Build the context-aware tutor system prompt
-                        system_content = build_tutor_system_prompt(
-                            case_data=case_data,
-                            documents=documents,
-                            activity_context=activity_context,
-                            current_document_id=current_document_id,
-                            current_document=current_document,
-                            tools_desc=tools_desc,
-                            current_module=current_module,
-                            language=request.language
-                        )
-
-            except Exception as e:
-                logger.warning(f"Could not get case context: {e}", exc_info=True)
-        else:
-            # No course_id provided - build tutor prompt without course context
-            system_content = build_tutor_system_prompt(
-                case_data=None,
-                documents=[],
-                activity_context=activity_context,
-                current_document_id=None,
-                current_document=None,
-                tools_desc=tools_desc,
-                current_module=None,
-                language=request.language
-            )
+        # Build the context-aware tutor prompt (course, documents, activity)
+        system_content, sources_list, history = await _build_tutor_context(request, tools_desc)
 
         # Build the conversation prompt
-        conversation_prompt = ""
         is_english = request.language == "en"
+        conversation_prompt = _build_conversation_prompt(request, history, include_course_id=True)
 
-        # Add conversation history
-        for msg in request.history:
-            role_name = ("User" if msg.role == "user" else "Assistant") if is_english else ("Utilisateur" if msg.role == "user" else "Assistant")
-            conversation_prompt += f"\n{role_name}: {msg.content}\n"
+        logger.info(f"Sending conversation to agent with {len(history)} history messages")
 
-        # Add current user message
-        user_label = "User" if is_english else "Utilisateur"
-        conversation_prompt += f"\n{user_label}: {request.message}"
-
-        logger.info(f"Sending conversation to agent with {len(request.history)} history messages")
-
-        # Inject course_id into the tool's context by modifying the prompt
-        if request.course_id:
-            context_msg = f"Context: The current course identifier is '{request.course_id}'" if is_english else f"Contexte: L'identifiant du cours actuel est '{request.course_id}'"
-            conversation_prompt += f"\n\n[{context_msg}]"
-
-        # Check if we should use multi-agent mode
-        use_team = (
-            request.use_multi_agent
-            and request.course_id
-            and is_legal_research_query(request.message)
-        )
-
-        if use_team:
+        if _use_research_team(request):
             # Multi-agent mode: Use legal research team (Chercheur + Validateur)
-            logger.info(f"Using multi-agent team for legal research query")
+            logger.info("Using multi-agent team for legal research query")
             team = create_legal_research_team(
                 model=model,
                 course_id=request.course_id,
@@ -507,29 +477,7 @@ Document contents:"""
             response = await team.arun(conversation_prompt)
         else:
             # Single-agent mode: Standard agent with all tools
-            agent = Agent(
-                name="LegalAssistant",
-                model=model,
-                instructions=system_content,
-                tools=[
-                    # Existing tools
-                    transcribe_audio,
-                    search_documents,
-                    semantic_search,
-                    list_documents,
-                    extract_entities,
-                    find_entity,
-                    index_document_tool,  # Tool name: "index_document"
-                    get_index_stats,
-                    search_caij_jurisprudence,  # Recherche jurisprudence québécoise
-                    # NEW: Tutor tools for pedagogical support
-                    generate_summary,         # Generate pedagogical summaries
-                    generate_mindmap,         # Create mind maps with emojis
-                    generate_quiz,            # Generate interactive quizzes
-                    explain_concept,          # Explain legal concepts in detail
-                ],
-                markdown=True,
-            )
+            agent = _create_tutor_agent(request.model_id, system_content)
             # Get response from agent (use arun for async tools support)
             response = await agent.arun(conversation_prompt)
 
@@ -544,40 +492,10 @@ Document contents:"""
 
         # Save conversation to database if we have a course_id
         if request.course_id:
-            try:
-                conv_service = get_conversation_service()
-                # Save user message
-                await conv_service.save_message(
-                    course_id=request.course_id,
-                    role="user",
-                    content=request.message
-                )
-                # Save assistant response
-                await conv_service.save_message(
-                    course_id=request.course_id,
-                    role="assistant",
-                    content=assistant_message,
-                    model_id=request.model_id,
-                    metadata={
-                        "sources": [s.dict() for s in sources_list] if sources_list else []
-                    }
-                )
-                logger.info(f"Saved conversation to database for case {request.course_id}")
-            except Exception as e:
-                logger.warning(f"Failed to save conversation: {e}")
+            await _save_conversation(request, assistant_message, sources_list)
 
         # Detect if a document was created (transcription completed successfully)
-        # Check for successful transcription phrases in the response (French phrases for French UI)
-        document_created = False
-        transcription_success_phrases = [
-            "J'ai transcrit le fichier audio",
-            "Un document markdown",
-            "a été créé avec le contenu formaté",
-        ]
-        for phrase in transcription_success_phrases:
-            if phrase in assistant_message:
-                document_created = True
-                break
+        document_created = _is_document_created(assistant_message)
 
         return ChatResponse(
             message=assistant_message,
@@ -601,9 +519,15 @@ async def chat_stream(request: ChatRequest):
 
     Uses SSE (Server-Sent Events) to send multiple messages:
     - message: Regular text message parts
-    - complete_message: A complete standalone message
+    - delta: A piece of the assistant's answer, as the model generates it
+    - tool_call: A tool call starting or completing (status, id, name)
+    - complete_message: A complete standalone message (the full answer
+      after its deltas, with its sources when a course is given)
     - document_created: Notification when a document is created
     - done: Final event when streaming is complete
+
+    With a course_id, the answer comes from the course-aware tutor (same
+    context, tools and research team as /chat) and is saved to the history.
     """
     logger.info(f"Chat stream request: model={request.model_id}, course_id={request.course_id}")
 
@@ -735,7 +659,7 @@ def _generate_transcript_summary(text: str, max_length: int = 500) -> str:
 
 
 async def _handle_regular_chat_stream(request: ChatRequest) -> AsyncGenerator[str, None]:
-    """Handle regular chat with streaming response."""
+    """Handle regular chat with token-by-token streaming."""
     try:
         # Auto-start model server if needed (MLX or vLLM)
         # Note: "huggingface:" is deprecated and redirects to "vllm:" in model_factory
@@ -771,15 +695,32 @@ async def _handle_regular_chat_stream(request: ChatRequest) -> AsyncGenerator[st
             yield f"event: message\ndata: {json.dumps({'content': f'✅ {provider} server ready\\n\\n'})}\n\n"
 
         # Create the model
-        model = create_model(request.model_id)
+        model = get_model(request.model_id)
 
         # Get tools description
         tools_desc = get_tools_description()
 
-        # System prompt (simplified version) - language-aware
         is_english = request.language == "en"
-        if is_english:
-            system_content = f"""You are an intelligent and versatile conversational assistant. You help users with their questions in a professional and precise manner.
+        sources_list = []
+
+        if request.course_id:
+            # Course-aware tutor: same context, tools and team as /chat
+            system_content, sources_list, history = await _build_tutor_context(request, tools_desc)
+            conversation_prompt = _build_conversation_prompt(request, history, include_course_id=True)
+
+            if _use_research_team(request):
+                logger.info("Using multi-agent team for legal research query")
+                runner = create_legal_research_team(
+                    model=model,
+                    course_id=request.course_id,
+                    debug_mode=False
+                )
+            else:
+                runner = _create_tutor_agent(request.model_id, system_content)
+        else:
+            # System prompt (simplified version) - language-aware
+            if is_english:
+                system_content = f"""You are an intelligent and versatile conversational assistant. You help users with their questions in a professional and precise manner.
 
 Guidelines:
 - Always respond in English
@@ -788,8 +729,8 @@ Guidelines:
 - Adapt your expertise to the context (legal, academic, technical, etc.)
 
 {tools_desc}"""
-        else:
-            system_content = f"""Tu es un assistant conversationnel intelligent et polyvalent. Tu aides les utilisateurs avec leurs questions de manière professionnelle et précise.
+            else:
+                system_content = f"""Tu es un assistant conversationnel intelligent et polyvalent. Tu aides les utilisateurs avec leurs questions de manière professionnelle et précise.
 
 Directives:
 - Réponds toujours en français
@@ -799,30 +740,35 @@ Directives:
 
 {tools_desc}"""
 
-        # Build conversation
-        conversation_prompt = ""
-        for msg in request.history:
-            role_name = ("User" if msg.role == "user" else "Assistant") if is_english else ("Utilisateur" if msg.role == "user" else "Assistant")
-            conversation_prompt += f"\n{role_name}: {msg.content}\n"
-        user_label = "User" if is_english else "Utilisateur"
-        conversation_prompt += f"\n{user_label}: {request.message}"
-
-        # Create agent without tools for regular chat
-        agent = Agent(
-            name="LegalAssistant",
-            model=model,
-            instructions=system_content,
-            markdown=True,
-        )
+            system_content, _, history = await _pack_context(request, system_content)
+            conversation_prompt = _build_conversation_prompt(request, history)
 
-        # Get response
-        response = await agent.arun(conversation_prompt)
+            # Create agent without tools for regular chat
+            runner = get_agent(
+                request.model_id,
+                name="LegalAssistant",
+                instructions=system_content,
+                markdown=True,
+            )
 
-        if response and hasattr(response, 'content') and response.content:
-            yield f"event: complete_message\ndata: {json.dumps({'content': response.content, 'role': 'assistant'})}\n\n"
-        else:
-            error_msg = "Sorry, I couldn't generate a response." if is_english else "Désolé, je n'ai pas pu générer une réponse."
-            yield f"event: complete_message\ndata: {json.dumps({'content': error_msg, 'role': 'assistant'})}\n\n"
+        # Forward the answer as it is generated, then the whole message
+        final = {}
+        async for event in _stream_run(runner, conversation_prompt, final):
+            yield event
+
+        assistant_message = final.get("content")
+        if not assistant_message:
+            assistant_message = "Sorry, I couldn't generate a response." if is_english else "Désolé, je n'ai pas pu générer une réponse."
+
+        complete = {'content': assistant_message, 'role': 'assistant'}
+        if sources_list:
+            complete['sources'] = [s.dict() for s in sources_list]
+        yield f"event: complete_message\ndata: {json.dumps(complete)}\n\n"
+
+        if request.course_id:
+            await _save_conversation(request, assistant_message, sources_list)
+            if _is_document_created(assistant_message):
+                yield f"event: document_created\ndata: {json.dumps({})}\n\n"
 
     except Exception as e:
         logger.error(f"Regular chat stream error: {e}", exc_info=True)
@@ -830,6 +776,70 @@ Directives:
         yield f"event: complete_message\ndata: {json.dumps({'content': f'{error_prefix}: {str(e)}', 'role': 'assistant'})}\n\n"
 
 
+# Agno run events forwarded to the client (agent and team variants)
+_CONTENT_EVENTS = ("RunContent", "TeamRunContent")
+_TOOL_STARTED_EVENTS = ("ToolCallStarted", "TeamToolCallStarted")
+_TOOL_COMPLETED_EVENTS = ("ToolCallCompleted", "TeamToolCallCompleted")
+_COMPLETED_EVENTS = ("RunCompleted", "TeamRunCompleted")
+_ERROR_EVENTS = ("RunError", "TeamRunError")
+
+
+def _tool_call_payload(tool, status: str) -> dict:
+    """SSE payload describing a tool call (Agno ToolExecution)."""
+    payload = {
+        "status": status,
+        "id": getattr(tool, "tool_call_id", None),
+        "name": getattr(tool, "tool_name", None),
+    }
+    if status == "started":
+        payload["args"] = getattr(tool, "tool_args", None) or {}
+    else:
+        payload["error"] = bool(getattr(tool, "tool_call_error", False))
+    return payload
+
+
+async def _stream_run(runner, prompt: str, final: dict) -> AsyncGenerator[str, None]:
+    """
+    Run an agent or team in streaming mode and yield SSE events.
+
+    - delta: a piece of the answer, as produced by the model
+    - tool_call: a tool starting ("started") or finishing ("completed")
+
+    The full answer is stored in final["content"] once the run completes.
+    Only the runner's own content is forwarded: with a team, member
+    agents' intermediate answers are not part of the reply.
+    """
+    parts = []
+    own_content = _CONTENT_EVENTS[1] if isinstance(runner, Team) else _CONTENT_EVENTS[0]
+
+    async for event in runner.arun(prompt, stream=True, stream_events=True):
+        event_type = getattr(event, "event", None)
+
+        if event_type == own_content:
+            content = getattr(event, "content", None)
+            if isinstance(content, str) and content:
+                parts.append(content)
+                yield f"event: delta\ndata: {json.dumps({'content': content})}\n\n"
+
+        elif event_type in _TOOL_STARTED_EVENTS:
+            payload = _tool_call_payload(event.tool, "started")
+            yield f"event: tool_call\ndata: {json.dumps(payload, default=str)}\n\n"
+
+        elif event_type in _TOOL_COMPLETED_EVENTS:
+            payload = _tool_call_payload(event.tool, "completed")
+            yield f"event: tool_call\ndata: {json.dumps(payload, default=str)}\n\n"
+
+        elif event_type in _COMPLETED_EVENTS:
+            content = getattr(event, "content", None)
+            if isinstance(content, str) and content:
+                final["content"] = content
+
+        elif event_type in _ERROR_EVENTS:
+            raise RuntimeError(getattr(event, "content", None) or "Agent run failed")
+
+    final.setdefault("content", "".join(parts))
+
+
 @router.get("/chat/history/{course_id}")
 async def get_chat_history(course_id: str, limit: int = 50, offset: int = 0):
     """
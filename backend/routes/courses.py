@@ -24,6 +24,7 @@ from pydantic import BaseModel
 
 from config.settings import settings
 from services.surreal_service import get_surreal_service
+from services.course_context_cache import bump_course_version
 from models.course import Course, CourseCreate, CourseUpdate
 from services.course_service import get_course_service
 
@@ -450,6 +451,7 @@ async def update_course(
 
         # Update in database
         await service.merge(course_id, updates)
+        bump_course_version(course_id)
 
         # Fetch updated record
         updated_item = await get_course_by_id(service, course_id)
@@ -659,6 +661,7 @@ async def delete_course(
 
         # 4. Delete the course itself
         await service.delete(course_id)
+        bump_course_version(course_id)
         logger.info(f"Course deleted: {course_id}")
 
     except HTTPException:
@@ -24,6 +24,7 @@ from pydantic import BaseModel
 
 from config.settings import settings
 from services.surreal_service import get_surreal_service
+from services.course_context_cache import bump_course_version
 from services.document_indexing_service import DocumentIndexingService
 from utils.text_utils import remove_yaml_frontmatter
 from models.document_models import DocumentResponse, DocumentListResponse, RegisterDocumentRequest
@@ -85,6 +86,7 @@ async def list_documents(
     auto_remove_missing: bool = True,
     auto_discover: bool = False,  # Disabled by default to avoid duplicates
     include_derived: bool = True,  # Include derived files by default (filtering done in frontend)
+    include_text: bool = False,  # Extracted text is fetched per document by default
     user_id: Optional[str] = Depends(get_current_user_id)
 ):
     """
@@ -96,6 +98,8 @@ async def list_documents(
         auto_remove_missing: If True, automatically remove documents whose files no longer exist
         auto_discover: If True, automatically discover and register orphaned files in /data/uploads/[id]/
         include_derived: If True, include derived files (transcriptions, extractions, TTS). Default False.
+        include_text: If True, include extracted_text for every document. Otherwise only
+            has_extracted_text is set and the text is fetched with GET /documents/{doc_id}.
     """
     try:
         # Use document service for main listing logic
@@ -104,7 +108,8 @@ async def list_documents(
             course_id=course_id,
             verify_files=verify_files,
             auto_remove_missing=auto_remove_missing,
-            include_derived=include_derived
+            include_derived=include_derived,
+            include_text=include_text
         )
 
         missing_files = []  # Track missing files (already handled by service if auto_remove_missing=True)
@@ -571,8 +576,8 @@ async def diagnose_documents(
     doc_service = get_document_service()
     documents = await doc_service.list_documents(
         course_id=course_id,
-        verify_files=False,  # Don't auto-remove missing files
-        auto_remove_missing=False
+        verify_files=True,  # Batched existence check, sets file_exists
+        auto_remove_missing=False  # Don't auto-remove missing files
     )
 
     missing_files = []
@@ -588,7 +593,7 @@ async def diagnose_documents(
             })
             continue
 
-        if not Path(doc.file_path).exists():
+        if not doc.file_exists:
             missing_files.append({
                 "id": doc.id,
                 "filename": doc.filename,
@@ -944,6 +949,7 @@ async def extract_document_text(
             "extraction_method": extraction_result.extraction_method,
             "updated_at": now,
         })
+        bump_course_version(course_id)
 
         logger.info(f"Text extracted for {normalized_doc_id}: {len(extraction_result.text)} chars via {extraction_result.extraction_method}")
 
@@ -999,6 +1005,7 @@ async def clear_document_text(
             "extraction_method": None,
             "updated_at": now,
         })
+        bump_course_version(course_id)
 
         logger.info(f"Cleared texte_extrait for {normalized_doc_id}")
 
@@ -1146,10 +1153,7 @@ async def extract_pdf_to_markdown(
                                     doc_id_str = str(existing_doc["id"])
 
                                     # Delete embedding chunks first
-                                    await service.query(
-                                        "DELETE FROM embedding_chunk WHERE document_id = $doc_id",
-                                        {"doc_id": doc_id_str}
-                                    )
+                                    await DocumentIndexingService().delete_document_index(doc_id_str)
 
                                     # Delete document record
                                     await service.delete(doc_id_str)
@@ -1224,6 +1228,7 @@ async def extract_pdf_to_markdown(
 
                     # Use service.create() with record_id to ensure correct format
                     await service.create("document", doc_record, record_id=new_doc_id)
+                    bump_course_version(course_id)
 
                     # Index the document for semantic search
                     try:
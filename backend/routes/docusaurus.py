@@ -21,6 +21,7 @@ from pydantic import BaseModel
 
 from config.settings import settings
 from services.surreal_service import get_surreal_service
+from services.course_context_cache import bump_course_version
 from services.document_indexing_service import DocumentIndexingService
 from models.document_models import DocumentResponse, DocusaurusSource
 from auth.helpers import require_auth, get_current_user_id
@@ -284,6 +285,7 @@ async def import_docusaurus_files(
                     document_data["module_id"] = target_module_id
 
                 await service.create("document", document_data, record_id=doc_id)
+                bump_course_version(course_id)
                 logger.info(f"Imported Docusaurus file: {source_file.name} -> document:{doc_id}")
 
                 # Indexer le document pour la recherche sémantique
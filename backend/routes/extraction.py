@@ -20,6 +20,7 @@ from pydantic import BaseModel
 
 from config.settings import settings
 from services.surreal_service import get_surreal_service
+from services.course_context_cache import bump_course_version
 from auth.helpers import require_auth
 from utils.file_utils import AUDIO_EXTENSIONS
 
@@ -129,6 +130,7 @@ async def extract_document_text(
             "extraction_method": extraction_result.extraction_method,
             "updated_at": now,
         })
+        bump_course_version(course_id)
 
         logger.info(f"Text extracted for document {doc_id}: {len(extraction_result.text)} chars via {extraction_result.extraction_method}")
 
@@ -210,6 +212,7 @@ async def clear_document_text(
             "extraction_method": None,
             "updated_at": now,
         })
+        bump_course_version(course_id)
 
         logger.info(f"Cleared texte_extrait for document {doc_id}")
 
@@ -446,6 +449,7 @@ async def extract_pdf_to_markdown(
                     }
 
                     await service.create("document", doc_record, record_id=new_doc_id)
+                    bump_course_version(course_id)
 
                     # Index le document pour la recherche sémantique
                     try:
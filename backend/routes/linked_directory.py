@@ -14,7 +14,6 @@ import traceback
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Dict
-from collections import defaultdict
 
 from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.responses import StreamingResponse
@@ -23,7 +22,16 @@ import json
 
 from config.settings import settings
 from services.surreal_service import get_surreal_service
+from services.course_context_cache import bump_course_version
 from services.document_indexing_service import DocumentIndexingService
+from services.auto_sync_service import get_auto_sync_service
+from services.sync_manifest import get_sync_manifest_store
+from services.ingestion_pipeline import (
+    IngestionItem,
+    IngestionPipeline,
+    build_linked_document,
+    has_text_content,
+)
 from models.document_models import DocumentResponse
 from auth.helpers import require_auth, get_current_user_id
 from utils.file_utils import calculate_file_hash, LINKABLE_EXTENSIONS
@@ -31,8 +39,6 @@ from utils.linked_directory_utils import (
     FileInfo,
     DirectoryScanResult,
     scan_directory,
-    extract_text_from_file,
-    normalize_linked_source,
     SUPPORTED_EXTENSIONS,
 )
 
@@ -70,8 +76,7 @@ class LinkedDirectoryMetadata(BaseModel):
 # ============================================================================
 # Helper Functions
 # ============================================================================
-# Note: scan_directory, extract_text_from_file, normalize_linked_source
-# are imported from utils.linked_directory_utils
+# Note: scan_directory is imported from utils.linked_directory_utils
 
 
 async def create_markdown_from_file(
@@ -162,6 +167,7 @@ async def create_markdown_from_file(
             document_data["module_id"] = module_id
 
         await service.create("document", document_data, record_id=doc_id)
+        bump_course_version(course_id)
         logger.info(f"Created markdown document {doc_id} from {source_file.name}")
 
         return (f"document:{doc_id}", extraction_result.text)
@@ -270,120 +276,92 @@ async def link_directory_endpoint(
             try:
                 indexing_service = DocumentIndexingService()
 
-                for file_info in files_to_index:
-                    try:
-                        source_file = Path(file_info.absolute_path)
-
-                        # Générer un ID unique pour le document
-                        doc_id = str(uuid.uuid4())[:8]
-
-                        # Extract content
-                        content = extract_text_from_file(source_file)
-
-                        # Calculer le hash
-                        file_hash = calculate_file_hash(source_file)
-
-                        # Créer les métadonnées de liaison
-                        linked_source = {
-                            "absolute_path": str(source_file),
-                            "relative_path": file_info.relative_path,
-                            "parent_folder": file_info.parent_folder,
-                            "link_id": link_id,
-                            "base_path": scan_result.base_path,
-                            "last_sync": now,
-                            "source_hash": file_hash,
-                            "source_mtime": file_info.modified_time,
-                        }
-
-                        # Déterminer le type MIME
-                        mime_types = {
-                            "md": "text/markdown",
-                            "mdx": "text/markdown",
-                            "txt": "text/plain",
-                            "pdf": "application/pdf",
-                            "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                            "doc": "application/msword"
-                        }
-                        type_mime = mime_types.get(file_info.extension, "application/octet-stream")
-
-                        # Créer le document dans SurrealDB
-                        document_data = {
-                            "course_id": course_id,
-                            "nom_fichier": source_file.name,
-                            "type_fichier": file_info.extension,
-                            "type_mime": type_mime,
-                            "taille": file_info.size,
-                            "file_path": str(source_file),
-                            "user_id": user_id,
-                            "created_at": now,
-                            "source_type": "linked",
-                            "linked_source": linked_source,
-                            "texte_extrait": content if content and not content.startswith("[Contenu") else None,
-                            "indexed": False
-                        }
-
-                        # Add module_id if specified
-                        if target_module_id:
-                            document_data["module_id"] = target_module_id
-
-                        await service.create("document", document_data, record_id=doc_id)
-
-                        # Si auto_extract_markdown est activé et le fichier est PDF/DOCX/Audio
-                        markdown_result = None
-                        if request.auto_extract_markdown and file_info.extension in ["pdf", "docx", "doc", "mp3", "m4a", "wav", "mp4", "webm", "ogg"]:
-                            markdown_result = await create_markdown_from_file(
-                                service=service,
-                                source_file=source_file,
+                def build_record(item: IngestionItem) -> dict:
+                    record = build_linked_document(
+                        item.file_info,
+                        item.content,
+                        item.file_hash,
+                        course_id,
+                        link_id,
+                        scan_result.base_path,
+                        user_id,
+                        now,
+                    )
+                    # Add module_id if specified
+                    if target_module_id:
+                        record["module_id"] = target_module_id
+                    return record
+
+                async def finish(item: IngestionItem):
+                    source_file = Path(item.file_info.absolute_path)
+
+                    # Si auto_extract_markdown est activé et le fichier est PDF/DOCX/Audio
+                    markdown_result = None
+                    if request.auto_extract_markdown and item.file_info.extension in ["pdf", "docx", "doc", "mp3", "m4a", "wav", "mp4", "webm", "ogg"]:
+                        markdown_result = await create_markdown_from_file(
+                            service=service,
+                            source_file=source_file,
+                            course_id=course_id,
+                            user_id=user_id,
+                            link_id=link_id,
+                            linked_source_metadata=item.record["linked_source"],
+                            module_id=target_module_id
+                        )
+
+                    # Déterminer quel contenu indexer
+                    content_to_index = None
+                    doc_id_to_index = None
+
+                    if markdown_result:
+                        # Si markdown créé avec succès, indexer le markdown
+                        doc_id_to_index, content_to_index = markdown_result
+                    elif has_text_content(item.content):
+                        # Sinon, indexer le fichier source si contenu disponible
+                        content_to_index = item.content
+                        doc_id_to_index = item.document_id
+
+                    # Indexer si contenu disponible
+                    if content_to_index and doc_id_to_index:
+                        try:
+                            result = await indexing_service.index_document(
+                                document_id=doc_id_to_index,
                                 course_id=course_id,
-                                user_id=user_id,
-                                link_id=link_id,
-                                linked_source_metadata=linked_source,
-                                module_id=target_module_id
+                                text_content=content_to_index
                             )
 
-                        # Déterminer quel contenu indexer
-                        content_to_index = None
-                        doc_id_to_index = None
-
-                        if markdown_result:
-                            # Si markdown créé avec succès, indexer le markdown
-                            doc_id_to_index, content_to_index = markdown_result
-                        elif content and not content.startswith("[Contenu"):
-                            # Sinon, indexer le fichier source si contenu disponible
-                            content_to_index = content
-                            doc_id_to_index = f"document:{doc_id}"
-
-                        # Indexer si contenu disponible
-                        if content_to_index and doc_id_to_index:
-                            try:
-                                result = await indexing_service.index_document(
-                                    document_id=doc_id_to_index,
-                                    course_id=course_id,
-                                    text_content=content_to_index
+                            if result.get("success"):
+                                await service.merge(
+                                    doc_id_to_index,
+                                    {"indexed": True}
                                 )
-
-                                if result.get("success"):
-                                    await service.merge(
-                                        doc_id_to_index,
-                                        {"indexed": True}
-                                    )
-                            except Exception as e:
-                                logger.error(f"Error indexing document:{doc_id_to_index}: {e}")
-
+                        except Exception as e:
+                            logger.error(f"Error indexing document:{doc_id_to_index}: {e}")
+
+                # Extraction, création et indexation en parallèle (bornées):
+                # la progression est envoyée dans l'ordre de complétion
+                pipeline = IngestionPipeline(service, build_record, finish)
+                processed = 0
+                async for item in pipeline.run(files_to_index):
+                    processed += 1
+                    if item.error:
+                        logger.error(f"Error processing file {item.file_info.absolute_path}: {item.error}")
+                    else:
                         indexed += 1
 
-                        # Envoyer la progression
-                        progress_data = {
-                            "indexed": indexed,
-                            "total": total,
-                            "current_file": source_file.name,
-                            "percentage": round((indexed / total) * 100, 1)
-                        }
-                        yield f"event: progress\ndata: {json.dumps(progress_data)}\n\n"
-
-                    except Exception as e:
-                        logger.error(f"Error processing file {file_info.absolute_path}: {e}")
-                        continue
+                    # Envoyer la progression
+                    progress_data = {
+                        "indexed": indexed,
+                        "processed": processed,
+                        "total": total,
+                        "current_file": item.file_info.filename,
+                        "percentage": round((processed / total) * 100, 1)
+                    }
+                    if item.error:
+                        progress_data["error"] = item.error
+                    yield f"event: progress\ndata: {json.dumps(progress_data)}\n\n"
+
+                # Surveiller le nouveau répertoire (mode événementiel)
+                get_auto_sync_service().refresh_watches()
 
                 # Envoyer le message de complétion
                 complete_data = {
@@ -442,225 +420,16 @@ async def sync_linked_directories_endpoint(
         }
     """
     try:
-        service = get_surreal_service()
-        if not service.db:
-            await service.connect()
-
-        # Normalize course ID
-        if not course_id.startswith("course:"):
-            course_id = f"course:{course_id}"
-
-        # Récupérer tous les documents liés pour ce cours
-        query = """
-            SELECT * FROM document
-            WHERE course_id = $course_id
-            AND source_type = 'linked'
-            AND linked_source IS NOT NONE
-        """
-        result = await service.db.query(query, {"course_id": course_id})
-        # Note: result est directement la liste de documents, pas result[0]
-        linked_docs = result if result else []
-
-        if not linked_docs:
-            return {
-                "added": 0,
-                "updated": 0,
-                "removed": 0,
-                "unchanged": 0,
-                "message": "Aucun répertoire lié trouvé"
-            }
+        # Même synchronisation que le service automatique (manifeste partagé:
+        # seuls les fichiers dont le stat a changé sont relus)
+        stats = await get_auto_sync_service().sync_course(course_id, user_id)
 
-        # Grouper par link_id
-        by_link_id = defaultdict(list)
-        for doc in linked_docs:
-            linked_source = normalize_linked_source(doc.get("linked_source"))
-            link_id = linked_source.get("link_id")
-            if link_id:
-                by_link_id[link_id].append(doc)
-
-        # Compteurs
-        total_added = 0
-        total_updated = 0
-        total_removed = 0
-        total_unchanged = 0
-
-        indexing_service = DocumentIndexingService()
-        now = datetime.utcnow().isoformat()
-
-        # Pour chaque répertoire lié
-        for link_id, docs in by_link_id.items():
-            # Obtenir le chemin de base depuis le premier document
-            first_doc_linked_source = normalize_linked_source(docs[0].get("linked_source"))
-
-            # Essayer d'abord le base_path stocké (nouveaux documents)
-            directory_path = first_doc_linked_source.get("base_path")
-
-            # Fallback pour les anciens documents (avant la correction)
-            if not directory_path:
-                absolute_path = first_doc_linked_source.get("absolute_path", "")
-                if not absolute_path:
-                    logger.warning(f"Chemin de base introuvable pour link_id {link_id}")
-                    continue
-                directory_path = str(Path(absolute_path).parent)
-
-            # Re-scanner le répertoire
-            try:
-                scan_result = scan_directory(directory_path)
-            except Exception as e:
-                logger.error(f"Impossible de scanner {directory_path}: {e}")
-                continue
-
-            # Créer un index des fichiers existants par chemin absolu
-            existing_files = {doc["file_path"]: doc for doc in docs}
-            scanned_files = {str(f.absolute_path): f for f in scan_result.files}
-
-            # 1. Détecter les fichiers supprimés (dans BD mais pas sur disque)
-            for file_path, doc in existing_files.items():
-                if file_path not in scanned_files:
-                    # Fichier supprimé - retirer de la BD
-                    doc_id = doc["id"]
-                    await service.delete(doc_id)
-                    total_removed += 1
-                    logger.info(f"Document {doc_id} deleted (file missing)")
-
-            # 2. Détecter les nouveaux fichiers et fichiers modifiés
-            for file_path, file_info in scanned_files.items():
-                source_file = Path(file_path)
-
-                if file_path not in existing_files:
-                    # Nouveau fichier - ajouter et indexer
-                    try:
-                        doc_id = str(uuid.uuid4())[:8]
-                        content = extract_text_from_file(source_file)
-                        file_hash = calculate_file_hash(source_file)
-
-                        linked_source = {
-                            "absolute_path": str(source_file),
-                            "relative_path": file_info.relative_path,
-                            "parent_folder": file_info.parent_folder,
-                            "link_id": link_id,
-                            "base_path": scan_result.base_path,
-                            "last_sync": now,
-                            "source_hash": file_hash,
-                            "source_mtime": file_info.modified_time,
-                        }
-
-                        mime_types = {
-                            "md": "text/markdown",
-                            "mdx": "text/markdown",
-                            "txt": "text/plain",
-                            "pdf": "application/pdf",
-                            "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                            "doc": "application/msword"
-                        }
-                        type_mime = mime_types.get(file_info.extension, "application/octet-stream")
-
-                        document_data = {
-                            "course_id": course_id,
-                            "nom_fichier": source_file.name,
-                            "type_fichier": file_info.extension,
-                            "type_mime": type_mime,
-                            "taille": file_info.size,
-                            "file_path": str(source_file),
-                            "user_id": user_id,
-                            "created_at": now,
-                            "source_type": "linked",
-                            "linked_source": linked_source,
-                            "texte_extrait": content if content and not content.startswith("[Contenu") else None,
-                            "indexed": False
-                        }
-
-                        await service.create("document", document_data, record_id=doc_id)
-
-                        # Indexer si contenu disponible
-                        if content and not content.startswith("[Contenu"):
-                            try:
-                                result = await indexing_service.index_document(
-                                    document_id=f"document:{doc_id}",
-                                    course_id=course_id,
-                                    text_content=content
-                                )
-
-                                if result.get("success"):
-                                    await service.merge(
-                                        f"document:{doc_id}",
-                                        {"indexed": True}
-                                    )
-                            except Exception as e:
-                                logger.error(f"Erreur lors de l'indexation du document:{doc_id}: {e}")
-
-                        total_added += 1
-                        logger.info(f"New file added: {file_path}")
-
-                    except Exception as e:
-                        logger.error(f"Erreur lors de l'ajout de {file_path}: {e}")
-
-                else:
-                    # Fichier existant - vérifier s'il a été modifié
-                    existing_doc = existing_files[file_path]
-                    existing_linked_source = normalize_linked_source(existing_doc.get("linked_source"))
-                    old_hash = existing_linked_source.get("source_hash", "")
-                    old_mtime = existing_linked_source.get("source_mtime", 0)
-
-                    # Calculer le nouveau hash
-                    new_hash = calculate_file_hash(source_file)
-
-                    # Vérifier si le fichier a changé (hash ou mtime différent)
-                    if new_hash != old_hash or file_info.modified_time != old_mtime:
-                        # Fichier modifié - réindexer
-                        try:
-                            content = extract_text_from_file(source_file)
-                            doc_id = existing_doc["id"]
-
-                            # Mettre à jour l'objet linked_source complet
-                            updated_linked_source = existing_linked_source.copy()
-                            updated_linked_source["source_hash"] = new_hash
-                            updated_linked_source["source_mtime"] = file_info.modified_time
-                            updated_linked_source["last_sync"] = now
-
-                            # Mettre à jour les métadonnées
-                            update_data = {
-                                "linked_source": updated_linked_source,
-                                "texte_extrait": content if content and not content.startswith("[Contenu") else None,
-                                "taille": file_info.size,
-                                "indexed": False
-                            }
-
-                            await service.merge(doc_id, update_data)
-
-                            # Réindexer si contenu disponible
-                            if content and not content.startswith("[Contenu"):
-                                try:
-                                    result = await indexing_service.index_document(
-                                        document_id=doc_id,
-                                        course_id=course_id,
-                                        text_content=content
-                                    )
-
-                                    if result.get("success"):
-                                        await service.merge(
-                                            doc_id,
-                                            {"indexed": True}
-                                        )
-                                except Exception as e:
-                                    logger.error(f"Erreur lors de la réindexation de {doc_id}: {e}")
-
-                            total_updated += 1
-                            logger.info(f"File updated: {file_path}")
-
-                        except Exception as e:
-                            logger.error(f"Erreur lors de la mise à jour de {file_path}: {e}")
-
-                    else:
-                        # Fichier inchangé
-                        total_unchanged += 1
+        if not any(stats.values()):
+            return {**stats, "message": "Aucun répertoire lié trouvé"}
 
         return {
-            "added": total_added,
-            "updated": total_updated,
-            "removed": total_removed,
-            "unchanged": total_unchanged,
-            "message": f"Synchronisation terminée: {total_added} ajouté(s), {total_updated} mis à jour, {total_removed} supprimé(s)"
+            **stats,
+            "message": f"Synchronisation terminée: {stats['added']} ajouté(s), {stats['updated']} mis à jour, {stats['removed']} supprimé(s)"
         }
 
     except Exception as e:
@@ -846,6 +615,10 @@ async def cancel_link_directory(
             await service.delete(doc_id)
             documents_deleted += 1
 
+        get_sync_manifest_store().delete(link_id)
+        bump_course_version(course_id)
+        get_auto_sync_service().refresh_watches()
+
         logger.info(f"Link {link_id} cancelled: {documents_deleted} documents and {embeddings_deleted} embeddings deleted")
 
         return {
@@ -5,6 +5,7 @@ Endpoints:
 - GET /api/settings/current - Current settings
 - PUT /api/settings/current - Update settings
 - GET /api/settings/extraction-methods - Available extraction methods
+- GET /api/settings/search-stats - Embedding cache and vector index statistics
 - GET /api/settings/mlx/status - MLX server status
 - POST /api/settings/mlx/start - Start MLX server
 - POST /api/settings/mlx/stop - Stop MLX server
@@ -20,6 +21,8 @@ from config.settings import settings
 from config.models import get_all_models_for_api
 from services.mlx_server_service import get_mlx_server_service, ensure_mlx_server
 from services.document_indexing_service import get_document_indexing_service
+from services.vector_index import get_vector_index_registry
+from services.keyword_index import get_keyword_index_registry
 from services.surreal_service import get_surreal_service
 
 logger = logging.getLogger(__name__)
@@ -260,6 +263,25 @@ async def get_embedding_models() -> Dict[str, Any]:
     }
 
 
+@router.get("/search-stats")
+async def get_search_stats() -> Dict[str, Any]:
+    """
+    Retrieve semantic search runtime statistics.
+
+    Returns:
+        Dict containing:
+        - embedding_cache: Query embedding cache hits/misses and size
+        - vector_index: In-memory vector indexes currently loaded
+        - keyword_index: BM25 indexes currently loaded
+    """
+    indexing_service = get_document_indexing_service()
+    return {
+        "embedding_cache": indexing_service.embedding_service.cache_stats(),
+        "vector_index": get_vector_index_registry().stats(),
+        "keyword_index": get_keyword_index_registry().stats(),
+    }
+
+
 # ============================================================================
 # Embedding Model Management
 # ============================================================================
@@ -342,6 +364,8 @@ async def reindex_all_documents() -> Dict[str, Any]:
         # Delete ALL old embeddings
         logger.info("Deleting all old embeddings...")
         await surreal_service.query("DELETE document_embedding")
+        get_vector_index_registry().clear()
+        get_keyword_index_registry().clear()
 
         # Reindex all documents
         indexing_service = get_document_indexing_service()
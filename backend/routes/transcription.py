@@ -21,6 +21,7 @@ from fastapi.responses import StreamingResponse
 
 from config.settings import settings
 from services.surreal_service import get_surreal_service
+from services.course_context_cache import bump_course_version
 from auth.helpers import require_auth
 from utils.file_utils import AUDIO_EXTENSIONS
 from models.transcription_models import (
@@ -171,6 +172,7 @@ async def transcribe_document(
                 "transcribed_at": now
             }
         })
+        bump_course_version(course_id)
 
         logger.info(f"Transcription saved for document {doc_id}: {len(transcription.text)} chars")
 
@@ -514,6 +516,7 @@ async def download_youtube_audio(
             document_data["module_id"] = target_module_id
 
         await service.create("document", document_data, record_id=doc_id)
+        bump_course_version(course_id)
         logger.info(f"YouTube audio saved as document: {doc_id}")
 
         # Launch transcription in background (non-blocking)
@@ -44,8 +44,11 @@ async def run_migration(migration_file: Path):
     # Execute migration
     print("\n🚀 Executing migration...")
     try:
-        # Split statements by semicolon and execute each
-        statements = [s.strip() for s in migration_sql.split(';') if s.strip() and not s.strip().startswith('--')]
+        # Drop comment lines, then split statements by semicolon and execute each
+        migration_sql = "\n".join(
+            line for line in migration_sql.splitlines() if not line.strip().startswith('--')
+        )
+        statements = [s.strip() for s in migration_sql.split(';') if s.strip()]
 
         total = len(statements)
         success_count = 0
@@ -1,6 +1,6 @@
 """Services module for Legal Assistant."""
 
-from .model_factory import create_model
+from .model_factory import create_model, get_agent, get_model
 from .surreal_service import (
     SurrealDBService,
     get_surreal_service,
@@ -16,6 +16,8 @@ from .docling_service import (
 
 __all__ = [
     "create_model",
+    "get_model",
+    "get_agent",
     "SurrealDBService",
     "get_surreal_service",
     "init_surreal_service",
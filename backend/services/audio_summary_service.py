@@ -5,10 +5,13 @@ Converts markdown course documents to structured audio files with:
 - LLM-based content restructuring for audio optimization
 - Voice assignment per section (H1/H2 headers)
 - Pause markers between sections
-- FFmpeg concatenation for final output
+- Concurrent section synthesis and single-pass FFmpeg assembly
+- Per-section audio cache: re-rendering an edited script only synthesizes
+  the sections whose text or voice changed
 """
 
 import asyncio
+import hashlib
 import json
 import json5
 import logging
@@ -17,18 +20,15 @@ import random
 import re
 import shutil
 import subprocess
-import tempfile
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import AsyncGenerator, Dict, List, Optional
 
-from agno.agent import Agent
-
 from config.settings import settings
-from services.model_factory import create_model
+from services.model_factory import get_agent
 from services.surreal_service import get_surreal_service
-from services.tts_service import TTSService
+from services.tts_service import TTSResult, TTSService
 
 from models.audio_summary_models import (
     AudioSourceDocument,
@@ -40,6 +40,10 @@ from models.audio_summary_models import (
 
 logger = logging.getLogger(__name__)
 
+# edge-tts prosody used for every section (part of the section cache key)
+TTS_RATE = "+0%"
+TTS_VOLUME = "+0%"
+
 
 # Prompt template for audio script generation (single document or first chunk)
 AUDIO_SCRIPT_PROMPT = """Tu es un professeur de droit qui REFORMULE un document écrit en script audio pour qu'un étudiant puisse l'écouter et réviser.
@@ -115,6 +119,11 @@ class AudioSummaryService:
         """Initialize the audio summary service."""
         self.tts_service = TTSService()
         self.default_model = settings.model_id
+        # Silence clips are generated once per pause duration and reused
+        self._silence_dir = Path(settings.upload_dir) / "audio_cache" / "silence"
+        self._silence_lock = asyncio.Lock()
+        # Synthesized sections, one directory per summary, keyed by content hash
+        self._sections_dir = Path(settings.upload_dir) / "audio_cache" / "sections"
 
     async def generate_audio_summary(
         self,
@@ -142,7 +151,6 @@ class AudioSummaryService:
             Progress updates as dict
         """
         model_id = model_id or self.default_model
-        temp_dir = None
 
         try:
             yield {
@@ -267,39 +275,12 @@ class AudioSummaryService:
                 "total_sections": len(script_data.sections)
             }
 
-            temp_dir = tempfile.mkdtemp(prefix="audio_summary_")
-            segment_files = []
-
-            for i, section in enumerate(script_data.sections):
-                yield {
-                    "status": "generating_audio",
-                    "message": f"Section {i+1}/{len(script_data.sections)}: {section.title or section.level}",
-                    "percentage": 45.0 + (45.0 * i / len(script_data.sections)),
-                    "current_section": i + 1,
-                    "total_sections": len(script_data.sections)
-                }
+            segment_files: List[str] = []
 
-                # Generate pause/silence if needed
-                if section.pause_before_ms > 0:
-                    silence_path = os.path.join(temp_dir, f"{i:03d}_silence.mp3")
-                    await self._generate_silence(silence_path, section.pause_before_ms)
-                    if os.path.exists(silence_path):
-                        segment_files.append(silence_path)
-
-                # Generate audio for section content
-                segment_path = os.path.join(temp_dir, f"{i:03d}_content.mp3")
-                result = await self.tts_service.text_to_speech(
-                    text=section.content,
-                    output_path=segment_path,
-                    voice=section.voice,
-                    language="fr",
-                    clean_markdown=False  # Already cleaned
-                )
-
-                if result.success:
-                    segment_files.append(segment_path)
-                else:
-                    logger.warning(f"Failed to generate audio for section {i}: {result.error}")
+            async for progress in self._synthesize_sections(
+                script_data.sections, self._section_cache_dir(summary_record_id), segment_files, 45.0, 45.0
+            ):
+                yield progress
 
             if len(segment_files) < 1:
                 yield {
@@ -321,7 +302,7 @@ class AudioSummaryService:
             audio_path = audio_dir / audio_filename
 
             # Concatenate with ffmpeg
-            success = await self._concatenate_segments(segment_files, str(audio_path), temp_dir)
+            success = await self._concatenate_segments(segment_files, str(audio_path))
 
             if not success:
                 yield {
@@ -386,14 +367,6 @@ class AudioSummaryService:
                 "message": f"Erreur: {str(e)}"
             }
 
-        finally:
-            # Clean up temp directory
-            if temp_dir and os.path.exists(temp_dir):
-                try:
-                    shutil.rmtree(temp_dir)
-                except Exception as cleanup_error:
-                    logger.warning(f"Failed to clean up temp dir: {cleanup_error}")
-
     async def generate_audio_from_script(
         self,
         summary_id: str,
@@ -411,7 +384,6 @@ class AudioSummaryService:
         Yields:
             Progress updates as dict
         """
-        temp_dir = None
         service = get_surreal_service()
 
         try:
@@ -482,39 +454,12 @@ class AudioSummaryService:
             )
 
             # Generate audio segments
-            temp_dir = tempfile.mkdtemp(prefix="audio_summary_")
-            segment_files = []
+            segment_files: List[str] = []
 
-            for i, section in enumerate(script_data.sections):
-                yield {
-                    "status": "generating_audio",
-                    "message": f"Section {i+1}/{len(script_data.sections)}: {section.title or section.level}",
-                    "percentage": 10.0 + (80.0 * i / len(script_data.sections)),
-                    "current_section": i + 1,
-                    "total_sections": len(script_data.sections)
-                }
-
-                # Generate pause/silence if needed
-                if section.pause_before_ms > 0:
-                    silence_path = os.path.join(temp_dir, f"{i:03d}_silence.mp3")
-                    await self._generate_silence(silence_path, section.pause_before_ms)
-                    if os.path.exists(silence_path):
-                        segment_files.append(silence_path)
-
-                # Generate audio for section content
-                segment_path = os.path.join(temp_dir, f"{i:03d}_content.mp3")
-                result = await self.tts_service.text_to_speech(
-                    text=section.content,
-                    output_path=segment_path,
-                    voice=section.voice,
-                    language="fr",
-                    clean_markdown=False  # Already cleaned
-                )
-
-                if result.success:
-                    segment_files.append(segment_path)
-                else:
-                    logger.warning(f"Failed to generate audio for section {i}: {result.error}")
+            async for progress in self._synthesize_sections(
+                script_data.sections, self._section_cache_dir(summary_record_id), segment_files, 10.0, 80.0
+            ):
+                yield progress
 
             if len(segment_files) < 1:
                 yield {
@@ -536,7 +481,7 @@ class AudioSummaryService:
             audio_path = audio_dir / audio_filename
 
             # Concatenate with ffmpeg
-            success = await self._concatenate_segments(segment_files, str(audio_path), temp_dir)
+            success = await self._concatenate_segments(segment_files, str(audio_path))
 
             if not success:
                 yield {
@@ -600,14 +545,6 @@ class AudioSummaryService:
                 "message": f"Erreur: {str(e)}"
             }
 
-        finally:
-            # Clean up temp directory
-            if temp_dir and os.path.exists(temp_dir):
-                try:
-                    shutil.rmtree(temp_dir)
-                except Exception as cleanup_error:
-                    logger.warning(f"Failed to clean up temp dir: {cleanup_error}")
-
     async def import_script_from_markdown(
         self,
         summary_id: str,
@@ -634,8 +571,12 @@ class AudioSummaryService:
             # Normalize summary_id
             summary_record_id = summary_id.replace("audio_summary:", "")
 
-            # Parse the markdown content
-            script_data = self._parse_markdown_script(markdown_content, voice_titles)
+            # Parse the markdown content. Voices assigned automatically are seeded
+            # by the summary so that re-importing an edited script keeps them, and
+            # unchanged sections are reused from the section audio cache.
+            script_data = self._parse_markdown_script(
+                markdown_content, voice_titles, seed=summary_record_id
+            )
 
             if not script_data or not script_data.sections:
                 return {
@@ -712,11 +653,15 @@ class AudioSummaryService:
     def _parse_markdown_script(
         self,
         markdown_content: str,
-        default_voice: str
+        default_voice: str,
+        seed: Optional[str] = None
     ) -> Optional[ScriptData]:
         """
         Parse a markdown script into ScriptData structure.
 
+        Voices of scripts without annotations are assigned randomly; a seed
+        makes that assignment reproducible.
+
         Expected format:
         # Title
         ---
@@ -731,6 +676,7 @@ class AudioSummaryService:
         """
         sections = []
         section_idx = 0
+        rng = random.Random(seed)
 
         # Build list of available body voices
         body_voices = [v for v in BODY_VOICES if v != default_voice]
@@ -798,7 +744,7 @@ class AudioSummaryService:
 
         if not sections:
             # Try alternative parsing for simpler format
-            sections = self._parse_simple_markdown(markdown_content, default_voice, body_voices)
+            sections = self._parse_simple_markdown(markdown_content, default_voice, body_voices, rng)
 
         if not sections:
             logger.warning("No sections found in markdown script")
@@ -816,7 +762,7 @@ class AudioSummaryService:
                 available = [v for v in body_voices if v != last_body_voice]
                 if not available:
                     available = body_voices
-                voice = random.choice(available)
+                voice = rng.choice(available)
                 last_body_voice = voice
                 return voice
 
@@ -840,7 +786,8 @@ class AudioSummaryService:
         self,
         markdown_content: str,
         default_voice: str,
-        body_voices: List[str]
+        body_voices: List[str],
+        rng: Optional[random.Random] = None
     ) -> List[ScriptSection]:
         """
         Parse simpler markdown format without voice annotations.
@@ -850,13 +797,14 @@ class AudioSummaryService:
         sections = []
         section_idx = 0
         last_body_voice = None
+        rng = rng or random.Random()
 
         def get_random_body_voice() -> str:
             nonlocal last_body_voice
             available = [v for v in body_voices if v != last_body_voice]
             if not available:
                 available = body_voices
-            voice = random.choice(available)
+            voice = rng.choice(available)
             last_body_voice = voice
             return voice
 
@@ -1058,10 +1006,9 @@ class AudioSummaryService:
             logger.debug(f"Content preview: {content[:500]}...")
 
             # Use Agno for LLM call
-            model = create_model(model_id)
-            agent = Agent(
+            agent = get_agent(
+                model_id,
                 name="AudioScriptGenerator",
-                model=model,
                 instructions="Tu es un professeur qui crée des cours audio pédagogiques détaillés pour préparer des examens. Tu enseignes TOUT le contenu fourni de manière claire et complète.",
                 markdown=False
             )
@@ -1490,10 +1437,148 @@ class AudioSummaryService:
 
         return "\n".join(lines)
 
+    def _section_cache_dir(self, summary_record_id: str) -> Path:
+        """Directory holding the synthesized sections of one summary."""
+        return self._sections_dir / summary_record_id
+
+    @staticmethod
+    def _section_cache_key(section: ScriptSection) -> str:
+        """Cache key of a section: hash of its text, voice, rate and volume."""
+        parts = {
+            "content": section.content,
+            "voice": section.voice,
+            "rate": TTS_RATE,
+            "volume": TTS_VOLUME,
+        }
+        encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def purge_section_cache(self, summary_id: str) -> None:
+        """Delete the cached section audio of a summary (called on deletion)."""
+        cache_dir = self._section_cache_dir(summary_id.replace("audio_summary:", ""))
+        if not cache_dir.exists():
+            return
+        try:
+            shutil.rmtree(cache_dir)
+            logger.info(f"Section audio cache deleted: {cache_dir}")
+        except Exception as e:
+            logger.warning(f"Error deleting section audio cache {cache_dir}: {e}")
+
+    async def _synthesize_sections(
+        self,
+        sections: List[ScriptSection],
+        cache_dir: Path,
+        segment_files: List[str],
+        start_percentage: float,
+        span_percentage: float,
+    ) -> AsyncGenerator[Dict, None]:
+        """Synthesize sections concurrently, yielding progress as they finish.
+
+        Each section's audio is cached in cache_dir under the hash of its text,
+        voice, rate and volume: only new or edited sections go to edge-tts (up
+        to settings.audio_tts_concurrency at once), the others are reused.
+        Cached clips no longer referenced by the script are removed afterwards.
+
+        segment_files receives the segments in script order: the pause clip
+        before each section, then its audio. Failed sections are skipped.
+        """
+        total = len(sections)
+        slots = asyncio.Semaphore(max(1, settings.audio_tts_concurrency))
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        clip_paths = [cache_dir / f"{self._section_cache_key(s)}.mp3" for s in sections]
+
+        # One silence clip per distinct pause duration, shared by all sections
+        silences: Dict[int, Optional[str]] = {}
+        for duration_ms in sorted({s.pause_before_ms for s in sections if s.pause_before_ms > 0}):
+            silences[duration_ms] = await self._silence_clip(duration_ms)
+
+        async def synthesize(i: int, section: ScriptSection):
+            clip_path = clip_paths[i]
+            if clip_path.exists():
+                return i, section, TTSResult(success=True, audio_path=str(clip_path)), True
+
+            # Write under a temporary name so an interrupted run never leaves a partial clip
+            tmp_path = clip_path.with_name(f".{clip_path.stem}.{uuid.uuid4().hex[:8]}.mp3")
+            async with slots:
+                result = await self.tts_service.text_to_speech(
+                    text=section.content,
+                    output_path=str(tmp_path),
+                    voice=section.voice,
+                    language="fr",
+                    rate=TTS_RATE,
+                    volume=TTS_VOLUME,
+                    clean_markdown=False  # Already cleaned
+                )
+            if result.success:
+                os.replace(tmp_path, clip_path)
+                result.audio_path = str(clip_path)
+            else:
+                tmp_path.unlink(missing_ok=True)
+            return i, section, result, False
+
+        tasks = [asyncio.create_task(synthesize(i, s)) for i, s in enumerate(sections)]
+        results: List[Optional[TTSResult]] = [None] * total
+        reused = 0
+
+        try:
+            for done, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+                i, section, result, cached = await next_done
+                results[i] = result
+                reused += cached
+                if not result.success:
+                    logger.warning(f"Failed to generate audio for section {i}: {result.error}")
+
+                yield {
+                    "status": "generating_audio",
+                    "message": f"Section {done}/{total}: {section.title or section.level}"
+                               + (" (cache)" if cached else ""),
+                    "percentage": start_percentage + (span_percentage * done / total),
+                    "current_section": done,
+                    "total_sections": total
+                }
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        logger.info(f"Audio sections: {total - reused} synthesized, {reused} reused from cache")
+
+        for section, result in zip(sections, results):
+            silence_path = silences.get(section.pause_before_ms)
+            if silence_path:
+                segment_files.append(silence_path)
+            if result is not None and result.success:
+                segment_files.append(result.audio_path)
+
+        # Drop clips of sections that were edited or removed from the script
+        current = set(clip_paths)
+        for stale in cache_dir.glob("*.mp3"):
+            if stale not in current and not stale.name.startswith("."):
+                stale.unlink(missing_ok=True)
+
+    async def _silence_clip(self, duration_ms: int) -> Optional[str]:
+        """Return a cached silent clip of the given duration, generating it once."""
+        clip_path = self._silence_dir / f"silence_{duration_ms}ms.mp3"
+        if clip_path.exists():
+            return str(clip_path)
+
+        async with self._silence_lock:
+            if clip_path.exists():
+                return str(clip_path)
+
+            self._silence_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = clip_path.with_name(f".{clip_path.stem}.{uuid.uuid4().hex[:8]}.mp3")
+            if not await self._generate_silence(str(tmp_path), duration_ms):
+                tmp_path.unlink(missing_ok=True)
+                return None
+            os.replace(tmp_path, clip_path)
+
+        return str(clip_path)
+
     async def _generate_silence(self, output_path: str, duration_ms: int) -> bool:
         """Generate a silent audio segment using ffmpeg.
 
-        Uses 24000 Hz mono to match edge-tts output format.
+        Uses 24000 Hz mono to match edge-tts output format, without ID3 or
+        Xing headers so the clip can be spliced into a raw MP3 stream.
         """
         try:
             duration_seconds = duration_ms / 1000.0
@@ -1506,6 +1591,9 @@ class AudioSummaryService:
                 "-t", str(duration_seconds),
                 "-b:a", "48k",
                 "-acodec", "libmp3lame",
+                "-id3v2_version", "0",
+                "-write_xing", "0",
+                "-f", "mp3",
                 output_path
             ]
 
@@ -1523,27 +1611,21 @@ class AudioSummaryService:
             return False
 
     async def _concatenate_segments(
-        self, segment_files: List[str], output_path: str, temp_dir: str
+        self, segment_files: List[str], output_path: str
     ) -> bool:
-        """Concatenate audio segments using ffmpeg.
+        """Concatenate audio segments in a single ffmpeg pass.
 
-        Re-encodes to ensure consistent sample rate and format across all segments.
+        The segments are raw MP3 streams in the same format (edge-tts output and
+        silence clips), so they are streamed back to back into ffmpeg's stdin
+        and re-encoded once, without a concat list or intermediate files.
         """
         try:
-            # Create concat file
-            concat_file = os.path.join(temp_dir, "concat.txt")
-            with open(concat_file, "w") as f:
-                for seg_file in segment_files:
-                    escaped_path = seg_file.replace("'", "'\\''")
-                    f.write(f"file '{escaped_path}'\n")
-
-            # Concatenate with ffmpeg - re-encode to ensure consistent output
-            # Use 48kHz stereo for better quality and browser compatibility
+            # Re-encode to 48kHz stereo for better quality and browser compatibility
             ffmpeg_cmd = [
                 "ffmpeg", "-y",
-                "-f", "concat",
-                "-safe", "0",
-                "-i", concat_file,
+                "-loglevel", "error",
+                "-f", "mp3",
+                "-i", "pipe:0",
                 "-ar", "48000",      # 48kHz sample rate
                 "-ac", "2",          # Stereo
                 "-b:a", "128k",      # Good quality bitrate
@@ -1553,10 +1635,23 @@ class AudioSummaryService:
 
             proc = await asyncio.create_subprocess_exec(
                 *ffmpeg_cmd,
-                stdout=subprocess.PIPE,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
                 stderr=subprocess.PIPE
             )
-            stdout, stderr = await proc.communicate()
+            stderr_task = asyncio.create_task(proc.stderr.read())
+
+            try:
+                for seg_file in segment_files:
+                    proc.stdin.write(await asyncio.to_thread(Path(seg_file).read_bytes))
+                    await proc.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # ffmpeg exited early: its error is reported below
+            finally:
+                proc.stdin.close()
+
+            stderr = await stderr_task
+            await proc.wait()
 
             if proc.returncode != 0:
                 logger.error(f"ffmpeg concatenation failed: {stderr.decode()}")
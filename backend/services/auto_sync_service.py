@@ -6,28 +6,58 @@ all linked directories to detect:
 - New files (add and index)
 - Modified files (reindex)
 - Deleted files (remove from index)
+
+Change detection is stat-first: a per-link manifest (see sync_manifest)
+keeps the (size, mtime_ns, inode) and hash of every file, and a file is
+only read and hashed when its stat tuple changed.
+
+In watch mode (watchfiles), filesystem events trigger the sync of the
+changed files within seconds; bursts of events are debounced and
+coalesced. The periodic full sync then runs at a low frequency as a
+safety net for missed events.
 """
 
 import asyncio
 import logging
+import os
 import traceback
-import uuid
 from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 from services.surreal_service import get_surreal_service
+from services.course_context_cache import bump_course_version
 from services.document_indexing_service import DocumentIndexingService
+from services.sync_manifest import FileStat, SyncManifest, get_sync_manifest_store
+from services.ingestion_pipeline import (
+    IngestionItem,
+    IngestionPipeline,
+    build_linked_document,
+    extract_text_async,
+    has_text_content,
+)
 from utils.file_utils import calculate_file_hash
 from utils.linked_directory_utils import (
+    build_file_info,
     scan_directory,
-    extract_text_from_file,
     normalize_linked_source,
 )
 
 logger = logging.getLogger(__name__)
 
+# Vérifier si watchfiles est disponible (installé avec uvicorn[standard])
+try:
+    import watchfiles
+    WATCHFILES_AVAILABLE = True
+except ImportError:
+    WATCHFILES_AVAILABLE = False
+    logger.warning("watchfiles non disponible, synchronisation par intervalle uniquement. Installer avec: uv add watchfiles")
+
+
+# Columns needed to synchronize linked documents (never the extracted text)
+SYNC_FIELDS = "id, course_id, file_path, taille, user_id, linked_source"
+
 
 class AutoSyncService:
     """Singleton service for automatic synchronization of linked directories."""
@@ -48,6 +78,15 @@ class AutoSyncService:
         self._running = False
         self._interval_seconds = 300  # 5 minutes by default
         self._task = None
+        # Event-driven mode
+        self._watch_enabled = False
+        self._debounce_ms = 1500
+        self._watch_task: Optional[asyncio.Task] = None
+        self._watched_links: dict[str, tuple[str, str, str]] = {}
+        self._links_changed = asyncio.Event()
+        self._watch_stop: Optional[asyncio.Event] = None
+        # Serializes full syncs and event-driven syncs
+        self._sync_lock = asyncio.Lock()
 
     @property
     def interval_seconds(self) -> int:
@@ -60,6 +99,28 @@ class AutoSyncService:
         self._interval_seconds = max(60, value)
         logger.info(f"Auto-sync interval set to {self._interval_seconds} seconds")
 
+    @property
+    def watch_enabled(self) -> bool:
+        """Whether linked directories are watched for filesystem events."""
+        return self._watch_enabled
+
+    @watch_enabled.setter
+    def watch_enabled(self, value: bool):
+        """Enable event-driven sync (requires watchfiles)."""
+        if value and not WATCHFILES_AVAILABLE:
+            logger.warning("watchfiles is not installed, falling back to periodic sync")
+            value = False
+        self._watch_enabled = value
+
+    @property
+    def debounce_ms(self) -> int:
+        """Quiet period (ms) after the last filesystem event before syncing."""
+        return self._debounce_ms
+
+    @debounce_ms.setter
+    def debounce_ms(self, value: int):
+        self._debounce_ms = max(50, value)
+
     @property
     def is_running(self) -> bool:
         """Check if the service is running."""
@@ -73,8 +134,11 @@ class AutoSyncService:
 
         self._running = True
         self._task = asyncio.create_task(self._sync_loop())
+        if self._watch_enabled:
+            self._watch_task = asyncio.create_task(self._watch_loop())
         logger.info(
-            f"Auto-sync service started (interval: {self._interval_seconds}s)"
+            f"Auto-sync service started (interval: {self._interval_seconds}s, "
+            f"watch: {self._watch_enabled})"
         )
 
     async def stop(self):
@@ -83,13 +147,17 @@ class AutoSyncService:
             return
 
         self._running = False
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-            self._task = None
+        if self._watch_stop:
+            self._watch_stop.set()
+        for task in (self._task, self._watch_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._watch_task = None
         logger.info("Auto-sync service stopped")
 
     async def _sync_loop(self):
@@ -99,7 +167,10 @@ class AutoSyncService:
 
         while self._running:
             try:
-                await self._sync_all_linked_directories()
+                async with self._sync_lock:
+                    await self._sync_all_linked_directories()
+                if self._watch_enabled:
+                    await self._refresh_watches_if_changed()
             except Exception as e:
                 logger.error(f"Error in auto-sync loop: {e}")
                 logger.debug(traceback.format_exc())
@@ -119,8 +190,8 @@ class AutoSyncService:
                 return
 
             # Retrieve all linked documents (all courses)
-            query = """
-                SELECT * FROM document
+            query = f"""
+                SELECT {SYNC_FIELDS} FROM document
                 WHERE source_type = 'linked'
                 AND linked_source IS NOT NONE
             """
@@ -186,27 +257,334 @@ class AutoSyncService:
             logger.error(f"Error in _sync_all_linked_directories: {e}")
             logger.debug(traceback.format_exc())
 
+    async def sync_course(self, course_id: str, user_id: Optional[str] = None) -> dict:
+        """
+        Synchronize the linked directories of one course now.
+
+        Args:
+            course_id: Course ID (normalized to "course:xxx")
+            user_id: Owner of newly added documents (defaults to the link's owner)
+
+        Returns:
+            Statistics: {"added", "updated", "removed", "unchanged"}
+        """
+        service = get_surreal_service()
+        if not service.db:
+            await service.connect()
+
+        if not course_id.startswith("course:"):
+            course_id = f"course:{course_id}"
+
+        query = f"""
+            SELECT {SYNC_FIELDS} FROM document
+            WHERE course_id = $course_id
+            AND source_type = 'linked'
+            AND linked_source IS NOT NONE
+        """
+        result = await service.db.query(query, {"course_id": course_id})
+        linked_docs = result if result else []
+
+        links = defaultdict(list)
+        for doc in linked_docs:
+            link_id = normalize_linked_source(doc.get("linked_source")).get("link_id")
+            if link_id:
+                links[link_id].append(doc)
+
+        async with self._sync_lock:
+            return await self._sync_course_directories(service, course_id, links, user_id)
+
+    # =========================================================================
+    # Event-driven sync
+    # =========================================================================
+
+    def refresh_watches(self):
+        """Reload the set of watched directories (after a link was added or removed)."""
+        self._links_changed.set()
+        if self._watch_stop:
+            self._watch_stop.set()
+
+    async def _load_watched_links(self) -> dict[str, tuple[str, str, str]]:
+        """
+        List the linked directories to watch.
+
+        Returns:
+            {base_path: (course_id, link_id, owner user_id)} for existing directories
+        """
+        service = get_surreal_service()
+        if not service.db:
+            return {}
+
+        result = await service.db.query(
+            """
+            SELECT course_id, user_id, linked_source FROM document
+            WHERE source_type = 'linked'
+            AND linked_source IS NOT NONE
+            """
+        )
+        links = {}
+        for doc in result or []:
+            linked_source = normalize_linked_source(doc.get("linked_source"))
+            link_id = linked_source.get("link_id")
+            directory_path = self._link_directory(linked_source)
+            if not link_id or not directory_path or directory_path in links:
+                continue
+            if Path(directory_path).is_dir():
+                links[directory_path] = (
+                    doc.get("course_id", ""),
+                    link_id,
+                    doc.get("user_id", "system"),
+                )
+        return links
+
+    async def _refresh_watches_if_changed(self):
+        """Restart the watcher if linked directories were added or removed."""
+        links = await self._load_watched_links()
+        if links.keys() != self._watched_links.keys():
+            self.refresh_watches()
+
+    async def _watch_loop(self):
+        """Watch linked directories and sync changed files as events arrive."""
+        await asyncio.sleep(10)
+
+        while self._running:
+            self._links_changed.clear()
+            try:
+                links = await self._load_watched_links()
+            except Exception as e:
+                logger.error(f"Cannot list linked directories to watch: {e}")
+                links = {}
+
+            self._watched_links = links
+            if not links:
+                await self._links_changed.wait()
+                continue
+
+            self._watch_stop = asyncio.Event()
+            logger.info(f"Auto-sync: watching {len(links)} linked directories")
+            try:
+                # step: quiet period before yielding; debounce: upper bound for a burst
+                async for changes in watchfiles.awatch(
+                    *links,
+                    watch_filter=watchfiles.DefaultFilter(),
+                    step=self._debounce_ms,
+                    debounce=self._debounce_ms * 10,
+                    stop_event=self._watch_stop,
+                ):
+                    await self._handle_changes(changes, links)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error watching linked directories: {e}")
+                logger.debug(traceback.format_exc())
+                await asyncio.sleep(30)
+
+    @staticmethod
+    def _owning_link(path: str, links: dict) -> Optional[str]:
+        """Base path of the (innermost) linked directory containing path."""
+        best = None
+        for base_path in links:
+            if path == base_path or path.startswith(base_path.rstrip(os.sep) + os.sep):
+                if best is None or len(base_path) > len(best):
+                    best = base_path
+        return best
+
+    async def _handle_changes(self, changes: set, links: dict):
+        """Sync the files of a batch of (coalesced) filesystem events."""
+        by_link = defaultdict(set)
+        for _change, path in changes:
+            base_path = self._owning_link(path, links)
+            if base_path:
+                by_link[base_path].add(path)
+
+        if not by_link:
+            return
+
+        service = get_surreal_service()
+        if not service.db:
+            return
+
+        async with self._sync_lock:
+            for base_path, paths in by_link.items():
+                course_id, link_id, owner_id = links[base_path]
+                try:
+                    stats = await self._sync_paths(
+                        service, course_id, link_id, owner_id, base_path, sorted(paths)
+                    )
+                    if stats["added"] + stats["updated"] + stats["removed"]:
+                        logger.info(
+                            f"Auto-sync (events): {base_path} "
+                            f"+{stats['added']} -{stats['removed']} ~{stats['updated']}"
+                        )
+                except Exception as e:
+                    logger.error(f"Error syncing changes in {base_path}: {e}")
+                    logger.debug(traceback.format_exc())
+
+    async def _sync_paths(
+        self,
+        service,
+        course_id: str,
+        link_id: str,
+        owner_id: str,
+        base_path: str,
+        paths: list[str],
+    ) -> dict:
+        """
+        Synchronize the given paths of a linked directory.
+
+        Falls back to a full sync of the link when a directory was created,
+        moved or deleted, since events for the files it contains may be
+        missing.
+        """
+        result = await service.db.query(
+            f"""
+            SELECT {SYNC_FIELDS} FROM document
+            WHERE course_id = $course_id
+            AND source_type = 'linked'
+            AND file_path IN $paths
+            """,
+            {"course_id": course_id, "paths": paths},
+        )
+        existing_files = {doc["file_path"]: doc for doc in (result or [])}
+
+        file_infos = {}
+        for path in paths:
+            file_path = Path(path)
+            try:
+                file_info = build_file_info(file_path, Path(base_path))
+            except OSError as e:
+                logger.warning(f"Cannot stat {path}: {e}")
+                continue
+
+            if file_info is None and path not in existing_files and (
+                file_path.is_dir() or (not file_path.exists() and not file_path.suffix)
+            ):
+                return await self._sync_link(service, course_id, link_id)
+
+            file_infos[path] = file_info
+
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        manifest = get_sync_manifest_store().get(link_id)
+        indexing_service = DocumentIndexingService()
+        now = datetime.utcnow().isoformat()
+        try:
+            new_files = []
+            for path, file_info in file_infos.items():
+                existing_doc = existing_files.get(path)
+                if file_info is None:
+                    if existing_doc:
+                        await self._remove_deleted_file(
+                            service, indexing_service, manifest, stats, path, existing_doc["id"]
+                        )
+                elif existing_doc is None:
+                    new_files.append(file_info)
+                else:
+                    await self._sync_existing_file(
+                        service, indexing_service, manifest, stats, file_info, existing_doc,
+                        course_id, now,
+                    )
+
+            await self._add_new_files(
+                service, indexing_service, manifest, stats, new_files,
+                base_path, course_id, link_id, owner_id, now,
+            )
+        finally:
+            await asyncio.to_thread(manifest.save)
+            if stats["updated"] or stats["removed"]:
+                bump_course_version(course_id)
+
+        return stats
+
+    async def _sync_link(self, service, course_id: str, link_id: str) -> dict:
+        """Full sync of one linked directory."""
+        result = await service.db.query(
+            f"""
+            SELECT {SYNC_FIELDS} FROM document
+            WHERE course_id = $course_id
+            AND source_type = 'linked'
+            AND linked_source.link_id = $link_id
+            """,
+            {"course_id": course_id, "link_id": link_id},
+        )
+        docs = result if result else []
+        if not docs:
+            return {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        return await self._sync_course_directories(service, course_id, {link_id: docs})
+
+    # =========================================================================
+    # Change detection
+    # =========================================================================
+
+    @staticmethod
+    def _link_directory(linked_source: dict) -> Optional[str]:
+        """Base directory of a link (older documents only store the file path)."""
+        directory_path = linked_source.get("base_path")
+        if not directory_path:
+            absolute_path = linked_source.get("absolute_path", "")
+            if not absolute_path:
+                return None
+            directory_path = str(Path(absolute_path).parent)
+        return directory_path
+
+    @staticmethod
+    def _file_stat(file_info) -> FileStat:
+        return FileStat(file_info.size, file_info.mtime_ns, file_info.inode)
+
+    async def _is_modified(
+        self,
+        manifest: SyncManifest,
+        file_path: str,
+        file_info,
+        existing_doc: dict,
+        existing_linked_source: dict,
+    ) -> Optional[str]:
+        """
+        Check whether a linked file changed since its document was synced.
+
+        The file is hashed only when its stat tuple differs from the
+        manifest. Files synced before the manifest existed are trusted when
+        their size and mtime match the document.
+
+        Returns:
+            The new content hash if the file was modified, None otherwise
+        """
+        old_hash = existing_linked_source.get("source_hash", "")
+        stat = self._file_stat(file_info)
+
+        entry = manifest.get(file_path)
+        if entry is not None and entry.stat == stat and entry.hash == old_hash:
+            return None
+
+        if (
+            entry is None
+            and old_hash
+            and existing_linked_source.get("source_mtime", 0) == file_info.modified_time
+            and existing_doc.get("taille") == file_info.size
+        ):
+            manifest.set(file_path, stat, old_hash)
+            return None
+
+        new_hash = await asyncio.to_thread(calculate_file_hash, Path(file_path))
+        manifest.set(file_path, stat, new_hash)
+        return new_hash if new_hash != old_hash else None
+
     async def _sync_course_directories(
-        self, service, course_id: str, links: dict
+        self, service, course_id: str, links: dict, user_id: Optional[str] = None
     ) -> dict:
         """Synchronize linked directories for a specific course."""
         stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
         indexing_service = DocumentIndexingService()
+        manifests = get_sync_manifest_store()
         now = datetime.utcnow().isoformat()
 
         for link_id, docs in links.items():
+            manifest = manifests.get(link_id)
             try:
                 # Get the base path
-                first_doc_linked_source = normalize_linked_source(
-                    docs[0].get("linked_source")
+                directory_path = self._link_directory(
+                    normalize_linked_source(docs[0].get("linked_source"))
                 )
-                directory_path = first_doc_linked_source.get("base_path")
-
                 if not directory_path:
-                    absolute_path = first_doc_linked_source.get("absolute_path", "")
-                    if not absolute_path:
-                        continue
-                    directory_path = str(Path(absolute_path).parent)
+                    continue
 
                 # Verify the directory still exists
                 if not Path(directory_path).exists():
@@ -217,7 +595,7 @@ class AutoSyncService:
 
                 # Scan the directory
                 try:
-                    scan_result = scan_directory(directory_path)
+                    scan_result = await asyncio.to_thread(scan_directory, directory_path)
                 except Exception as e:
                     logger.error(f"Cannot scan {directory_path}: {e}")
                     continue
@@ -229,147 +607,174 @@ class AutoSyncService:
                 }
 
                 # Get user_id from first document for new files
-                user_id = docs[0].get("user_id", "system")
+                owner_id = user_id or docs[0].get("user_id", "system")
 
                 # 1. Detect deleted files
                 for file_path, doc in existing_files.items():
                     if file_path not in scanned_files:
-                        doc_id = doc["id"]
-                        await service.delete(doc_id)
-                        stats["removed"] += 1
-                        logger.info(f"Auto-sync: removed {Path(file_path).name}")
+                        await self._remove_deleted_file(
+                            service, indexing_service, manifest, stats, file_path, doc["id"]
+                        )
 
-                # 2. Detect new files and modifications
+                # 2. Detect modifications
+                new_files = []
                 for file_path, file_info in scanned_files.items():
-                    source_file = Path(file_path)
-
-                    if file_path not in existing_files:
-                        # New file
-                        try:
-                            await self._add_new_file(
-                                service,
-                                indexing_service,
-                                source_file,
-                                file_info,
-                                scan_result,
-                                course_id,
-                                link_id,
-                                user_id,
-                                now,
-                            )
-                            stats["added"] += 1
-                            logger.info(f"Auto-sync: added {source_file.name}")
-                        except Exception as e:
-                            logger.error(f"Error adding {file_path}: {e}")
-                    else:
-                        # Existing file - check for modifications
-                        existing_doc = existing_files[file_path]
-                        existing_linked_source = normalize_linked_source(
-                            existing_doc.get("linked_source")
-                        )
-                        old_hash = existing_linked_source.get("source_hash", "")
-                        old_mtime = existing_linked_source.get("source_mtime", 0)
-
-                        new_hash = calculate_file_hash(source_file)
-
-                        if (
-                            new_hash != old_hash
-                            or file_info.modified_time != old_mtime
-                        ):
-                            # Modified file
-                            try:
-                                await self._update_modified_file(
-                                    service,
-                                    indexing_service,
-                                    existing_doc,
-                                    existing_linked_source,
-                                    source_file,
-                                    file_info,
-                                    new_hash,
-                                    course_id,
-                                    now,
-                                )
-                                stats["updated"] += 1
-                                logger.info(f"Auto-sync: updated {source_file.name}")
-                            except Exception as e:
-                                logger.error(f"Error updating {file_path}: {e}")
-                        else:
-                            stats["unchanged"] += 1
+                    existing_doc = existing_files.get(file_path)
+                    if existing_doc is None:
+                        new_files.append(file_info)
+                        continue
+                    await self._sync_existing_file(
+                        service,
+                        indexing_service,
+                        manifest,
+                        stats,
+                        file_info,
+                        existing_doc,
+                        course_id,
+                        now,
+                    )
+
+                # 3. Add new files (concurrent ingestion pipeline)
+                await self._add_new_files(
+                    service,
+                    indexing_service,
+                    manifest,
+                    stats,
+                    new_files,
+                    scan_result.base_path,
+                    course_id,
+                    link_id,
+                    owner_id,
+                    now,
+                )
 
             except Exception as e:
                 logger.error(f"Error syncing link_id {link_id}: {e}")
+            finally:
+                try:
+                    await asyncio.to_thread(manifest.save)
+                except Exception as e:
+                    logger.warning(f"Could not save sync manifest for {link_id}: {e}")
 
+        if stats["updated"] or stats["removed"]:
+            bump_course_version(course_id)
         return stats
 
-    async def _add_new_file(
+    async def _add_new_files(
         self,
         service,
         indexing_service,
-        source_file: Path,
-        file_info,
-        scan_result,
+        manifest: SyncManifest,
+        stats: dict,
+        new_files: list,
+        base_path: str,
         course_id: str,
         link_id: str,
-        user_id: str,
+        owner_id: str,
         now: str,
     ):
-        """Add a newly detected file."""
-        doc_id = str(uuid.uuid4())[:8]
-        content = extract_text_from_file(source_file)
-        file_hash = calculate_file_hash(source_file)
-
-        linked_source = {
-            "absolute_path": str(source_file),
-            "relative_path": file_info.relative_path,
-            "parent_folder": file_info.parent_folder,
-            "link_id": link_id,
-            "base_path": scan_result.base_path,
-            "last_sync": now,
-            "source_hash": file_hash,
-            "source_mtime": file_info.modified_time,
-        }
-
-        mime_types = {
-            "md": "text/markdown",
-            "mdx": "text/markdown",
-            "txt": "text/plain",
-            "pdf": "application/pdf",
-            "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            "doc": "application/msword",
-        }
-        type_mime = mime_types.get(file_info.extension, "application/octet-stream")
-
-        document_data = {
-            "course_id": course_id,
-            "nom_fichier": source_file.name,
-            "type_fichier": file_info.extension,
-            "type_mime": type_mime,
-            "taille": file_info.size,
-            "file_path": str(source_file),
-            "user_id": user_id,
-            "created_at": now,
-            "source_type": "linked",
-            "linked_source": linked_source,
-            "texte_extrait": (
-                content if content and not content.startswith("[Contenu") else None
-            ),
-            "indexed": False,
-        }
+        """Add newly detected files: extraction, creation and indexing run concurrently."""
+        if not new_files:
+            return
 
-        await service.create("document", document_data, record_id=doc_id)
+        def build_record(item: IngestionItem) -> dict:
+            return build_linked_document(
+                item.file_info,
+                item.content,
+                item.file_hash,
+                course_id,
+                link_id,
+                base_path,
+                owner_id,
+                now,
+            )
 
-        # Index if content is available
-        if content and not content.startswith("[Contenu"):
+        async def finish(item: IngestionItem):
+            # Index if content is available
+            if not has_text_content(item.content):
+                return
             try:
                 result = await indexing_service.index_document(
-                    document_id=f"document:{doc_id}",
+                    document_id=item.document_id,
                     course_id=course_id,
-                    text_content=content,
+                    text_content=item.content,
                 )
                 if result.get("success"):
-                    await service.merge(f"document:{doc_id}", {"indexed": True})
+                    await service.merge(item.document_id, {"indexed": True})
             except Exception as e:
-                logger.error(f"Error indexing document:{doc_id}: {e}")
+                logger.error(f"Error indexing {item.document_id}: {e}")
+
+        pipeline = IngestionPipeline(service, build_record, finish)
+        async for item in pipeline.run(new_files):
+            if item.error:
+                logger.error(f"Error adding {item.file_info.absolute_path}: {item.error}")
+                continue
+            manifest.set(item.file_info.absolute_path, self._file_stat(item.file_info), item.file_hash)
+            stats["added"] += 1
+            logger.info(f"Auto-sync: added {item.file_info.filename}")
+
+    async def _remove_deleted_file(
+        self,
+        service,
+        indexing_service,
+        manifest: SyncManifest,
+        stats: dict,
+        file_path: str,
+        doc_id: str,
+    ):
+        """Delete the document of a removed file with its embeddings and index entries."""
+        await service.delete(doc_id)
+        if not await indexing_service.delete_document_index(doc_id):
+            logger.error(f"Error deleting embeddings for {doc_id}")
+        manifest.remove(file_path)
+        stats["removed"] += 1
+        logger.info(f"Auto-sync: removed {Path(file_path).name}")
+
+    async def _sync_existing_file(
+        self,
+        service,
+        indexing_service,
+        manifest: SyncManifest,
+        stats: dict,
+        file_info,
+        existing_doc: dict,
+        course_id: str,
+        now: str,
+    ):
+        """Reindex a known file if it changed, updating stats and manifest."""
+        file_path = file_info.absolute_path
+        source_file = Path(file_path)
+
+        existing_linked_source = normalize_linked_source(existing_doc.get("linked_source"))
+        new_hash = await self._is_modified(
+            manifest,
+            file_path,
+            file_info,
+            existing_doc,
+            existing_linked_source,
+        )
+
+        if not new_hash:
+            stats["unchanged"] += 1
+            return
+
+        # Modified file
+        try:
+            await self._update_modified_file(
+                service,
+                indexing_service,
+                existing_doc,
+                existing_linked_source,
+                source_file,
+                file_info,
+                new_hash,
+                course_id,
+                now,
+            )
+            stats["updated"] += 1
+            logger.info(f"Auto-sync: updated {source_file.name}")
+        except Exception as e:
+            logger.error(f"Error updating {file_path}: {e}")
 
     async def _update_modified_file(
         self,
@@ -384,7 +789,7 @@ class AutoSyncService:
         now: str,
     ):
         """Update a modified file."""
-        content = extract_text_from_file(source_file)
+        content = await extract_text_async(str(source_file))
         doc_id = existing_doc["id"]
 
         updated_linked_source = existing_linked_source.copy()
@@ -394,27 +799,28 @@ class AutoSyncService:
 
         update_data = {
             "linked_source": updated_linked_source,
-            "texte_extrait": (
-                content if content and not content.startswith("[Contenu") else None
-            ),
+            "texte_extrait": content if has_text_content(content) else None,
             "taille": file_info.size,
             "indexed": False,
         }
 
         await service.merge(doc_id, update_data)
 
-        # Reindex if content is available
-        if content and not content.startswith("[Contenu"):
-            try:
+        # Reindex if content is available; unchanged chunks reuse their embeddings
+        try:
+            if has_text_content(content):
                 result = await indexing_service.index_document(
                     document_id=doc_id,
                     course_id=course_id,
                     text_content=content,
+                    force_reindex=True,
                 )
                 if result.get("success"):
                     await service.merge(doc_id, {"indexed": True})
-            except Exception as e:
-                logger.error(f"Error re-indexing {doc_id}: {e}")
+            else:
+                await indexing_service.delete_document_index(doc_id)
+        except Exception as e:
+            logger.error(f"Error re-indexing {doc_id}: {e}")
 
 
 # Global service instance
@@ -429,10 +835,27 @@ def get_auto_sync_service() -> AutoSyncService:
     return _auto_sync_service
 
 
-async def start_auto_sync(interval_seconds: int = 300):
-    """Start the automatic synchronization service."""
+async def start_auto_sync(
+    interval_seconds: int = 300,
+    watch: bool = False,
+    reconcile_interval_seconds: int = 3600,
+    debounce_ms: int = 1500,
+):
+    """
+    Start the automatic synchronization service.
+
+    Args:
+        interval_seconds: Full sync interval when not watching
+        watch: Sync on filesystem events (falls back to polling without watchfiles)
+        reconcile_interval_seconds: Full sync interval when watching (safety net)
+        debounce_ms: Quiet period after the last event before syncing
+    """
     service = get_auto_sync_service()
-    service.interval_seconds = interval_seconds
+    service.watch_enabled = watch
+    service.debounce_ms = debounce_ms
+    service.interval_seconds = (
+        reconcile_interval_seconds if service.watch_enabled else interval_seconds
+    )
     await service.start()
 
 
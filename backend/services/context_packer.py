@@ -0,0 +1,206 @@
+"""
+Assemblage du contexte du tuteur sous budget de tokens.
+
+Le prompt d'un tour de chat est borné par le budget du modèle
+(config.models.get_context_budget). Ce qui reste après les instructions et
+le message de l'utilisateur est réparti entre:
+- les tours d'historique les plus récents (contigus, jusqu'à une part du budget)
+- les extraits de documents les mieux classés pour le message, retrouvés par
+  la recherche hybride (vecteurs + BM25) sur les chunks indexés; les
+  documents pas encore indexés sont classés par BM25 sur leur extrait
+- les tours d'historique plus anciens, si les extraits laissent de la place
+
+Les tokens sont estimés (~4 caractères par token), comme pour le découpage.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, List, Sequence
+
+from services.keyword_index import BM25Index, reciprocal_rank_fusion
+from services.text_chunker import estimate_tokens
+from services.vector_index import IndexedChunk
+
+logger = logging.getLogger(__name__)
+
+# Part du budget disponible réservée d'abord à l'historique récent
+HISTORY_SHARE = 0.4
+
+# Coût fixe d'un tour d'historique ou d'un extrait (libellé, séparateurs)
+ENTRY_OVERHEAD_TOKENS = 8
+
+# Extraits candidats demandés à la recherche
+DEFAULT_TOP_K = 12
+
+
+@dataclass
+class ContextSnippet:
+    """Extrait de document candidat au contexte du prompt."""
+    document_id: str
+    name: str
+    text: str
+    score: float = 0.0
+    is_transcription: bool = False
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text) + ENTRY_OVERHEAD_TOKENS
+
+
+@dataclass
+class PackedContext:
+    """Contenu retenu pour un tour de chat."""
+    snippets: List[ContextSnippet] = field(default_factory=list)
+    # Tours d'historique retenus, dans l'ordre chronologique
+    history: List[Any] = field(default_factory=list)
+    budget: int = 0
+    used_tokens: int = 0
+    dropped_turns: int = 0
+
+
+def _turn_tokens(message: Any) -> int:
+    return estimate_tokens(message.content or "") + ENTRY_OVERHEAD_TOKENS
+
+
+def pack_context(
+    snippets: Sequence[ContextSnippet],
+    history: Sequence[Any],
+    budget: int,
+    reserved_tokens: int = 0,
+    history_share: float = HISTORY_SHARE,
+) -> PackedContext:
+    """
+    Sélectionne l'historique et les extraits qui tiennent dans le budget.
+
+    Args:
+        snippets: Extraits classés par pertinence décroissante
+        history: Tours d'historique (objets avec role et content), du plus ancien au plus récent
+        budget: Budget de tokens du prompt complet
+        reserved_tokens: Tokens déjà pris (instructions, message de l'utilisateur)
+        history_share: Part du budget disponible d'abord réservée à l'historique
+
+    Returns:
+        Le contexte retenu; un extrait trop long est sauté au profit des suivants,
+        l'historique reste contigu (les tours les plus anciens sont abandonnés)
+    """
+    available = max(0, budget - reserved_tokens)
+    packed = PackedContext(budget=budget)
+
+    turns = list(history)
+    kept_turns = 0
+    used = 0
+
+    def keep_recent_turns(limit: int) -> None:
+        nonlocal kept_turns, used
+        while kept_turns < len(turns):
+            cost = _turn_tokens(turns[len(turns) - 1 - kept_turns])
+            if used + cost > limit:
+                break
+            used += cost
+            kept_turns += 1
+
+    keep_recent_turns(int(available * history_share))
+
+    for snippet in snippets:
+        cost = snippet.tokens
+        if used + cost <= available:
+            packed.snippets.append(snippet)
+            used += cost
+
+    # La place laissée par les extraits revient à l'historique plus ancien
+    keep_recent_turns(available)
+
+    packed.history = turns[len(turns) - kept_turns:] if kept_turns else []
+    packed.dropped_turns = len(turns) - kept_turns
+    packed.used_tokens = reserved_tokens + used
+    return packed
+
+
+def _rank_excerpts(message: str, excerpts: List[dict], course_id: str, top_k: int) -> List[dict]:
+    """Classe par BM25 les extraits de documents absents de l'index du cours."""
+    index = BM25Index()
+    index.add([
+        IndexedChunk(
+            document_id=excerpt["document_id"],
+            course_id=course_id,
+            chunk_index=-1,
+            chunk_text=excerpt["content"],
+        )
+        for excerpt in excerpts
+    ])
+    return [
+        {**chunk.to_result(0.0), "bm25_score": score}
+        for chunk, score in index.search_text(message, top_k)
+    ]
+
+
+async def rank_snippets(
+    course_id: str,
+    message: str,
+    documents: List[dict],
+    excerpts: List[dict],
+    top_k: int = DEFAULT_TOP_K,
+) -> List[ContextSnippet]:
+    """
+    Classe les extraits candidats pour le message de l'utilisateur.
+
+    Args:
+        course_id: Cours de la conversation
+        message: Message de l'utilisateur
+        documents: Documents du cours (id, nom_fichier, is_transcription)
+        excerpts: Extraits des documents (document_id, content), utilisés pour
+            les documents sans chunks indexés
+        top_k: Nombre maximum d'extraits
+
+    Returns:
+        Extraits par pertinence décroissante (fusion des rangs)
+    """
+    # Import tardif: le service d'indexation charge le modèle d'embeddings
+    from services.document_indexing_service import get_document_indexing_service
+
+    indexing_service = get_document_indexing_service()
+    indexed_hits: List[dict] = []
+    indexed_ids: set = set()
+    try:
+        indexed_hits = await indexing_service.hybrid_search(message, course_id, top_k=top_k)
+        indexed_ids = await indexing_service.indexed_document_ids(course_id)
+    except Exception as e:
+        logger.warning(f"Recherche des extraits impossible pour {course_id}: {e}")
+
+    unindexed = [excerpt for excerpt in excerpts if excerpt["document_id"] not in indexed_ids]
+    excerpt_hits = _rank_excerpts(message, unindexed, course_id, top_k) if unindexed else []
+
+    by_id = {str(doc.get("id")): doc for doc in documents}
+    snippets = []
+    for hit in reciprocal_rank_fusion([indexed_hits, excerpt_hits], top_k):
+        doc = by_id.get(str(hit.get("document_id")))
+        if doc is None:
+            continue
+        snippets.append(ContextSnippet(
+            document_id=str(hit["document_id"]),
+            name=doc.get("nom_fichier", "Document"),
+            text=hit.get("chunk_text") or "",
+            score=hit["rrf_score"],
+            is_transcription=bool(doc.get("is_transcription")),
+        ))
+    return snippets
+
+
+def render_snippets(snippets: Sequence[ContextSnippet], language: str = "fr") -> str:
+    """Section du prompt système présentant les extraits retenus."""
+    if not snippets:
+        return ""
+
+    is_english = language == "en"
+    if is_english:
+        section = "\n\n**RELEVANT DOCUMENT EXCERPTS** (selected for the current question):"
+    else:
+        section = "\n\n**EXTRAITS PERTINENTS DES DOCUMENTS** (sélectionnés pour la question actuelle):"
+
+    for snippet in snippets:
+        if snippet.is_transcription:
+            content_type = "Transcription"
+        else:
+            content_type = "Content" if is_english else "Contenu"
+        section += f"\n\n### {snippet.name} ({content_type}):\n{snippet.text}"
+    return section
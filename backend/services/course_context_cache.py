@@ -0,0 +1,363 @@
+"""
+Cache des instantanés de contexte de cours pour le chat.
+
+Chaque message du chat dans un cours a besoin des mêmes données: la fiche du
+cours, la liste de ses documents (métadonnées et extrait du texte), les
+relations audio → transcription et PDF → extraction, l'aperçu compact de la
+liste et le début du prompt système. Elles sont calculées une fois par
+version du cours et conservées en mémoire.
+
+Chaque cours a un compteur de version, incrémenté par bump_course_version à
+chaque écriture qui modifie ce contexte (DocumentService, ModuleService,
+mise à jour ou suppression du cours). Un instantané n'est servi que si sa
+version est toujours la version courante du cours: sur le chemin habituel,
+la préparation du chat coûte une recherche dans un dictionnaire. Une durée
+de vie (chat_context_cache_ttl) couvre les écritures qui contournent ces
+services.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import settings
+from services.prompt_builder_service import build_tutor_prompt_prefix
+from services.surreal_service import get_surreal_service
+
+logger = logging.getLogger(__name__)
+
+# Caractères du texte extrait de chaque document conservés dans l'instantané
+CONTEXT_EXCERPT_CHARS = 4000
+
+AUDIO_TYPES = {"MP3", "WAV", "M4A", "OGG", "WEBM"}
+
+_course_versions: Dict[str, int] = {}
+# Incrémentée quand le cours concerné par une écriture est inconnu: invalide tout
+_global_epoch = 0
+
+
+def course_key(course_id: str) -> str:
+    """Identifiant normalisé d'un cours (course:xxx)."""
+    return course_id if course_id.startswith("course:") else f"course:{course_id}"
+
+
+def bump_course_version(course_id: Optional[str] = None) -> None:
+    """
+    Signale une modification du contexte d'un cours.
+
+    Args:
+        course_id: Cours modifié; None invalide les instantanés de tous les cours
+    """
+    global _global_epoch
+    if not course_id:
+        _global_epoch += 1
+        return
+    key = course_key(course_id)
+    _course_versions[key] = _course_versions.get(key, 0) + 1
+
+
+def course_version(course_id: str) -> Tuple[int, int]:
+    """Version courante du contexte d'un cours."""
+    return _global_epoch, _course_versions.get(course_key(course_id), 0)
+
+
+@dataclass
+class CourseContextSnapshot:
+    """Contexte d'un cours à une version donnée."""
+    course_id: str
+    version: Tuple[int, int]
+    case_data: dict
+    documents: List[dict]
+    audio_transcription_map: Dict[str, str]
+    pdf_extraction_map: Dict[str, str]
+    preview: str
+    excerpts: List[dict]
+    sources: List[dict]
+    created_at: float = field(default_factory=time.monotonic)
+    _prompt_prefixes: Dict[str, str] = field(default_factory=dict, repr=False)
+
+    def find_document(self, document_id: str) -> Optional[dict]:
+        """Document du cours (métadonnées et extrait), ou None."""
+        if not document_id.startswith("document:"):
+            document_id = f"document:{document_id}"
+        for doc in self.documents:
+            if str(doc.get("id")) == document_id:
+                return doc
+        return None
+
+    def prompt_prefix(self, language: str) -> str:
+        """Début du prompt tuteur en mode cours complet (calculé une fois par langue)."""
+        prefix = self._prompt_prefixes.get(language)
+        if prefix is None:
+            prefix = build_tutor_prompt_prefix(
+                case_data=self.case_data,
+                documents=self.documents,
+                current_document_id=None,
+                current_document=None,
+                current_module=None,
+                language=language,
+            )
+            self._prompt_prefixes[language] = prefix
+        return prefix
+
+
+def _unwrap_rows(result) -> List[dict]:
+    """Lignes d'un résultat SurrealDB, quel que soit le format de réponse."""
+    if not result:
+        return []
+    first_item = result[0]
+    if isinstance(first_item, dict):
+        if "result" in first_item:
+            return first_item["result"] if isinstance(first_item["result"], list) else []
+        return result
+    if isinstance(first_item, list):
+        return first_item
+    return []
+
+
+def build_relationship_maps(documents: List[dict]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Relations entre documents: audio → transcription et PDF → extraction Markdown.
+
+    Une extraction est un fichier .md (hors transcription) de même nom de base
+    que le PDF; le premier PDF de la liste portant ce nom l'emporte.
+    """
+    audio_transcription_map = {}
+    for doc in documents:
+        if doc.get("is_transcription") and doc.get("source_audio"):
+            audio_transcription_map[doc["source_audio"]] = doc.get("nom_fichier")
+
+    pdf_by_stem: Dict[str, str] = {}
+    for doc in documents:
+        name = doc.get("nom_fichier", "")
+        if name.lower().endswith(".pdf"):
+            pdf_by_stem.setdefault(Path(name).stem, name)
+
+    pdf_extraction_map = {}
+    for doc in documents:
+        name = doc.get("nom_fichier", "")
+        if name.lower().endswith(".md") and not doc.get("is_transcription"):
+            pdf_name = pdf_by_stem.get(Path(name).stem)
+            if pdf_name:
+                pdf_extraction_map[pdf_name] = name
+
+    return audio_transcription_map, pdf_extraction_map
+
+
+def _format_size(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def _status_note(
+    doc: dict,
+    audio_transcription_map: Dict[str, str],
+    pdf_extraction_map: Dict[str, str],
+    extraction_sources: Dict[str, str],
+) -> str:
+    """Note de statut d'un document dans l'aperçu (transcrit, extrait, etc.)."""
+    doc_name = doc.get("nom_fichier", "Document inconnu")
+    doc_type = doc.get("type_fichier", "").upper()
+    source_audio = doc.get("source_audio", "")
+
+    if doc.get("is_transcription", False) and source_audio:
+        return f" [Transcription de {source_audio}]"
+    if doc_type in AUDIO_TYPES:
+        transcription_file = audio_transcription_map.get(doc_name)
+        return f" [DÉJÀ TRANSCRIT → voir {transcription_file}]" if transcription_file else " [Non transcrit]"
+    if doc_type == "PDF":
+        extraction_file = pdf_extraction_map.get(doc_name)
+        return f" [DÉJÀ EXTRAIT → voir {extraction_file}]" if extraction_file else " [PDF non extrait]"
+    if doc.get("texte_extrait") and doc_name in extraction_sources:
+        return f" [Extraction de {extraction_sources[doc_name]}]"
+    if doc.get("texte_extrait"):
+        return " [Contenu disponible]"
+    return ""
+
+
+def build_snapshot(
+    course_id: str,
+    version: Tuple[int, int],
+    case_data: dict,
+    documents: List[dict],
+) -> CourseContextSnapshot:
+    """Calcule les relations, l'aperçu, les extraits et les sources d'un cours."""
+    audio_transcription_map, pdf_extraction_map = build_relationship_maps(documents)
+    extraction_sources = {}
+    for pdf_name, md_name in pdf_extraction_map.items():
+        extraction_sources.setdefault(md_name, pdf_name)
+
+    lines = [f"- Number of documents: {len(documents)}"]
+    excerpts = []
+    sources = []
+    for doc in documents:
+        doc_name = doc.get("nom_fichier", "Document inconnu")
+        doc_type = doc.get("type_fichier", "").upper()
+        is_transcription = doc.get("is_transcription", False)
+        texte_extrait = doc.get("texte_extrait", "")
+        note = _status_note(doc, audio_transcription_map, pdf_extraction_map, extraction_sources)
+        lines.append(f"  - {doc_name} ({doc_type}, {_format_size(doc.get('taille', 0))}){note}")
+
+        if texte_extrait:
+            excerpts.append({
+                "document_id": str(doc.get("id", "")),
+                "name": doc_name,
+                "content": texte_extrait,
+                "truncated": (doc.get("texte_length") or 0) > len(texte_extrait),
+                "is_transcription": is_transcription,
+            })
+            sources.append({
+                "document_id": str(doc.get("id", "")),
+                "name": doc_name,
+                "type": doc_type,
+                "word_count": doc.get("word_count") or len(texte_extrait.split()),
+                "is_transcription": is_transcription,
+            })
+
+    return CourseContextSnapshot(
+        course_id=course_id,
+        version=version,
+        case_data=case_data,
+        documents=documents,
+        audio_transcription_map=audio_transcription_map,
+        pdf_extraction_map=pdf_extraction_map,
+        preview="\n".join(lines),
+        excerpts=excerpts,
+        sources=sources,
+    )
+
+
+class CourseContextCache:
+    """
+    Instantanés de contexte par cours, bornés en nombre (LRU).
+
+    Args:
+        max_entries: Nombre maximum de cours conservés
+        ttl: Durée de vie d'un instantané (secondes, 0 = sans limite)
+    """
+
+    def __init__(self, max_entries: int = 64, ttl: float = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._snapshots: "OrderedDict[str, CourseContextSnapshot]" = OrderedDict()
+        self._loading: Dict[Tuple[str, Tuple[int, int]], asyncio.Future] = {}
+
+    def _fresh(self, snapshot: CourseContextSnapshot, version: Tuple[int, int]) -> bool:
+        if snapshot.version != version:
+            return False
+        return not self.ttl or time.monotonic() - snapshot.created_at < self.ttl
+
+    async def get(self, course_id: str) -> Optional[CourseContextSnapshot]:
+        """
+        Instantané courant d'un cours, chargé depuis la base si nécessaire.
+
+        Returns:
+            L'instantané, ou None si le cours n'existe pas
+        """
+        key = course_key(course_id)
+        version = course_version(key)
+
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and self._fresh(snapshot, version):
+            self._snapshots.move_to_end(key)
+            self.hits += 1
+            return snapshot
+
+        self.misses += 1
+        # Les requêtes simultanées d'un même cours partagent le chargement
+        loading = self._loading.get((key, version))
+        if loading is not None:
+            return await asyncio.shield(loading)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[(key, version)] = future
+        try:
+            snapshot = await self._load(key, version)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Évite l'avertissement "exception never retrieved" sans attente concurrente
+            future.exception()
+            raise
+        else:
+            future.set_result(snapshot)
+        finally:
+            self._loading.pop((key, version), None)
+
+        # Une écriture pendant le chargement a déjà rendu l'instantané obsolète
+        if snapshot is not None and course_version(key) == version:
+            self._snapshots[key] = snapshot
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.max_entries:
+                self._snapshots.popitem(last=False)
+        return snapshot
+
+    async def _load(self, key: str, version: Tuple[int, int]) -> Optional[CourseContextSnapshot]:
+        service = get_surreal_service()
+        if not service.db:
+            await service.connect()
+
+        case_result = await service.query(f"SELECT * FROM {key}")
+        case_rows = _unwrap_rows(case_result)
+        case_data = case_rows[0] if case_rows and isinstance(case_rows[0], dict) else None
+        if not case_data:
+            return None
+
+        # Métadonnées et extrait du texte: les textes complets restent en base
+        docs_result = await service.query(
+            """SELECT id, nom_fichier, type_fichier, taille, is_transcription, source_audio, module_id, created_at,
+                string::slice(texte_extrait ?? "", 0, $excerpt_chars) AS texte_extrait,
+                string::len(texte_extrait ?? "") AS texte_length,
+                array::len(string::words(texte_extrait ?? "")) AS word_count
+            FROM document WHERE course_id = $course_id ORDER BY created_at DESC""",
+            {"course_id": key, "excerpt_chars": CONTEXT_EXCERPT_CHARS}
+        )
+        documents = [doc for doc in _unwrap_rows(docs_result) if isinstance(doc, dict)]
+
+        snapshot = build_snapshot(key, version, case_data, documents)
+        logger.info(f"Contexte du cours {key} chargé: {len(documents)} documents")
+        return snapshot
+
+    def invalidate(self, course_id: Optional[str] = None) -> None:
+        """Oublie l'instantané d'un cours (ou de tous les cours)."""
+        if course_id is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(course_key(course_id), None)
+
+    def stats(self) -> dict:
+        """Statistiques du cache."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._snapshots),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Singleton
+_course_context_cache: Optional[CourseContextCache] = None
+
+
+def get_course_context_cache() -> CourseContextCache:
+    """Obtient l'instance singleton du cache de contexte de cours."""
+    global _course_context_cache
+    if _course_context_cache is None:
+        _course_context_cache = CourseContextCache(
+            max_entries=settings.chat_context_cache_size,
+            ttl=settings.chat_context_cache_ttl,
+        )
+    return _course_context_cache
@@ -17,6 +17,7 @@ from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass, field
 
+from services.extraction_cache import get_extraction_cache, package_version
 from utils.text_utils import sanitize_text
 
 logger = logging.getLogger(__name__)
@@ -118,6 +119,26 @@ class DoclingService:
                 error=f"Fichier non trouvé: {pdf_path}"
             )
 
+        mode = "vlm" if self.use_vlm else "standard"
+        cache = get_extraction_cache()
+        cache_key = await cache.key_for(
+            pdf_path,
+            "docling",
+            engine=self.vlm_model if self.use_vlm else mode,
+            version=package_version("docling", "docling-core"),
+        )
+        cached = await cache.load(cache_key)
+        if cached is not None:
+            logger.debug(f"Extraction Docling servie depuis le cache: {pdf_path.name}")
+            return DoclingExtractionResult(
+                success=True,
+                markdown=cached.text,
+                text=cached.text,
+                tables=cached.metadata.get("tables", []),
+                metadata=cached.metadata.get("metadata", {}),
+                extraction_method=cached.extractor,
+            )
+
         converter = self._get_converter()
         if converter is None:
             return DoclingExtractionResult(
@@ -147,16 +168,25 @@ class DoclingService:
             metadata = {
                 "num_pages": getattr(doc, 'num_pages', 0),
                 "num_tables": len(tables),
-                "extraction_mode": "vlm" if self.use_vlm else "standard",
+                "extraction_mode": mode,
             }
 
+            markdown = sanitize_text(markdown)
+            extraction_method = f"docling-{mode}"
+            await cache.store(
+                cache_key,
+                markdown,
+                {"tables": tables, "metadata": metadata},
+                extraction_method,
+            )
+
             return DoclingExtractionResult(
                 success=True,
-                markdown=sanitize_text(markdown),
-                text=sanitize_text(markdown),  # Fallback
+                markdown=markdown,
+                text=markdown,  # Fallback
                 tables=tables,
                 metadata=metadata,
-                extraction_method=f"docling-{'vlm' if self.use_vlm else 'standard'}"
+                extraction_method=extraction_method
             )
 
         except Exception as e:
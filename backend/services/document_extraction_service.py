@@ -15,6 +15,7 @@ from typing import Optional
 from dataclasses import dataclass, field
 import mimetypes
 
+from services.extraction_cache import get_extraction_cache, package_version
 from utils.text_utils import remove_yaml_frontmatter, sanitize_text
 
 logger = logging.getLogger(__name__)
@@ -66,6 +67,10 @@ SUPPORTED_TYPES = {
     "video/webm": "audio",
 }
 
+# Categories dont l'extraction est couteuse et passe par le cache d'extraction
+# (texte et Markdown sont relus directement)
+CACHED_CATEGORIES = {"pdf", "word", "image", "audio"}
+
 # Extensions de fichiers supportees
 SUPPORTED_EXTENSIONS = {
     # PDF
@@ -149,6 +154,10 @@ class DocumentExtractionService:
 
     def __init__(self):
         self._check_dependencies()
+        # Versions des extracteurs, dans la cle du cache d'extraction
+        self._extractors_version = package_version(
+            "markitdown", "pypdf", "python-docx", "openai-whisper"
+        )
 
     def _check_dependencies(self):
         """Verifie les dependances disponibles."""
@@ -235,7 +244,54 @@ class DocumentExtractionService:
                 error=f"Type de fichier non supporte: {file_path.suffix}"
             )
 
-        # Router vers la methode d'extraction appropriee
+        # Docling a son propre cache (DoclingService.extract_pdf)
+        uses_docling = category == "pdf" and self._has_docling and (
+            use_ocr or extraction_method in ("docling", "docling-vlm")
+        )
+        if category not in CACHED_CATEGORIES or uses_docling:
+            return await self._extract_category(
+                file_path, category, extraction_method, use_ocr, language
+            )
+
+        cache = get_extraction_cache()
+        cache_key = await cache.key_for(
+            file_path,
+            f"extract-{category}",
+            engine=extraction_method,
+            version=self._extractors_version,
+            options={"use_ocr": use_ocr, "language": language if category == "audio" else None},
+        )
+        cached = await cache.load(cache_key)
+        if cached is not None:
+            logger.debug(f"Extraction servie depuis le cache: {file_path.name}")
+            metadata = dict(cached.metadata)
+            if "source" in metadata:
+                # Le meme contenu peut provenir d'un autre fichier
+                metadata["source"] = str(file_path)
+            return ExtractionResult(
+                success=True,
+                text=cached.text,
+                metadata=metadata,
+                extraction_method=cached.extractor,
+                is_transcription=category == "audio",
+            )
+
+        result = await self._extract_category(
+            file_path, category, extraction_method, use_ocr, language
+        )
+        if result.success and result.text:
+            await cache.store(cache_key, result.text, result.metadata, result.extraction_method)
+        return result
+
+    async def _extract_category(
+        self,
+        file_path: Path,
+        category: str,
+        extraction_method: str,
+        use_ocr: bool,
+        language: str,
+    ) -> ExtractionResult:
+        """Route vers la methode d'extraction de la categorie."""
         if category == "pdf":
             return await self._extract_pdf(file_path, extraction_method, use_ocr)
         elif category == "word":
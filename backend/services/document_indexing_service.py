@@ -6,8 +6,10 @@ Ce service gère:
 - La génération d'embeddings vectoriels
 - Le stockage des embeddings dans SurrealDB
 - La recherche par similarité vectorielle
+- La recherche lexicale (BM25) et hybride (fusion RRF)
 """
 
+import hashlib
 import logging
 import asyncio
 from typing import Optional, List
@@ -15,6 +17,8 @@ from datetime import datetime
 
 from services.embedding_service import get_embedding_service, EmbeddingResult
 from services.surreal_service import get_surreal_service
+from services.vector_index import IndexedChunk, get_vector_index_registry
+from services.keyword_index import get_keyword_index_registry, reciprocal_rank_fusion
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -28,12 +32,19 @@ class DocumentIndexingService:
     les documents juridiques en français et en anglais.
     """
 
+    # Présence d'un index vectoriel natif SurrealDB, par dimension d'embedding
+    _knn_support: dict[int, bool] = {}
+    # Dimension pour laquelle l'index natif a été (re)défini (backend surreal)
+    _vector_index_dimensions: Optional[int] = None
+
     def __init__(
         self,
         embedding_provider: str = "local",
         embedding_model: str = "BAAI/bge-m3",
-        chunk_size: int = 400,
-        chunk_overlap: int = 75  # Increased from 50 for better context continuity (18.75% overlap)
+        chunk_size: int = 512,
+        chunk_overlap: int = 64,
+        max_retries: int = 3,
+        retry_delay: float = 2.0
     ):
         """
         Initialise le service d'indexation.
@@ -41,16 +52,22 @@ class DocumentIndexingService:
         Args:
             embedding_provider: Provider d'embeddings (local, ollama, openai)
             embedding_model: Modèle d'embeddings (BAAI/bge-m3 recommandé pour FR/EN)
-            chunk_size: Taille des chunks en mots (réduit à 400 pour plus de robustesse)
-            chunk_overlap: Chevauchement entre chunks en mots
+            chunk_size: Taille maximale des chunks en tokens (bge-m3 accepte jusqu'à 8192)
+            chunk_overlap: Chevauchement maximal entre chunks en tokens
+            max_retries: Nombre de tentatives pour les embeddings en échec
+            retry_delay: Délai de base entre les tentatives (secondes)
         """
         self.embedding_service = get_embedding_service(
             provider=embedding_provider,
             model=embedding_model
         )
         self.surreal_service = get_surreal_service()
+        self.vector_index_registry = get_vector_index_registry()
+        self.keyword_index_registry = get_keyword_index_registry()
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
 
     async def index_document(
         self,
@@ -82,20 +99,18 @@ class DocumentIndexingService:
 
             # Vérifier si déjà indexé
             if not force_reindex:
-                existing = await self._get_document_embeddings(document_id)
-                if existing:
-                    logger.info(f"Document {document_id} already indexed with {len(existing)} chunks")
+                existing_count = await self._count_document_embeddings(document_id)
+                if existing_count:
+                    logger.info(f"Document {document_id} already indexed with {existing_count} chunks")
                     return {
                         "success": True,
                         "already_indexed": True,
-                        "chunks_count": len(existing)
+                        "chunks_count": existing_count
                     }
-            else:
-                # Supprimer les embeddings existants
-                await self._delete_document_embeddings(document_id)
 
-            # Découper le texte en chunks
-            chunk_result = self.embedding_service.chunk_text(
+            # Découper le texte en chunks (hors de la boucle d'événements: tokenizer)
+            chunk_result = await asyncio.to_thread(
+                self.embedding_service.chunk_text,
                 text_content,
                 chunk_size=self.chunk_size,
                 overlap=self.chunk_overlap
@@ -109,55 +124,58 @@ class DocumentIndexingService:
 
             logger.info(f"Generated {len(chunk_result.chunks)} chunks")
 
-            # Générer les embeddings pour chaque chunk
-            chunks_created = 0
-            max_retries = 3
-            retry_delay = 2.0  # seconds
-
-            for idx, chunk_text in enumerate(chunk_result.chunks):
-                # Retry loop for each chunk
-                retry_count = 0
-                embedding_success = False
-
-                while retry_count < max_retries and not embedding_success:
-                    try:
-                        embedding_result = await self.embedding_service.generate_embedding(chunk_text)
-
-                        if not embedding_result.success:
-                            logger.warning(f"Failed to generate embedding for chunk {idx} (attempt {retry_count + 1}/{max_retries}): {embedding_result.error}")
-                            retry_count += 1
-                            if retry_count < max_retries:
-                                await asyncio.sleep(retry_delay)
-                            continue
-
-                        # Stocker l'embedding dans SurrealDB
-                        await self._store_embedding(
-                            document_id=document_id,
-                            course_id=course_id,
-                            chunk_index=idx,
-                            chunk_text=chunk_text,
-                            embedding=embedding_result.embedding,
-                            embedding_model=embedding_result.model,
-                            embedding_dimensions=embedding_result.dimensions
-                        )
-
-                        chunks_created += 1
-                        embedding_success = True
-
-                    except Exception as e:
-                        logger.warning(f"Exception generating embedding for chunk {idx} (attempt {retry_count + 1}/{max_retries}): {e}")
-                        retry_count += 1
-                        if retry_count < max_retries:
-                            await asyncio.sleep(retry_delay)
-
-                if not embedding_success:
-                    logger.error(f"Failed to generate embedding for chunk {idx} after {max_retries} attempts - skipping")
+            # Réutiliser les embeddings des chunks inchangés, générer les autres par lots
+            chunk_hashes = [self.chunk_hash(chunk) for chunk in chunk_result.chunks]
+            cached = await self._get_cached_embeddings(document_id, chunk_hashes)
+            missing = [idx for idx, chunk_hash in enumerate(chunk_hashes) if chunk_hash not in cached]
+
+            embeddings = [
+                self._cached_result(cached[chunk_hash]) if chunk_hash in cached else None
+                for chunk_hash in chunk_hashes
+            ]
+            if missing:
+                generated = await self._embed_chunks([chunk_result.chunks[idx] for idx in missing])
+                for idx, result in zip(missing, generated):
+                    embeddings[idx] = result
+
+            chunks_reused = len(chunk_hashes) - len(missing)
+            if chunks_reused:
+                logger.info(
+                    f"Reusing {chunks_reused}/{len(chunk_hashes)} cached chunk embeddings, "
+                    f"embedding {len(missing)} new chunks"
+                )
+
+            records = []
+            for idx, (chunk_text, embedding_result) in enumerate(zip(chunk_result.chunks, embeddings)):
+                if not embedding_result.success:
+                    logger.error(f"Failed to generate embedding for chunk {idx}: {embedding_result.error} - skipping")
+                    continue
+                records.append({
+                    "chunk_index": idx,
+                    "chunk_text": chunk_text,
+                    "chunk_hash": chunk_hashes[idx],
+                    "char_start": chunk_result.offsets[idx][0],
+                    "char_end": chunk_result.offsets[idx][1],
+                    "embedding": embedding_result.embedding,
+                    "embedding_model": embedding_result.model,
+                    "embedding_dimensions": embedding_result.dimensions
+                })
+
+            if not records:
+                return {
+                    "success": False,
+                    "error": "Aucun embedding n'a pu être généré"
+                }
+
+            # Remplacer atomiquement les embeddings du document
+            chunks_created = await self._store_embeddings(document_id, course_id, records)
 
             logger.info(f"Indexed document {document_id}: {chunks_created} chunks created")
 
             return {
                 "success": True,
                 "chunks_created": chunks_created,
+                "chunks_reused": chunks_reused,
                 "total_chunks": len(chunk_result.chunks),
                 "embedding_model": self.embedding_service.model
             }
@@ -169,77 +187,239 @@ class DocumentIndexingService:
                 "error": str(e)
             }
 
-    async def _store_embedding(
+    @staticmethod
+    def chunk_hash(chunk_text: str) -> str:
+        """Empreinte SHA-256 du texte d'un chunk, clé du cache d'embeddings."""
+        return hashlib.sha256(chunk_text.encode("utf-8")).hexdigest()
+
+    def _cached_result(self, embedding: List[float]) -> EmbeddingResult:
+        """Construit un EmbeddingResult à partir d'un vecteur déjà calculé."""
+        return EmbeddingResult(
+            success=True,
+            embedding=embedding,
+            model=self.embedding_service.full_model_name,
+            dimensions=len(embedding)
+        )
+
+    @staticmethod
+    def _result_rows(result) -> List[dict]:
+        """Extrait les enregistrements du résultat d'une requête SurrealDB."""
+        if not result:
+            return []
+        first_item = result[0]
+        if isinstance(first_item, dict) and "result" in first_item:
+            return first_item["result"] if isinstance(first_item["result"], list) else []
+        if isinstance(first_item, list):
+            return first_item
+        if isinstance(first_item, dict):
+            return result
+        return []
+
+    async def _get_cached_embeddings(
+        self,
+        document_id: str,
+        chunk_hashes: List[str]
+    ) -> dict[str, List[float]]:
+        """
+        Récupère les embeddings déjà calculés pour des chunks, par empreinte.
+
+        Les embeddings stockés dans document_embedding servent de cache
+        adressé par contenu: (chunk_hash, embedding_model) identifie un
+        vecteur quel que soit le document qui le contient. Les anciens
+        embeddings du document sont cherchés en premier (y compris ceux
+        enregistrés sans chunk_hash), puis ceux des autres documents.
+
+        Returns:
+            Dict chunk_hash -> embedding pour les chunks déjà connus
+        """
+        wanted = set(chunk_hashes)
+        if not wanted:
+            return {}
+
+        model = self.embedding_service.full_model_name
+        cached: dict[str, List[float]] = {}
+
+        try:
+            if not self.surreal_service.db:
+                await self.surreal_service.connect()
+
+            result = await self.surreal_service.query(
+                """
+                SELECT chunk_hash, chunk_text, embedding FROM document_embedding
+                WHERE document_id = $document_id AND embedding_model = $model
+                """,
+                {"document_id": document_id, "model": model}
+            )
+            for row in self._result_rows(result):
+                chunk_hash = row.get("chunk_hash") or self.chunk_hash(row.get("chunk_text") or "")
+                if chunk_hash in wanted and row.get("embedding"):
+                    cached[chunk_hash] = row["embedding"]
+
+            remaining = list(wanted.difference(cached))
+            if remaining:
+                result = await self.surreal_service.query(
+                    """
+                    SELECT chunk_hash, embedding FROM document_embedding
+                    WHERE embedding_model = $model AND chunk_hash IN $hashes
+                    """,
+                    {"model": model, "hashes": remaining}
+                )
+                for row in self._result_rows(result):
+                    chunk_hash = row.get("chunk_hash")
+                    if chunk_hash in wanted and row.get("embedding"):
+                        cached.setdefault(chunk_hash, row["embedding"])
+
+        except Exception as e:
+            # Le cache n'est qu'une optimisation: en cas d'erreur, tout recalculer
+            logger.warning(f"Chunk embedding cache lookup failed for {document_id}: {e}")
+            return {}
+
+        return cached
+
+    async def _embed_chunks(self, chunks: List[str]) -> List[EmbeddingResult]:
+        """
+        Génère les embeddings de tous les chunks par lots.
+
+        Seuls les chunks en échec sont réessayés, avec un délai croissant
+        entre les tentatives.
+        """
+        results = await self.embedding_service.generate_embeddings_batch(chunks)
+
+        for attempt in range(1, self.max_retries):
+            failed = [idx for idx, result in enumerate(results) if not result.success]
+            if not failed:
+                break
+
+            logger.warning(
+                f"Retrying {len(failed)} failed embeddings "
+                f"(attempt {attempt + 1}/{self.max_retries})"
+            )
+            await asyncio.sleep(self.retry_delay * attempt)
+
+            retried = await self.embedding_service.generate_embeddings_batch(
+                [chunks[idx] for idx in failed]
+            )
+            for idx, result in zip(failed, retried):
+                results[idx] = result
+
+        return results
+
+    async def _store_embeddings(
         self,
         document_id: str,
         course_id: str,
-        chunk_index: int,
-        chunk_text: str,
-        embedding: List[float],
-        embedding_model: str,
-        embedding_dimensions: int
-    ):
-        """Stocke un embedding dans SurrealDB."""
+        records: List[dict]
+    ) -> int:
+        """
+        Remplace les embeddings d'un document dans une seule transaction.
+
+        Les anciens embeddings sont supprimés et les nouveaux insérés en un
+        seul INSERT multi-enregistrements: un document n'est jamais visible
+        à moitié indexé.
+
+        Returns:
+            Nombre d'embeddings présents pour le document après la transaction
+        """
         if not self.surreal_service.db:
             await self.surreal_service.connect()
 
-        word_count = len(chunk_text.split())
-
         # Utiliser le format datetime SurrealDB: d"ISO8601"
         # Format: d"2025-01-15T12:00:00.000Z"
         now = datetime.utcnow()
         surreal_datetime = now.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
 
-        # Utiliser une requête SQL avec des paramètres
+        rows = [
+            {
+                "document_id": document_id,
+                "course_id": course_id,
+                "chunk_index": record["chunk_index"],
+                "chunk_text": record["chunk_text"],
+                "chunk_hash": record["chunk_hash"],
+                "char_start": record["char_start"],
+                "char_end": record["char_end"],
+                "embedding": record["embedding"],
+                "embedding_model": record["embedding_model"],
+                "embedding_dimensions": record["embedding_dimensions"],
+                "word_count": len(record["chunk_text"].split()),
+                "created_at": surreal_datetime
+            }
+            for record in records
+        ]
+
+        # Un index HNSW natif n'accepte que les vecteurs de sa dimension
+        dimensions = rows[0]["embedding_dimensions"] if rows else 0
+        if (
+            settings.vector_index_backend == "surreal"
+            and dimensions
+            and DocumentIndexingService._vector_index_dimensions != dimensions
+        ):
+            await self.ensure_vector_index(dimensions)
+
         query = """
-        CREATE document_embedding CONTENT {{
-            document_id: $document_id,
-            course_id: $course_id,
-            chunk_index: $chunk_index,
-            chunk_text: $chunk_text,
-            embedding: $embedding,
-            embedding_model: $embedding_model,
-            embedding_dimensions: $embedding_dimensions,
-            word_count: $word_count,
-            created_at: $created_at
-        }}
-        """
-
-        params = {
-            "document_id": document_id,
-            "course_id": course_id,
-            "chunk_index": chunk_index,
-            "chunk_text": chunk_text,
-            "embedding": embedding,
-            "embedding_model": embedding_model,
-            "embedding_dimensions": embedding_dimensions,
-            "word_count": word_count,
-            "created_at": surreal_datetime
-        }
+        BEGIN TRANSACTION;
+        DELETE document_embedding WHERE document_id = $document_id;
+        INSERT INTO document_embedding $rows RETURN NONE;
+        COMMIT TRANSACTION;
+        """
 
-        result = await self.surreal_service.query(query, params)
-        logger.info(f"Stored embedding: {len(embedding)} dimensions")
+        await self.surreal_service.query(query, {"document_id": document_id, "rows": rows})
 
-    async def _get_document_embeddings(self, document_id: str) -> List[dict]:
-        """Récupère les embeddings existants d'un document."""
+        stored = await self._count_document_embeddings(document_id)
+        if stored != len(rows):
+            raise RuntimeError(
+                f"Transaction d'indexation incomplète pour {document_id}: "
+                f"{stored}/{len(rows)} embeddings enregistrés"
+            )
+
+        chunks = [
+            IndexedChunk(
+                document_id=document_id,
+                course_id=course_id,
+                chunk_index=row["chunk_index"],
+                chunk_text=row["chunk_text"],
+                word_count=row["word_count"],
+                char_start=row["char_start"],
+                char_end=row["char_end"]
+            )
+            for row in rows
+        ]
+        self.vector_index_registry.update_document(
+            course_id=course_id,
+            embedding_model=rows[0]["embedding_model"],
+            document_id=document_id,
+            chunks=chunks,
+            vectors=[row["embedding"] for row in rows]
+        )
+        self.keyword_index_registry.update_document(
+            course_id=course_id,
+            embedding_model=rows[0]["embedding_model"],
+            document_id=document_id,
+            chunks=chunks,
+            vectors=[]
+        )
+
+        logger.info(f"Stored {len(rows)} embeddings for {document_id}")
+        return stored
+
+    async def _count_document_embeddings(self, document_id: str) -> int:
+        """Compte les embeddings existants d'un document."""
         if not self.surreal_service.db:
             await self.surreal_service.connect()
 
         result = await self.surreal_service.query(
-            "SELECT * FROM document_embedding WHERE document_id = $document_id ORDER BY chunk_index",
+            "SELECT count() AS total FROM document_embedding WHERE document_id = $document_id GROUP ALL",
             {"document_id": document_id}
         )
 
         if result and len(result) > 0:
-            first_item = result[0]
-            if isinstance(first_item, dict) and "result" in first_item:
-                return first_item["result"] if isinstance(first_item["result"], list) else []
-            elif isinstance(first_item, list):
-                return first_item
-            elif isinstance(first_item, dict) and ("id" in first_item or "chunk_text" in first_item):
-                return result
+            stats = result[0]
+            if isinstance(stats, dict) and "result" in stats:
+                stats = stats["result"][0] if stats["result"] else {}
+            elif isinstance(stats, list):
+                stats = stats[0] if stats else {}
+            return stats.get("total", 0)
 
-        return []
+        return 0
 
     async def _delete_document_embeddings(self, document_id: str):
         """Supprime tous les embeddings d'un document."""
@@ -250,25 +430,31 @@ class DocumentIndexingService:
             "DELETE document_embedding WHERE document_id = $document_id",
             {"document_id": document_id}
         )
+        self.vector_index_registry.remove_document(document_id)
+        self.keyword_index_registry.remove_document(document_id)
 
     async def search_similar(
         self,
         query_text: str,
         course_id: Optional[str] = None,
         top_k: int = 7,  # Increased from 5 for better coverage of legal documents
-        min_similarity: float = 0.35  # Abaissé de 0.5 pour meilleure couverture des documents juridiques
+        min_similarity: float = 0.35,  # Abaissé de 0.5 pour meilleure couverture des documents juridiques
+        document_id: Optional[str] = None
     ) -> List[dict]:
         """
         Recherche les chunks les plus similaires à une requête.
 
-        Utilise l'opérateur vectoriel natif de SurrealDB <|k,COSINE|> pour
-        une recherche optimisée par similarité cosinus.
+        Ordre des stratégies:
+        1. Index vectoriel en mémoire du cours (voir services/vector_index.py)
+        2. Opérateur KNN de SurrealDB si un index HNSW/MTREE natif existe
+        3. Scan exhaustif dans SurrealDB (versions sans index vectoriel)
 
         Args:
             query_text: Texte de la requête
             course_id: Optionnel, limiter la recherche à un cours
             top_k: Nombre maximum de résultats
             min_similarity: Score de similarité minimum (0-1)
+            document_id: Optionnel, limiter la recherche à un document
 
         Returns:
             Liste de résultats avec document_id, chunk_text, similarity_score
@@ -286,91 +472,375 @@ class DocumentIndexingService:
             # Normaliser course_id si fourni
             if course_id and not course_id.startswith("course:"):
                 course_id = f"course:{course_id}"
+            if document_id and not document_id.startswith("document:"):
+                document_id = f"document:{document_id}"
 
-            # Utiliser l'opérateur vectoriel natif de SurrealDB
-            if not self.surreal_service.db:
-                await self.surreal_service.connect()
-
-            # Construire la requête avec calcul de similarité manuelle
-            # Note: L'opérateur <|k,COSINE|> nécessite un index MTREE qui n'est pas encore configuré
-            # Pour l'instant, on utilise vector::similarity::cosine() et on filtre manuellement
-            # IMPORTANT: On filtre aussi par embedding_model pour garantir la compatibilité des vecteurs
+            # IMPORTANT: On filtre par embedding_model pour garantir la compatibilité des vecteurs
             current_model = self.embedding_service.full_model_name
 
             if course_id:
-                query = """
-                SELECT *, vector::similarity::cosine(embedding, $query_embedding) AS similarity_score
-                FROM document_embedding
-                WHERE course_id = $course_id AND embedding_model = $embedding_model
-                ORDER BY similarity_score DESC
-                """
-                params = {
-                    "course_id": course_id,
-                    "query_embedding": query_embedding,
-                    "embedding_model": current_model
-                }
-            else:
-                query = """
-                SELECT *, vector::similarity::cosine(embedding, $query_embedding) AS similarity_score
-                FROM document_embedding
-                WHERE embedding_model = $embedding_model
-                ORDER BY similarity_score DESC
-                """
-                params = {
-                    "query_embedding": query_embedding,
-                    "embedding_model": current_model
-                }
+                index = await self.vector_index_registry.get_index(course_id, current_model)
+                if index is not None:
+                    hits = index.search(query_embedding, top_k, document_id=document_id)
+                    return [
+                        chunk.to_result(similarity)
+                        for chunk, similarity in hits
+                        if similarity >= min_similarity
+                    ]
+
+            if await self._knn_index_available():
+                try:
+                    return await self._knn_similar(
+                        query_embedding,
+                        current_model,
+                        course_id=course_id,
+                        document_id=document_id,
+                        top_k=top_k,
+                        min_similarity=min_similarity
+                    )
+                except Exception as e:
+                    logger.warning(f"KNN search failed, falling back to full scan: {e}")
+                    DocumentIndexingService._knn_support[self.embedding_service.dimensions] = False
+
+            return await self._scan_similar(
+                query_embedding,
+                current_model,
+                course_id=course_id,
+                document_id=document_id,
+                top_k=top_k,
+                min_similarity=min_similarity
+            )
 
-            result = await self.surreal_service.query(query, params)
+        except Exception as e:
+            logger.error(f"Error in semantic search: {e}", exc_info=True)
+            return []
 
-            embeddings = []
-            if result and len(result) > 0:
-                first_item = result[0]
-                if isinstance(first_item, dict) and "result" in first_item:
-                    embeddings = first_item["result"] if isinstance(first_item["result"], list) else []
-                elif isinstance(first_item, list):
-                    embeddings = first_item
-                elif isinstance(first_item, dict):
-                    embeddings = result
-
-            if not embeddings:
-                return []
+    async def keyword_search(
+        self,
+        query_text: str,
+        course_id: str,
+        top_k: int = 7,
+        document_id: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Recherche lexicale BM25 dans les chunks indexés d'un cours.
 
-            # Filtrer par similarité minimum et formater les résultats
-            similarities = []
-            for emb_record in embeddings:
-                similarity = emb_record.get("similarity_score", 0)
+        Args:
+            query_text: Texte de la requête (mots-clés ou question)
+            course_id: ID du cours
+            top_k: Nombre maximum de résultats
+            document_id: Optionnel, limiter la recherche à un document
+
+        Returns:
+            Liste de résultats avec document_id, chunk_text, bm25_score
+        """
+        try:
+            if not course_id.startswith("course:"):
+                course_id = f"course:{course_id}"
+            if document_id and not document_id.startswith("document:"):
+                document_id = f"document:{document_id}"
 
-                if similarity >= min_similarity:
-                    similarities.append({
-                        "document_id": emb_record.get("document_id"),
-                        "course_id": emb_record.get("course_id"),
-                        "chunk_index": emb_record.get("chunk_index"),
-                        "chunk_text": emb_record.get("chunk_text"),
-                        "similarity_score": similarity,
-                        "word_count": emb_record.get("word_count", 0)
-                    })
+            index = await self.keyword_index_registry.get_index(
+                course_id, self.embedding_service.full_model_name
+            )
+            hits = index.search_text(query_text, top_k, document_id=document_id)
 
-            return similarities
+            results = []
+            for chunk, score in hits:
+                result = chunk.to_result(0.0)
+                del result["similarity_score"]
+                result["bm25_score"] = score
+                results.append(result)
+            return results
 
         except Exception as e:
-            logger.error(f"Error in semantic search: {e}", exc_info=True)
+            logger.error(f"Error in keyword search: {e}", exc_info=True)
             return []
 
+    async def indexed_document_ids(self, course_id: str) -> set[str]:
+        """IDs des documents d'un cours présents dans l'index BM25."""
+        if not course_id.startswith("course:"):
+            course_id = f"course:{course_id}"
+        index = await self.keyword_index_registry.get_index(
+            course_id, self.embedding_service.full_model_name
+        )
+        return index.document_ids()
+
+    async def keyword_candidate_documents(
+        self,
+        keywords: List[str],
+        course_id: str
+    ) -> Optional[set[str]]:
+        """
+        Documents indexés d'un cours pouvant contenir l'un des mots-clés.
+
+        Sert de préfiltre à la recherche exacte par sous-chaîne: les
+        documents exclus ne peuvent contenir aucun des mots-clés.
+
+        Returns:
+            IDs des documents candidats, ou None si l'index ne permet pas
+            d'écarter de documents pour l'un des mots-clés
+        """
+        if not course_id.startswith("course:"):
+            course_id = f"course:{course_id}"
+        index = await self.keyword_index_registry.get_index(
+            course_id, self.embedding_service.full_model_name
+        )
+
+        candidates: set[str] = set()
+        for keyword in keywords:
+            documents = index.candidate_documents(keyword)
+            if documents is None:
+                return None
+            candidates |= documents
+        return candidates
+
+    async def hybrid_search(
+        self,
+        query_text: str,
+        course_id: str,
+        top_k: int = 7,
+        min_similarity: float = 0.35,
+        document_id: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Recherche hybride: similarité vectorielle et BM25 fusionnées par RRF.
+
+        Les deux recherches sont lancées en parallèle sur un nombre élargi de
+        candidats, puis classées par Reciprocal Rank Fusion. Un passage trouvé
+        uniquement par mots-clés a un similarity_score de 0.
+
+        Args:
+            query_text: Texte de la requête
+            course_id: ID du cours
+            top_k: Nombre maximum de résultats
+            min_similarity: Score de similarité minimum des résultats vectoriels
+            document_id: Optionnel, limiter la recherche à un document
+
+        Returns:
+            Liste de résultats avec similarity_score, bm25_score et rrf_score
+        """
+        candidates = max(top_k * 3, 20)
+
+        vector_results, keyword_results = await asyncio.gather(
+            self.search_similar(
+                query_text,
+                course_id=course_id,
+                top_k=candidates,
+                min_similarity=min_similarity,
+                document_id=document_id
+            ),
+            self.keyword_search(
+                query_text,
+                course_id=course_id,
+                top_k=candidates,
+                document_id=document_id
+            )
+        )
+
+        results = reciprocal_rank_fusion([vector_results, keyword_results], top_k)
+        for result in results:
+            result.setdefault("similarity_score", 0.0)
+            result.setdefault("bm25_score", 0.0)
+        return results
+
+    async def _scan_similar(
+        self,
+        query_embedding: List[float],
+        embedding_model: str,
+        course_id: Optional[str],
+        document_id: Optional[str],
+        top_k: int,
+        min_similarity: float
+    ) -> List[dict]:
+        """
+        Recherche exhaustive par vector::similarity::cosine() dans SurrealDB.
+
+        Seuls les champs utiles sont projetés (pas les vecteurs) et top_k est
+        appliqué côté serveur.
+        """
+        if not self.surreal_service.db:
+            await self.surreal_service.connect()
+
+        conditions, params = self._search_conditions(
+            embedding_model, course_id, document_id
+        )
+        params["query_embedding"] = query_embedding
+        params["top_k"] = top_k
+
+        query = f"""
+        SELECT document_id, course_id, chunk_index, chunk_text, word_count, char_start, char_end,
+            vector::similarity::cosine(embedding, $query_embedding) AS similarity_score
+        FROM document_embedding
+        WHERE {" AND ".join(conditions)}
+        ORDER BY similarity_score DESC
+        LIMIT $top_k
+        """
+
+        result = await self.surreal_service.query(query, params)
+        return self._format_search_results(result, min_similarity)
+
+    async def _table_indexes(self) -> dict:
+        """Retourne les index définis sur document_embedding (nom -> définition)."""
+        if not self.surreal_service.db:
+            await self.surreal_service.connect()
+
+        info = await self.surreal_service.query("INFO FOR TABLE document_embedding")
+        if isinstance(info, list):
+            info = info[0] if info else {}
+        if isinstance(info, dict) and "result" in info:
+            info = info["result"]
+        indexes = info.get("indexes", {}) if isinstance(info, dict) else {}
+        return {name: str(definition) for name, definition in indexes.items()}
+
     @staticmethod
-    def _cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
-        """Calcule la similarité cosinus entre deux vecteurs."""
-        if len(vec1) != len(vec2):
-            return 0.0
+    def _is_vector_index(definition: str) -> bool:
+        upper = definition.upper()
+        return " HNSW" in upper or " MTREE" in upper
 
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = sum(a * a for a in vec1) ** 0.5
-        norm2 = sum(b * b for b in vec2) ** 0.5
+    async def ensure_vector_index(self, dimensions: Optional[int] = None) -> str:
+        """
+        Crée l'index HNSW natif pour la dimension du modèle courant.
 
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
+        Un index vectoriel SurrealDB n'accepte que les vecteurs de sa dimension:
+        les index vectoriels d'une autre dimension sont donc supprimés.
+        Appelé au démarrage et avant l'écriture d'embeddings d'une nouvelle
+        dimension (backend surreal), jamais depuis la recherche.
 
-        return dot_product / (norm1 * norm2)
+        Returns:
+            Nom de l'index vectoriel actif
+        """
+        dimensions = int(dimensions or self.embedding_service.dimensions)
+        target = f"idx_embedding_hnsw_{dimensions}"
+        indexes = await self._table_indexes()
+
+        for name, definition in indexes.items():
+            if name != target and self._is_vector_index(definition) and f"DIMENSION {dimensions}" not in definition.upper():
+                logger.info(f"Removing vector index {name} (other dimension)")
+                await self.surreal_service.query(f"REMOVE INDEX {name} ON document_embedding")
+
+        if not any(
+            self._is_vector_index(definition) and f"DIMENSION {dimensions}" in definition.upper()
+            for definition in indexes.values()
+        ):
+            logger.info(f"Defining vector index {target} ({dimensions} dimensions)")
+            await self.surreal_service.query(
+                f"DEFINE INDEX IF NOT EXISTS {target} ON document_embedding "
+                f"FIELDS embedding HNSW DIMENSION {dimensions} DIST COSINE"
+            )
+
+        DocumentIndexingService._knn_support.clear()
+        DocumentIndexingService._knn_support[dimensions] = True
+        DocumentIndexingService._vector_index_dimensions = dimensions
+        return target
+
+    async def _knn_index_available(self) -> bool:
+        """
+        Indique si un index vectoriel natif (HNSW/MTREE) couvre la dimension
+        du modèle courant. Le résultat est mis en cache par dimension.
+        """
+        dimensions = self.embedding_service.dimensions
+        cached = DocumentIndexingService._knn_support.get(dimensions)
+        if cached is not None:
+            return cached
+
+        try:
+            indexes = await self._table_indexes()
+            available = any(
+                self._is_vector_index(definition) and f"DIMENSION {dimensions}" in definition.upper()
+                for definition in indexes.values()
+            )
+        except Exception as e:
+            logger.warning(f"Vector index detection failed, using full scan: {e}")
+            available = False
+
+        DocumentIndexingService._knn_support[dimensions] = available
+        return available
+
+    async def _knn_similar(
+        self,
+        query_embedding: List[float],
+        embedding_model: str,
+        course_id: Optional[str],
+        document_id: Optional[str],
+        top_k: int,
+        min_similarity: float
+    ) -> List[dict]:
+        """
+        Recherche par l'opérateur KNN natif de SurrealDB (<|k,ef|>).
+
+        Les conditions course_id/embedding_model sont évaluées pendant le
+        parcours de l'index et seuls les champs utiles sont projetés.
+        """
+        if not self.surreal_service.db:
+            await self.surreal_service.connect()
+
+        k = max(1, int(top_k))
+        ef = max(40, 4 * k)
+
+        conditions, params = self._search_conditions(
+            embedding_model, course_id, document_id
+        )
+        params["query_embedding"] = query_embedding
+
+        query = f"""
+        SELECT document_id, course_id, chunk_index, chunk_text, word_count, char_start, char_end,
+            vector::similarity::cosine(embedding, $query_embedding) AS similarity_score
+        FROM document_embedding
+        WHERE embedding <|{k},{ef}|> $query_embedding AND {" AND ".join(conditions)}
+        ORDER BY similarity_score DESC
+        """
+
+        result = await self.surreal_service.query(query, params)
+        return self._format_search_results(result, min_similarity)[:k]
+
+    @staticmethod
+    def _search_conditions(
+        embedding_model: str,
+        course_id: Optional[str],
+        document_id: Optional[str]
+    ) -> tuple[List[str], dict]:
+        """Construit les filtres WHERE communs aux requêtes de recherche."""
+        conditions = ["embedding_model = $embedding_model"]
+        params = {"embedding_model": embedding_model}
+        if course_id:
+            conditions.append("course_id = $course_id")
+            params["course_id"] = course_id
+        if document_id:
+            conditions.append("document_id = $document_id")
+            params["document_id"] = document_id
+        return conditions, params
+
+    @staticmethod
+    def _format_search_results(result, min_similarity: float) -> List[dict]:
+        """Filtre par similarité minimum et formate les résultats d'une requête."""
+        embeddings = []
+        if result and len(result) > 0:
+            first_item = result[0]
+            if isinstance(first_item, dict) and "result" in first_item:
+                embeddings = first_item["result"] if isinstance(first_item["result"], list) else []
+            elif isinstance(first_item, list):
+                embeddings = first_item
+            elif isinstance(first_item, dict):
+                embeddings = result
+
+        similarities = []
+        for emb_record in embeddings:
+            similarity = emb_record.get("similarity_score", 0)
+
+            if similarity >= min_similarity:
+                similarities.append({
+                    "document_id": emb_record.get("document_id"),
+                    "course_id": emb_record.get("course_id"),
+                    "chunk_index": emb_record.get("chunk_index"),
+                    "chunk_text": emb_record.get("chunk_text"),
+                    "similarity_score": similarity,
+                    "word_count": emb_record.get("word_count", 0),
+                    "char_start": emb_record.get("char_start"),
+                    "char_end": emb_record.get("char_end")
+                })
+
+        return similarities
 
     async def delete_document_index(self, document_id: str) -> bool:
         """
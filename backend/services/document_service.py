@@ -4,6 +4,7 @@ Document Service - Business logic for document management.
 Handles CRUD operations, file management, and document metadata for courses.
 """
 
+import asyncio
 import logging
 import uuid
 from datetime import datetime
@@ -12,8 +13,10 @@ from typing import Optional, List, Dict, Any
 
 from config.settings import settings
 from services.surreal_service import get_surreal_service
+from services.course_context_cache import bump_course_version
+from services.document_indexing_service import get_document_indexing_service
 from models.document_models import DocumentResponse, DocusaurusSource
-from utils.file_utils import calculate_file_hash, get_file_extension, get_mime_type
+from utils.file_utils import calculate_file_hash, find_existing_paths, get_file_extension, get_mime_type
 
 logger = logging.getLogger(__name__)
 
@@ -25,12 +28,23 @@ class DocumentService:
         """Initialize the document service."""
         self.surreal_service = get_surreal_service()
 
+    # Metadata columns read when listing documents: the extracted text can be
+    # megabytes per document and is fetched by id only when needed.
+    LIST_FIELDS = (
+        "id, course_id, nom_fichier, type_fichier, type_mime, taille, file_path, created_at, "
+        "source_document_id, is_derived, derivation_type, source_type, linked_source, "
+        "docusaurus_source, indexed, module_id, ocr_status, ocr_error, "
+        "transcription_status, transcription_error, "
+        "(texte_extrait != NONE AND texte_extrait != NULL AND texte_extrait != '') AS has_extracted_text"
+    )
+
     async def list_documents(
         self,
         course_id: str,
         verify_files: bool = True,
         auto_remove_missing: bool = True,
-        include_derived: bool = True
+        include_derived: bool = True,
+        include_text: bool = False
     ) -> List[DocumentResponse]:
         """
         List all documents for a course.
@@ -40,6 +54,8 @@ class DocumentService:
             verify_files: Check if files exist on disk
             auto_remove_missing: Remove documents with missing files
             include_derived: Include derived documents (transcriptions, etc.)
+            include_text: Include the extracted text of each document
+                (otherwise only has_extracted_text is set)
 
         Returns:
             List of DocumentResponse objects
@@ -54,15 +70,16 @@ class DocumentService:
 
             # Query documents
             legacy_course_id = course_id.replace("course:", "course:")
+            fields = f"{self.LIST_FIELDS}, texte_extrait" if include_text else self.LIST_FIELDS
 
             if include_derived:
                 result = await self.surreal_service.query(
-                    "SELECT * FROM document WHERE course_id IN [$course_id, $legacy_course_id] ORDER BY created_at DESC",
+                    f"SELECT {fields} FROM document WHERE course_id IN [$course_id, $legacy_course_id] ORDER BY created_at DESC",
                     {"course_id": course_id, "legacy_course_id": legacy_course_id}
                 )
             else:
                 result = await self.surreal_service.query(
-                    "SELECT * FROM document WHERE course_id IN [$course_id, $legacy_course_id] AND is_derived != true ORDER BY created_at DESC",
+                    f"SELECT {fields} FROM document WHERE course_id IN [$course_id, $legacy_course_id] AND is_derived != true ORDER BY created_at DESC",
                     {"course_id": course_id, "legacy_course_id": legacy_course_id}
                 )
 
@@ -75,6 +92,13 @@ class DocumentService:
                 elif isinstance(result, list):
                     items = result
 
+            # Verify file existence for all documents at once (thread pool)
+            existing_paths = None
+            if verify_files:
+                existing_paths = await asyncio.to_thread(
+                    find_existing_paths, [item.get("file_path", "") for item in items]
+                )
+
             documents = []
             docs_to_remove = []
 
@@ -82,43 +106,13 @@ class DocumentService:
                 file_path = item.get("file_path", "")
                 file_exists = True
 
-                # Verify file existence
-                if verify_files and file_path:
-                    file_exists = Path(file_path).exists()
+                if existing_paths is not None and file_path:
+                    file_exists = file_path in existing_paths
                     if not file_exists and auto_remove_missing:
                         docs_to_remove.append(str(item.get("id", "")))
                         continue
 
-                # Build response
-                linked_source_data = item.get("linked_source")
-                docusaurus_source_data = item.get("docusaurus_source")
-
-                doc_response = DocumentResponse(
-                    id=str(item.get("id", "")),
-                    course_id=item.get("course_id", course_id),
-                    filename=item.get("nom_fichier", ""),
-                    file_type=item.get("type_fichier", ""),
-                    mime_type=item.get("type_mime", ""),
-                    size=item.get("taille", 0),
-                    file_path=file_path,
-                    created_at=item.get("created_at", ""),
-                    extracted_text=item.get("texte_extrait"),
-                    file_exists=file_exists,
-                    source_document_id=item.get("source_document_id"),
-                    is_derived=item.get("is_derived", False),
-                    derivation_type=item.get("derivation_type"),
-                    source_type=item.get("source_type", "upload"),
-                    linked_source=linked_source_data,
-                    docusaurus_source=DocusaurusSource(**docusaurus_source_data) if docusaurus_source_data else None,
-                    indexed=item.get("indexed", False),
-                    module_id=item.get("module_id"),
-                    ocr_status=item.get("ocr_status"),
-                    ocr_error=item.get("ocr_error"),
-                    transcription_status=item.get("transcription_status"),
-                    transcription_error=item.get("transcription_error")
-                )
-
-                documents.append(doc_response)
+                documents.append(self._build_response(item, file_exists, course_id))
 
             # Remove missing documents if requested
             if docs_to_remove:
@@ -169,39 +163,53 @@ class DocumentService:
             file_path = doc_data.get("file_path", "")
             file_exists = Path(file_path).exists() if file_path else False
 
-            # Build response
-            linked_source_data = doc_data.get("linked_source")
-            docusaurus_source_data = doc_data.get("docusaurus_source")
-
-            return DocumentResponse(
-                id=str(doc_data.get("id", document_id)),
-                course_id=doc_data.get("course_id", ""),
-                filename=doc_data.get("nom_fichier", ""),
-                file_type=doc_data.get("type_fichier", ""),
-                mime_type=doc_data.get("type_mime", ""),
-                size=doc_data.get("taille", 0),
-                file_path=file_path,
-                created_at=doc_data.get("created_at", ""),
-                extracted_text=doc_data.get("texte_extrait"),
-                file_exists=file_exists,
-                source_document_id=doc_data.get("source_document_id"),
-                is_derived=doc_data.get("is_derived", False),
-                derivation_type=doc_data.get("derivation_type"),
-                source_type=doc_data.get("source_type", "upload"),
-                linked_source=linked_source_data,
-                docusaurus_source=DocusaurusSource(**docusaurus_source_data) if docusaurus_source_data else None,
-                indexed=doc_data.get("indexed", False),
-                module_id=doc_data.get("module_id"),
-                ocr_status=doc_data.get("ocr_status"),
-                ocr_error=doc_data.get("ocr_error"),
-                transcription_status=doc_data.get("transcription_status"),
-                transcription_error=doc_data.get("transcription_error")
-            )
+            return self._build_response(doc_data, file_exists, "", default_id=document_id)
 
         except Exception as e:
             logger.error(f"Error getting document {document_id}: {e}", exc_info=True)
             raise
 
+    @staticmethod
+    def _build_response(
+        item: dict,
+        file_exists: bool,
+        course_id: str,
+        default_id: str = ""
+    ) -> DocumentResponse:
+        """Build a DocumentResponse from a document record (full or LIST_FIELDS projection)."""
+        linked_source_data = item.get("linked_source")
+        docusaurus_source_data = item.get("docusaurus_source")
+        extracted_text = item.get("texte_extrait")
+        has_extracted_text = item.get("has_extracted_text")
+        if has_extracted_text is None:
+            has_extracted_text = bool(extracted_text)
+
+        return DocumentResponse(
+            id=str(item.get("id", default_id)),
+            course_id=item.get("course_id", course_id),
+            filename=item.get("nom_fichier", ""),
+            file_type=item.get("type_fichier", ""),
+            mime_type=item.get("type_mime", ""),
+            size=item.get("taille", 0),
+            file_path=item.get("file_path", ""),
+            created_at=item.get("created_at", ""),
+            extracted_text=extracted_text,
+            has_extracted_text=has_extracted_text,
+            file_exists=file_exists,
+            source_document_id=item.get("source_document_id"),
+            is_derived=item.get("is_derived", False),
+            derivation_type=item.get("derivation_type"),
+            source_type=item.get("source_type", "upload"),
+            linked_source=linked_source_data,
+            docusaurus_source=DocusaurusSource(**docusaurus_source_data) if docusaurus_source_data else None,
+            indexed=item.get("indexed", False),
+            module_id=item.get("module_id"),
+            ocr_status=item.get("ocr_status"),
+            ocr_error=item.get("ocr_error"),
+            transcription_status=item.get("transcription_status"),
+            transcription_error=item.get("transcription_error")
+        )
+
     async def create_document(
         self,
         course_id: str,
@@ -319,6 +327,7 @@ class DocumentService:
                 {"data": doc_data}
             )
 
+            bump_course_version(course_id)
             logger.info(f"Created document {doc_id} for course {course_id}")
 
             # Return created document
@@ -355,6 +364,7 @@ class DocumentService:
 
             # Delete from database
             await self.surreal_service.query(f"DELETE {document_id}")
+            bump_course_version(doc.course_id)
 
             # Delete file if requested
             if delete_file and doc.file_path:
@@ -366,15 +376,11 @@ class DocumentService:
                 except Exception as e:
                     logger.error(f"Error deleting file {doc.file_path}: {e}")
 
-            # Delete associated embeddings
-            try:
-                await self.surreal_service.query(
-                    "DELETE FROM embedding WHERE document_id = $doc_id",
-                    {"doc_id": document_id}
-                )
+            # Delete associated embeddings (DB rows and in-memory vector index)
+            if await get_document_indexing_service().delete_document_index(document_id):
                 logger.info(f"Deleted embeddings for document {document_id}")
-            except Exception as e:
-                logger.error(f"Error deleting embeddings for {document_id}: {e}")
+            else:
+                logger.error(f"Error deleting embeddings for {document_id}")
 
             logger.info(f"Deleted document {document_id}")
             return True
@@ -459,7 +465,9 @@ class DocumentService:
             logger.info(f"Updated text for document {document_id}")
 
             # Return updated document
-            return await self.get_document(document_id)
+            document = await self.get_document(document_id)
+            bump_course_version(document.course_id if document else None)
+            return document
 
         except Exception as e:
             logger.error(f"Error updating document text: {e}", exc_info=True)
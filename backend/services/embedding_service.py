@@ -11,11 +11,22 @@ Les embeddings sont stockes dans SurrealDB pour la recherche vectorielle.
 
 import logging
 import asyncio
-from typing import Optional
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator, Optional
 from dataclasses import dataclass, field
 
 import httpx
 
+from config.settings import settings
+from services.http_clients import call_timeout, http_client
+from services.text_chunker import TextChunk, estimate_tokens, iter_chunks
+
 logger = logging.getLogger(__name__)
 
 # Verifier si sentence-transformers est disponible
@@ -42,6 +53,134 @@ class ChunkResult:
     """Resultat du chunking de texte."""
     chunks: list[str] = field(default_factory=list)
     total_tokens: int = 0
+    # Positions (debut, fin) de chaque chunk dans le texte source
+    offsets: list[tuple[int, int]] = field(default_factory=list)
+
+
+class EmbeddingCache:
+    """
+    Cache LRU + TTL des embeddings, cle (modele, texte normalise).
+
+    Un niveau disque optionnel (SQLite) permet au cache de survivre aux
+    redemarrages; les entrees lues sur disque sont remontees en memoire.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600,
+        disk_path: Optional[Path] = None
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = disk_path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[float, list[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: Optional[sqlite3.Connection] = None
+
+        if disk_path is not None:
+            try:
+                disk_path.parent.mkdir(parents=True, exist_ok=True)
+                self._disk = sqlite3.connect(str(disk_path), check_same_thread=False)
+                self._disk.execute(
+                    "CREATE TABLE IF NOT EXISTS embedding_cache ("
+                    "model TEXT NOT NULL, text TEXT NOT NULL, vector BLOB NOT NULL, "
+                    "created_at REAL NOT NULL, PRIMARY KEY (model, text))"
+                )
+                self._disk.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Cache disque des embeddings indisponible: {e}")
+                self._disk = None
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalise un texte (Unicode NFC, espaces, casse) pour la cle du cache."""
+        return " ".join(unicodedata.normalize("NFC", text).split()).casefold()
+
+    def get(self, model: str, text: str) -> Optional[list[float]]:
+        """Retourne l'embedding en cache, ou None."""
+        key = (model, self.normalize(text))
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, embedding = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return embedding
+                del self._entries[key]
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT vector, created_at FROM embedding_cache WHERE model = ? AND text = ?",
+                    key
+                ).fetchone()
+                if row is not None and now - row[1] <= self.ttl_seconds:
+                    embedding = array("f", row[0]).tolist()
+                    self._store(key, embedding, row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return embedding
+
+            self.misses += 1
+            return None
+
+    def put(self, model: str, text: str, embedding: list[float]) -> None:
+        """Ajoute un embedding au cache."""
+        key = (model, self.normalize(text))
+        now = time.time()
+
+        with self._lock:
+            self._store(key, embedding, now)
+
+            if self._disk is not None:
+                try:
+                    self._disk.execute(
+                        "INSERT OR REPLACE INTO embedding_cache (model, text, vector, created_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (*key, array("f", embedding).tobytes(), now)
+                    )
+                    self._disk.execute(
+                        "DELETE FROM embedding_cache WHERE created_at < ?",
+                        (now - self.ttl_seconds,)
+                    )
+                    self._disk.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Ecriture du cache disque des embeddings impossible: {e}")
+
+    def _store(self, key: tuple[str, str], embedding: list[float], created_at: float) -> None:
+        self._entries[key] = (created_at, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Vide le cache (memoire et disque) et remet les compteurs a zero."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM embedding_cache")
+                self._disk.commit()
+
+    def stats(self) -> dict:
+        """Compteurs de hits/misses et taille du cache."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "persistent": self._disk is not None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
 
 
 class EmbeddingService:
@@ -93,7 +232,10 @@ class EmbeddingService:
         provider: str = "ollama",
         model: str = "nomic-embed-text",
         ollama_url: str = "http://localhost:11434",
-        openai_api_key: Optional[str] = None
+        openai_api_key: Optional[str] = None,
+        batch_size: int = 32,
+        max_batch_tokens: int = 16000,
+        cache: Optional[EmbeddingCache] = None
     ):
         """
         Initialise le service d'embeddings.
@@ -103,12 +245,18 @@ class EmbeddingService:
             model: Modele d'embedding
             ollama_url: URL du serveur Ollama
             openai_api_key: Cle API OpenAI (si provider=openai)
+            batch_size: Nombre maximum de textes envoyes par lot
+            max_batch_tokens: Budget approximatif de tokens par lot
+            cache: Cache des embeddings de requetes (aucun cache si None)
         """
         self.provider = provider
         self.model = model
         self.ollama_url = ollama_url
         self.openai_api_key = openai_api_key
         self._local_model = None
+        self.batch_size = max(1, batch_size)
+        self.max_batch_tokens = max(1, max_batch_tokens)
+        self.cache = cache
 
         # Determiner les dimensions
         provider_models = self.MODELS.get(provider, {})
@@ -149,12 +297,13 @@ class EmbeddingService:
 
         return self._local_model
 
-    async def generate_embedding(self, text: str) -> EmbeddingResult:
+    async def generate_embedding(self, text: str, use_cache: bool = True) -> EmbeddingResult:
         """
         Genere un embedding pour un texte.
 
         Args:
             text: Texte a encoder
+            use_cache: Consulter et alimenter le cache des requetes
 
         Returns:
             EmbeddingResult avec le vecteur d'embedding
@@ -165,46 +314,69 @@ class EmbeddingService:
                 error="Texte vide"
             )
 
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            cached = self.cache.get(self.full_model_name, text)
+            if cached is not None:
+                return EmbeddingResult(
+                    success=True,
+                    embedding=cached,
+                    model=self.full_model_name,
+                    dimensions=len(cached)
+                )
+
         if self.provider == "ollama":
-            return await self._generate_ollama(text)
+            result = await self._generate_ollama(text)
         elif self.provider == "openai":
-            return await self._generate_openai(text)
+            result = await self._generate_openai(text)
         elif self.provider == "local":
-            return await self._generate_local(text)
+            result = await self._generate_local(text)
         else:
             return EmbeddingResult(
                 success=False,
                 error=f"Provider non supporte: {self.provider}"
             )
 
+        if use_cache and result.success:
+            self.cache.put(self.full_model_name, text, result.embedding)
+
+        return result
+
+    def cache_stats(self) -> dict:
+        """Statistiques du cache des embeddings de requetes."""
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, "model": self.full_model_name, **self.cache.stats()}
+
     async def _generate_ollama(self, text: str) -> EmbeddingResult:
         """Genere un embedding via Ollama."""
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.ollama_url}/api/embeddings",
-                    json={
-                        "model": self.model,
-                        "prompt": text
-                    }
-                )
-
-                if response.status_code != 200:
-                    return EmbeddingResult(
-                        success=False,
-                        error=f"Ollama error: {response.status_code} - {response.text}"
-                    )
-
-                data = response.json()
-                embedding = data.get("embedding", [])
+            client = http_client(self.ollama_url)
+            response = await client.post(
+                f"{self.ollama_url}/api/embeddings",
+                timeout=call_timeout("embedding"),
+                json={
+                    "model": self.model,
+                    "prompt": text
+                }
+            )
 
+            if response.status_code != 200:
                 return EmbeddingResult(
-                    success=True,
-                    embedding=embedding,
-                    model=f"ollama:{self.model}",
-                    dimensions=len(embedding)
+                    success=False,
+                    error=f"Ollama error: {response.status_code} - {response.text}"
                 )
 
+            data = response.json()
+            embedding = data.get("embedding", [])
+
+            return EmbeddingResult(
+                success=True,
+                embedding=embedding,
+                model=f"ollama:{self.model}",
+                dimensions=len(embedding)
+            )
+
         except httpx.ConnectError:
             return EmbeddingResult(
                 success=False,
@@ -225,35 +397,36 @@ class EmbeddingService:
             )
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    "https://api.openai.com/v1/embeddings",
-                    headers={
-                        "Authorization": f"Bearer {self.openai_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.model,
-                        "input": text
-                    }
-                )
-
-                if response.status_code != 200:
-                    return EmbeddingResult(
-                        success=False,
-                        error=f"OpenAI error: {response.status_code}"
-                    )
-
-                data = response.json()
-                embedding = data["data"][0]["embedding"]
+            client = http_client("https://api.openai.com")
+            response = await client.post(
+                "https://api.openai.com/v1/embeddings",
+                timeout=call_timeout("embedding"),
+                headers={
+                    "Authorization": f"Bearer {self.openai_api_key}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "model": self.model,
+                    "input": text
+                }
+            )
 
+            if response.status_code != 200:
                 return EmbeddingResult(
-                    success=True,
-                    embedding=embedding,
-                    model=f"openai:{self.model}",
-                    dimensions=len(embedding)
+                    success=False,
+                    error=f"OpenAI error: {response.status_code}"
                 )
 
+            data = response.json()
+            embedding = data["data"][0]["embedding"]
+
+            return EmbeddingResult(
+                success=True,
+                embedding=embedding,
+                model=f"openai:{self.model}",
+                dimensions=len(embedding)
+            )
+
         except Exception as e:
             return EmbeddingResult(
                 success=False,
@@ -295,65 +468,270 @@ class EmbeddingService:
                 error=str(e)
             )
 
-    async def generate_embeddings_batch(self, texts: list[str]) -> list[EmbeddingResult]:
+    async def generate_embeddings_batch(
+        self,
+        texts: list[str],
+        batch_size: Optional[int] = None
+    ) -> list[EmbeddingResult]:
         """
-        Genere des embeddings pour plusieurs textes.
+        Genere des embeddings pour plusieurs textes, par lots.
+
+        Les textes sont regroupes en lots bornes par `batch_size` et par
+        `max_batch_tokens`, puis envoyes en un seul appel au provider
+        (encode() pour local, input multiple pour OpenAI, /api/embed pour Ollama).
 
         Args:
             texts: Liste de textes a encoder
+            batch_size: Taille maximale d'un lot (defaut: self.batch_size)
 
         Returns:
-            Liste de EmbeddingResult
+            Liste de EmbeddingResult, dans le meme ordre que `texts`
         """
-        results = []
-        for text in texts:
-            result = await self.generate_embedding(text)
-            results.append(result)
+        results: list[Optional[EmbeddingResult]] = [None] * len(texts)
+
+        pending = []
+        for idx, text in enumerate(texts):
+            if not text or not text.strip():
+                results[idx] = EmbeddingResult(success=False, error="Texte vide")
+            else:
+                pending.append((idx, text))
+
+        for batch in self._build_batches(pending, batch_size or self.batch_size):
+            batch_results = await self._generate_batch([text for _, text in batch])
+            for (idx, _), result in zip(batch, batch_results):
+                results[idx] = result
+
         return results
 
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Estimation rapide du nombre de tokens (~4 caracteres par token)."""
+        return estimate_tokens(text)
+
+    def _build_batches(
+        self,
+        items: list[tuple[int, str]],
+        batch_size: int
+    ) -> list[list[tuple[int, str]]]:
+        """Regroupe les textes en lots respectant la taille et le budget de tokens."""
+        batches = []
+        current = []
+        current_tokens = 0
+
+        for idx, text in items:
+            tokens = self.estimate_tokens(text)
+            if current and (
+                len(current) >= batch_size
+                or current_tokens + tokens > self.max_batch_tokens
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append((idx, text))
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    async def _generate_batch(self, texts: list[str]) -> list[EmbeddingResult]:
+        """
+        Encode un lot de textes avec le provider configure.
+
+        Si l'appel groupe echoue, chaque texte est reessaye individuellement
+        afin que l'erreur soit rapportee pour le bon element.
+        """
+        if self.provider == "ollama":
+            results, error = await self._generate_ollama_batch(texts)
+        elif self.provider == "openai":
+            results, error = await self._generate_openai_batch(texts)
+        elif self.provider == "local":
+            results, error = await self._generate_local_batch(texts)
+        else:
+            error = f"Provider non supporte: {self.provider}"
+            return [EmbeddingResult(success=False, error=error) for _ in texts]
+
+        if error is None:
+            return results
+
+        if len(texts) == 1:
+            return [EmbeddingResult(success=False, error=error)]
+
+        logger.warning(
+            f"Echec du lot de {len(texts)} embeddings ({error}), "
+            f"repli sur l'encodage individuel"
+        )
+        return [await self.generate_embedding(text, use_cache=False) for text in texts]
+
+    def _batch_results(self, embeddings: list[list[float]]) -> list[EmbeddingResult]:
+        """Convertit une liste de vecteurs en EmbeddingResult."""
+        return [
+            EmbeddingResult(
+                success=True,
+                embedding=embedding,
+                model=self.full_model_name,
+                dimensions=len(embedding)
+            )
+            for embedding in embeddings
+        ]
+
+    async def _generate_ollama_batch(
+        self,
+        texts: list[str]
+    ) -> tuple[list[EmbeddingResult], Optional[str]]:
+        """Genere un lot d'embeddings via l'endpoint /api/embed d'Ollama."""
+        try:
+            client = http_client(self.ollama_url)
+            response = await client.post(
+                f"{self.ollama_url}/api/embed",
+                timeout=call_timeout("embedding_batch"),
+                json={
+                    "model": self.model,
+                    "input": texts
+                }
+            )
+
+            if response.status_code != 200:
+                return [], f"Ollama error: {response.status_code} - {response.text}"
+
+            embeddings = response.json().get("embeddings", [])
+            if len(embeddings) != len(texts):
+                return [], f"Ollama a retourne {len(embeddings)} embeddings pour {len(texts)} textes"
+
+            return self._batch_results(embeddings), None
+
+        except httpx.ConnectError:
+            return [], "Impossible de se connecter a Ollama. Verifiez qu'il est demarre."
+        except Exception as e:
+            return [], str(e)
+
+    async def _generate_openai_batch(
+        self,
+        texts: list[str]
+    ) -> tuple[list[EmbeddingResult], Optional[str]]:
+        """Genere un lot d'embeddings via OpenAI API (input multiple)."""
+        if not self.openai_api_key:
+            return [], "Cle API OpenAI non configuree"
+
+        try:
+            client = http_client("https://api.openai.com")
+            response = await client.post(
+                "https://api.openai.com/v1/embeddings",
+                timeout=call_timeout("embedding_batch"),
+                headers={
+                    "Authorization": f"Bearer {self.openai_api_key}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "model": self.model,
+                    "input": texts
+                }
+            )
+
+            if response.status_code != 200:
+                return [], f"OpenAI error: {response.status_code}"
+
+            data = sorted(response.json()["data"], key=lambda item: item["index"])
+            if len(data) != len(texts):
+                return [], f"OpenAI a retourne {len(data)} embeddings pour {len(texts)} textes"
+
+            return self._batch_results([item["embedding"] for item in data]), None
+
+        except Exception as e:
+            return [], str(e)
+
+    async def _generate_local_batch(
+        self,
+        texts: list[str]
+    ) -> tuple[list[EmbeddingResult], Optional[str]]:
+        """Genere un lot d'embeddings via SentenceTransformers local."""
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            return [], "sentence-transformers non installe"
+
+        model = self._load_local_model()
+        if model is None:
+            return [], "Impossible de charger le modele local"
+
+        try:
+            loop = asyncio.get_event_loop()
+            embeddings = await loop.run_in_executor(
+                None,
+                lambda: model.encode(texts, batch_size=self.batch_size).tolist()
+            )
+            return self._batch_results(embeddings), None
+
+        except Exception as e:
+            return [], str(e)
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Compte les tokens d'un texte.
+
+        Utilise le tokenizer du modele local s'il est disponible, sinon
+        l'estimation rapide (~4 caracteres par token).
+        """
+        if self.provider == "local":
+            model = self._load_local_model()
+            tokenizer = getattr(model, "tokenizer", None) if model is not None else None
+            if tokenizer is not None:
+                return max(1, len(tokenizer.encode(text, add_special_tokens=False)))
+        return self.estimate_tokens(text)
+
+    def iter_chunks(
+        self,
+        text: str,
+        chunk_size: int = 512,
+        overlap: int = 64
+    ) -> Iterator[TextChunk]:
+        """
+        Decoupe un texte en chunks au fil de l'eau (voir text_chunker.iter_chunks).
+
+        Args:
+            text: Texte a decouper
+            chunk_size: Taille maximale des chunks en tokens
+            overlap: Chevauchement maximal entre chunks en tokens
+        """
+        return iter_chunks(
+            text,
+            max_tokens=chunk_size,
+            overlap_tokens=overlap,
+            count_tokens=self.count_tokens
+        )
+
     def chunk_text(
         self,
         text: str,
-        chunk_size: int = 500,
-        overlap: int = 50
+        chunk_size: int = 512,
+        overlap: int = 64
     ) -> ChunkResult:
         """
         Decoupe un texte en chunks pour l'embedding.
 
+        Les coupes suivent les titres Markdown, paragraphes et phrases.
+
         Args:
             text: Texte a decouper
-            chunk_size: Taille approximative des chunks en mots
-            overlap: Nombre de mots de chevauchement entre chunks
+            chunk_size: Taille maximale des chunks en tokens
+            overlap: Chevauchement maximal entre chunks en tokens
 
         Returns:
-            ChunkResult avec les chunks
+            ChunkResult avec les chunks et leurs positions dans le texte
         """
-        if not text:
-            return ChunkResult()
-
-        words = text.split()
-        chunks = []
-        start = 0
-
-        while start < len(words):
-            end = min(start + chunk_size, len(words))
-            chunk = " ".join(words[start:end])
-            chunks.append(chunk)
-
-            # Avancer avec chevauchement
-            start = end - overlap if end < len(words) else len(words)
-
-        return ChunkResult(
-            chunks=chunks,
-            total_tokens=len(words)
-        )
-
-    @staticmethod
-    def is_ollama_available() -> bool:
-        """Verifie si Ollama est disponible."""
+        result = ChunkResult()
+        for chunk in self.iter_chunks(text, chunk_size=chunk_size, overlap=overlap):
+            result.chunks.append(chunk.text)
+            result.offsets.append((chunk.start, chunk.end))
+            result.total_tokens += chunk.token_count
+        return result
+
+    async def is_ollama_available(self) -> bool:
+        """Verifie si Ollama est disponible (sans bloquer la boucle d'evenements)."""
         try:
-            import httpx
-            response = httpx.get("http://localhost:11434/api/tags", timeout=5.0)
+            response = await http_client(self.ollama_url).get(
+                f"{self.ollama_url}/api/tags",
+                timeout=call_timeout("health")
+            )
             return response.status_code == 200
         except Exception:
             return False
@@ -377,5 +755,18 @@ def get_embedding_service(
         # Utiliser le modele multilingue par defaut si non specifie
         if model is None:
             model = EmbeddingService.DEFAULT_MODEL.get(provider, "nomic-embed-text")
-        _embedding_service = EmbeddingService(provider=provider, model=model)
+        _embedding_service = EmbeddingService(
+            provider=provider,
+            model=model,
+            batch_size=settings.embedding_batch_size,
+            max_batch_tokens=settings.embedding_batch_max_tokens,
+            cache=EmbeddingCache(
+                max_entries=settings.embedding_cache_size,
+                ttl_seconds=settings.embedding_cache_ttl,
+                disk_path=(
+                    settings.upload_dir / "cache" / "query_embeddings.sqlite"
+                    if settings.embedding_cache_persist else None
+                )
+            ) if settings.embedding_cache_size > 0 else None
+        )
     return _embedding_service
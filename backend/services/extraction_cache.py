@@ -0,0 +1,297 @@
+"""
+Cache persistant des résultats d'extraction.
+
+Les extractions coûteuses (MarkItDown, Docling, OCR, transcription) sont
+conservées sous settings.upload_dir/extraction_cache et adressées par le
+contenu du fichier: la clé combine le hash SHA-256 du fichier, l'extracteur,
+le moteur, sa version et les options. Le même PDF téléversé dans un autre
+cours, ou réextrait après clear_document_text, est servi depuis le cache.
+
+Chaque entrée est un fichier JSON dont la date de modification sert de date
+de dernier accès: au-delà de la taille maximale, les entrées les moins
+récemment utilisées sont supprimées.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from importlib import metadata as importlib_metadata
+from pathlib import Path
+from typing import Optional
+
+from config.settings import settings
+from utils.file_utils import calculate_file_hash
+
+logger = logging.getLogger(__name__)
+
+# À incrémenter quand le format des entrées ou le post-traitement du texte change
+CACHE_FORMAT_VERSION = 1
+
+# Après éviction, le cache redescend à cette fraction de sa taille maximale
+EVICTION_TARGET_RATIO = 0.9
+
+
+@lru_cache(maxsize=None)
+def package_version(*packages: str) -> str:
+    """Versions installées des paquets d'un extracteur (pour invalider le cache aux mises à jour)."""
+    versions = []
+    for package in packages:
+        try:
+            versions.append(f"{package}={importlib_metadata.version(package)}")
+        except importlib_metadata.PackageNotFoundError:
+            versions.append(f"{package}=none")
+    return ",".join(versions)
+
+
+@dataclass
+class CachedExtraction:
+    """Résultat d'extraction conservé dans le cache."""
+    text: str
+    metadata: dict = field(default_factory=dict)
+    extractor: str = ""
+    created_at: str = ""
+
+
+class ExtractionCache:
+    """
+    Cache des extractions, adressé par contenu et borné en taille (LRU).
+
+    Args:
+        cache_dir: Répertoire des entrées
+        max_bytes: Taille maximale du cache sur disque
+        enabled: Si False, key_for retourne None et le cache est ignoré
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+        self._entries: Optional[int] = None
+
+    @staticmethod
+    def make_key(
+        file_hash: str,
+        extractor: str,
+        engine: str = "",
+        version: str = "",
+        options: Optional[dict] = None,
+    ) -> str:
+        """Clé d'une extraction: hash du fichier + extracteur, moteur, version et options."""
+        parts = {
+            "format": CACHE_FORMAT_VERSION,
+            "file": file_hash,
+            "extractor": extractor,
+            "engine": engine,
+            "version": version,
+            "options": options or {},
+        }
+        encoded = json.dumps(parts, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    async def key_for(
+        self,
+        file_path: Path,
+        extractor: str,
+        engine: str = "",
+        version: str = "",
+        options: Optional[dict] = None,
+    ) -> Optional[str]:
+        """Calcule la clé d'un fichier (hash dans un thread). None si le cache est désactivé."""
+        if not self.enabled:
+            return None
+        try:
+            file_hash = await asyncio.to_thread(calculate_file_hash, Path(file_path))
+        except OSError as e:
+            logger.warning(f"Cache d'extraction: hash impossible pour {file_path}: {e}")
+            return None
+        return self.make_key(file_hash, extractor, engine, version, options)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: Optional[str]) -> Optional[CachedExtraction]:
+        """Retourne une entrée et la marque comme récemment utilisée, ou None."""
+        if key is None:
+            return None
+
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entrée de cache d'extraction illisible {path}: {e}")
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return CachedExtraction(
+            text=data.get("text", ""),
+            metadata=data.get("metadata") or {},
+            extractor=data.get("extractor", ""),
+            created_at=data.get("created_at", ""),
+        )
+
+    def put(
+        self,
+        key: Optional[str],
+        text: str,
+        metadata: Optional[dict] = None,
+        extractor: str = "",
+    ) -> None:
+        """Enregistre une extraction (écriture atomique), puis évince si nécessaire."""
+        if key is None:
+            return
+
+        path = self._path(key)
+        data = {
+            "text": text,
+            "metadata": metadata or {},
+            "extractor": extractor,
+            "created_at": datetime.now().isoformat(),
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            previous = path.stat().st_size if path.exists() else None
+            with tempfile.NamedTemporaryFile(
+                "w", dir=path.parent, suffix=".json.tmp", delete=False, encoding="utf-8"
+            ) as tmp:
+                json.dump(data, tmp, ensure_ascii=False, default=str)
+            os.replace(tmp.name, path)
+            size = path.stat().st_size
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Impossible d'écrire le cache d'extraction {path}: {e}")
+            return
+
+        with self._lock:
+            self._ensure_counted()
+            self._size += size - (previous or 0)
+            if previous is None:
+                self._entries += 1
+            over_limit = self._size > self.max_bytes
+
+        if over_limit:
+            self._evict()
+
+    async def load(self, key: Optional[str]) -> Optional[CachedExtraction]:
+        """Version asynchrone de get (lecture dans un thread)."""
+        if key is None:
+            return None
+        return await asyncio.to_thread(self.get, key)
+
+    async def store(
+        self,
+        key: Optional[str],
+        text: str,
+        metadata: Optional[dict] = None,
+        extractor: str = "",
+    ) -> None:
+        """Version asynchrone de put (écriture dans un thread)."""
+        if key is None:
+            return
+        await asyncio.to_thread(self.put, key, text, metadata, extractor)
+
+    def _scan(self) -> list[tuple[float, int, Path]]:
+        """Entrées du cache: (dernier accès, taille, chemin)."""
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _ensure_counted(self) -> None:
+        """Calcule la taille du cache au premier besoin (appelé sous verrou)."""
+        if self._size is None:
+            entries = self._scan()
+            self._size = sum(size for _, size, _ in entries)
+            self._entries = len(entries)
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Supprime les entrées les moins récemment utilisées jusqu'à la taille cible."""
+        with self._lock:
+            entries = sorted(self._scan())
+            size = sum(entry_size for _, entry_size, _ in entries)
+            target = int(self.max_bytes * EVICTION_TARGET_RATIO)
+            evicted = 0
+
+            for _, entry_size, path in entries:
+                if size <= target:
+                    break
+                self._remove(path)
+                size -= entry_size
+                evicted += 1
+
+            self._size = size
+            self._entries = len(entries) - evicted
+
+        if evicted:
+            logger.info(f"Cache d'extraction: {evicted} entrées évincées (LRU)")
+
+    def stats(self) -> dict:
+        """Statistiques du cache."""
+        with self._lock:
+            self._ensure_counted()
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": self._entries,
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def purge(self) -> int:
+        """Vide le cache. Retourne le nombre d'entrées supprimées."""
+        with self._lock:
+            entries = self._scan()
+            for _, _, path in entries:
+                self._remove(path)
+            self._size = 0
+            self._entries = 0
+            self.hits = 0
+            self.misses = 0
+        logger.info(f"Cache d'extraction vidé: {len(entries)} entrées supprimées")
+        return len(entries)
+
+
+# Singleton
+_extraction_cache: Optional[ExtractionCache] = None
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Obtient l'instance singleton du cache d'extraction."""
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = ExtractionCache(
+            Path(settings.upload_dir) / "extraction_cache",
+            max_bytes=settings.extraction_cache_max_mb * 1024 * 1024,
+            enabled=settings.extraction_cache_enabled,
+        )
+    return _extraction_cache
@@ -0,0 +1,109 @@
+"""
+Détection des questions de fiches quasi identiques.
+
+Deux questions sont des doublons quand la similarité de Jaccard de leurs
+ensembles de mots atteint le seuil (0.8 par défaut). Plutôt que de comparer
+chaque question à toutes les questions retenues, l'index applique le
+filtrage par préfixe (AllPairs): les mots de chaque question sont triés
+dans un ordre global, du plus rare au plus fréquent, et deux ensembles dont
+la similarité atteint le seuil partagent forcément un mot de leurs
+préfixes. Seuls les candidats ainsi trouvés, de taille compatible, sont
+vérifiés par le calcul exact: le résultat est identique à la comparaison
+exhaustive, sans faux négatifs.
+"""
+
+import math
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+
+def question_words(question: str) -> FrozenSet[str]:
+    """Ensemble de mots d'une question (minuscules, découpage sur les espaces)."""
+    return frozenset(question.lower().strip().split())
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Similarité de Jaccard de deux ensembles."""
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+class QuestionDedupIndex:
+    """
+    Index des questions retenues, interrogé à chaque nouvelle question.
+
+    Args:
+        threshold: Similarité de Jaccard à partir de laquelle deux questions
+            sont des doublons
+        word_counts: Fréquences des mots du lot à dédoublonner; elles fixent
+            l'ordre global (mots rares en tête) et ne doivent plus changer
+            une fois l'index utilisé
+    """
+
+    def __init__(self, threshold: float = 0.8, word_counts: Optional[Counter] = None):
+        self.threshold = threshold
+        self._word_counts = word_counts or Counter()
+        self._entries: List[FrozenSet[str]] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+
+    def _prefix(self, words: FrozenSet[str]) -> List[str]:
+        """Préfixe de l'ensemble: assez long pour garantir un mot commun au-delà du seuil."""
+        ordered = sorted(words, key=lambda word: (self._word_counts[word], word))
+        # Le chevauchement minimal est ceil(t * |x|); l'epsilon évite qu'une erreur
+        # d'arrondi ne raccourcisse le préfixe (un préfixe plus long reste exact)
+        min_overlap = max(1, math.ceil(self.threshold * len(ordered) - 1e-9))
+        return ordered[:len(ordered) - min_overlap + 1]
+
+    def find(self, words: FrozenSet[str]) -> Optional[int]:
+        """Position de la première question retenue similaire, ou None."""
+        return self._find(words, self._prefix(words)) if words else None
+
+    def add(self, words: FrozenSet[str]) -> int:
+        """Retient une question et retourne sa position."""
+        return self._add(words, self._prefix(words))
+
+    def add_if_unique(self, words: FrozenSet[str]) -> Optional[int]:
+        """Retient la question si elle n'a pas de doublon; sinon retourne la position du doublon."""
+        if not words:
+            return None
+        prefix = self._prefix(words)
+        match = self._find(words, prefix)
+        if match is None:
+            self._add(words, prefix)
+        return match
+
+    def _find(self, words: FrozenSet[str], prefix: List[str]) -> Optional[int]:
+        size = len(words)
+        min_size = self.threshold * size - 1e-9
+        max_size = size / self.threshold + 1e-9 if self.threshold > 0 else math.inf
+
+        candidates = set()
+        for word in prefix:
+            candidates.update(self._postings.get(word, ()))
+
+        for position in sorted(candidates):
+            other = self._entries[position]
+            if min_size <= len(other) <= max_size and jaccard(words, other) >= self.threshold:
+                return position
+        return None
+
+    def _add(self, words: FrozenSet[str], prefix: List[str]) -> int:
+        position = len(self._entries)
+        self._entries.append(words)
+        for word in prefix:
+            self._postings[word].append(position)
+        return position
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def build_dedup_index(
+    questions: Iterable[str],
+    threshold: float = 0.8,
+) -> QuestionDedupIndex:
+    """Crée un index dont l'ordre des mots est fixé par les fréquences des questions données."""
+    counts: Counter = Counter()
+    for question in questions:
+        counts.update(question_words(question))
+    return QuestionDedupIndex(threshold, counts)
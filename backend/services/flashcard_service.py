@@ -15,12 +15,12 @@ import tempfile
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import AsyncGenerator, Dict, List, Optional
-
-from agno.agent import Agent
+from typing import AsyncGenerator, Awaitable, Callable, Dict, List, Optional
 
 from config.settings import settings
-from services.model_factory import create_model
+from services.flashcard_dedup import build_dedup_index, question_words
+from services.http_clients import call_timeout, http_client
+from services.model_factory import get_agent
 from services.surreal_service import get_surreal_service
 from services.tts_service import TTSService
 
@@ -80,6 +80,24 @@ FRENCH_VOICES_FOR_ALTERNATING = [
 ]
 
 
+# Concurrent LLM calls per provider, shared by all running generations
+_provider_slots: Dict[str, asyncio.Semaphore] = {}
+
+
+def get_provider_slots(model_id: str) -> asyncio.Semaphore:
+    """
+    Get the semaphore bounding concurrent calls to a model's provider.
+
+    Limits come from settings.llm_provider_concurrency (one slot for
+    providers that are not listed).
+    """
+    provider = model_id.split(":", 1)[0].lower() if ":" in model_id else settings.llm_provider
+    if provider not in _provider_slots:
+        limit = settings.llm_provider_concurrency.get(provider, 1)
+        _provider_slots[provider] = asyncio.Semaphore(max(1, limit))
+    return _provider_slots[provider]
+
+
 class FlashcardService:
     """Service for generating flashcards from documents."""
 
@@ -163,7 +181,9 @@ class FlashcardService:
         Generate flashcards from documents using LLM.
 
         Processes each document individually to maintain source attribution
-        and ensure diverse coverage across all source materials.
+        and ensure diverse coverage across all source materials. Chunks are
+        sent to the LLM concurrently (bounded per provider) and their cards
+        are streamed as each chunk completes.
 
         Args:
             deck_id: ID of the deck to add cards to
@@ -242,25 +262,12 @@ class FlashcardService:
             "message": f"Génération de {card_count} fiches depuis {len(documents_data)} documents..."
         }
 
-        # Generate cards for each document separately
-        all_cards = []
-        docs_processed = 0
+        # One LLM call per chunk; each document's cards are spread across its chunks
+        jobs = []
+        chunk_size = 6000  # Slightly larger chunks for better context
 
         for doc_data, doc_card_count in zip(documents_data, cards_distribution):
-            docs_processed += 1
-            doc_name = doc_data["name"]
-            doc_id = doc_data["doc_id"]
-
-            yield {
-                "status": "generating",
-                "message": f"Document {docs_processed}/{len(documents_data)}: {doc_name} ({doc_card_count} fiches)..."
-            }
-
-            # Split document content into chunks if needed
-            chunk_size = 6000  # Slightly larger chunks for better context
             chunks = self._split_content_into_chunks(doc_data["content"], chunk_size)
-
-            # Distribute this document's cards across its chunks
             cards_per_chunk = max(3, min(15, doc_card_count // max(1, len(chunks))))
             remaining_doc_cards = doc_card_count
 
@@ -274,56 +281,67 @@ class FlashcardService:
                     chunk_cards = remaining_doc_cards
                 remaining_doc_cards -= chunk_cards
 
-                # Build prompt with document name for context
-                prompt = FLASHCARD_GENERATION_PROMPT.format(
-                    card_count=chunk_cards,
-                    document_name=doc_name,
-                    content=chunk_content
-                )
+                jobs.append({
+                    "doc_id": doc_data["doc_id"],
+                    "doc_name": doc_data["name"],
+                    "chunk_idx": chunk_idx,
+                    "card_count": chunk_cards,
+                    "prompt": FLASHCARD_GENERATION_PROMPT.format(
+                        card_count=chunk_cards,
+                        document_name=doc_data["name"],
+                        content=chunk_content
+                    )
+                })
 
-                try:
-                    # For Ollama, call directly for better JSON compliance
-                    if "ollama" in model_id.lower():
-                        response_text = await self._call_ollama_direct(
-                            model_id=model_id.replace("ollama:", ""),
-                            prompt=prompt,
-                            card_count=chunk_cards
-                        )
-                    else:
-                        # Use Agno for other providers (Claude, etc.)
-                        model = create_model(model_id)
-                        agent = Agent(
-                            name="FlashcardGenerator",
-                            model=model,
-                            instructions="Tu génères des fiches de révision diversifiées en JSON.",
-                            markdown=False
-                        )
-                        response = await agent.arun(prompt)
-                        response_text = response.content if hasattr(response, "content") else str(response)
-
-                    # Parse JSON from response
-                    chunk_parsed_cards = self._parse_cards_json(response_text)
-
-                    if chunk_parsed_cards:
-                        # Add source document info to each card
-                        for card in chunk_parsed_cards:
-                            card["source_doc_id"] = doc_id
-                            card["source_doc_name"] = doc_name
-                        all_cards.extend(chunk_parsed_cards)
-                        logger.info(f"Doc '{doc_name}' chunk {chunk_idx + 1}: {len(chunk_parsed_cards)} cards")
-                    else:
-                        logger.warning(f"Doc '{doc_name}' chunk {chunk_idx + 1}: No cards parsed")
+        try:
+            complete = self._create_completion(model_id)
+        except Exception as e:
+            logger.error(f"Error creating model {model_id}: {e}")
+            yield {
+                "status": "error",
+                "message": f"Impossible de charger le modèle {model_id}: {e}"
+            }
+            return
 
-                except Exception as e:
-                    logger.error(f"Error generating cards for {doc_name} chunk {chunk_idx + 1}: {e}")
+        # Chunks are generated concurrently; cards are kept in document/chunk
+        # order so that deduplication keeps the same cards as a serial run
+        chunk_results: List[List[Dict]] = [[] for _ in jobs]
+        completed = 0
+
+        async for job_idx, cards in self._generate_chunks(jobs, complete, model_id):
+            chunk_results[job_idx] = cards
+            completed += 1
+            job = jobs[job_idx]
+
+            yield {
+                "status": "generating",
+                "message": (
+                    f"{job['doc_name']} (partie {job['chunk_idx'] + 1}): {len(cards)} fiches "
+                    f"[{completed}/{len(jobs)}]"
+                ),
+                "chunks_completed": completed,
+                "total_chunks": len(jobs),
+                "cards": [
+                    {
+                        "front": card.get("front", ""),
+                        "back": card.get("back", ""),
+                        "theme": card.get("theme"),
+                        "document_name": job["doc_name"],
+                    }
+                    for card in cards
+                ]
+            }
+
+        all_cards = [card for cards in chunk_results for card in cards]
 
         yield {
             "status": "deduplicating",
             "message": f"Déduplication de {len(all_cards)} fiches..."
         }
 
-        # Deduplicate similar cards
-        unique_cards = self._deduplicate_cards(all_cards)
+        # Deduplicate similar cards, including against cards already in the deck
+        existing_questions = await self._load_deck_questions(deck_id)
+        unique_cards = self._deduplicate_cards(all_cards, existing_questions=existing_questions)
         duplicates_removed = len(all_cards) - len(unique_cards)
 
         if duplicates_removed > 0:
@@ -333,6 +351,15 @@ class FlashcardService:
                 "message": f"{duplicates_removed} doublons supprimés, {len(unique_cards)} fiches uniques"
             }
 
+        if not unique_cards and all_cards and existing_questions:
+            logger.info(f"All {len(all_cards)} generated cards already exist in deck {deck_id}")
+            yield {
+                "status": "completed",
+                "message": "Aucune nouvelle fiche: toutes les fiches générées existent déjà dans le deck",
+                "cards_generated": 0
+            }
+            return
+
         if not unique_cards:
             logger.error("No cards generated from any document")
             yield {
@@ -398,6 +425,92 @@ class FlashcardService:
             "cards_generated": saved_count
         }
 
+    def _create_completion(self, model_id: str) -> Callable[[str, int], Awaitable[str]]:
+        """
+        Build the LLM call shared by every chunk of a generation.
+
+        Ollama is called directly for better JSON compliance; other providers
+        go through the cached Agno agent, with a copy per chunk since chunks
+        run concurrently.
+
+        Args:
+            model_id: LLM model to use
+
+        Returns:
+            Coroutine function (prompt, card_count) -> raw response text
+        """
+        if "ollama" in model_id.lower():
+            async def complete(prompt: str, card_count: int) -> str:
+                return await self._call_ollama_direct(
+                    model_id=model_id.replace("ollama:", ""),
+                    prompt=prompt,
+                    card_count=card_count
+                )
+            return complete
+
+        async def complete(prompt: str, card_count: int) -> str:
+            agent = get_agent(
+                model_id,
+                name="FlashcardGenerator",
+                instructions="Tu génères des fiches de révision diversifiées en JSON.",
+                markdown=False
+            )
+            response = await agent.arun(prompt)
+            return response.content if hasattr(response, "content") else str(response)
+
+        return complete
+
+    async def _generate_chunks(
+        self,
+        jobs: List[Dict],
+        complete: Callable[[str, int], Awaitable[str]],
+        model_id: str
+    ) -> AsyncGenerator[tuple, None]:
+        """
+        Run chunk prompts concurrently, yielding (job index, cards) as each finishes.
+
+        Concurrency is bounded by the provider's slots, shared with other
+        generations running against the same provider. A failed chunk yields
+        no cards.
+
+        Args:
+            jobs: Chunk jobs (doc_id, doc_name, chunk_idx, card_count, prompt)
+            complete: LLM call from _create_completion
+            model_id: LLM model, used to select the provider's slots
+        """
+        slots = get_provider_slots(model_id)
+
+        async def run(job_idx: int) -> tuple:
+            job = jobs[job_idx]
+            try:
+                async with slots:
+                    response_text = await complete(job["prompt"], job["card_count"])
+
+                # Parse JSON from response
+                cards = self._parse_cards_json(response_text)
+            except Exception as e:
+                logger.error(f"Error generating cards for {job['doc_name']} chunk {job['chunk_idx'] + 1}: {e}")
+                return job_idx, []
+
+            if cards:
+                # Add source document info to each card
+                for card in cards:
+                    card["source_doc_id"] = job["doc_id"]
+                    card["source_doc_name"] = job["doc_name"]
+                logger.info(f"Doc '{job['doc_name']}' chunk {job['chunk_idx'] + 1}: {len(cards)} cards")
+            else:
+                logger.warning(f"Doc '{job['doc_name']}' chunk {job['chunk_idx'] + 1}: No cards parsed")
+            return job_idx, cards
+
+        tasks = [asyncio.create_task(run(i)) for i in range(len(jobs))]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Client disconnected: don't keep the provider busy
+            for task in tasks:
+                task.cancel()
+
     def _distribute_cards_by_document(
         self,
         documents_data: List[Dict],
@@ -457,15 +570,22 @@ class FlashcardService:
 
         return distribution
 
-    def _deduplicate_cards(self, cards: List[Dict], similarity_threshold: float = 0.8) -> List[Dict]:
+    def _deduplicate_cards(
+        self,
+        cards: List[Dict],
+        similarity_threshold: float = 0.8,
+        existing_questions: Optional[List[str]] = None
+    ) -> List[Dict]:
         """
         Remove duplicate or very similar cards based on question similarity.
 
-        Uses simple word overlap ratio for efficiency.
+        Uses word overlap (Jaccard) ratio, looked up through a prefix-filter
+        index instead of comparing every pair of questions.
 
         Args:
             cards: List of card dictionaries
             similarity_threshold: Threshold for considering cards as duplicates (0-1)
+            existing_questions: Questions already in the deck; similar cards are dropped
 
         Returns:
             List of unique cards
@@ -473,37 +593,62 @@ class FlashcardService:
         if not cards:
             return []
 
-        unique_cards = []
+        existing_questions = existing_questions or []
+        index = build_dedup_index(
+            existing_questions + [card.get("front", "") for card in cards],
+            similarity_threshold
+        )
         seen_questions = []
 
+        for question in existing_questions:
+            words = question_words(question)
+            if words:
+                index.add(words)
+                seen_questions.append(question.lower().strip())
+
+        unique_cards = []
+
         for card in cards:
             question = card.get("front", "").lower().strip()
             if not question:
                 continue
 
-            # Check similarity with existing questions
-            is_duplicate = False
-            question_words = set(question.split())
+            match = index.add_if_unique(question_words(question))
+            if match is not None:
+                logger.debug(f"Duplicate found: '{question[:50]}...' similar to '{seen_questions[match][:50]}...'")
+                continue
 
-            for seen_q in seen_questions:
-                seen_words = set(seen_q.split())
+            seen_questions.append(question)
+            unique_cards.append(card)
 
-                # Calculate Jaccard similarity
-                if question_words and seen_words:
-                    intersection = len(question_words & seen_words)
-                    union = len(question_words | seen_words)
-                    similarity = intersection / union if union > 0 else 0
+        return unique_cards
 
-                    if similarity >= similarity_threshold:
-                        is_duplicate = True
-                        logger.debug(f"Duplicate found: '{question[:50]}...' similar to '{seen_q[:50]}...'")
-                        break
+    async def _load_deck_questions(self, deck_id: str) -> List[str]:
+        """
+        Load the questions of the cards already in a deck.
 
-            if not is_duplicate:
-                unique_cards.append(card)
-                seen_questions.append(question)
+        Args:
+            deck_id: Deck ID (with or without prefix)
 
-        return unique_cards
+        Returns:
+            Card questions (empty if the deck has no cards or the query fails)
+        """
+        deck_record_id = deck_id.replace("flashcard_deck:", "")
+        try:
+            service = get_surreal_service()
+            result = await service.query(
+                "SELECT front FROM flashcard WHERE deck_id = $deck_id",
+                {"deck_id": f"flashcard_deck:{deck_record_id}"}
+            )
+        except Exception as e:
+            logger.warning(f"Could not load existing cards of deck {deck_id}: {e}")
+            return []
+
+        return [
+            row.get("front", "")
+            for row in result or []
+            if isinstance(row, dict) and row.get("front")
+        ]
 
     def _split_content_into_chunks(self, content: str, chunk_size: int = 5000) -> List[str]:
         """
@@ -574,8 +719,6 @@ class FlashcardService:
         Returns:
             Raw response text from Ollama
         """
-        import httpx
-
         # Calculate timeout based on card count (more cards = more time)
         timeout = max(120.0, card_count * 15.0)
 
@@ -586,27 +729,28 @@ class FlashcardService:
 
         logger.info(f"Ollama request: model={model_id}, num_predict={num_predict}, prompt_len={len(prompt)}")
 
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                "http://localhost:11434/api/generate",
-                json={
-                    "model": model_id,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.3,  # Slightly higher for variety
-                        "num_predict": num_predict,
-                        "num_ctx": 8192  # Increase context window
-                    }
+        ollama_url = settings.ollama_base_url
+        response = await http_client(ollama_url).post(
+            f"{ollama_url}/api/generate",
+            timeout=call_timeout("generation", read=timeout),
+            json={
+                "model": model_id,
+                "prompt": prompt,
+                "stream": False,
+                "options": {
+                    "temperature": 0.3,  # Slightly higher for variety
+                    "num_predict": num_predict,
+                    "num_ctx": 8192  # Increase context window
                 }
-            )
+            }
+        )
 
-            if response.status_code != 200:
-                logger.error(f"Ollama error: {response.status_code} - {response.text}")
-                raise Exception(f"Ollama returned status {response.status_code}")
+        if response.status_code != 200:
+            logger.error(f"Ollama error: {response.status_code} - {response.text}")
+            raise Exception(f"Ollama returned status {response.status_code}")
 
-            result = response.json()
-            return result.get("response", "")
+        result = response.json()
+        return result.get("response", "")
 
     def _parse_cards_json(self, response_text: str) -> List[Dict]:
         """
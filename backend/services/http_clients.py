@@ -0,0 +1,145 @@
+"""
+Clients HTTP partagés de l'application.
+
+Les appels à Ollama, OpenAI et aux serveurs de modèles locaux (MLX, vLLM)
+passent par un client httpx.AsyncClient par hôte, ouvert pour toute la
+durée de vie de l'application (main.lifespan): les connexions restent
+ouvertes entre les appels (keep-alive) au lieu d'un nouvel établissement
+TCP/TLS à chaque requête. Chaque hôte a sa propre limite de connexions, et
+HTTP/2 est négocié avec les hôtes HTTPS qui le supportent si le paquet h2
+est installé.
+
+Les délais dépendent du type d'appel (CALL_TIMEOUTS) et sont passés à
+chaque requête.
+"""
+
+import importlib.util
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Délais par type d'appel: connexion courte, lecture selon la durée attendue
+CALL_TIMEOUTS: Dict[str, httpx.Timeout] = {
+    "health": httpx.Timeout(5.0, connect=2.0),
+    "embedding": httpx.Timeout(60.0, connect=5.0),
+    "embedding_batch": httpx.Timeout(300.0, connect=5.0),
+    "generation": httpx.Timeout(600.0, connect=5.0),
+}
+
+
+def call_timeout(call_type: str, read: Optional[float] = None) -> httpx.Timeout:
+    """
+    Délai d'un type d'appel.
+
+    Args:
+        call_type: Clé de CALL_TIMEOUTS
+        read: Délai de lecture à utiliser à la place de celui du type (secondes)
+    """
+    timeout = CALL_TIMEOUTS[call_type]
+    if read is None:
+        return timeout
+    return httpx.Timeout(read, connect=timeout.connect)
+
+
+class HttpClientRegistry:
+    """
+    Un client httpx poolé par origine (schéma, hôte, port).
+
+    Args:
+        max_connections_per_host: Connexions simultanées maximum vers un hôte
+        keepalive_expiry: Durée de conservation d'une connexion inactive (secondes)
+        http2: Négocier HTTP/2 avec les hôtes HTTPS (si h2 est installé)
+        transport: Transport httpx à utiliser à la place du réseau (tests)
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = 16,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_connections_per_host,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.transport = transport
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def client(self, url: str) -> httpx.AsyncClient:
+        """Client partagé de l'hôte d'une URL (créé au premier appel)."""
+        origin = self._origin(url)
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=self.limits,
+                http2=self.http2 and origin.startswith("https://"),
+                timeout=CALL_TIMEOUTS["generation"],
+                transport=self.transport,
+            )
+            self._clients[origin] = client
+            logger.debug(f"Client HTTP ouvert pour {origin}")
+        return client
+
+    async def aclose(self) -> None:
+        """Ferme tous les clients et leurs connexions."""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Erreur à la fermeture d'un client HTTP: {e}")
+        if clients:
+            logger.info(f"{len(clients)} clients HTTP fermés")
+
+    def stats(self) -> dict:
+        """Hôtes ayant un client ouvert."""
+        return {
+            "hosts": sorted(self._clients),
+            "http2": self.http2,
+            "max_connections_per_host": self.limits.max_connections,
+        }
+
+
+# Singleton
+_http_clients: Optional[HttpClientRegistry] = None
+
+
+def get_http_clients() -> HttpClientRegistry:
+    """Obtient l'instance singleton du registre de clients HTTP."""
+    global _http_clients
+    if _http_clients is None:
+        _http_clients = HttpClientRegistry(
+            max_connections_per_host=settings.http_max_connections_per_host,
+            keepalive_expiry=settings.http_keepalive_expiry,
+            http2=settings.http2_enabled,
+        )
+    return _http_clients
+
+
+def http_client(url: str) -> httpx.AsyncClient:
+    """Client partagé de l'hôte d'une URL."""
+    return get_http_clients().client(url)
+
+
+async def close_http_clients() -> None:
+    """Ferme les clients partagés (arrêt de l'application)."""
+    global _http_clients
+    if _http_clients is not None:
+        await _http_clients.aclose()
+        _http_clients = None
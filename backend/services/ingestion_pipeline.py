@@ -0,0 +1,278 @@
+"""
+Pipeline d'ingestion des fichiers de répertoires liés.
+
+Les fichiers passent par trois étapes bornées, qui se chevauchent:
+1. extraction du texte et hash du fichier, dans un pool de processus
+2. création des documents dans SurrealDB, par lots (INSERT)
+3. traitement final (extraction Markdown, indexation), à concurrence limitée
+
+Les fichiers sont rendus au fur et à mesure qu'ils terminent, sans
+attendre les plus lents: la progression est rapportée dans le désordre.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from config.settings import settings
+from services.course_context_cache import bump_course_version
+from utils.file_utils import calculate_file_hash
+from utils.linked_directory_utils import FileInfo, extract_text_from_file
+
+logger = logging.getLogger(__name__)
+
+LINKED_MIME_TYPES = {
+    "md": "text/markdown",
+    "mdx": "text/markdown",
+    "txt": "text/plain",
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "doc": "application/msword",
+}
+
+
+def read_linked_file(path: str) -> tuple[str, str]:
+    """
+    Extrait le texte d'un fichier et calcule son hash (exécuté dans le pool de processus).
+
+    Returns:
+        (texte extrait, hash SHA-256 du fichier)
+    """
+    file_path = Path(path)
+    return extract_text_from_file(file_path), calculate_file_hash(file_path)
+
+
+def has_text_content(content: Optional[str]) -> bool:
+    """Le texte extrait est-il exploitable (et non un placeholder "[Contenu ...]")?"""
+    return bool(content) and not content.startswith("[Contenu")
+
+
+def build_linked_document(
+    file_info: FileInfo,
+    content: Optional[str],
+    file_hash: str,
+    course_id: str,
+    link_id: str,
+    base_path: str,
+    user_id: str,
+    now: str,
+) -> dict:
+    """Construit l'enregistrement document d'un fichier lié."""
+    return {
+        "course_id": course_id,
+        "nom_fichier": file_info.filename,
+        "type_fichier": file_info.extension,
+        "type_mime": LINKED_MIME_TYPES.get(file_info.extension, "application/octet-stream"),
+        "taille": file_info.size,
+        "file_path": file_info.absolute_path,
+        "user_id": user_id,
+        "created_at": now,
+        "source_type": "linked",
+        "linked_source": {
+            "absolute_path": file_info.absolute_path,
+            "relative_path": file_info.relative_path,
+            "parent_folder": file_info.parent_folder,
+            "link_id": link_id,
+            "base_path": base_path,
+            "last_sync": now,
+            "source_hash": file_hash,
+            "source_mtime": file_info.modified_time,
+        },
+        "texte_extrait": content if has_text_content(content) else None,
+        "indexed": False,
+    }
+
+
+# Pool de processus partagé pour l'extraction
+_extraction_pool: Optional[ProcessPoolExecutor] = None
+
+
+def extraction_workers() -> int:
+    """Nombre de processus d'extraction (par défaut: nombre de coeurs)."""
+    return settings.ingestion_extract_workers or os.cpu_count() or 1
+
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    """Obtient le pool de processus d'extraction (créé au premier usage)."""
+    global _extraction_pool
+    if _extraction_pool is None:
+        # spawn: le processus serveur a des threads (modèles, client DB), fork n'est pas sûr
+        _extraction_pool = ProcessPoolExecutor(
+            max_workers=extraction_workers(),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _extraction_pool
+
+
+def shutdown_extraction_pool() -> None:
+    """Arrête le pool de processus d'extraction."""
+    global _extraction_pool
+    if _extraction_pool is not None:
+        _extraction_pool.shutdown(wait=False, cancel_futures=True)
+        _extraction_pool = None
+
+
+async def read_linked_file_async(path: str) -> tuple[str, str]:
+    """Extrait et hashe un fichier dans le pool de processus."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_extraction_pool(), read_linked_file, path)
+
+
+async def extract_text_async(path: str) -> str:
+    """Extrait le texte d'un fichier dans le pool de processus."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_extraction_pool(), extract_text_from_file, Path(path))
+
+
+@dataclass
+class IngestionItem:
+    """Fichier en cours d'ingestion."""
+    file_info: FileInfo
+    doc_id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    content: Optional[str] = None
+    file_hash: str = ""
+    record: Optional[dict] = None
+    result: Any = None
+    error: Optional[str] = None
+
+    @property
+    def document_id(self) -> str:
+        return f"document:{self.doc_id}"
+
+
+class IngestionPipeline:
+    """
+    Pipeline extraction -> écriture par lots -> traitement final.
+
+    Args:
+        service: Service SurrealDB
+        build_record: Construit l'enregistrement document d'un fichier extrait
+        finish: Traitement final d'un document créé (indexation...), son
+            résultat est conservé dans item.result
+        extract_concurrency: Extractions simultanées (défaut: taille du pool)
+        finish_concurrency: Traitements finaux simultanés
+        batch_size: Nombre maximum de documents par INSERT
+    """
+
+    # Attente maximale avant d'écrire un lot incomplet (secondes)
+    batch_delay = 0.2
+
+    def __init__(
+        self,
+        service,
+        build_record: Callable[[IngestionItem], dict],
+        finish: Optional[Callable[[IngestionItem], Awaitable[Any]]] = None,
+        extract_concurrency: Optional[int] = None,
+        finish_concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.service = service
+        self.build_record = build_record
+        self.finish = finish
+        self.extract_concurrency = max(1, extract_concurrency or extraction_workers())
+        self.finish_concurrency = max(1, finish_concurrency or settings.ingestion_finish_concurrency)
+        self.batch_size = max(1, batch_size or settings.ingestion_db_batch_size)
+
+    async def run(self, files: list[FileInfo]) -> AsyncIterator[IngestionItem]:
+        """
+        Ingère des fichiers et rend chaque élément dès qu'il est terminé.
+
+        Un fichier en erreur est rendu avec item.error renseigné; les autres
+        continuent. Fermer le générateur annule les traitements en cours.
+        """
+        if not files:
+            return
+
+        written: asyncio.Queue = asyncio.Queue()
+        done: asyncio.Queue = asyncio.Queue()
+        extract_slots = asyncio.Semaphore(self.extract_concurrency)
+        finish_slots = asyncio.Semaphore(self.finish_concurrency)
+        tasks: set[asyncio.Task] = set()
+
+        async def extract(item: IngestionItem):
+            async with extract_slots:
+                try:
+                    item.content, item.file_hash = await read_linked_file_async(
+                        item.file_info.absolute_path
+                    )
+                    item.record = self.build_record(item)
+                except Exception as e:
+                    item.error = f"Extraction: {e}"
+            await written.put(item)
+
+        async def complete(item: IngestionItem):
+            if item.error is None and self.finish is not None:
+                async with finish_slots:
+                    try:
+                        item.result = await self.finish(item)
+                    except Exception as e:
+                        item.error = str(e)
+            await done.put(item)
+
+        def start(coro):
+            task = asyncio.create_task(coro)
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        async def write_batches():
+            pending = len(files)
+            while pending:
+                batch = [await written.get()]
+                pending -= 1
+                while pending and len(batch) < self.batch_size:
+                    try:
+                        batch.append(await asyncio.wait_for(written.get(), self.batch_delay))
+                        pending -= 1
+                    except asyncio.TimeoutError:
+                        break
+
+                await self._write(item for item in batch if item.error is None)
+                for item in batch:
+                    start(complete(item))
+
+        items = [IngestionItem(file_info=file_info) for file_info in files]
+        for item in items:
+            start(extract(item))
+        writer = asyncio.create_task(write_batches())
+
+        try:
+            for _ in items:
+                yield await done.get()
+            await writer
+        finally:
+            writer.cancel()
+            for task in list(tasks):
+                task.cancel()
+
+    async def _write(self, items) -> None:
+        """Crée les documents d'un lot; en cas d'échec, un par un pour isoler l'erreur."""
+        items = list(items)
+        if not items:
+            return
+
+        try:
+            await self._insert(items)
+        finally:
+            # Après l'écriture: un contexte de chat chargé entre-temps serait périmé
+            for course_id in {item.record.get("course_id") for item in items}:
+                bump_course_version(course_id)
+
+    async def _insert(self, items) -> None:
+        rows = [{**item.record, "id": item.doc_id} for item in items]
+        try:
+            await self.service.query("INSERT INTO document $rows RETURN NONE", {"rows": rows})
+            return
+        except Exception as e:
+            logger.warning(f"Batch insert of {len(rows)} documents failed, retrying one by one: {e}")
+
+        for item in items:
+            try:
+                await self.service.create("document", item.record, record_id=item.doc_id)
+            except Exception as e:
+                item.error = f"Création du document: {e}"
@@ -0,0 +1,314 @@
+"""
+Index lexical BM25 pour la recherche hybride.
+
+Les embeddings retrouvent mal les références exactes ("art. 1726",
+numéros de dossier, noms propres): cet index inversé couvre les mêmes
+chunks que document_embedding et se combine à la recherche vectorielle
+par fusion des rangs (Reciprocal Rank Fusion).
+
+Comme les index vectoriels, il est tenu par cours et modèle d'embedding,
+mis à jour à chaque (ré)indexation et persisté en sidecar JSON.
+"""
+
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+import unicodedata
+from collections import Counter
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+from config.settings import settings
+from services.vector_index import IndexedChunk, VectorIndex, VectorIndexRegistry
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Mots vides FR/EN: trop fréquents pour discriminer les passages
+STOPWORDS = frozenset("""
+a au aux avec ce ces cette dans de des du elle en et est il ils je la le les leur lui
+mais me meme mes ne nous on ou par pas pour qu que qui sa se ses son sont sur ta te
+tes toi ton tu un une vos votre vous y c d j l m n s t quel quelle quels quelles
+an and are as at be by for from has have in is it its of on or that the this to was
+were what which who will with
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Découpe un texte en termes d'index.
+
+    Minuscules sans accents, mots vides retirés; les pluriels réguliers
+    (-s, -x) sont ramenés au singulier. Les nombres sont conservés tels
+    quels pour les références d'articles.
+    """
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    normalized = "".join(char for char in normalized if not unicodedata.combining(char))
+
+    terms = []
+    for term in TOKEN_RE.findall(normalized):
+        if term in STOPWORDS:
+            continue
+        if len(term) > 3 and term[-1] in "sx" and not term.isdigit():
+            term = term[:-1]
+        terms.append(term)
+    return terms
+
+
+class BM25Index(VectorIndex):
+    """
+    Index inversé BM25 des chunks d'un cours.
+
+    Implémente l'interface de VectorIndex pour être géré par le même
+    registre (chargement, mises à jour incrémentales, sidecars); les
+    vecteurs sont ignorés et la recherche se fait par texte (search_text).
+    """
+
+    persistent = True
+
+    def __init__(self, dimensions: int = 0, k1: float = 1.2, b: float = 0.75):
+        super().__init__(0)
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[int, int]] = {}
+        self._term_counts: dict[int, Counter] = {}
+        self._lengths: dict[int, int] = {}
+        self._total_length = 0
+
+    def add(self, chunks: list[IndexedChunk], vectors: Optional[list[list[float]]] = None) -> None:
+        """Ajoute des chunks à l'index (les vecteurs sont ignorés)."""
+        self._add_terms(chunks, [Counter(tokenize(chunk.chunk_text or "")) for chunk in chunks])
+
+    def _add_terms(self, chunks: list[IndexedChunk], term_counts: list[Counter]) -> None:
+        for chunk, counts in zip(chunks, term_counts):
+            label = self._next_label
+            self._next_label += 1
+
+            self.chunks[label] = chunk
+            self._document_labels.setdefault(chunk.document_id, []).append(label)
+            self._term_counts[label] = counts
+            self._lengths[label] = sum(counts.values())
+            self._total_length += self._lengths[label]
+            for term, frequency in counts.items():
+                self._postings.setdefault(term, {})[label] = frequency
+
+    def _remove_labels(self, labels: list[int]) -> None:
+        for label in labels:
+            counts = self._term_counts.pop(label, Counter())
+            self._total_length -= self._lengths.pop(label, 0)
+            for term in counts:
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(label, None)
+                    if not postings:
+                        del self._postings[term]
+
+    def search_text(
+        self,
+        query: str,
+        top_k: int,
+        document_id: Optional[str] = None
+    ) -> list[tuple[IndexedChunk, float]]:
+        """
+        Recherche les chunks les plus pertinents pour une requête textuelle.
+
+        Seules les listes de postings des termes de la requête sont parcourues.
+
+        Returns:
+            Liste de (chunk, score BM25) triée par score décroissant
+        """
+        terms = set(tokenize(query))
+        if not terms or not self.chunks or top_k <= 0:
+            return []
+
+        allowed = None
+        if document_id:
+            allowed = set(self._document_labels.get(document_id, []))
+            if not allowed:
+                return []
+
+        total = len(self.chunks)
+        average_length = self._total_length / total or 1.0
+        scores: dict[int, float] = {}
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            frequency = len(postings)
+            idf = math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+
+            for label, term_frequency in postings.items():
+                if allowed is not None and label not in allowed:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[label] / average_length)
+                scores[label] = scores.get(label, 0.0) + idf * term_frequency * (self.k1 + 1) / (term_frequency + norm)
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(self.chunks[label], score) for label, score in best]
+
+    def candidate_documents(self, keyword: str) -> Optional[set[str]]:
+        """
+        Documents pouvant contenir un mot-clé comme sous-chaîne.
+
+        Un terme de la requête peut n'être qu'une partie d'un mot indexé
+        ("civil" dans "civile", "responsab"): tous les termes du vocabulaire
+        qui le contiennent sont retenus, y compris avant le retrait du
+        pluriel. Le résultat est un sur-ensemble; la recherche exacte se
+        fait ensuite dans le texte.
+
+        Returns:
+            IDs des documents candidats, ou None si l'index ne permet pas
+            de filtrer (aucun terme hors des mots vides)
+        """
+        normalized = unicodedata.normalize("NFKD", keyword.lower())
+        normalized = "".join(char for char in normalized if not unicodedata.combining(char))
+        # Un terme inclus dans un mot vide peut n'apparaître que dans des mots non indexés
+        terms = {
+            term for term in TOKEN_RE.findall(normalized)
+            if not any(term in stopword for stopword in STOPWORDS)
+        }
+        if not terms:
+            return None
+
+        candidates: Optional[set[str]] = None
+        for term in terms:
+            documents = set()
+            for indexed, postings in self._postings.items():
+                if term in indexed or term in f"{indexed}s" or term in f"{indexed}x":
+                    documents.update(self.chunks[label].document_id for label in postings)
+            candidates = documents if candidates is None else candidates & documents
+            if not candidates:
+                break
+        return candidates
+
+    def snapshot(self) -> list[dict]:
+        """Chunks et fréquences de termes, pour persistance."""
+        return [
+            {**asdict(self.chunks[label]), "terms": dict(self._term_counts[label])}
+            for label in self.chunks
+        ]
+
+    @staticmethod
+    def write_snapshot(path: Path, snapshot: list[dict], key: tuple[str, str]) -> None:
+        """Écrit le sidecar (.json) d'un (cours, modèle) de manière atomique."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        metadata = {
+            "course_id": key[0],
+            "embedding_model": key[1],
+            "chunks": snapshot
+        }
+        with tempfile.NamedTemporaryFile(
+            "w", dir=path.parent, suffix=".json.tmp", delete=False, encoding="utf-8"
+        ) as tmp:
+            json.dump(metadata, tmp, ensure_ascii=False)
+        os.replace(tmp.name, f"{path}.json")
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["BM25Index"]:
+        """Relit un sidecar sans retokeniser les textes. Retourne None s'il est absent ou illisible."""
+        metadata_path = Path(f"{path}.json")
+        if not metadata_path.exists():
+            return None
+
+        try:
+            metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+            entries = metadata.get("chunks", [])
+            chunks = []
+            term_counts = []
+            for entry in entries:
+                term_counts.append(Counter(entry.pop("terms", {})))
+                chunks.append(IndexedChunk(**entry))
+        except Exception as e:
+            logger.warning(f"Sidecar BM25 illisible {path}: {e}")
+            return None
+
+        index = cls()
+        index._add_terms(chunks, term_counts)
+        index.key = (metadata.get("course_id", ""), metadata.get("embedding_model", ""))
+        return index
+
+
+class KeywordIndexRegistry(VectorIndexRegistry):
+    """
+    Registre des index BM25 par (course_id, embedding_model).
+
+    Reprend le cycle de vie des index vectoriels (chargement paresseux,
+    revérification périodique, sidecars différés) sans relire les vecteurs.
+    """
+
+    _row_fields = "document_id, course_id, chunk_index, chunk_text, word_count, char_start, char_end"
+
+    def __init__(
+        self,
+        refresh_interval: int = 300,
+        storage_dir: Optional[Path] = None,
+        save_delay: float = 5.0
+    ):
+        super().__init__(
+            backend="bm25",
+            refresh_interval=refresh_interval,
+            storage_dir=storage_dir,
+            save_delay=save_delay
+        )
+
+    def _resolve_backend(self, backend: str) -> type[VectorIndex]:
+        return BM25Index
+
+    def _build_index(self, rows: list[dict]) -> VectorIndex:
+        index = BM25Index()
+        index.add([self._row_chunk(row) for row in rows if row.get("chunk_text")])
+        return index
+
+
+def reciprocal_rank_fusion(
+    result_lists: list[list[dict]],
+    top_k: int,
+    k: int = 60
+) -> list[dict]:
+    """
+    Fusionne des listes de résultats classées (Reciprocal Rank Fusion).
+
+    Chaque chunk, identifié par (document_id, chunk_index), reçoit
+    la somme de 1 / (k + rang) sur les listes où il apparaît. Les champs
+    du premier résultat rencontré sont conservés, complétés par ceux des
+    listes suivantes.
+
+    Returns:
+        Les top_k résultats fusionnés, avec leur rrf_score
+    """
+    fused: dict[tuple, dict] = {}
+
+    for results in result_lists:
+        for rank, result in enumerate(results, 1):
+            key = (result.get("document_id"), result.get("chunk_index"))
+            entry = fused.get(key)
+            if entry is None:
+                entry = fused[key] = {**result, "rrf_score": 0.0}
+            else:
+                for field, value in result.items():
+                    entry.setdefault(field, value)
+            entry["rrf_score"] += 1.0 / (k + rank)
+
+    return sorted(fused.values(), key=lambda entry: entry["rrf_score"], reverse=True)[:top_k]
+
+
+# Singleton
+_keyword_index_registry: Optional[KeywordIndexRegistry] = None
+
+
+def get_keyword_index_registry() -> KeywordIndexRegistry:
+    """Obtient l'instance singleton du registre d'index BM25."""
+    global _keyword_index_registry
+    if _keyword_index_registry is None:
+        _keyword_index_registry = KeywordIndexRegistry(
+            refresh_interval=settings.vector_index_refresh_interval,
+            storage_dir=settings.upload_dir / "keyword_index"
+        )
+    return _keyword_index_registry
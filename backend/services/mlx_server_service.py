@@ -11,6 +11,8 @@ import subprocess
 import time
 from typing import Optional
 
+from services.http_clients import call_timeout, http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,10 +52,12 @@ class MLXServerService:
             True si le serveur répond, False sinon
         """
         try:
-            import httpx
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"http://{self.host}:{self.port}/v1/models")
-                return response.status_code == 200
+            base_url = f"http://{self.host}:{self.port}"
+            response = await http_client(base_url).get(
+                f"{base_url}/v1/models",
+                timeout=call_timeout("health")
+            )
+            return response.status_code == 200
         except Exception as e:
             logger.debug(f"Health check failed: {e}")
             return False
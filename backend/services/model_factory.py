@@ -32,15 +32,19 @@ Usage:
     agent = Agent(name="Test", model=model)
 """
 
+import hashlib
 import logging
 import os
-from typing import Any, Optional
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
 
 from config.models import (
     DEFAULT_CLAUDE_MODEL,
     DEFAULT_MLX_MODEL,
     DEFAULT_MLX_SERVER_URL,
     DEFAULT_OLLAMA_MODEL,
+    OLLAMA_ANSWER_TOKENS,
+    get_context_budget,
 )
 from config.settings import settings
 
@@ -135,6 +139,10 @@ def _create_ollama_model(model_id: str, **kwargs) -> Any:
     # Configuration par défaut
     host = kwargs.pop("host", None)  # None = utilise la valeur par défaut d'Ollama
 
+    # Fenêtre assez grande pour le budget du prompt et la réponse
+    options = dict(kwargs.pop("options", None) or {})
+    options.setdefault("num_ctx", get_context_budget(f"ollama:{model_id}") + OLLAMA_ANSWER_TOKENS)
+
     if host:
         logger.info(f"✅ Creating Ollama model: {model_id} (host={host})")
     else:
@@ -143,6 +151,7 @@ def _create_ollama_model(model_id: str, **kwargs) -> Any:
     return Ollama(
         id=model_id,
         host=host,
+        options=options,
         **kwargs
     )
 
@@ -373,6 +382,183 @@ def create_default_google_model(**kwargs) -> Any:
     return create_model(f"google:{DEFAULT_GOOGLE_MODEL}", **kwargs)
 
 
+# ========================================
+# Réutilisation des modèles et des agents
+# ========================================
+
+def _freeze(values: Dict[str, Any]) -> Optional[tuple]:
+    """Clé hashable de paramètres nommés, ou None s'ils ne sont pas hashables."""
+    key = tuple(sorted(values.items()))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _tool_key(tool: Any) -> str:
+    """Identifiant stable d'un outil (nom de l'outil Agno ou de la fonction)."""
+    name = getattr(tool, "name", None) or getattr(tool, "__qualname__", None)
+    return name if isinstance(name, str) else f"{type(tool).__name__}:{id(tool)}"
+
+
+class ModelRegistry:
+    """
+    Modèles et agents Agno réutilisés d'une requête à l'autre.
+
+    Un modèle Agno garde ses clients de fournisseur (et leurs pools de
+    connexions) d'un appel à l'autre: le registre conserve un modèle par
+    (model_string, paramètres) au lieu d'en recréer un à chaque requête.
+    Les agents sont conservés comme modèles de construction par (modèle,
+    nom, outils, empreinte des instructions, options). Chaque appel reçoit
+    une copie (Agent.deep_copy) qui partage le modèle du registre: un agent
+    Agno mémorise sa session au fil d'une exécution, une même instance ne
+    peut donc pas servir plusieurs requêtes concurrentes.
+
+    Les deux caches sont des LRU bornés. Des paramètres non hashables
+    contournent le cache (nouvelle instance à chaque appel).
+
+    Args:
+        max_models: Nombre maximum de modèles conservés
+        max_agents: Nombre maximum d'agents conservés
+    """
+
+    def __init__(self, max_models: int = 16, max_agents: int = 32):
+        self.max_models = max_models
+        self.max_agents = max_agents
+        self._models: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._agents: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._stats = {"model_hits": 0, "model_misses": 0, "agent_hits": 0, "agent_misses": 0}
+
+    @staticmethod
+    def _lookup(cache: OrderedDict, key: tuple) -> Optional[Any]:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    @staticmethod
+    def _store(cache: OrderedDict, key: tuple, value: Any, max_entries: int) -> None:
+        cache[key] = value
+        while len(cache) > max_entries:
+            cache.popitem(last=False)
+
+    def model(self, model_string: str, **kwargs) -> Any:
+        """Modèle partagé pour model_string et les paramètres donnés (voir create_model)."""
+        frozen = _freeze(kwargs)
+        if frozen is None:
+            return create_model(model_string, **kwargs)
+
+        key = (model_string.strip(), frozen)
+        model = self._lookup(self._models, key)
+        if model is not None:
+            self._stats["model_hits"] += 1
+            return model
+
+        self._stats["model_misses"] += 1
+        model = create_model(model_string, **kwargs)
+        self._store(self._models, key, model, self.max_models)
+        return model
+
+    def agent(
+        self,
+        model_string: str,
+        name: str,
+        instructions: str,
+        tools: Optional[Sequence[Any]] = None,
+        **agent_kwargs,
+    ) -> Any:
+        """
+        Copie d'un agent modèle construit sur le modèle partagé de model_string.
+
+        Args:
+            model_string: String de configuration du modèle
+            name: Nom de l'agent
+            instructions: Instructions (prompt système) de l'agent
+            tools: Outils de l'agent
+            **agent_kwargs: Autres paramètres de agno.agent.Agent (markdown, etc.)
+
+        Returns:
+            Nouvelle instance de agno.agent.Agent, propre à l'appelant
+        """
+        from agno.agent import Agent
+
+        tools = list(tools or [])
+        frozen = _freeze(agent_kwargs)
+        key = None
+        if frozen is not None:
+            key = (
+                model_string.strip(),
+                name,
+                tuple(_tool_key(tool) for tool in tools),
+                hashlib.sha256(instructions.encode("utf-8")).hexdigest(),
+                frozen,
+            )
+            template = self._lookup(self._agents, key)
+            if template is not None:
+                self._stats["agent_hits"] += 1
+                return template.deep_copy(update={"model": template.model})
+
+        self._stats["agent_misses"] += 1
+        template = Agent(
+            name=name,
+            model=self.model(model_string),
+            instructions=instructions,
+            tools=tools or None,
+            **agent_kwargs,
+        )
+        if key is None:
+            return template
+        self._store(self._agents, key, template, self.max_agents)
+        return template.deep_copy(update={"model": template.model})
+
+    def clear(self) -> None:
+        """Oublie les modèles et agents conservés."""
+        self._models.clear()
+        self._agents.clear()
+
+    def stats(self) -> dict:
+        """Taille des caches et taux de réutilisation."""
+        return {
+            **self._stats,
+            "models": len(self._models),
+            "agents": len(self._agents),
+            "max_models": self.max_models,
+            "max_agents": self.max_agents,
+        }
+
+
+# Singleton
+_model_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Obtient l'instance singleton du registre de modèles et d'agents."""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry(
+            max_models=settings.model_registry_size,
+            max_agents=settings.agent_registry_size,
+        )
+    return _model_registry
+
+
+def get_model(model_string: str, **kwargs) -> Any:
+    """Comme create_model, mais réutilise le modèle déjà créé pour les mêmes paramètres."""
+    return get_model_registry().model(model_string, **kwargs)
+
+
+def get_agent(
+    model_string: str,
+    name: str,
+    instructions: str,
+    tools: Optional[Sequence[Any]] = None,
+    **agent_kwargs,
+) -> Any:
+    """Copie de l'agent modèle conservé pour le même modèle, les mêmes outils et les mêmes instructions."""
+    return get_model_registry().agent(model_string, name, instructions, tools, **agent_kwargs)
+
+
 # ========================================
 # Validation et tests
 # ========================================
@@ -12,6 +12,7 @@ from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any, Tuple
 
 from services.surreal_service import get_surreal_service
+from services.course_context_cache import bump_course_version
 from models.module_models import (
     ModuleCreate,
     ModuleUpdate,
@@ -86,6 +87,7 @@ class ModuleService:
             raise RuntimeError("Error creating module")
 
         created = result[0]
+        bump_course_version(course_record_id)
         logger.info(f"Module created: {module_id} for course {course_id}")
 
         return self._format_module_response(created)
@@ -202,6 +204,7 @@ class ModuleService:
         params = {"record_id": record_id, **update_fields}
 
         await self.db.query(query, params)
+        bump_course_version(existing.course_id)
 
         logger.info(f"Module updated: {module_id}")
         return await self.get_module(module_id)
@@ -241,6 +244,7 @@ class ModuleService:
             "DELETE module WHERE id = type::thing('module', $record_id)",
             {"record_id": record_id}
         )
+        bump_course_version(existing.course_id)
 
         logger.info(f"Module deleted: {module_id}")
         return True
@@ -288,6 +292,7 @@ class ModuleService:
             if result:
                 assigned_count += 1
 
+        bump_course_version(existing.course_id)
         logger.info(f"Assigned {assigned_count} documents to module {module_id}")
         return assigned_count
 
@@ -322,6 +327,8 @@ class ModuleService:
             if result:
                 unassigned_count += 1
 
+        module = await self.get_module(module_id)
+        bump_course_version(module.course_id if module else None)
         logger.info(f"Unassigned {unassigned_count} documents from module {module_id}")
         return unassigned_count
 
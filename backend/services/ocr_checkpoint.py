@@ -0,0 +1,114 @@
+"""
+Page-level checkpoints for OCR jobs.
+
+Each OCR job gets a persistent directory under upload_dir/ocr_jobs, keyed by
+the content hash of its input and the options that change the output. Every
+page that was recognized without error is written there as a JSON file, so a
+job that dies at page 280 of 300 resumes at page 281 when it is restarted with
+the same input. Images extracted from the pages live next to the checkpoints.
+
+The job directory is removed once the job completes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from config.settings import settings
+from models.ocr_models import OCRPageResult
+from utils.file_utils import calculate_file_hash
+
+logger = logging.getLogger(__name__)
+
+# Jobs left unfinished for longer than this are abandoned and purged
+CHECKPOINT_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+
+class OCRCheckpoint:
+    """Checkpoints of one OCR job."""
+
+    def __init__(self, job_dir: Path):
+        self.job_dir = job_dir
+        self.pages_dir = job_dir / "checkpoints"
+        self.output_dir = job_dir / "output"
+
+    def _page_path(self, page_num: int) -> Path:
+        return self.pages_dir / f"page_{page_num:05d}.json"
+
+    def load(self) -> Dict[int, OCRPageResult]:
+        """Pages already recognized, by page number. Unreadable checkpoints are ignored."""
+        results: Dict[int, OCRPageResult] = {}
+        if not self.pages_dir.exists():
+            return results
+
+        for path in self.pages_dir.glob("page_*.json"):
+            try:
+                result = OCRPageResult.model_validate_json(path.read_text(encoding="utf-8"))
+                results[result.page_num] = result
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable OCR checkpoint {path}: {e}")
+        return results
+
+    def save(self, result: OCRPageResult) -> None:
+        """Persist the result of a page (written atomically)."""
+        self.pages_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.pages_dir, suffix=".json.tmp", delete=False, encoding="utf-8"
+        ) as tmp:
+            tmp.write(result.model_dump_json())
+        os.replace(tmp.name, self._page_path(result.page_num))
+        self.touch()
+
+    def touch(self) -> None:
+        """Mark the job as active (stale jobs are purged by age)."""
+        self.job_dir.mkdir(parents=True, exist_ok=True)
+        os.utime(self.job_dir)
+
+    def clear(self) -> None:
+        """Remove the job directory (job completed)."""
+        shutil.rmtree(self.job_dir, ignore_errors=True)
+
+
+def ocr_job_key(source: Path, **options) -> str:
+    """Key of an OCR job: hash of the input file and of the options affecting the output."""
+    digest = hashlib.sha256(calculate_file_hash(source).encode())
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:32]
+
+
+def open_ocr_checkpoint(source: Path, **options) -> OCRCheckpoint:
+    """Checkpoints of the OCR job for this input and these options (created if needed)."""
+    checkpoint = OCRCheckpoint(ocr_jobs_dir() / ocr_job_key(source, **options))
+    checkpoint.touch()
+    return checkpoint
+
+
+def ocr_jobs_dir() -> Path:
+    """Root directory of the OCR job checkpoints."""
+    return Path(settings.upload_dir) / "ocr_jobs"
+
+
+def purge_stale_checkpoints(
+    root: Optional[Path] = None, max_age_seconds: int = CHECKPOINT_MAX_AGE_SECONDS
+) -> int:
+    """Remove the jobs that were not touched for max_age_seconds. Returns the number removed."""
+    root = root or ocr_jobs_dir()
+    if not root.exists():
+        return 0
+
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for job_dir in root.iterdir():
+        try:
+            if job_dir.is_dir() and job_dir.stat().st_mtime < cutoff:
+                shutil.rmtree(job_dir)
+                removed += 1
+        except OSError as e:
+            logger.warning(f"Could not purge OCR checkpoint {job_dir}: {e}")
+    return removed
@@ -10,16 +10,22 @@ Adapted from ocr_livre_images_light.py and ocr_livre_mlx.py reference scripts.
 """
 
 import asyncio
+import io
 import logging
+import multiprocessing
 import os
 import platform
 import re
 import shutil
 import tempfile
+import threading
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import AsyncGenerator, List, Optional, Tuple
+from typing import AsyncGenerator, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 from PIL import Image
@@ -30,6 +36,8 @@ Image.MAX_IMAGE_PIXELS = 500_000_000
 
 from config.settings import settings
 from models.ocr_models import OCREngine, OCRJobStatus, OCRPageResult, OCRProgressEvent
+from services.extraction_cache import get_extraction_cache, package_version
+from services.ocr_checkpoint import OCRCheckpoint, open_ocr_checkpoint, purge_stale_checkpoints
 
 logger = logging.getLogger(__name__)
 
@@ -55,12 +63,82 @@ class OCRConfig:
     MIN_IMAGE_SIZE = 100
     IMAGE_VARIANCE_THRESHOLD = 500
     PDF_DPI = 200  # Resolution for PDF to image conversion
+    RENDER_LOOKAHEAD = 2  # Pages rendered in memory ahead of the page being recognized
 
     # Image resizing for large scans (prevents memory issues and speeds up OCR)
     MAX_IMAGE_DIMENSION = 4000  # Max width or height in pixels
     RESIZE_QUALITY = Image.Resampling.LANCZOS  # High quality downsampling
 
 
+@dataclass(frozen=True)
+class PageSource:
+    """A page to OCR: an image file, or one page of a PDF rendered on demand."""
+
+    path: Path
+    pdf_page: Optional[int] = None  # 0-based page index for PDFs
+
+    @property
+    def sort_name(self) -> str:
+        """Name used to order pages (PDF pages sort like their former JPG renders)."""
+        if self.pdf_page is None:
+            return self.path.stem
+        return f"{self.path.stem}_page_{self.pdf_page + 1:03d}"
+
+
+class PageRasterizer:
+    """
+    Renders pages to in-memory RGB images.
+
+    PDF pages are rasterized straight into a PIL image from the pixmap
+    samples, without encoding them to a file. The current PDF stays open
+    between consecutive pages of the same document.
+    """
+
+    def __init__(self):
+        self._doc = None
+        self._doc_path: Optional[Path] = None
+        # A PDF document must not be used by two threads at once
+        self._lock = threading.Lock()
+
+    def render(self, source: PageSource) -> Image.Image:
+        """Render a page."""
+        with self._lock:
+            if source.pdf_page is None:
+                with Image.open(source.path) as img:
+                    return img.convert("RGB")
+
+            import fitz  # PyMuPDF
+
+            if self._doc_path != source.path:
+                self._close_doc()
+                self._doc = fitz.open(source.path)
+                self._doc_path = source.path
+
+            # Render page at specified DPI
+            mat = fitz.Matrix(OCRConfig.PDF_DPI / 72, OCRConfig.PDF_DPI / 72)
+            pix = self._doc[source.pdf_page].get_pixmap(matrix=mat, alpha=False)
+            return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+    def close(self) -> None:
+        """Close the open PDF, if any."""
+        with self._lock:
+            self._close_doc()
+
+    def _close_doc(self) -> None:
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+            self._doc_path = None
+
+
+def _encode_png(image: Image.Image) -> io.BytesIO:
+    """Encode an image to an in-memory PNG, for engines that only read files."""
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=1)
+    buffer.seek(0)
+    return buffer
+
+
 class OCRService:
     """Service for OCR processing of scanned books."""
 
@@ -83,25 +161,25 @@ class OCRService:
         # Current engine
         self._current_engine: Optional[OCREngine] = None
 
+        # In-process inference runs one page at a time (pages are rendered ahead)
+        self._inference_lock = asyncio.Lock()
+
     def _is_apple_silicon(self) -> bool:
         """Check if running on Apple Silicon."""
         return platform.system() == "Darwin" and platform.machine() == "arm64"
 
-    def _resize_image_if_needed(self, image_path: Path) -> Path:
+    def _resize_image_if_needed(self, image: Image.Image) -> Image.Image:
         """
         Resize image if it exceeds MAX_IMAGE_DIMENSION.
 
-        Returns the path to the resized image (or original if no resize needed).
-        Creates a temporary file for resized images.
+        Returns the resized image (or the original if no resize needed).
         """
-        img = Image.open(image_path)
-        width, height = img.size
+        width, height = image.size
         max_dim = OCRConfig.MAX_IMAGE_DIMENSION
 
         # Check if resize is needed
         if width <= max_dim and height <= max_dim:
-            img.close()
-            return image_path
+            return image
 
         # Calculate new dimensions maintaining aspect ratio
         if width > height:
@@ -117,15 +195,7 @@ class OCRService:
         )
 
         # Resize with high quality
-        img_resized = img.resize((new_width, new_height), OCRConfig.RESIZE_QUALITY)
-        img.close()
-
-        # Save to temp file
-        temp_path = image_path.parent / f"_resized_{image_path.name}"
-        img_resized.save(temp_path, quality=OCRConfig.IMAGE_QUALITY)
-        img_resized.close()
-
-        return temp_path
+        return image.resize((new_width, new_height), OCRConfig.RESIZE_QUALITY)
 
     def _get_device(self) -> str:
         """Detect the best available device for PyTorch."""
@@ -243,7 +313,7 @@ class OCRService:
         logger.info("MLX dots.ocr model loaded successfully")
 
     def _detect_image_regions(
-        self, image_path: Path, min_size: int = 100
+        self, image: Image.Image, min_size: int = 100
     ) -> List[Tuple[int, int, int, int]]:
         """
         Detect image regions in a page.
@@ -251,18 +321,17 @@ class OCRService:
         Uses PIL-based heuristic detection (lighter than OpenCV).
         """
         # Use simple PIL-based detection (more reliable, less memory)
-        return self._detect_image_regions_simple(image_path, min_size)
+        return self._detect_image_regions_simple(image, min_size)
 
     def _detect_image_regions_simple(
-        self, image_path: Path, min_size: int = 100
+        self, image: Image.Image, min_size: int = 100
     ) -> List[Tuple[int, int, int, int]]:
         """
         Simple image region detection without OpenCV.
 
         Divides the image into a grid and analyzes variance.
         """
-        img = Image.open(image_path).convert("L")
-        img_array = np.array(img)
+        img_array = np.array(image.convert("L"))
 
         height, width = img_array.shape
         regions = []
@@ -320,7 +389,7 @@ class OCRService:
 
     def _extract_images_from_page(
         self,
-        image_path: Path,
+        image: Image.Image,
         regions: List[Tuple],
         output_dir: Path,
         page_num: int,
@@ -329,7 +398,7 @@ class OCRService:
         if not regions:
             return []
 
-        source_image = Image.open(image_path).convert("RGB")
+        source_image = image.convert("RGB")
         images_dir = output_dir / "images"
         images_dir.mkdir(exist_ok=True)
 
@@ -345,21 +414,19 @@ class OCRService:
         return extracted
 
     async def _ocr_page(
-        self, image_path: Path, engine: OCREngine = OCREngine.DOCLING
+        self, image: Image.Image, engine: OCREngine = OCREngine.DOCLING
     ) -> str:
         """Perform OCR on a single page using the specified engine."""
         if engine == OCREngine.DOCLING:
-            return await self._ocr_page_docling(image_path)
+            return await self._ocr_page_docling(image)
         elif engine == OCREngine.MLX_DOTS_OCR:
-            return await self._ocr_page_mlx(image_path)
-        return await self._ocr_page_paddle(image_path)
+            return await self._ocr_page_mlx(image)
+        return await self._ocr_page_paddle(image)
 
-    async def _ocr_page_paddle(self, image_path: Path) -> str:
+    async def _ocr_page_paddle(self, image: Image.Image) -> str:
         """Perform OCR using PaddleOCR-VL."""
         import torch
 
-        image = Image.open(image_path).convert("RGB")
-
         messages = [{"role": "user", "content": "OCR"}]
         text = self._paddle_processor.apply_chat_template(
             messages, tokenize=False, add_generation_prompt=True
@@ -383,13 +450,13 @@ class OCRService:
 
         return response.strip()
 
-    async def _ocr_page_mlx(self, image_path: Path) -> str:
+    async def _ocr_page_mlx(self, image: Image.Image) -> str:
         """Perform OCR using MLX dots.ocr."""
         from mlx_vlm import generate
         from mlx_vlm.utils import load_image
 
-        # Load image using mlx_vlm utility
-        image = await asyncio.to_thread(load_image, str(image_path))
+        # Load image using mlx_vlm utility (from an in-memory PNG)
+        image = await asyncio.to_thread(load_image, _encode_png(image))
 
         # Generate text using MLX
         output = await asyncio.to_thread(
@@ -405,45 +472,41 @@ class OCRService:
 
         return output.strip()
 
-    async def _ocr_page_docling(self, image_path: Path) -> str:
+    async def _ocr_page_docling(self, image: Image.Image) -> str:
         """Perform OCR using Docling VLM pipeline."""
+        from docling.datamodel.base_models import DocumentStream
         from docling_core.types.doc import ImageRefMode
 
-        # Resize image if too large (prevents memory issues)
-        resized_path = self._resize_image_if_needed(image_path)
-        use_resized = resized_path != image_path
-
         def _convert_image():
+            # Resize image if too large (prevents memory issues)
+            resized = self._resize_image_if_needed(image)
+            # Docling reads documents, not pixels: hand it a lossless in-memory PNG
+            source = DocumentStream(name="page.png", stream=_encode_png(resized))
             # Convert single image using Docling
-            result = self._docling_converter.convert(str(resized_path))
+            result = self._docling_converter.convert(source)
             # Export to markdown
             return result.document.export_to_markdown(image_mode=ImageRefMode.EMBEDDED)
 
-        try:
-            markdown = await asyncio.to_thread(_convert_image)
-            return markdown.strip()
-        finally:
-            # Cleanup resized temp file
-            if use_resized and resized_path.exists():
-                try:
-                    resized_path.unlink()
-                except Exception:
-                    pass
+        markdown = await asyncio.to_thread(_convert_image)
+        return markdown.strip()
 
     async def process_page(
         self,
-        image_path: Path,
+        image: Union[Image.Image, Path],
         output_dir: Path,
         page_num: int,
         extract_images: bool = True,
         engine: OCREngine = OCREngine.DOCLING,
     ) -> OCRPageResult:
-        """Process a single page: OCR + optional image extraction."""
+        """Process a single page (in-memory image or image file): OCR + optional image extraction."""
         result = OCRPageResult(page_num=page_num, text="", images=[])
 
+        if isinstance(image, Path):
+            image = await asyncio.to_thread(PageRasterizer().render, PageSource(image))
+
         # OCR
         try:
-            result.text = await self._ocr_page(image_path, engine)
+            result.text = await self._ocr_page(image, engine)
         except Exception as e:
             logger.error(f"OCR error on page {page_num}: {e}")
             result.error = str(e)
@@ -452,10 +515,10 @@ class OCRService:
         # Image extraction (only for PaddleOCR-VL engine - Docling handles images internally)
         if extract_images and engine == OCREngine.PADDLEOCR_VL:
             try:
-                regions = self._detect_image_regions(image_path)
+                regions = self._detect_image_regions(image)
                 if regions:
                     result.images = self._extract_images_from_page(
-                        image_path, regions, output_dir, page_num
+                        image, regions, output_dir, page_num
                     )
             except Exception as e:
                 logger.warning(f"Image extraction error on page {page_num}: {e}")
@@ -497,21 +560,29 @@ Retourne UNIQUEMENT le texte corrige, sans commentaires."""
         response = await asyncio.to_thread(agent.run, prompt)
         return response.content if response else markdown_content
 
-    def _convert_pdfs_to_images(self, input_dir: Path) -> int:
-        """
-        Convert all PDF files in directory to images.
-
-        Each page of each PDF is saved as a separate JPG file.
-        Returns the number of images created.
-        """
+    def _pdf_page_count(self, pdf_path: Path) -> int:
+        """Number of pages of a PDF (0 if PyMuPDF is missing or the file is unreadable)."""
         try:
             import fitz  # PyMuPDF
         except ImportError:
             logger.warning("PyMuPDF not installed, skipping PDF conversion")
             return 0
 
-        images_created = 0
+        try:
+            with fitz.open(pdf_path) as doc:
+                return doc.page_count
+        except Exception as e:
+            logger.error(f"Error opening PDF {pdf_path}: {e}")
+            return 0
 
+    def _collect_page_sources(self, input_dir: Path) -> List[PageSource]:
+        """
+        Collect and sort the pages to OCR from directory (including nested).
+
+        Images are used as-is; each page of a PDF becomes a source that is
+        rendered only when it is processed.
+        """
+        sources: List[PageSource] = []
         for root, _dirs, files in os.walk(input_dir):
             # Skip __MACOSX directories
             if "__MACOSX" in root:
@@ -523,62 +594,180 @@ Retourne UNIQUEMENT le texte corrige, sans commentaires."""
                 if f.startswith("._"):
                     continue
 
-                if Path(f).suffix.lower() in OCRConfig.PDF_EXTENSIONS:
+                suffix = Path(f).suffix.lower()
+                if suffix in OCRConfig.IMAGE_EXTENSIONS:
+                    sources.append(PageSource(root_path / f))
+                elif suffix in OCRConfig.PDF_EXTENSIONS:
                     pdf_path = root_path / f
-                    try:
-                        doc = fitz.open(pdf_path)
-                        pdf_stem = pdf_path.stem
-                        num_pages = len(doc)
+                    num_pages = self._pdf_page_count(pdf_path)
+                    sources.extend(PageSource(pdf_path, i) for i in range(num_pages))
+                    if num_pages:
+                        logger.info(f"Found {pdf_path.name}: {num_pages} pages")
 
-                        for page_num in range(num_pages):
-                            page = doc[page_num]
-                            # Render page to image at specified DPI
-                            mat = fitz.Matrix(
-                                OCRConfig.PDF_DPI / 72, OCRConfig.PDF_DPI / 72
-                            )
-                            pix = page.get_pixmap(matrix=mat)
+        def natural_sort_key(source: PageSource):
+            parts = re.split(r"(\d+)", source.sort_name)
+            return [int(p) if p.isdigit() else p.lower() for p in parts]
 
-                            # Save as JPG
-                            img_filename = f"{pdf_stem}_page_{page_num + 1:03d}.jpg"
-                            img_path = root_path / img_filename
-                            pix.save(str(img_path))
-                            images_created += 1
+        sources.sort(key=natural_sort_key)
+        return sources
 
-                        doc.close()
-                        logger.info(f"Converted {pdf_path.name}: {num_pages} pages")
+    async def _rasterize(
+        self, pages: List[Tuple[int, PageSource]]
+    ) -> AsyncIterator[Tuple[int, Union[Image.Image, Exception]]]:
+        """
+        Stream pages as in-memory images, in page order.
 
-                        # Remove original PDF after conversion
-                        pdf_path.unlink()
+        A background task renders at most OCRConfig.RENDER_LOOKAHEAD pages
+        ahead of the consumer, so memory use does not grow with the page
+        count and nothing is written to disk. A page that fails to render is
+        yielded with its exception.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=OCRConfig.RENDER_LOOKAHEAD)
+        rasterizer = PageRasterizer()
 
-                    except Exception as e:
-                        logger.error(f"Error converting PDF {pdf_path}: {e}")
+        async def produce():
+            for page_num, source in pages:
+                try:
+                    image = await asyncio.to_thread(rasterizer.render, source)
+                except Exception as e:
+                    image = e
+                await queue.put((page_num, image))
 
-        return images_created
+        producer = asyncio.create_task(produce())
+        try:
+            for _ in pages:
+                yield await queue.get()
+        finally:
+            producer.cancel()
+            await asyncio.to_thread(rasterizer.close)
 
-    def _collect_images_from_dir(self, input_dir: Path) -> List[Path]:
+    def _page_pool_workers(self, engine: OCREngine) -> int:
         """
-        Collect and sort image files from directory (including nested).
+        Number of OCR worker processes for an engine, or 0 to OCR in-process.
 
-        Also converts any PDF files to images first.
+        Worker processes only pay off on CPU: on a GPU (CUDA, MPS) or with MLX,
+        a single model in the server process is faster than several copies.
         """
-        # First, convert any PDFs to images
-        pdf_images = self._convert_pdfs_to_images(input_dir)
-        if pdf_images > 0:
-            logger.info(f"Converted PDFs to {pdf_images} images")
+        workers = settings.ocr_page_workers
+        if workers <= 1 or engine == OCREngine.MLX_DOTS_OCR or self._is_apple_silicon():
+            return 0
 
-        # Then collect all images
-        images = []
-        for root, _dirs, files in os.walk(input_dir):
-            for f in files:
-                if Path(f).suffix.lower() in OCRConfig.IMAGE_EXTENSIONS:
-                    images.append(Path(root) / f)
+        try:
+            import torch
 
-        def natural_sort_key(path: Path):
-            parts = re.split(r"(\d+)", path.stem)
-            return [int(p) if p.isdigit() else p.lower() for p in parts]
+            if torch.cuda.is_available():
+                return 0
+        except ImportError:
+            pass
+        return workers
 
-        images.sort(key=natural_sort_key)
-        return images
+    async def _process_page_in_pool(
+        self,
+        source: PageSource,
+        output_dir: Path,
+        page_num: int,
+        extract_images: bool,
+        engine: OCREngine,
+    ) -> OCRPageResult:
+        """Render and process a page in an OCR worker process."""
+        loop = asyncio.get_running_loop()
+        try:
+            data = await loop.run_in_executor(
+                get_ocr_page_pool(engine, self._page_pool_workers(engine)),
+                _ocr_page_in_worker,
+                str(source.path),
+                source.pdf_page,
+                str(output_dir),
+                page_num,
+                extract_images,
+                engine.value,
+            )
+            return OCRPageResult(**data)
+        except BrokenProcessPool as e:
+            # A worker died (out of memory, model failed to load): start fresh next time
+            shutdown_ocr_page_pool()
+            logger.error(f"OCR worker pool failed on page {page_num}: {e}")
+            return OCRPageResult(
+                page_num=page_num, text=f"*[OCR Error: {e}]*", error=str(e)
+            )
+
+    async def _ocr_pages_in_pool(
+        self,
+        pages: List[Tuple[int, PageSource]],
+        output_dir: Path,
+        extract_images: bool,
+        engine: OCREngine,
+    ) -> AsyncIterator[OCRPageResult]:
+        """OCR pages in worker processes, each rendering its own pages."""
+        slots = asyncio.Semaphore(self._page_pool_workers(engine))
+
+        async def process(page_num: int, source: PageSource) -> OCRPageResult:
+            async with slots:
+                return await self._process_page_in_pool(
+                    source, output_dir, page_num, extract_images, engine
+                )
+
+        tasks = [
+            asyncio.create_task(process(page_num, source)) for page_num, source in pages
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _ocr_pages_in_process(
+        self,
+        pages: List[Tuple[int, PageSource]],
+        output_dir: Path,
+        extract_images: bool,
+        engine: OCREngine,
+    ) -> AsyncIterator[OCRPageResult]:
+        """OCR pages with the in-process model while the next pages are rendered."""
+        await self.load_model(engine)
+
+        async for page_num, image in self._rasterize(pages):
+            if isinstance(image, Exception):
+                logger.error(f"Rendering error on page {page_num}: {image}")
+                yield OCRPageResult(
+                    page_num=page_num, text=f"*[OCR Error: {image}]*", error=str(image)
+                )
+                continue
+
+            async with self._inference_lock:
+                result = await self.process_page(
+                    image, output_dir, page_num, extract_images, engine
+                )
+            yield result
+
+    async def _ocr_pages(
+        self,
+        pages: List[Tuple[int, PageSource]],
+        output_dir: Path,
+        extract_images: bool,
+        engine: OCREngine,
+        checkpoint: OCRCheckpoint,
+    ) -> AsyncIterator[OCRPageResult]:
+        """
+        OCR pages and yield each result as soon as it is ready.
+
+        On CPU, up to settings.ocr_page_workers pages are rendered and
+        recognized at once in worker processes, and results come in
+        completion order. Otherwise the in-process model recognizes one page
+        at a time while the next pages are rendered in memory. Pages
+        recognized without error are checkpointed, so a restarted job skips
+        them.
+        """
+        if self._page_pool_workers(engine) > 0:
+            results = self._ocr_pages_in_pool(pages, output_dir, extract_images, engine)
+        else:
+            results = self._ocr_pages_in_process(pages, output_dir, extract_images, engine)
+
+        async for result in results:
+            if result.error is None:
+                await asyncio.to_thread(checkpoint.save, result)
+            yield result
 
     def _generate_markdown(
         self,
@@ -648,6 +837,10 @@ Retourne UNIQUEMENT le texte corrige, sans commentaires."""
         """
         Process a ZIP file containing scanned pages.
 
+        Pages are recognized concurrently (see _ocr_pages) and checkpointed:
+        processing the same ZIP again with the same options resumes after
+        the pages already recognized.
+
         Args:
             zip_path: Path to the ZIP file
             title: Optional book title
@@ -661,13 +854,23 @@ Retourne UNIQUEMENT le texte corrige, sans commentaires."""
         """
         work_dir = Path(tempfile.mkdtemp(prefix="ocr_"))
         extract_dir = work_dir / "pages"
-        output_dir = work_dir / "output"
 
         # For Docling and MLX engines, disable image extraction (handled internally or not supported)
         if engine in (OCREngine.DOCLING, OCREngine.MLX_DOTS_OCR):
             extract_images = False
 
         try:
+            await asyncio.to_thread(purge_stale_checkpoints)
+            checkpoint = await asyncio.to_thread(
+                open_ocr_checkpoint,
+                zip_path,
+                engine=engine.value,
+                start_page=start_page,
+                extract_images=extract_images,
+            )
+            # Extracted images are kept with the checkpoints they belong to
+            output_dir = checkpoint.output_dir
+
             # Step 1: Extract ZIP
             yield OCRProgressEvent(
                 status=OCRJobStatus.EXTRACTING_ZIP,
@@ -678,15 +881,15 @@ Retourne UNIQUEMENT le texte corrige, sans commentaires."""
             with zipfile.ZipFile(zip_path, "r") as zf:
                 zf.extractall(extract_dir)
 
-            # Collect images (also converts any PDFs to images)
+            # Collect pages (PDF pages are rendered when they are processed)
             yield OCRProgressEvent(
                 status=OCRJobStatus.EXTRACTING_ZIP,
                 message="Conversion des PDF en images...",
                 percentage=8,
             )
-            images = self._collect_images_from_dir(extract_dir)
+            sources = await asyncio.to_thread(self._collect_page_sources, extract_dir)
 
-            if not images:
+            if not sources:
                 yield OCRProgressEvent(
                     status=OCRJobStatus.ERROR,
                     message="Aucune image trouvee dans le ZIP",
@@ -694,9 +897,22 @@ Retourne UNIQUEMENT le texte corrige, sans commentaires."""
                 )
                 return
 
-            total_pages = len(images)
+            total_pages = len(sources)
             output_dir.mkdir(parents=True, exist_ok=True)
 
+            # Resume from the pages checkpointed by a previous run
+            page_numbers = range(start_page, start_page + total_pages)
+            saved = await asyncio.to_thread(checkpoint.load)
+            pages_results: Dict[int, OCRPageResult] = {
+                page_num: saved[page_num] for page_num in page_numbers if page_num in saved
+            }
+            pending = [
+                (page_num, source)
+                for page_num, source in zip(page_numbers, sources)
+                if page_num not in pages_results
+            ]
+            total_images_extracted = sum(len(r.images) for r in pages_results.values())
+
             # Step 2: Load model
             engine_names = {
                 OCREngine.DOCLING: "Docling VLM",
@@ -706,35 +922,35 @@ Retourne UNIQUEMENT le texte corrige, sans commentaires."""
             engine_name = engine_names.get(engine, str(engine))
             yield OCRProgressEvent(
                 status=OCRJobStatus.LOADING_MODEL,
+                current_page=len(pages_results),
                 total_pages=total_pages,
+                images_extracted=total_images_extracted,
                 message=f"Chargement du modele {engine_name}...",
                 percentage=10,
             )
 
-            await self.load_model(engine)
+            if pages_results:
+                logger.info(
+                    f"Resuming OCR job: {len(pages_results)}/{total_pages} pages already done"
+                )
 
             # Step 3: Process pages
-            pages_results: List[OCRPageResult] = []
-            total_images_extracted = 0
-
-            for i, img_path in enumerate(images):
-                page_num = start_page + i
+            async for result in self._ocr_pages(
+                pending, output_dir, extract_images, engine, checkpoint
+            ):
+                pages_results[result.page_num] = result
+                total_images_extracted += len(result.images)
+                done = len(pages_results)
 
                 yield OCRProgressEvent(
                     status=OCRJobStatus.PROCESSING_PAGES,
-                    current_page=i + 1,
+                    current_page=done,
                     total_pages=total_pages,
                     images_extracted=total_images_extracted,
-                    message=f"OCR page {page_num}...",
-                    percentage=10 + int((i / total_pages) * 70),
+                    message=f"OCR page {result.page_num}...",
+                    percentage=10 + int((done / total_pages) * 70),
                 )
 
-                result = await self.process_page(
-                    img_path, output_dir, page_num, extract_images, engine
-                )
-                pages_results.append(result)
-                total_images_extracted += len(result.images)
-
             # Step 4: Generate Markdown
             yield OCRProgressEvent(
                 status=OCRJobStatus.GENERATING_OUTPUT,
@@ -746,7 +962,10 @@ Retourne UNIQUEMENT le texte corrige, sans commentaires."""
             )
 
             markdown_content = self._generate_markdown(
-                pages_results, title, start_page, engine
+                [pages_results[page_num] for page_num in page_numbers],
+                title,
+                start_page,
+                engine,
             )
 
             # Step 5: LLM post-processing (optional)
@@ -795,6 +1014,9 @@ Retourne UNIQUEMENT le texte corrige, sans commentaires."""
                 final_path = results_dir / final_filename
                 final_path.write_text(markdown_content, encoding="utf-8")
 
+            # Job done: its checkpoints are no longer needed
+            await asyncio.to_thread(checkpoint.clear)
+
             yield OCRProgressEvent(
                 status=OCRJobStatus.COMPLETED,
                 current_page=total_pages,
@@ -828,7 +1050,9 @@ Retourne UNIQUEMENT le texte corrige, sans commentaires."""
         """
         Process a single PDF file and return markdown content.
 
-        Simplified method for automatic OCR during document upload.
+        Simplified method for automatic OCR during document upload. Pages are
+        recognized concurrently and checkpointed like in process_zip. The
+        result is kept in the extraction cache, keyed by the PDF content.
 
         Args:
             pdf_path: Path to the PDF file
@@ -839,59 +1063,65 @@ Retourne UNIQUEMENT le texte corrige, sans commentaires."""
             If successful: (markdown, None)
             If error: ("", error_message)
         """
+        cache = get_extraction_cache()
+        cache_key = await cache.key_for(
+            pdf_path,
+            "ocr",
+            engine=engine.value,
+            version=package_version("docling", "transformers", "mlx-vlm", "pymupdf"),
+            options={"dpi": OCRConfig.PDF_DPI},
+        )
+        cached = await cache.load(cache_key)
+        if cached is not None:
+            logger.info(f"OCR result for {pdf_path.name} served from the extraction cache")
+            return cached.text, None
+
         work_dir = Path(tempfile.mkdtemp(prefix="ocr_pdf_"))
 
         try:
-            # Convert PDF to images
-            logger.info(f"Converting PDF to images: {pdf_path.name}")
-            pdf_images_dir = work_dir / "images"
-            pdf_images_dir.mkdir(parents=True, exist_ok=True)
-
-            # Copy PDF to work directory for processing
-            import shutil as shutil_local
-
-            temp_pdf = pdf_images_dir / pdf_path.name
-            shutil_local.copy2(pdf_path, temp_pdf)
-
-            # Convert PDF to images (this removes the PDF after conversion)
-            num_images = self._convert_pdfs_to_images(pdf_images_dir)
-            if num_images == 0:
+            num_pages = await asyncio.to_thread(self._pdf_page_count, pdf_path)
+            if num_pages == 0:
                 return "", "Aucune page trouvée dans le PDF"
 
-            # Collect converted images
-            images = self._collect_images_from_dir(pdf_images_dir)
-            if not images:
-                return "", "Échec de la conversion PDF en images"
-
-            logger.info(f"Processing {len(images)} pages with OCR...")
-
-            # Load model if needed
-            await self.load_model(engine)
+            checkpoint = await asyncio.to_thread(
+                open_ocr_checkpoint, pdf_path, engine=engine.value
+            )
+            pages_results = await asyncio.to_thread(checkpoint.load)
+            pending = [
+                (i + 1, PageSource(pdf_path, i))
+                for i in range(num_pages)
+                if i + 1 not in pages_results
+            ]
+
+            logger.info(
+                f"Processing {len(pending)}/{num_pages} pages of {pdf_path.name} with OCR..."
+            )
 
-            # Process each page
-            pages_results: List[OCRPageResult] = []
-            for i, img_path in enumerate(images):
-                page_num = i + 1
-                logger.info(f"OCR page {page_num}/{len(images)}...")
-
-                result = await self.process_page(
-                    img_path,
-                    work_dir,
-                    page_num,
-                    extract_images=False,  # Don't extract images for automatic OCR
-                    engine=engine,
-                )
-                pages_results.append(result)
+            async for result in self._ocr_pages(
+                pending,
+                work_dir,
+                False,  # Don't extract images for automatic OCR
+                engine,
+                checkpoint,
+            ):
+                pages_results[result.page_num] = result
+                logger.info(f"OCR page {result.page_num} ({len(pages_results)}/{num_pages})")
 
             # Generate markdown (without title, simpler format)
             markdown_content = self._generate_markdown(
-                pages_results,
+                [pages_results[page_num] for page_num in range(1, num_pages + 1)],
                 title=None,
                 start_page=1,
                 engine=engine,
             )
 
-            logger.info(f"OCR completed: {len(pages_results)} pages processed")
+            await asyncio.to_thread(checkpoint.clear)
+            # Pages in error are not cached: they are retried on the next run
+            if not any(result.error for result in pages_results.values()):
+                await cache.store(
+                    cache_key, markdown_content, {"num_pages": num_pages}, f"ocr-{engine.value}"
+                )
+            logger.info(f"OCR completed: {num_pages} pages processed")
             return markdown_content, None
 
         except Exception as e:
@@ -906,6 +1136,72 @@ Retourne UNIQUEMENT le texte corrige, sans commentaires."""
                 logger.warning(f"Failed to cleanup work dir: {e}")
 
 
+# OCR worker processes (CPU only): each one loads its own model once
+_ocr_page_pool: Optional[ProcessPoolExecutor] = None
+_ocr_page_pool_engine: Optional[OCREngine] = None
+_worker_service: Optional[OCRService] = None
+_worker_rasterizer: Optional[PageRasterizer] = None
+
+
+def _init_ocr_worker(engine_value: str) -> None:
+    """Load the OCR model in a worker process."""
+    global _worker_service, _worker_rasterizer
+    _worker_service = OCRService()
+    _worker_rasterizer = PageRasterizer()
+    asyncio.run(_worker_service.load_model(OCREngine(engine_value)))
+
+
+def _ocr_page_in_worker(
+    source_path: str,
+    pdf_page: Optional[int],
+    output_dir: str,
+    page_num: int,
+    extract_images: bool,
+    engine_value: str,
+) -> dict:
+    """Render and process a page in a worker process (result returned as a dict)."""
+    try:
+        image = _worker_rasterizer.render(PageSource(Path(source_path), pdf_page))
+    except Exception as e:
+        logger.error(f"Rendering error on page {page_num}: {e}")
+        return OCRPageResult(
+            page_num=page_num, text=f"*[OCR Error: {e}]*", error=str(e)
+        ).model_dump()
+
+    result = asyncio.run(
+        _worker_service.process_page(
+            image, Path(output_dir), page_num, extract_images, OCREngine(engine_value)
+        )
+    )
+    return result.model_dump()
+
+
+def get_ocr_page_pool(engine: OCREngine, workers: int) -> ProcessPoolExecutor:
+    """Get the OCR worker pool for an engine (recreated when the engine changes)."""
+    global _ocr_page_pool, _ocr_page_pool_engine
+    if _ocr_page_pool is not None and _ocr_page_pool_engine != engine:
+        shutdown_ocr_page_pool()
+    if _ocr_page_pool is None:
+        # spawn: the server process has threads (models, DB client), fork is not safe
+        _ocr_page_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_ocr_worker,
+            initargs=(engine.value,),
+        )
+        _ocr_page_pool_engine = engine
+    return _ocr_page_pool
+
+
+def shutdown_ocr_page_pool() -> None:
+    """Stop the OCR worker processes."""
+    global _ocr_page_pool, _ocr_page_pool_engine
+    if _ocr_page_pool is not None:
+        _ocr_page_pool.shutdown(wait=False, cancel_futures=True)
+        _ocr_page_pool = None
+        _ocr_page_pool_engine = None
+
+
 # Singleton
 _ocr_service: Optional[OCRService] = None
 
@@ -34,6 +34,34 @@ def build_tutor_system_prompt(
     Returns:
         Complete system prompt for tutor mode
     """
+    prefix = build_tutor_prompt_prefix(
+        case_data=case_data,
+        documents=documents,
+        current_document_id=current_document_id,
+        current_document=current_document,
+        current_module=current_module,
+        language=language
+    )
+    return complete_tutor_system_prompt(prefix, activity_context, tools_desc, language)
+
+
+def build_tutor_prompt_prefix(
+    case_data: Optional[dict],
+    documents: list,
+    current_document_id: Optional[str],
+    current_document: Optional[dict],
+    current_module: Optional[dict] = None,
+    language: str = "fr"
+) -> str:
+    """
+    Build the tutor identity and context-specific part of the prompt.
+
+    The prefix only depends on the course and on what the user is viewing,
+    so it can be cached with the course context.
+
+    Returns:
+        Prompt prefix, completed by complete_tutor_system_prompt
+    """
     is_english = language == "en"
 
     # Base tutor identity
@@ -54,17 +82,33 @@ Ton rôle est d'aider l'étudiant à comprendre, mémoriser et maîtriser le con
         case_data=case_data
     )
 
-    # Combine all parts with language-appropriate rules
-    if is_english:
-        full_prompt = _build_english_full_prompt(
-            base_prompt, context_specific, activity_context, tools_desc
-        )
-    else:
-        full_prompt = _build_french_full_prompt(
-            base_prompt, context_specific, activity_context, tools_desc
-        )
+    return f"""{base_prompt}
+
+{context_specific}"""
 
-    return full_prompt
+
+def complete_tutor_system_prompt(
+    prefix: str,
+    activity_context: str,
+    tools_desc: str,
+    language: str = "fr"
+) -> str:
+    """
+    Complete a tutor prompt prefix with activity context, rules and tools.
+
+    Args:
+        prefix: Output of build_tutor_prompt_prefix
+        activity_context: Recent activity context
+        tools_desc: Description of available tools
+        language: Language for the prompt (fr or en)
+
+    Returns:
+        Complete system prompt for tutor mode
+    """
+    # Combine all parts with language-appropriate rules
+    if language == "en":
+        return _build_english_full_prompt(prefix, activity_context, tools_desc)
+    return _build_french_full_prompt(prefix, activity_context, tools_desc)
 
 
 def _build_context_specific_prompt(
@@ -304,15 +348,12 @@ Nombre de documents disponibles: {num_docs}
 
 
 def _build_english_full_prompt(
-    base_prompt: str,
-    context_specific: str,
+    prefix: str,
     activity_context: str,
     tools_desc: str
 ) -> str:
     """Build complete English prompt."""
-    return f"""{base_prompt}
-
-{context_specific}
+    return f"""{prefix}
 
 {activity_context}
 
@@ -352,15 +393,12 @@ Be encouraging, patient, and adapt to the student's pace.
 
 
 def _build_french_full_prompt(
-    base_prompt: str,
-    context_specific: str,
+    prefix: str,
     activity_context: str,
     tools_desc: str
 ) -> str:
     """Build complete French prompt."""
-    return f"""{base_prompt}
-
-{context_specific}
+    return f"""{prefix}
 
 {activity_context}
 
@@ -0,0 +1,136 @@
+"""
+Sync manifests for linked directories.
+
+A manifest records, for each file of a linked directory, the stat tuple
+(size, mtime_ns, inode) observed at the last sync and the content hash
+computed for it. A file whose stat tuple is unchanged is not read again:
+an idle sync costs one stat call per file instead of a full read.
+
+Manifests are stored as one JSON file per link_id and written atomically.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class FileStat(NamedTuple):
+    """Stat tuple used to detect file changes without reading them."""
+    size: int
+    mtime_ns: int
+    inode: int
+
+
+class ManifestEntry(NamedTuple):
+    """Last known state of a linked file."""
+    stat: FileStat
+    hash: str
+
+
+class SyncManifest:
+    """Manifest of the files of one linked directory."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._entries: dict[str, ManifestEntry] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> "SyncManifest":
+        """Read a manifest from disk. A missing or unreadable file gives an empty manifest."""
+        manifest = cls(path)
+        if not path.exists():
+            return manifest
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            for file_path, (size, mtime_ns, inode, file_hash) in data.get("files", {}).items():
+                manifest._entries[file_path] = ManifestEntry(FileStat(size, mtime_ns, inode), file_hash)
+        except Exception as e:
+            logger.warning(f"Unreadable sync manifest {path}: {e}")
+            manifest._entries = {}
+        return manifest
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, file_path: str) -> Optional[ManifestEntry]:
+        """Last known state of a file, or None if it was never recorded."""
+        return self._entries.get(file_path)
+
+    def set(self, file_path: str, stat: FileStat, file_hash: str) -> None:
+        """Record the state of a file."""
+        entry = ManifestEntry(stat, file_hash)
+        if self._entries.get(file_path) != entry:
+            self._entries[file_path] = entry
+            self._dirty = True
+
+    def remove(self, file_path: str) -> None:
+        """Forget a file (deleted from the directory)."""
+        if self._entries.pop(file_path, None) is not None:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest if it changed since it was loaded or last saved."""
+        if not self._dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "files": {
+                file_path: [entry.stat.size, entry.stat.mtime_ns, entry.stat.inode, entry.hash]
+                for file_path, entry in self._entries.items()
+            }
+        }
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.path.parent, suffix=".json.tmp", delete=False, encoding="utf-8"
+        ) as tmp:
+            json.dump(data, tmp, ensure_ascii=False)
+        os.replace(tmp.name, self.path)
+        self._dirty = False
+
+
+class SyncManifestStore:
+    """Loads and caches the manifests of all linked directories."""
+
+    def __init__(self, storage_dir: Path):
+        self.storage_dir = storage_dir
+        self._manifests: dict[str, SyncManifest] = {}
+
+    def _path(self, link_id: str) -> Path:
+        safe_id = "".join(char if char.isalnum() or char in "-_" else "_" for char in link_id)
+        return self.storage_dir / f"{safe_id}.json"
+
+    def get(self, link_id: str) -> SyncManifest:
+        """Manifest of a link (loaded from disk on first access)."""
+        manifest = self._manifests.get(link_id)
+        if manifest is None:
+            manifest = self._manifests[link_id] = SyncManifest.load(self._path(link_id))
+        return manifest
+
+    def delete(self, link_id: str) -> None:
+        """Drop the manifest of a link that was removed."""
+        self._manifests.pop(link_id, None)
+        try:
+            self._path(link_id).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not delete sync manifest for {link_id}: {e}")
+
+
+# Singleton
+_sync_manifest_store: Optional[SyncManifestStore] = None
+
+
+def get_sync_manifest_store() -> SyncManifestStore:
+    """Return the singleton manifest store."""
+    global _sync_manifest_store
+    if _sync_manifest_store is None:
+        _sync_manifest_store = SyncManifestStore(settings.upload_dir / "sync_manifests")
+    return _sync_manifest_store
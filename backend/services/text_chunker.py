@@ -0,0 +1,224 @@
+"""
+Découpage de texte en chunks pour l'indexation sémantique.
+
+Le texte est parcouru une seule fois, sans le découper en liste de mots:
+- les titres Markdown ferment la section en cours
+- les paragraphes sont les frontières de coupe privilégiées
+- les phrases sont l'unité de remplissage et de chevauchement
+
+Chaque chunk conserve ses positions (caractères) dans le texte source, ce
+qui permet aux citations de pointer vers le passage d'origine.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Iterator, NamedTuple, Optional
+
+# Une ligne, avec son saut de ligne final éventuel
+LINE_RE = re.compile(r"[^\n]*\n|[^\n]+$")
+HEADING_RE = re.compile(r"#{1,6}\s+\S")
+# Fin de phrase: ponctuation finale, guillemets/parenthèses fermants, puis espace
+SENTENCE_END_RE = re.compile(r"[.!?…]+[\"'»”’)\]]*\s+")
+WORD_RE = re.compile(r"\S+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimation rapide du nombre de tokens (~4 caracteres par token)."""
+    return max(1, len(text) // 4)
+
+
+@dataclass
+class TextChunk:
+    """Chunk de texte avec ses positions dans le document source."""
+    text: str
+    start: int
+    end: int
+    token_count: int
+    heading: Optional[str] = None
+
+
+class _Piece(NamedTuple):
+    """Fragment insécable (phrase, titre ou fenêtre de mots)."""
+    start: int
+    end: int
+    tokens: int
+    starts_block: bool
+    heading: Optional[str]
+
+
+def _iter_blocks(text: str) -> Iterator[tuple[int, int, bool]]:
+    """
+    Parcourt les blocs du texte: paragraphes et titres Markdown.
+
+    Yields:
+        (début, fin, est_un_titre) en positions de caractères
+    """
+    block_start = None
+    block_end = 0
+
+    for match in LINE_RE.finditer(text):
+        line = match.group()
+        stripped = line.strip()
+
+        if not stripped:
+            if block_start is not None:
+                yield block_start, block_end, False
+                block_start = None
+            continue
+
+        content_start = match.start() + len(line) - len(line.lstrip())
+        content_end = match.start() + len(line.rstrip())
+
+        if HEADING_RE.match(stripped):
+            if block_start is not None:
+                yield block_start, block_end, False
+                block_start = None
+            yield content_start, content_end, True
+            continue
+
+        if block_start is None:
+            block_start = content_start
+        block_end = content_end
+
+    if block_start is not None:
+        yield block_start, block_end, False
+
+
+def _iter_sentences(text: str, start: int, end: int) -> Iterator[tuple[int, int]]:
+    """Découpe un bloc en phrases (positions sans espaces de bordure)."""
+    sentence_start = start
+    for match in SENTENCE_END_RE.finditer(text, start, end):
+        sentence_end = match.start() + len(match.group().rstrip())
+        if sentence_end > sentence_start:
+            yield sentence_start, sentence_end
+        sentence_start = match.end()
+    if sentence_start < end:
+        yield sentence_start, end
+
+
+def _iter_pieces(
+    text: str,
+    start: int,
+    end: int,
+    max_tokens: int,
+    count_tokens: Callable[[str], int],
+    heading: Optional[str]
+) -> Iterator[_Piece]:
+    """Découpe un bloc en phrases, et les phrases trop longues en fenêtres de mots."""
+    first = True
+    for sentence_start, sentence_end in _iter_sentences(text, start, end):
+        tokens = count_tokens(text[sentence_start:sentence_end])
+        if tokens <= max_tokens:
+            yield _Piece(sentence_start, sentence_end, tokens, first, heading)
+            first = False
+            continue
+
+        window_start = None
+        window_end = sentence_start
+        window_tokens = 0
+        for word in WORD_RE.finditer(text, sentence_start, sentence_end):
+            word_tokens = count_tokens(word.group())
+            if window_start is not None and window_tokens + word_tokens > max_tokens:
+                yield _Piece(window_start, window_end, window_tokens, first, heading)
+                first = False
+                window_start = None
+                window_tokens = 0
+            if window_start is None:
+                window_start = word.start()
+            window_end = word.end()
+            window_tokens += word_tokens
+        if window_start is not None:
+            yield _Piece(window_start, window_end, window_tokens, first, heading)
+            first = False
+
+
+def iter_chunks(
+    text: str,
+    max_tokens: int = 512,
+    overlap_tokens: int = 64,
+    count_tokens: Optional[Callable[[str], int]] = None
+) -> Iterator[TextChunk]:
+    """
+    Découpe un texte en chunks de taille bornée, au fil de l'eau.
+
+    Les phrases sont accumulées jusqu'au budget de tokens. Quand il est
+    dépassé, la coupe se fait au dernier début de paragraphe si le chunk
+    est au moins à moitié plein, sinon entre deux phrases avec un
+    chevauchement d'au plus overlap_tokens. Un titre Markdown ferme le
+    chunk en cours s'il contient déjà un quart du budget.
+
+    Args:
+        text: Texte à découper
+        max_tokens: Nombre maximum de tokens par chunk
+        overlap_tokens: Chevauchement entre chunks coupés en milieu de paragraphe
+        count_tokens: Compteur de tokens (estimation rapide par défaut)
+
+    Yields:
+        TextChunk dans l'ordre du texte
+    """
+    if not text:
+        return
+
+    count = count_tokens or estimate_tokens
+    max_tokens = max(1, max_tokens)
+    overlap_tokens = max(0, min(overlap_tokens, max_tokens // 2))
+    min_section_tokens = max_tokens // 4
+
+    pieces: list[_Piece] = []
+    total = 0
+    heading = None
+
+    def make_chunk(selected: list[_Piece]) -> TextChunk:
+        start, end = selected[0].start, selected[-1].end
+        return TextChunk(
+            text=text[start:end],
+            start=start,
+            end=end,
+            token_count=sum(piece.tokens for piece in selected),
+            heading=selected[0].heading
+        )
+
+    for block_start, block_end, is_heading in _iter_blocks(text):
+        if is_heading:
+            if pieces and total >= min_section_tokens:
+                yield make_chunk(pieces)
+                pieces = []
+                total = 0
+            heading = text[block_start:block_end].lstrip("#").strip()
+
+        for piece in _iter_pieces(text, block_start, block_end, max_tokens, count, heading):
+            if pieces and total + piece.tokens > max_tokens:
+                # Couper au dernier début de paragraphe si le chunk est assez rempli
+                cut = 0
+                running = 0
+                for idx, candidate in enumerate(pieces):
+                    if idx and candidate.starts_block and running >= max_tokens // 2:
+                        cut = idx
+                    running += candidate.tokens
+
+                if cut:
+                    yield make_chunk(pieces[:cut])
+                    pieces = pieces[cut:]
+                    if sum(p.tokens for p in pieces) + piece.tokens > max_tokens:
+                        yield make_chunk(pieces)
+                        pieces = []
+                else:
+                    yield make_chunk(pieces)
+                    carried = []
+                    carried_tokens = 0
+                    for previous in reversed(pieces):
+                        if carried_tokens + previous.tokens > overlap_tokens:
+                            break
+                        carried.insert(0, previous)
+                        carried_tokens += previous.tokens
+                    if carried_tokens + piece.tokens > max_tokens:
+                        carried = []
+                    pieces = carried
+
+                total = sum(p.tokens for p in pieces)
+
+            pieces.append(piece)
+            total += piece.tokens
+
+    if pieces:
+        yield make_chunk(pieces)
@@ -808,7 +808,7 @@ Veuillez vérifier que:
         top_k: int = 5
     ) -> List[Dict]:
         """
-        Search for content using semantic search.
+        Search for content using hybrid (semantic + BM25) search.
 
         Args:
             course_id: Course ID
@@ -849,17 +849,14 @@ Veuillez vérifier que:
 
                     logger.info(f"Resolved filename '{document_id}' to document_id: {normalized_doc_id}")
 
-            # Use the indexing service for semantic search
-            raw_results = await self.indexing_service.search_similar(
+            # Use the indexing service for hybrid (semantic + keyword) search
+            raw_results = await self.indexing_service.hybrid_search(
                 query_text=query,
                 course_id=course_id,
-                top_k=top_k
+                top_k=top_k,
+                document_id=normalized_doc_id
             )
 
-            # Filter by document_id if provided
-            if normalized_doc_id and raw_results:
-                raw_results = [r for r in raw_results if r.get("document_id") == normalized_doc_id]
-
             # Transform results to expected format
             results = []
             for r in raw_results:
@@ -181,7 +181,23 @@ class UserActivityService:
         """
         try:
             activities = await self.get_recent_activities(course_id, limit)
+            return self.format_activity_context(activities)
 
+        except Exception as e:
+            logger.error(f"Failed to get activity context: {e}", exc_info=True)
+            return ""
+
+    def format_activity_context(self, activities: List[Dict[str, Any]]) -> str:
+        """
+        Format activities already retrieved with get_recent_activities for the AI agent.
+
+        Args:
+            activities: Activity dicts ordered by timestamp (newest first)
+
+        Returns:
+            Formatted context string ready for inclusion in the AI prompt
+        """
+        try:
             if not activities:
                 return ""
 
@@ -216,7 +232,7 @@ class UserActivityService:
             return context
 
         except Exception as e:
-            logger.error(f"Failed to get activity context: {e}", exc_info=True)
+            logger.error(f"Failed to format activity context: {e}", exc_info=True)
             return ""
 
     def _format_activity_description(self, action_type: str, metadata: Dict[str, Any]) -> str:
@@ -0,0 +1,854 @@
+"""
+Index vectoriels en mémoire pour la recherche sémantique.
+
+Chaque couple (cours, modèle d'embedding) possède son propre index, chargé
+paresseusement depuis SurrealDB à la première recherche puis maintenu à jour
+lors de l'indexation et de la suppression des documents.
+
+Backends supportés:
+- hnsw: index approximatif HNSW (hnswlib), latence sous-linéaire, persisté en sidecar .hnsw
+- numpy: index exact sur matrice float32 (VectorStore), persisté en sidecar .npy
+- surreal: aucun index en mémoire, index HNSW natif de SurrealDB (opérateur KNN)
+- scan: aucun index en mémoire, recherche exhaustive dans SurrealDB
+
+Si le backend demandé n'est pas disponible, la recherche retombe sur l'index
+NumPy, puis sur le scan exhaustif de SurrealDB.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import pickle
+import re
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from config.settings import settings
+from services.surreal_service import get_surreal_service
+
+logger = logging.getLogger(__name__)
+
+# Verifier si NumPy et hnswlib sont disponibles
+NUMPY_AVAILABLE = False
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    logger.info("numpy non installe, recherche vectorielle exhaustive dans SurrealDB")
+
+HNSWLIB_AVAILABLE = False
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    logger.info("hnswlib non installe, index HNSW indisponible")
+
+
+@dataclass
+class IndexedChunk:
+    """Métadonnées d'un chunk présent dans un index vectoriel."""
+    document_id: str
+    course_id: str
+    chunk_index: int
+    chunk_text: str
+    word_count: int = 0
+    # Positions du chunk dans le texte du document (None pour les anciens chunks)
+    char_start: Optional[int] = None
+    char_end: Optional[int] = None
+
+    def to_result(self, similarity: float) -> dict:
+        """Formate le chunk comme un résultat de search_similar."""
+        return {
+            "document_id": self.document_id,
+            "course_id": self.course_id,
+            "chunk_index": self.chunk_index,
+            "chunk_text": self.chunk_text,
+            "similarity_score": similarity,
+            "word_count": self.word_count,
+            "char_start": self.char_start,
+            "char_end": self.char_end
+        }
+
+
+class VectorIndex:
+    """
+    Interface commune des index vectoriels en mémoire.
+
+    Gère l'association label -> chunk et document -> labels; les sous-classes
+    implémentent le stockage des vecteurs et la recherche des plus proches voisins.
+    """
+
+    # True si l'index sait se persister en sidecar (snapshot/write_snapshot/load)
+    persistent = False
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self.chunks: dict[int, IndexedChunk] = {}
+        self._document_labels: dict[str, list[int]] = {}
+        self._next_label = 0
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def document_ids(self) -> set[str]:
+        """IDs des documents présents dans l'index."""
+        return set(self._document_labels)
+
+    def add(self, chunks: list[IndexedChunk], vectors: list[list[float]]) -> None:
+        """Ajoute des chunks et leurs vecteurs à l'index."""
+        if not chunks:
+            return
+
+        labels = list(range(self._next_label, self._next_label + len(chunks)))
+        self._next_label += len(chunks)
+
+        self._add_vectors(labels, vectors)
+
+        for label, chunk in zip(labels, chunks):
+            self.chunks[label] = chunk
+            self._document_labels.setdefault(chunk.document_id, []).append(label)
+
+    def remove_document(self, document_id: str) -> int:
+        """Retire tous les chunks d'un document. Retourne le nombre de chunks retirés."""
+        labels = self._document_labels.pop(document_id, [])
+        if labels:
+            self._remove_labels(labels)
+            for label in labels:
+                self.chunks.pop(label, None)
+        return len(labels)
+
+    def replace_document(
+        self,
+        document_id: str,
+        chunks: list[IndexedChunk],
+        vectors: list[list[float]]
+    ) -> None:
+        """Remplace les chunks d'un document (réindexation)."""
+        self.remove_document(document_id)
+        self.add(chunks, vectors)
+
+    def search(
+        self,
+        vector: list[float],
+        top_k: int,
+        document_id: Optional[str] = None
+    ) -> list[tuple[IndexedChunk, float]]:
+        """
+        Recherche les chunks les plus similaires à un vecteur.
+
+        Args:
+            vector: Vecteur de la requête
+            top_k: Nombre maximum de résultats
+            document_id: Optionnel, limiter la recherche à un document
+
+        Returns:
+            Liste de (chunk, similarité cosinus) triée par similarité décroissante
+        """
+        allowed = None
+        if document_id:
+            allowed = set(self._document_labels.get(document_id, []))
+            if not allowed:
+                return []
+
+        k = min(top_k, len(allowed) if allowed is not None else len(self.chunks))
+        if k <= 0:
+            return []
+
+        hits = self._search(vector, k, allowed)
+        return [(self.chunks[label], score) for label, score in hits if label in self.chunks]
+
+    def _add_vectors(self, labels: list[int], vectors: list[list[float]]) -> None:
+        raise NotImplementedError
+
+    def _remove_labels(self, labels: list[int]) -> None:
+        raise NotImplementedError
+
+    def _search(
+        self,
+        vector: list[float],
+        k: int,
+        allowed: Optional[set[int]]
+    ) -> list[tuple[int, float]]:
+        raise NotImplementedError
+
+
+class HNSWVectorIndex(VectorIndex):
+    """
+    Index approximatif HNSW (hnswlib) en distance cosinus.
+
+    Les chunks retirés sont marqués supprimés (mark_deleted) et leurs places
+    réutilisées par les ajouts suivants. L'index est persisté par hnswlib
+    (save_index/load_index) en sidecar .hnsw, avec les chunks en .json.
+    """
+
+    persistent = True
+
+    def __init__(
+        self,
+        dimensions: int,
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 64,
+        initial_capacity: int = 1024
+    ):
+        super().__init__(dimensions)
+        self.ef_search = ef_search
+        self._index = hnswlib.Index(space="cosine", dim=dimensions)
+        self._index.init_index(
+            max_elements=initial_capacity,
+            ef_construction=ef_construction,
+            M=m,
+            allow_replace_deleted=True
+        )
+        self._index.set_ef(ef_search)
+        self.key: Optional[tuple[str, str]] = None
+
+    def _add_vectors(self, labels: list[int], vectors: list[list[float]]) -> None:
+        needed = len(self.chunks) + len(labels)
+        capacity = self._index.get_max_elements()
+        if needed > capacity:
+            self._index.resize_index(max(needed, capacity * 2))
+
+        self._index.add_items(
+            np.asarray(vectors, dtype=np.float32),
+            labels,
+            replace_deleted=True
+        )
+
+    def _remove_labels(self, labels: list[int]) -> None:
+        for label in labels:
+            self._index.mark_deleted(label)
+
+    def _search(
+        self,
+        vector: list[float],
+        k: int,
+        allowed: Optional[set[int]]
+    ) -> list[tuple[int, float]]:
+        self._index.set_ef(max(self.ef_search, k))
+        labels, distances = self._index.knn_query(
+            np.asarray(vector, dtype=np.float32),
+            k=k,
+            filter=(lambda label: label in allowed) if allowed is not None else None
+        )
+        return [
+            (int(label), 1.0 - float(distance))
+            for label, distance in zip(labels[0], distances[0])
+        ]
+
+    def snapshot(self) -> tuple[bytes, dict]:
+        """Copie sérialisée de l'index hnswlib et métadonnées des chunks, pour persistance."""
+        metadata = {
+            "dimensions": self.dimensions,
+            "ef_search": self.ef_search,
+            "next_label": self._next_label,
+            "chunks": [{"label": label, **asdict(chunk)} for label, chunk in self.chunks.items()]
+        }
+        return pickle.dumps(self._index), metadata
+
+    @staticmethod
+    def write_snapshot(path: Path, snapshot: tuple[bytes, dict], key: tuple[str, str]) -> None:
+        """Écrit le sidecar (.hnsw + .json) d'un (cours, modèle) de manière atomique."""
+        data, metadata = snapshot
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".hnsw.tmp")
+        os.close(fd)
+        pickle.loads(data).save_index(tmp_path)
+        os.replace(tmp_path, f"{path}.hnsw")
+
+        metadata = {"course_id": key[0], "embedding_model": key[1], **metadata}
+        with tempfile.NamedTemporaryFile(
+            "w", dir=path.parent, suffix=".json.tmp", delete=False, encoding="utf-8"
+        ) as tmp:
+            json.dump(metadata, tmp, ensure_ascii=False)
+        os.replace(tmp.name, f"{path}.json")
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["HNSWVectorIndex"]:
+        """Relit un sidecar avec hnswlib. Retourne None s'il est absent ou incohérent."""
+        index_path = Path(f"{path}.hnsw")
+        metadata_path = Path(f"{path}.json")
+        if not index_path.exists() or not metadata_path.exists():
+            return None
+
+        try:
+            metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+            dimensions = int(metadata["dimensions"])
+            entries = [(entry.pop("label"), IndexedChunk(**entry)) for entry in metadata["chunks"]]
+            hnsw = hnswlib.Index(space="cosine", dim=dimensions)
+            hnsw.load_index(str(index_path), allow_replace_deleted=True)
+        except Exception as e:
+            logger.warning(f"Sidecar HNSW illisible {path}: {e}")
+            return None
+
+        if len(entries) > hnsw.get_current_count():
+            logger.warning(f"Sidecar HNSW incohérent {path}, ignoré")
+            return None
+
+        index = cls.__new__(cls)
+        VectorIndex.__init__(index, dimensions)
+        index.ef_search = metadata.get("ef_search", 64)
+        index._index = hnsw
+        index._index.set_ef(index.ef_search)
+        index._next_label = metadata.get("next_label", 0)
+        index.key = (metadata.get("course_id", ""), metadata.get("embedding_model", ""))
+
+        for label, chunk in entries:
+            index.chunks[label] = chunk
+            index._document_labels.setdefault(chunk.document_id, []).append(label)
+
+        return index
+
+
+class VectorStore(VectorIndex):
+    """
+    Index exact sur une matrice float32 contiguë de vecteurs pré-normalisés.
+
+    Le top-k est obtenu par un seul produit matrice-vecteur suivi d'un
+    argpartition. La matrice peut être persistée en sidecar .npy et rouverte
+    avec mmap_mode="r": elle n'est copiée en mémoire qu'à la première écriture.
+    """
+
+    persistent = True
+
+    def __init__(self, dimensions: int, initial_capacity: int = 1024):
+        super().__init__(dimensions)
+        self._matrix = np.zeros((initial_capacity, dimensions), dtype=np.float32)
+        self._row_labels = np.full(initial_capacity, -1, dtype=np.int64)
+        self._label_rows: dict[int, int] = {}
+        self._size = 0
+        self._deleted = 0
+        self.key: Optional[tuple[str, str]] = None
+
+    def _reallocate(self, capacity: int) -> None:
+        """Compacte les lignes vivantes dans une nouvelle matrice modifiable."""
+        live = np.flatnonzero(self._row_labels[:self._size] >= 0)
+        capacity = max(capacity, len(live))
+
+        matrix = np.zeros((capacity, self.dimensions), dtype=np.float32)
+        matrix[:len(live)] = self._matrix[live]
+        row_labels = np.full(capacity, -1, dtype=np.int64)
+        row_labels[:len(live)] = self._row_labels[live]
+
+        self._matrix = matrix
+        self._row_labels = row_labels
+        self._label_rows = {int(label): row for row, label in enumerate(row_labels[:len(live)])}
+        self._size = len(live)
+        self._deleted = 0
+
+    def _add_vectors(self, labels: list[int], vectors: list[list[float]]) -> None:
+        data = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(data, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        data = data / norms
+
+        count = len(labels)
+        if self._size + count > self._matrix.shape[0] or not self._matrix.flags.writeable:
+            live = self._size - self._deleted
+            self._reallocate(max(1024, 2 * (live + count)))
+
+        start = self._size
+        self._matrix[start:start + count] = data
+        self._row_labels[start:start + count] = labels
+        for offset, label in enumerate(labels):
+            self._label_rows[label] = start + offset
+        self._size += count
+
+    def _remove_labels(self, labels: list[int]) -> None:
+        for label in labels:
+            row = self._label_rows.pop(label, None)
+            if row is not None:
+                self._row_labels[row] = -1
+                self._deleted += 1
+
+        if self._deleted > 1024 and self._deleted > self._size // 2:
+            self._reallocate(2 * (self._size - self._deleted))
+
+    def _search(
+        self,
+        vector: list[float],
+        k: int,
+        allowed: Optional[set[int]]
+    ) -> list[tuple[int, float]]:
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        query = query / norm
+
+        if allowed is not None:
+            rows = np.fromiter((self._label_rows[label] for label in allowed), dtype=np.int64)
+            scores = self._matrix[rows] @ query
+        else:
+            rows = None
+            scores = self._matrix[:self._size] @ query
+            scores[self._row_labels[:self._size] < 0] = -np.inf
+
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+
+        result_rows = rows[top] if rows is not None else top
+        return [
+            (int(self._row_labels[row]), float(scores[idx]))
+            for idx, row in zip(top, result_rows)
+        ]
+
+    def snapshot(self) -> tuple["np.ndarray", list[dict]]:
+        """Copie compacte (matrice, métadonnées) des lignes vivantes, pour persistance."""
+        live = np.flatnonzero(self._row_labels[:self._size] >= 0)
+        matrix = np.ascontiguousarray(self._matrix[live])
+        chunks = [asdict(self.chunks[int(self._row_labels[row])]) for row in live]
+        return matrix, chunks
+
+    @staticmethod
+    def write_snapshot(
+        path: Path,
+        snapshot: tuple["np.ndarray", list[dict]],
+        key: tuple[str, str]
+    ) -> None:
+        """Écrit le sidecar (.npy + .json) d'un (cours, modèle) de manière atomique."""
+        matrix, chunks = snapshot
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".npy.tmp", delete=False) as tmp:
+            np.save(tmp, matrix)
+        os.replace(tmp.name, f"{path}.npy")
+
+        metadata = {
+            "course_id": key[0],
+            "embedding_model": key[1],
+            "dimensions": int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+            "chunks": chunks
+        }
+        with tempfile.NamedTemporaryFile(
+            "w", dir=path.parent, suffix=".json.tmp", delete=False, encoding="utf-8"
+        ) as tmp:
+            json.dump(metadata, tmp, ensure_ascii=False)
+        os.replace(tmp.name, f"{path}.json")
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["VectorStore"]:
+        """Rouvre un sidecar en mmap_mode="r". Retourne None s'il est absent ou incohérent."""
+        matrix_path = Path(f"{path}.npy")
+        metadata_path = Path(f"{path}.json")
+        if not matrix_path.exists() or not metadata_path.exists():
+            return None
+
+        try:
+            metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+            matrix = np.load(matrix_path, mmap_mode="r")
+        except Exception as e:
+            logger.warning(f"Sidecar vectoriel illisible {path}: {e}")
+            return None
+
+        chunks = metadata.get("chunks", [])
+        if matrix.ndim != 2 or matrix.shape[0] != len(chunks):
+            logger.warning(f"Sidecar vectoriel incohérent {path}, ignoré")
+            return None
+
+        count = len(chunks)
+        store = cls(matrix.shape[1], initial_capacity=0)
+        store._matrix = matrix
+        store._row_labels = np.arange(count, dtype=np.int64)
+        store._label_rows = {row: row for row in range(count)}
+        store._size = count
+        store._next_label = count
+        store.key = (metadata.get("course_id", ""), metadata.get("embedding_model", ""))
+
+        for label, data in enumerate(chunks):
+            chunk = IndexedChunk(**data)
+            store.chunks[label] = chunk
+            store._document_labels.setdefault(chunk.document_id, []).append(label)
+
+        return store
+
+
+INDEX_BACKENDS = {
+    "hnsw": (HNSWVectorIndex, HNSWLIB_AVAILABLE),
+    "numpy": (VectorStore, NUMPY_AVAILABLE),
+}
+
+# Backends sans index en mémoire: la recherche est faite par SurrealDB
+DATABASE_BACKENDS = ("surreal", "scan")
+
+
+def _sidecar_name(course_id: str, embedding_model: str) -> str:
+    """Nom de fichier sûr pour le sidecar d'un (cours, modèle)."""
+    return re.sub(r"[^A-Za-z0-9_-]", "_", f"{course_id}__{embedding_model}")
+
+
+class VectorIndexRegistry:
+    """
+    Registre des index vectoriels par (course_id, embedding_model).
+
+    Les index sont chargés paresseusement (depuis leur sidecar si le backend
+    est persistant, sinon depuis SurrealDB) et mis à jour incrémentalement.
+    Après `refresh_interval` secondes, le nombre de chunks est revérifié dans
+    la base afin de détecter les écritures externes (scripts de réindexation,
+    autre processus).
+    """
+
+    # Champs de document_embedding relus pour construire un index
+    _row_fields = "document_id, course_id, chunk_index, chunk_text, word_count, char_start, char_end, embedding"
+
+    def __init__(
+        self,
+        backend: str = "hnsw",
+        refresh_interval: int = 300,
+        storage_dir: Optional[Path] = None,
+        save_delay: float = 5.0
+    ):
+        self.backend = backend
+        self.refresh_interval = refresh_interval
+        self.storage_dir = storage_dir
+        self.save_delay = save_delay
+        self._indexes: dict[tuple[str, str], VectorIndex] = {}
+        self._checked_at: dict[tuple[str, str], float] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+        self._loading: set[tuple[str, str]] = set()
+        self._dirty: set[tuple[str, str]] = set()
+        self._pending_saves: set[tuple[str, str]] = set()
+        self._index_class = self._resolve_backend(backend)
+
+    def _resolve_backend(self, backend: str) -> Optional[type[VectorIndex]]:
+        """Choisit la classe d'index du backend demandé, avec repli si indisponible."""
+        index_class, available = INDEX_BACKENDS.get(backend, (None, False))
+        if not available and backend not in DATABASE_BACKENDS and NUMPY_AVAILABLE:
+            logger.warning(
+                f"Backend d'index vectoriel '{backend}' indisponible, "
+                f"repli sur l'index exact NumPy"
+            )
+            self.backend = "numpy"
+            index_class, available = VectorStore, True
+
+        if backend not in DATABASE_BACKENDS and not available:
+            logger.warning(
+                f"Backend d'index vectoriel '{backend}' indisponible, "
+                f"repli sur la recherche exhaustive SurrealDB"
+            )
+
+        return index_class if available else None
+
+    @property
+    def enabled(self) -> bool:
+        """True si un index en mémoire est utilisable."""
+        return self._index_class is not None
+
+    @property
+    def persistent(self) -> bool:
+        """True si les index sont persistés en sidecar sur disque."""
+        return self.enabled and self._index_class.persistent and self.storage_dir is not None
+
+    def _sidecar_path(self, key: tuple[str, str]) -> Path:
+        return self.storage_dir / _sidecar_name(*key)
+
+    def warm_up(self) -> int:
+        """
+        Rouvre tous les sidecars existants (mmap) au démarrage.
+
+        Chaque index ainsi ouvert est revérifié contre SurrealDB à sa
+        première utilisation.
+
+        Returns:
+            Nombre d'index ouverts
+        """
+        if not self.persistent or not self.storage_dir.exists():
+            return 0
+
+        opened = 0
+        for metadata_path in self.storage_dir.glob("*.json"):
+            path = metadata_path.with_suffix("")
+            store = self._index_class.load(path)
+            if store is None or self._sidecar_path(store.key) != path:
+                continue
+
+            key = store.key
+
+            self._indexes[key] = store
+            self._checked_at[key] = float("-inf")
+            opened += 1
+
+        logger.info(f"Vector store: {opened} sidecars ouverts depuis {self.storage_dir}")
+        return opened
+
+    async def get_index(self, course_id: str, embedding_model: str) -> Optional[VectorIndex]:
+        """
+        Retourne l'index d'un cours, en le chargeant si nécessaire.
+
+        Returns:
+            L'index, ou None si aucun backend n'est disponible
+        """
+        if not self.enabled:
+            return None
+
+        key = (course_id, embedding_model)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            index = self._indexes.get(key)
+            if index is not None and not await self._is_stale(key, index):
+                return index
+
+            while True:
+                self._loading.add(key)
+                self._dirty.discard(key)
+                try:
+                    index, from_sidecar = await self._load_index(course_id, embedding_model)
+                finally:
+                    self._loading.discard(key)
+                if key not in self._dirty:
+                    break
+                logger.info(f"Index {key} modifié pendant le chargement, rechargement")
+
+            self._indexes[key] = index
+            self._checked_at[key] = time.monotonic()
+            if not from_sidecar:
+                self._schedule_save(key)
+            return index
+
+    def update_document(
+        self,
+        course_id: str,
+        embedding_model: str,
+        document_id: str,
+        chunks: list[IndexedChunk],
+        vectors: list[list[float]]
+    ) -> None:
+        """Répercute la (ré)indexation d'un document sur les index chargés."""
+        for key in self._loading:
+            self._dirty.add(key)
+
+        key = (course_id, embedding_model)
+        # Le document n'appartient plus qu'à l'index de son cours et de son modèle
+        for other_key, other_index in self._indexes.items():
+            if other_key != key and other_index.remove_document(document_id):
+                self._schedule_save(other_key)
+
+        index = self._indexes.get(key)
+        if index is None:
+            return
+
+        if vectors and len(vectors[0]) != index.dimensions:
+            # Index vide créé sans dimensions connues: il sera rechargé
+            self._indexes.pop(key, None)
+            return
+
+        index.replace_document(document_id, chunks, vectors)
+        self._schedule_save(key)
+
+    def remove_document(self, document_id: str) -> None:
+        """Retire un document de tous les index chargés."""
+        for key in self._loading:
+            self._dirty.add(key)
+
+        for key, index in self._indexes.items():
+            if index.remove_document(document_id):
+                self._schedule_save(key)
+
+    def clear(self) -> None:
+        """Vide tous les index et leurs sidecars (ils seront rechargés à la prochaine recherche)."""
+        self._dirty.update(self._loading)
+        self._indexes.clear()
+        self._checked_at.clear()
+        self._pending_saves.clear()
+
+        if self.persistent and self.storage_dir.exists():
+            for path in self.storage_dir.iterdir():
+                if path.suffix in (".npy", ".hnsw", ".json"):
+                    path.unlink(missing_ok=True)
+
+    def flush(self) -> None:
+        """Écrit immédiatement les sidecars en attente (arrêt de l'application)."""
+        for key in list(self._pending_saves):
+            self._pending_saves.discard(key)
+            index = self._indexes.get(key)
+            if index is not None:
+                self._index_class.write_snapshot(self._sidecar_path(key), index.snapshot(), key)
+
+    def stats(self) -> dict:
+        """Statistiques des index chargés."""
+        return {
+            "backend": self.backend if self.enabled or self.backend in DATABASE_BACKENDS else "scan",
+            "persistent": self.persistent,
+            "indexes": [
+                {
+                    "course_id": course_id,
+                    "embedding_model": embedding_model,
+                    "chunks": len(index),
+                    "dimensions": index.dimensions
+                }
+                for (course_id, embedding_model), index in self._indexes.items()
+            ]
+        }
+
+    def _schedule_save(self, key: tuple[str, str]) -> None:
+        """Planifie l'écriture du sidecar d'un index (les rafales sont regroupées)."""
+        if not self.persistent or key in self._pending_saves:
+            return
+
+        self._pending_saves.add(key)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+
+        loop.call_later(self.save_delay, self._save_in_background, key)
+
+    def _save_in_background(self, key: tuple[str, str]) -> None:
+        if key not in self._pending_saves:
+            return
+        self._pending_saves.discard(key)
+
+        index = self._indexes.get(key)
+        if index is None:
+            return
+
+        # La copie est faite dans la boucle d'événements, l'écriture dans un thread
+        snapshot = index.snapshot()
+        path = self._sidecar_path(key)
+
+        def write():
+            try:
+                self._index_class.write_snapshot(path, snapshot, key)
+            except Exception as e:
+                logger.warning(f"Impossible d'écrire le sidecar vectoriel {path}: {e}")
+
+        asyncio.get_running_loop().run_in_executor(None, write)
+
+    async def _is_stale(self, key: tuple[str, str], index: VectorIndex) -> bool:
+        """Revérifie périodiquement le nombre de chunks dans SurrealDB."""
+        if time.monotonic() - self._checked_at.get(key, 0) < self.refresh_interval:
+            return False
+
+        course_id, embedding_model = key
+        total = await self._count_chunks(course_id, embedding_model)
+        self._checked_at[key] = time.monotonic()
+
+        if total != len(index):
+            logger.info(f"Index {key} désynchronisé ({len(index)} != {total}), rechargement")
+            return True
+        return False
+
+    async def _count_chunks(self, course_id: str, embedding_model: str) -> int:
+        surreal_service = get_surreal_service()
+        if not surreal_service.db:
+            await surreal_service.connect()
+
+        result = await surreal_service.query(
+            """
+            SELECT count() AS total FROM document_embedding
+            WHERE course_id = $course_id AND embedding_model = $embedding_model
+            GROUP ALL
+            """,
+            {"course_id": course_id, "embedding_model": embedding_model}
+        )
+
+        if result and len(result) > 0:
+            stats = result[0]
+            if isinstance(stats, dict) and "result" in stats:
+                stats = stats["result"][0] if stats["result"] else {}
+            elif isinstance(stats, list):
+                stats = stats[0] if stats else {}
+            return stats.get("total", 0)
+
+        return 0
+
+    async def _load_index(
+        self,
+        course_id: str,
+        embedding_model: str
+    ) -> tuple[VectorIndex, bool]:
+        """
+        Charge l'index d'un cours.
+
+        Le sidecar est utilisé s'il existe et s'il contient autant de chunks que
+        SurrealDB; sinon tous les embeddings du cours sont relus depuis la base.
+
+        Returns:
+            (index, True si chargé depuis le sidecar)
+        """
+        loop = asyncio.get_event_loop()
+        key = (course_id, embedding_model)
+
+        if self.persistent:
+            store = await loop.run_in_executor(None, self._index_class.load, self._sidecar_path(key))
+            if store is not None:
+                total = await self._count_chunks(course_id, embedding_model)
+                if total == len(store):
+                    logger.info(f"Loaded vector index for {course_id} ({embedding_model}) from sidecar: {len(store)} chunks")
+                    return store, True
+                logger.info(f"Sidecar obsolète pour {key} ({len(store)} != {total}), rechargement depuis SurrealDB")
+
+        surreal_service = get_surreal_service()
+        if not surreal_service.db:
+            await surreal_service.connect()
+
+        result = await surreal_service.query(
+            f"""
+            SELECT {self._row_fields}
+            FROM document_embedding
+            WHERE course_id = $course_id AND embedding_model = $embedding_model
+            """,
+            {"course_id": course_id, "embedding_model": embedding_model}
+        )
+
+        rows = []
+        if result and len(result) > 0:
+            first_item = result[0]
+            if isinstance(first_item, dict) and "result" in first_item:
+                rows = first_item["result"] if isinstance(first_item["result"], list) else []
+            elif isinstance(first_item, list):
+                rows = first_item
+            elif isinstance(first_item, dict):
+                rows = result
+
+        index = await loop.run_in_executor(None, self._build_index, rows)
+
+        logger.info(f"Loaded {self.backend} index for {course_id} ({embedding_model}): {len(index)} chunks")
+        return index, False
+
+    @staticmethod
+    def _row_chunk(row: dict) -> IndexedChunk:
+        return IndexedChunk(
+            document_id=row.get("document_id"),
+            course_id=row.get("course_id"),
+            chunk_index=row.get("chunk_index"),
+            chunk_text=row.get("chunk_text"),
+            word_count=row.get("word_count", 0),
+            char_start=row.get("char_start"),
+            char_end=row.get("char_end")
+        )
+
+    def _build_index(self, rows: list[dict]) -> VectorIndex:
+        """Construit un index à partir des enregistrements de SurrealDB (dans un thread)."""
+        rows = [row for row in rows if row.get("embedding")]
+        dimensions = len(rows[0]["embedding"]) if rows else 0
+
+        index = self._index_class(dimensions or 1)
+        index.add([self._row_chunk(row) for row in rows], [row["embedding"] for row in rows])
+        return index
+
+
+# Singleton
+_vector_index_registry: Optional[VectorIndexRegistry] = None
+
+
+def get_vector_index_registry() -> VectorIndexRegistry:
+    """Obtient l'instance singleton du registre d'index vectoriels."""
+    global _vector_index_registry
+    if _vector_index_registry is None:
+        _vector_index_registry = VectorIndexRegistry(
+            backend=settings.vector_index_backend,
+            refresh_interval=settings.vector_index_refresh_interval,
+            storage_dir=settings.upload_dir / "vector_store"
+        )
+    return _vector_index_registry
@@ -82,3 +82,12 @@ class TestAdmin:
         # Si cet endpoint est protégé admin, il échouera avec le token student
         response = await client.post("/api/admin/passwords/generate", json={"count": 5})
         assert response.status_code in [401, 403]
+
+    @pytest.mark.asyncio
+    async def test_extraction_cache_requires_admin(self, client: AsyncClient):
+        """Les statistiques et le vidage du cache des extractions sont réservés aux admins."""
+        response = await client.get("/api/admin/extraction-cache")
+        assert response.status_code in [401, 403]
+
+        response = await client.delete("/api/admin/extraction-cache")
+        assert response.status_code in [401, 403]
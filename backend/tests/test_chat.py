@@ -187,6 +187,269 @@ class TestChatStreaming:
             status.HTTP_503_SERVICE_UNAVAILABLE
         ]
 
+    @pytest.mark.asyncio
+    async def test_stream_run_forwards_deltas_and_tool_calls(self):
+        """Les morceaux de réponse et les appels d'outils sont relayés au fil de l'eau."""
+        import json
+        from types import SimpleNamespace
+
+        from routes.chat import _stream_run
+
+        tool = SimpleNamespace(tool_call_id="call_1", tool_name="semantic_search", tool_args={"query": "bail"})
+
+        class FakeAgent:
+            async def arun(self, prompt, stream=False, stream_events=False):
+                assert stream and stream_events
+                yield SimpleNamespace(event="RunStarted")
+                yield SimpleNamespace(event="ToolCallStarted", tool=tool)
+                yield SimpleNamespace(event="ToolCallCompleted", tool=tool)
+                yield SimpleNamespace(event="RunContent", content="Le bail ")
+                yield SimpleNamespace(event="RunContent", content="est un contrat.")
+                yield SimpleNamespace(event="RunCompleted", content="Le bail est un contrat.")
+
+        final = {}
+        events = [event async for event in _stream_run(FakeAgent(), "Qu'est-ce qu'un bail?", final)]
+
+        names = [event.split("\n", 1)[0] for event in events]
+        payloads = [json.loads(event.split("data: ", 1)[1]) for event in events]
+        assert names == ["event: tool_call", "event: tool_call", "event: delta", "event: delta"]
+        assert payloads[0] == {"status": "started", "id": "call_1", "name": "semantic_search", "args": {"query": "bail"}}
+        assert payloads[1]["status"] == "completed"
+        assert "".join(p["content"] for p in payloads[2:]) == final["content"] == "Le bail est un contrat."
+
+
+
+class TestCourseContextCache:
+    """Tests pour le cache des instantanés de contexte de cours."""
+
+    @pytest.fixture
+    def fake_db(self, monkeypatch):
+        """Base simulée: un cours et ses documents, avec compteur de requêtes."""
+        import services.course_context_cache as cache_module
+
+        class FakeSurreal:
+            db = object()
+
+            def __init__(self):
+                self.queries = 0
+                self.documents = [
+                    {"id": "document:a1", "nom_fichier": "cours1.mp3", "type_fichier": "mp3", "taille": 2048},
+                    {"id": "document:t1", "nom_fichier": "cours1.md", "type_fichier": "md", "taille": 10,
+                     "is_transcription": True, "source_audio": "cours1.mp3", "texte_extrait": "Le bail"},
+                    {"id": "document:p1", "nom_fichier": "Arrêt.pdf", "type_fichier": "pdf", "taille": 10},
+                    {"id": "document:m1", "nom_fichier": "Arrêt.md", "type_fichier": "md", "taille": 10,
+                     "texte_extrait": "Les faits", "texte_length": 9000},
+                ]
+
+            async def query(self, sql, params=None):
+                self.queries += 1
+                if sql.startswith("SELECT * FROM course:missing"):
+                    return []
+                if sql.startswith("SELECT * FROM course:"):
+                    return [{"id": "course:c1", "title": "Droit civil"}]
+                return list(self.documents)
+
+        db = FakeSurreal()
+        monkeypatch.setattr(cache_module, "get_surreal_service", lambda: db)
+        return db
+
+    @pytest.mark.asyncio
+    async def test_snapshot_reused_until_version_bump(self, fake_db):
+        """Le contexte est relu seulement après une modification du cours."""
+        from services.course_context_cache import CourseContextCache, bump_course_version
+
+        cache = CourseContextCache(ttl=0)
+        snapshot = await cache.get("c1")
+        assert fake_db.queries == 2
+        assert await cache.get("course:c1") is snapshot
+        assert fake_db.queries == 2
+
+        assert snapshot.audio_transcription_map == {"cours1.mp3": "cours1.md"}
+        assert snapshot.pdf_extraction_map == {"Arrêt.pdf": "Arrêt.md"}
+        assert "cours1.mp3 (MP3, 2.0 KB) [DÉJÀ TRANSCRIT → voir cours1.md]" in snapshot.preview
+        assert "Arrêt.md (MD, 10 B) [Extraction de Arrêt.pdf]" in snapshot.preview
+        assert [source["name"] for source in snapshot.sources] == ["cours1.md", "Arrêt.md"]
+        assert snapshot.excerpts[1]["truncated"] is True
+        assert snapshot.find_document("m1")["nom_fichier"] == "Arrêt.md"
+        assert "Droit civil" in snapshot.prompt_prefix("fr")
+
+        fake_db.documents.pop()
+        bump_course_version("course:c1")
+        refreshed = await cache.get("c1")
+        assert fake_db.queries == 4
+        assert refreshed is not snapshot
+        assert len(refreshed.documents) == 3
+        assert refreshed.pdf_extraction_map == {}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self, fake_db):
+        """Les requêtes simultanées d'un même cours ne chargent le contexte qu'une fois."""
+        import asyncio
+
+        from services.course_context_cache import CourseContextCache
+
+        cache = CourseContextCache(ttl=0)
+        first, second = await asyncio.gather(cache.get("c1"), cache.get("c1"))
+        assert first is second
+        assert fake_db.queries == 2
+        assert await cache.get("missing") is None
+
+
+class TestContextPacker:
+    """Tests pour l'assemblage du contexte sous budget de tokens."""
+
+    def test_pack_keeps_recent_history_and_best_fitting_snippets(self):
+        """L'historique récent passe d'abord, puis les extraits qui tiennent dans le budget."""
+        from types import SimpleNamespace
+
+        from services.context_packer import ContextSnippet, pack_context
+
+        history = [SimpleNamespace(role="user", content=f"tour {i} " + "x" * 400) for i in range(6)]
+        snippets = [
+            ContextSnippet("document:a", "a.md", "a" * 1200),
+            ContextSnippet("document:big", "big.md", "b" * 40000),
+            ContextSnippet("document:c", "c.md", "c" * 1200),
+        ]
+
+        packed = pack_context(snippets, history, budget=1200, reserved_tokens=200)
+
+        assert [s.document_id for s in packed.snippets] == ["document:a", "document:c"]
+        # Tours contigus les plus récents, dans l'ordre chronologique
+        assert packed.history == history[-len(packed.history):]
+        assert packed.history and packed.dropped_turns == 6 - len(packed.history)
+        assert packed.used_tokens <= 1200
+
+        # Sans extraits, la place revient à l'historique plus ancien
+        history_only = pack_context([], history, budget=1200, reserved_tokens=200)
+        assert len(history_only.history) > len(packed.history)
+
+    @pytest.mark.asyncio
+    async def test_rank_snippets_covers_unindexed_documents(self, monkeypatch):
+        """Les documents sans chunks indexés sont classés par BM25 sur leur extrait."""
+        import services.document_indexing_service as indexing_module
+        from services.context_packer import rank_snippets
+
+        class FakeIndexing:
+            async def hybrid_search(self, query, course_id, top_k=7):
+                return [{"document_id": "document:a", "chunk_index": 0, "chunk_text": "Le bail commercial"}]
+
+            async def indexed_document_ids(self, course_id):
+                return {"document:a"}
+
+        monkeypatch.setattr(indexing_module, "get_document_indexing_service", lambda: FakeIndexing())
+
+        documents = [
+            {"id": "document:a", "nom_fichier": "bail.md"},
+            {"id": "document:b", "nom_fichier": "cours.md", "is_transcription": True},
+            {"id": "document:c", "nom_fichier": "autre.md"},
+        ]
+        excerpts = [
+            {"document_id": "document:a", "content": "Le bail commercial (extrait)"},
+            {"document_id": "document:b", "content": "Résiliation du bail"},
+            {"document_id": "document:c", "content": "Droit de la famille"},
+        ]
+
+        snippets = await rank_snippets("course:c1", "résiliation du bail", documents, excerpts)
+
+        assert [(s.document_id, s.name) for s in snippets] == [
+            ("document:a", "bail.md"),
+            ("document:b", "cours.md"),
+        ]
+        assert snippets[0].text == "Le bail commercial"
+        assert snippets[1].is_transcription
+
+
+class TestModelRegistry:
+    """Tests pour la réutilisation des modèles et des agents."""
+
+    def test_models_reused_per_parameters_and_bounded(self, monkeypatch):
+        """Un modèle par (model_string, paramètres), les moins récents sont évincés."""
+        import services.model_factory as factory
+
+        created = []
+
+        def fake_create_model(model_string, **kwargs):
+            created.append((model_string, kwargs))
+            return object()
+
+        monkeypatch.setattr(factory, "create_model", fake_create_model)
+        registry = factory.ModelRegistry(max_models=2)
+
+        first = registry.model("ollama:mistral")
+        assert registry.model("ollama:mistral") is first
+        assert registry.model("ollama:mistral", host="http://gpu:11434") is not first
+        registry.model("anthropic:claude")  # évince ollama:mistral
+        assert registry.model("ollama:mistral") is not first
+
+        # Paramètres non hashables: pas de cache
+        registry.model("ollama:mistral", options={"temperature": 0})
+        registry.model("ollama:mistral", options={"temperature": 0})
+
+        assert len(created) == 6
+        assert registry.stats()["models"] == 2
+
+    def test_agents_reused_per_tools_and_instructions(self, monkeypatch):
+        """Les requêtes de même modèle, outils et instructions copient le même agent modèle."""
+        from agno import agent as agno_agent
+
+        import services.model_factory as factory
+
+        class FakeAgent:
+            def __init__(self, **kwargs):
+                self.kwargs = kwargs
+                self.model = kwargs["model"]
+                self.session_id = None
+
+            def deep_copy(self, update=None):
+                return FakeAgent(**{**self.kwargs, **(update or {})})
+
+        def search_documents():
+            pass
+
+        monkeypatch.setattr(agno_agent, "Agent", FakeAgent)
+        monkeypatch.setattr(factory, "create_model", lambda model_string, **kwargs: object())
+        registry = factory.ModelRegistry()
+
+        agent = registry.agent("ollama:mistral", "Tuteur", "Instructions", [search_documents], markdown=True)
+        again = registry.agent("ollama:mistral", "Tuteur", "Instructions", [search_documents], markdown=True)
+        assert registry.agent("ollama:mistral", "Tuteur", "Autres instructions", [search_documents], markdown=True).kwargs["instructions"] == "Autres instructions"
+        assert registry.agent("ollama:mistral", "Tuteur", "Instructions", [], markdown=True).kwargs["tools"] is None
+
+        # Chaque appel reçoit sa propre copie: l'état de session n'est pas partagé
+        assert again is not agent
+        agent.session_id = "session-a"
+        assert again.session_id is None
+        assert again.kwargs == agent.kwargs
+
+        # Les agents partagent le modèle du registre
+        other = registry.agent("ollama:mistral", "Fiches", "Instructions", markdown=False)
+        assert other.model is agent.model
+        assert registry.stats()["agent_hits"] == 1
+        assert registry.stats()["agents"] == 4
+        assert registry.stats()["models"] == 1
+
+    def test_ollama_window_fits_context_budget(self, monkeypatch):
+        """La fenêtre Ollama (num_ctx) couvre le budget du prompt et la réponse."""
+        import sys
+        from types import ModuleType
+
+        import services.model_factory as factory
+        from config.models import OLLAMA_ANSWER_TOKENS, get_context_budget
+
+        class FakeOllama:
+            def __init__(self, **kwargs):
+                self.kwargs = kwargs
+
+        module = ModuleType("agno.models.ollama")
+        module.Ollama = FakeOllama
+        monkeypatch.setitem(sys.modules, "agno.models.ollama", module)
+
+        model = factory.create_model("ollama:qwen2.5:7b")
+        assert model.kwargs["options"]["num_ctx"] == get_context_budget("ollama:qwen2.5:7b") + OLLAMA_ANSWER_TOKENS
+
+        # Une fenêtre explicite de l'appelant est conservée
+        model = factory.create_model("ollama:qwen2.5:7b", options={"num_ctx": 4096, "temperature": 0})
+        assert model.kwargs["options"] == {"num_ctx": 4096, "temperature": 0}
 
 class TestChatHistory:
     """Tests pour l'historique de conversation."""
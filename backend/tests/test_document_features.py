@@ -5,9 +5,14 @@ Ce module teste:
 - Generation TTS (Text-to-Speech)
 - Liste des voix TTS disponibles
 - Extraction PDF vers Markdown
+- Cache des extractions
 """
 
 import io
+import os
+import time
+from pathlib import Path
+
 import pytest
 from httpx import AsyncClient
 from fastapi import status
@@ -491,3 +496,170 @@ class TestDocumentWorkflowAdvanced:
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert "total_documents" in data or "documents" in data or "diagnostic" in data
+
+
+class TestExtractionCache:
+    """Tests du cache des extractions (sans serveur)."""
+
+    @pytest.mark.asyncio
+    async def test_same_content_hits_cache(self, tmp_path: Path):
+        """Un même contenu, sous un autre nom, est servi depuis le cache."""
+        from services.extraction_cache import ExtractionCache
+
+        cache = ExtractionCache(tmp_path / "cache", max_bytes=1024 * 1024)
+        original = tmp_path / "cours-a.pdf"
+        copy = tmp_path / "cours-b.pdf"
+        original.write_bytes(b"%PDF contenu")
+        copy.write_bytes(b"%PDF contenu")
+
+        key = await cache.key_for(original, "docling", engine="standard")
+        await cache.store(key, "# Texte", {"num_pages": 2}, "docling-standard")
+
+        cached = await cache.load(await cache.key_for(copy, "docling", engine="standard"))
+        assert cached.text == "# Texte"
+        assert cached.metadata == {"num_pages": 2}
+        assert cached.extractor == "docling-standard"
+
+        # Autre moteur: autre entrée
+        assert await cache.load(await cache.key_for(copy, "docling", engine="vlm")) is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction_and_purge(self, tmp_path: Path):
+        """Au-delà de la taille maximale, les entrées les moins utilisées sont évincées."""
+        from services.extraction_cache import ExtractionCache
+
+        cache = ExtractionCache(tmp_path / "cache", max_bytes=2500)
+        keys = [cache.make_key(f"hash-{i}", "markitdown") for i in range(3)]
+        for i, key in enumerate(keys[:2]):
+            cache.put(key, "x" * 1000)
+            old = time.time() - 100 + i
+            os.utime(cache._path(key), (old, old))
+
+        # La première entrée est relue: la seconde devient la moins récente
+        assert cache.get(keys[0]) is not None
+        cache.put(keys[2], "y" * 1000)
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[2]) is not None
+        assert cache.stats()["entries"] == 2
+
+        assert cache.purge() == 2
+        assert cache.stats()["size_bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_is_bypassed(self, tmp_path: Path):
+        """Un cache désactivé ne calcule pas de clé et n'écrit rien."""
+        from services.extraction_cache import ExtractionCache
+
+        cache = ExtractionCache(tmp_path / "cache", max_bytes=1024, enabled=False)
+        source = tmp_path / "doc.pdf"
+        source.write_bytes(b"%PDF")
+
+        key = await cache.key_for(source, "docling")
+        await cache.store(key, "texte")
+
+        assert key is None
+        assert not (tmp_path / "cache").exists()
+
+
+class TestAudioSummarySynthesis:
+    """Tests de la synthèse concurrente des sections audio (sans edge-tts ni ffmpeg)."""
+
+    @pytest.mark.asyncio
+    async def test_sections_keep_script_order(self, tmp_path: Path):
+        """Les segments suivent l'ordre du script et les silences sont générés une fois par durée."""
+        import asyncio
+        import random
+
+        from models.audio_summary_models import ScriptSection
+        from services.audio_summary_service import AudioSummaryService
+        from services.tts_service import TTSResult
+
+        class FakeTTS:
+            async def text_to_speech(self, text, output_path, **kwargs):
+                await asyncio.sleep(random.random() / 50)
+                if text == "échec":
+                    return TTSResult(success=False, error="edge-tts indisponible")
+                Path(output_path).write_bytes(text.encode())
+                return TTSResult(success=True, audio_path=output_path)
+
+        generated = []
+
+        async def fake_silence(output_path, duration_ms):
+            generated.append(duration_ms)
+            Path(output_path).write_bytes(b"\xff\xfb")
+            return True
+
+        service = AudioSummaryService()
+        service.tts_service = FakeTTS()
+        service._silence_dir = tmp_path / "silence"
+        service._generate_silence = fake_silence
+
+        sections = [
+            ScriptSection(id=str(i), level="body", content=content, voice="fr-CA-SylvieNeural", pause_before_ms=pause)
+            for i, (content, pause) in enumerate([("a", 0), ("b", 500), ("échec", 500), ("d", 1000)])
+        ]
+
+        cache_dir = tmp_path / "sections"
+        segments = []
+        events = [
+            event async for event in service._synthesize_sections(
+                sections, cache_dir, segments, 45.0, 45.0
+            )
+        ]
+
+        clips = [f"{service._section_cache_key(section)}.mp3" for section in sections]
+        assert [event["current_section"] for event in events] == [1, 2, 3, 4]
+        assert events[-1]["percentage"] == 90.0
+        assert [Path(segment).name for segment in segments] == [
+            clips[0],
+            "silence_500ms.mp3",
+            clips[1],
+            "silence_500ms.mp3",
+            "silence_1000ms.mp3",
+            clips[3],
+        ]
+        assert generated == [500, 1000]
+
+    @pytest.mark.asyncio
+    async def test_only_edited_sections_are_resynthesized(self, tmp_path: Path):
+        """Un script modifié ne resynthétise que les sections changées; le cache est supprimé avec le résumé."""
+        from models.audio_summary_models import ScriptSection
+        from services.audio_summary_service import AudioSummaryService
+        from services.tts_service import TTSResult
+
+        synthesized = []
+
+        class FakeTTS:
+            async def text_to_speech(self, text, output_path, **kwargs):
+                synthesized.append(text)
+                Path(output_path).write_bytes(text.encode())
+                return TTSResult(success=True, audio_path=output_path)
+
+        service = AudioSummaryService()
+        service.tts_service = FakeTTS()
+        service._sections_dir = tmp_path / "sections"
+
+        def script(*contents):
+            return [
+                ScriptSection(id=f"s{i}", level="body", content=content, voice="fr-CA-SylvieNeural")
+                for i, content in enumerate(contents)
+            ]
+
+        async def render(sections):
+            segments = []
+            async for _ in service._synthesize_sections(
+                sections, service._section_cache_dir("abc123"), segments, 10.0, 80.0
+            ):
+                pass
+            return [Path(segment).read_text() for segment in segments]
+
+        assert await render(script("un", "deux", "trois")) == ["un", "deux", "trois"]
+        assert await render(script("un", "deux corrigé", "trois")) == ["un", "deux corrigé", "trois"]
+        assert synthesized == ["un", "deux", "trois", "deux corrigé"]
+        assert len(list(service._section_cache_dir("abc123").glob("*.mp3"))) == 3
+
+        service.purge_section_cache("audio_summary:abc123")
+        assert not service._section_cache_dir("abc123").exists()
@@ -414,6 +414,13 @@ class TestRefactoredEndpointsIntegration:
         # API now returns English field names
         assert doc_data["extracted_text"] is not None
 
+        # Listing only flags the extracted text (fetched by id above)
+        list_response = await client.get(f"/api/courses/{course_id}/documents")
+        assert list_response.status_code == status.HTTP_200_OK
+        listed = next(d for d in list_response.json()["documents"] if d["id"] == doc_data["id"])
+        assert listed["has_extracted_text"] is True
+        assert listed.get("extracted_text") is None
+
         # 4. Get derived documents (refactored)
         derived_response = await client.get(
             f"/api/courses/{course_id}/documents/{doc_id}/derived"
@@ -7,6 +7,8 @@ Ce module teste:
 - Suppression de decks
 - Listage des cartes
 - Sessions d'étude
+- Génération concurrente des fiches par morceau
+- Déduplication des fiches
 """
 
 import pytest
@@ -417,3 +419,117 @@ class TestFlashcardValidation:
         )
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestFlashcardGeneration:
+    """Tests de la génération concurrente (sans LLM ni base de données)."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_run_concurrently_and_keep_order(self, monkeypatch):
+        """Les morceaux sont générés en parallèle (borné par fournisseur), les fiches gardent l'ordre des documents."""
+        import asyncio
+        import json
+
+        from services import flashcard_service as module
+
+        monkeypatch.setattr(module.settings, "llm_provider_concurrency", {"fake": 3})
+        monkeypatch.setattr(module, "_provider_slots", {})
+
+        running = peak = 0
+        saved = []
+
+        class FakeSurreal:
+            async def query(self, sql, params=None):
+                if sql.startswith("CREATE"):
+                    saved.append(params["data"]["front"])
+                return []
+
+        service = module.FlashcardService()
+        documents = {"a": "A" * 10, "b": "B" * 10}
+
+        async def get_document_content(doc_id):
+            return {"id": f"document:{doc_id}", "filename": f"{doc_id}.md", "content": documents[doc_id]}
+
+        async def read_document_text(doc):
+            return doc["content"]
+
+        def create_completion(model_id):
+            async def complete(prompt, card_count):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                name = "a.md" if "a.md" in prompt else "b.md"
+                # The first document finishes last
+                await asyncio.sleep(0.05 if name == "a.md" else 0.01)
+                running -= 1
+                cards = [{"front": f"Question {i} de {name}?", "back": "Réponse."} for i in range(card_count)]
+                return json.dumps({"cards": cards})
+            return complete
+
+        monkeypatch.setattr(module, "get_surreal_service", lambda: FakeSurreal())
+        monkeypatch.setattr(service, "get_document_content", get_document_content)
+        monkeypatch.setattr(service, "read_document_text", read_document_text)
+        monkeypatch.setattr(service, "_create_completion", create_completion)
+        monkeypatch.setattr(service, "_split_content_into_chunks", lambda content, size: [content[:5], content[5:]])
+
+        events = [
+            event async for event in service.generate_flashcards(
+                "flashcard_deck:d1", ["a", "b"], card_count=12, model_id="fake:model"
+            )
+        ]
+
+        chunk_events = [event for event in events if "cards" in event]
+        assert len(chunk_events) == 4
+        assert chunk_events[0]["cards"][0]["document_name"] == "b.md"
+        assert peak == 3
+        assert events[-1]["status"] == "completed"
+        assert saved[0].endswith("de a.md?")
+        assert saved[-1].endswith("de b.md?")
+
+
+class TestFlashcardDeduplication:
+    """Tests de la déduplication des fiches (sans LLM ni base de données)."""
+
+    def test_index_matches_pairwise_comparison(self):
+        """L'index retient exactement les mêmes fiches que la comparaison de toutes les paires."""
+        import random
+
+        from services.flashcard_dedup import jaccard, question_words
+        from services.flashcard_service import FlashcardService
+
+        rng = random.Random(42)
+        vocabulary = [f"mot{i}" for i in range(40)] + ["quelle", "est", "la", "le", "de", "?"]
+        questions = [
+            " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 12)))
+            for _ in range(300)
+        ]
+        # Near-duplicates: one word changed or case differences
+        questions += [q.upper() for q in questions[:20]]
+        questions += [q + " mot0" for q in questions[20:60]]
+        rng.shuffle(questions)
+        cards = [{"front": q, "back": "Réponse."} for q in questions]
+
+        expected, kept = [], []
+        for card in cards:
+            words = question_words(card["front"])
+            if words and all(jaccard(words, other) < 0.8 for other in kept):
+                kept.append(words)
+                expected.append(card)
+
+        assert FlashcardService()._deduplicate_cards(cards) == expected
+        assert len(expected) < len(cards)
+
+    def test_existing_deck_questions_are_skipped(self):
+        """Les fiches déjà présentes dans le deck ne sont pas rajoutées."""
+        from services.flashcard_service import FlashcardService
+
+        cards = [
+            {"front": "Qu'est-ce que la prescription acquisitive?", "back": "..."},
+            {"front": "Qu'est-ce que la possession?", "back": "..."},
+        ]
+
+        unique = FlashcardService()._deduplicate_cards(
+            cards, existing_questions=["QU'EST-CE QUE LA  PRESCRIPTION ACQUISITIVE?"]
+        )
+
+        assert [card["front"] for card in unique] == ["Qu'est-ce que la possession?"]
@@ -392,3 +392,363 @@ class TestLinkedFileValidation:
                 status.HTTP_400_BAD_REQUEST,
                 status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
             ]
+
+
+class TestSyncManifest:
+    """Tests de la détection de changements par stat (sans serveur)."""
+
+    def test_scan_records_stat_and_skips_hidden(self, temp_directory_with_files: Path):
+        """Le scan relève mtime_ns/inode et ignore les dossiers cachés."""
+        from utils.linked_directory_utils import scan_directory
+
+        hidden = temp_directory_with_files / ".cache"
+        hidden.mkdir()
+        (hidden / "ignored.md").write_text("# Ignoré")
+
+        result = scan_directory(str(temp_directory_with_files))
+
+        assert result.total_files == 4
+        for file_info in result.files:
+            stat = Path(file_info.absolute_path).stat()
+            assert file_info.mtime_ns == stat.st_mtime_ns
+            assert file_info.inode == stat.st_ino
+
+    def test_manifest_roundtrip(self, tmp_path: Path):
+        """Le manifeste est persisté et relu à l'identique."""
+        from services.sync_manifest import FileStat, SyncManifest
+
+        manifest = SyncManifest(tmp_path / "link.json")
+        manifest.set("/a.md", FileStat(10, 123, 7), "hash-a")
+        manifest.set("/b.md", FileStat(20, 456, 8), "hash-b")
+        manifest.remove("/b.md")
+        manifest.save()
+
+        reloaded = SyncManifest.load(tmp_path / "link.json")
+        assert len(reloaded) == 1
+        assert reloaded.get("/a.md").stat == FileStat(10, 123, 7)
+        assert reloaded.get("/a.md").hash == "hash-a"
+
+    @pytest.mark.asyncio
+    async def test_unchanged_stat_skips_hashing(
+        self, temp_directory_with_files: Path, tmp_path: Path, monkeypatch
+    ):
+        """Un fichier dont le stat n'a pas changé n'est pas relu."""
+        from services import auto_sync_service
+        from services.sync_manifest import SyncManifest
+        from utils.linked_directory_utils import scan_directory
+
+        file_info = scan_directory(str(temp_directory_with_files)).files[0]
+        file_path = file_info.absolute_path
+        file_hash = auto_sync_service.calculate_file_hash(Path(file_path))
+        linked_source = {"source_hash": file_hash, "source_mtime": file_info.modified_time}
+        doc = {"taille": file_info.size}
+
+        sync = auto_sync_service.AutoSyncService()
+        manifest = SyncManifest(tmp_path / "link.json")
+        hashed = []
+        real_hash = auto_sync_service.calculate_file_hash
+
+        def counting_hash(path):
+            hashed.append(path)
+            return real_hash(path)
+
+        monkeypatch.setattr(auto_sync_service, "calculate_file_hash", counting_hash)
+
+        # Document synchronisé avant le manifeste: repris sans lecture
+        assert await sync._is_modified(manifest, file_path, file_info, doc, linked_source) is None
+        assert await sync._is_modified(manifest, file_path, file_info, doc, linked_source) is None
+        assert hashed == []
+
+        # Contenu modifié: le stat change, le fichier est relu
+        Path(file_path).write_text("Contenu modifié, plus long que l'original.")
+        file_info = scan_directory(str(temp_directory_with_files)).files[0]
+        new_hash = await sync._is_modified(manifest, file_path, file_info, doc, linked_source)
+        assert new_hash and new_hash != file_hash
+        assert len(hashed) == 1
+
+
+class TestEventDrivenSync:
+    """Tests de la synchronisation par événements (sans serveur)."""
+
+    def test_owning_link_prefers_innermost(self):
+        """Un chemin est rattaché au répertoire lié le plus profond."""
+        from services.auto_sync_service import AutoSyncService
+
+        links = {"/data/cours": None, "/data/cours/droit": None, "/data/cours2": None}
+        assert AutoSyncService._owning_link("/data/cours/droit/a.md", links) == "/data/cours/droit"
+        assert AutoSyncService._owning_link("/data/cours/b.md", links) == "/data/cours"
+        assert AutoSyncService._owning_link("/data/cours2/c.md", links) == "/data/cours2"
+        assert AutoSyncService._owning_link("/autre/d.md", links) is None
+
+    @pytest.mark.asyncio
+    async def test_sync_paths_adds_and_removes(
+        self, temp_directory_with_files: Path, tmp_path: Path, monkeypatch
+    ):
+        """Seuls les fichiers signalés sont ajoutés ou retirés."""
+        from unittest.mock import AsyncMock, MagicMock
+        from services import auto_sync_service
+        from services.sync_manifest import SyncManifestStore
+
+        monkeypatch.setattr(
+            auto_sync_service, "get_sync_manifest_store", lambda: SyncManifestStore(tmp_path)
+        )
+        indexing_service = MagicMock()
+        indexing_service.delete_document_index = AsyncMock(return_value=True)
+        monkeypatch.setattr(auto_sync_service, "DocumentIndexingService", lambda: indexing_service)
+
+        base_path = str(temp_directory_with_files)
+        new_file = str(temp_directory_with_files / "document1.md")
+        deleted_file = str(temp_directory_with_files / "supprime.md")
+
+        service = MagicMock()
+        service.db.query = AsyncMock(return_value=[
+            {"id": "document:old", "file_path": deleted_file, "linked_source": {}}
+        ])
+        service.delete = AsyncMock()
+
+        sync = auto_sync_service.AutoSyncService()
+        monkeypatch.setattr(sync, "_add_new_files", AsyncMock())
+
+        stats = await sync._sync_paths(
+            service, "course:test", "link1", "user:1", base_path, [new_file, deleted_file]
+        )
+
+        assert stats["removed"] == 1
+        service.delete.assert_awaited_once_with("document:old")
+        indexing_service.delete_document_index.assert_awaited_once_with("document:old")
+        new_files = sync._add_new_files.await_args.args[4]
+        assert [file_info.absolute_path for file_info in new_files] == [new_file]
+
+    @pytest.mark.asyncio
+    async def test_full_sync_removes_index_of_deleted_files(
+        self, temp_directory_with_files: Path, tmp_path: Path, monkeypatch
+    ):
+        """Un fichier disparu perd aussi ses embeddings et ses entrées d'index."""
+        from unittest.mock import AsyncMock, MagicMock
+        from services import auto_sync_service
+        from services.sync_manifest import SyncManifestStore
+
+        monkeypatch.setattr(
+            auto_sync_service, "get_sync_manifest_store", lambda: SyncManifestStore(tmp_path)
+        )
+        indexing_service = MagicMock()
+        indexing_service.delete_document_index = AsyncMock(return_value=True)
+        monkeypatch.setattr(auto_sync_service, "DocumentIndexingService", lambda: indexing_service)
+
+        deleted_file = str(temp_directory_with_files / "supprime.md")
+        docs = [{
+            "id": "document:old",
+            "file_path": deleted_file,
+            "user_id": "user:1",
+            "linked_source": {"base_path": str(temp_directory_with_files)},
+        }]
+
+        service = MagicMock()
+        service.delete = AsyncMock()
+
+        sync = auto_sync_service.AutoSyncService()
+        monkeypatch.setattr(sync, "_add_new_files", AsyncMock())
+
+        stats = await sync._sync_course_directories(service, "course:test", {"link1": docs})
+
+        assert stats["removed"] == 1
+        service.delete.assert_awaited_once_with("document:old")
+        indexing_service.delete_document_index.assert_awaited_once_with("document:old")
+
+    @pytest.mark.asyncio
+    async def test_directory_event_triggers_full_link_sync(
+        self, temp_directory_with_files: Path, monkeypatch
+    ):
+        """Un événement sur un dossier déclenche la resynchronisation du lien."""
+        from unittest.mock import AsyncMock, MagicMock
+        from services import auto_sync_service
+
+        service = MagicMock()
+        service.db.query = AsyncMock(return_value=[])
+
+        sync = auto_sync_service.AutoSyncService()
+        full_sync = AsyncMock(return_value={"added": 1, "updated": 0, "removed": 0, "unchanged": 3})
+        monkeypatch.setattr(sync, "_sync_link", full_sync)
+
+        stats = await sync._sync_paths(
+            service, "course:test", "link1", "user:1",
+            str(temp_directory_with_files), [str(temp_directory_with_files / "subdir")]
+        )
+
+        full_sync.assert_awaited_once_with(service, "course:test", "link1")
+        assert stats["added"] == 1
+
+
+class TestIngestionPipeline:
+    """Tests du pipeline d'ingestion concurrent (sans serveur)."""
+
+    @pytest.mark.asyncio
+    async def test_items_complete_out_of_order_with_batched_writes(
+        self, temp_directory_with_files: Path, monkeypatch
+    ):
+        """Les fichiers sont rendus dès qu'ils terminent et créés par lots."""
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock
+        from services import ingestion_pipeline
+        from utils.linked_directory_utils import scan_directory
+
+        files = scan_directory(str(temp_directory_with_files)).files
+
+        async def fake_read(path):
+            return Path(path).read_text(), f"hash-{Path(path).name}"
+
+        monkeypatch.setattr(ingestion_pipeline, "read_linked_file_async", fake_read)
+
+        service = MagicMock()
+        service.query = AsyncMock()
+
+        async def finish(item):
+            # Le premier fichier est le plus lent
+            await asyncio.sleep(0.2 if item.file_info == files[0] else 0)
+            return item.file_info.filename
+
+        pipeline = ingestion_pipeline.IngestionPipeline(
+            service,
+            build_record=lambda item: {"nom_fichier": item.file_info.filename},
+            finish=finish,
+            extract_concurrency=2,
+            batch_size=10,
+        )
+        items = [item async for item in pipeline.run(files)]
+
+        assert len(items) == len(files)
+        assert all(item.error is None for item in items)
+        assert items[-1].file_info == files[0]
+        assert {item.result for item in items} == {f.filename for f in files}
+
+        inserted = [row for call in service.query.await_args_list for row in call.args[1]["rows"]]
+        assert sorted(row["id"] for row in inserted) == sorted(item.doc_id for item in items)
+        assert service.query.await_count < len(files)
+
+    @pytest.mark.asyncio
+    async def test_failed_extraction_is_reported(self, temp_directory_with_files: Path, monkeypatch):
+        """Un fichier illisible est rendu en erreur sans bloquer les autres."""
+        from unittest.mock import AsyncMock, MagicMock
+        from services import ingestion_pipeline
+        from utils.linked_directory_utils import scan_directory
+
+        files = scan_directory(str(temp_directory_with_files)).files
+
+        async def fake_read(path):
+            if path == files[1].absolute_path:
+                raise OSError("illisible")
+            return "texte", "hash"
+
+        monkeypatch.setattr(ingestion_pipeline, "read_linked_file_async", fake_read)
+        service = MagicMock()
+        service.query = AsyncMock()
+
+        pipeline = ingestion_pipeline.IngestionPipeline(
+            service, build_record=lambda item: {}, extract_concurrency=2
+        )
+        items = [item async for item in pipeline.run(files)]
+
+        failed = [item for item in items if item.error]
+        assert [item.file_info for item in failed] == [files[1]]
+        assert len(items) == len(files)
+
+
+class TestLinkedFileReindexing:
+    """Tests de la réindexation d'un fichier lié modifié (sans serveur)."""
+
+    MODEL = "local:BAAI/bge-m3"
+    OLD_TEXT = "Premier paragraphe.\n\nDeuxième paragraphe.\n\nTroisième paragraphe."
+    NEW_TEXT = "Premier paragraphe.\n\nDeuxième paragraphe, corrigé.\n\nTroisième paragraphe."
+
+    @pytest.fixture
+    def indexing(self, monkeypatch):
+        """Service d'indexation réel sur une base et un modèle d'embeddings simulés."""
+        from unittest.mock import AsyncMock, MagicMock
+        from services import auto_sync_service
+        from services.document_indexing_service import DocumentIndexingService
+        from services.embedding_service import ChunkResult, EmbeddingResult
+
+        def chunk_text(text, chunk_size, overlap):
+            chunks, offsets, start = [], [], 0
+            for paragraph in text.split("\n\n"):
+                chunks.append(paragraph)
+                offsets.append((start, start + len(paragraph)))
+                start += len(paragraph) + 2
+            return ChunkResult(chunks=chunks, offsets=offsets)
+
+        embedded = []
+
+        async def generate_embeddings_batch(texts):
+            embedded.extend(texts)
+            return [
+                EmbeddingResult(success=True, embedding=[float(len(text)), 1.0], model=self.MODEL, dimensions=2)
+                for text in texts
+            ]
+
+        old_chunks = chunk_text(self.OLD_TEXT, 0, 0).chunks
+        stored = {"rows": [{"chunk_text": text, "embedding": [float(len(text)), 1.0]} for text in old_chunks]}
+
+        async def query(sql, params=None):
+            if "BEGIN TRANSACTION" in sql:
+                stored["rows"] = params["rows"]
+            elif "count()" in sql:
+                return [{"total": len(stored["rows"])}]
+            elif "WHERE document_id = $document_id AND embedding_model = $model" in sql:
+                return list(stored["rows"])
+            return []
+
+        service = DocumentIndexingService.__new__(DocumentIndexingService)
+        service.embedding_service = MagicMock(full_model_name=self.MODEL, model="BAAI/bge-m3")
+        service.embedding_service.chunk_text = chunk_text
+        service.embedding_service.generate_embeddings_batch = generate_embeddings_batch
+        service.surreal_service = MagicMock(db=object())
+        service.surreal_service.query = AsyncMock(side_effect=query)
+        service.vector_index_registry = MagicMock()
+        service.keyword_index_registry = MagicMock()
+        service.chunk_size, service.chunk_overlap = 512, 64
+        service.max_retries, service.retry_delay = 3, 0.0
+
+        monkeypatch.setattr(auto_sync_service, "extract_text_async", AsyncMock(return_value=self.NEW_TEXT))
+        return service, stored, embedded
+
+    async def _update(self, indexing_service):
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock
+        from services import auto_sync_service
+
+        service = MagicMock()
+        service.merge = AsyncMock()
+        await auto_sync_service.AutoSyncService()._update_modified_file(
+            service,
+            indexing_service,
+            {"id": "document:note"},
+            {"source_hash": "ancien"},
+            Path("/notes/note.md"),
+            SimpleNamespace(size=len(self.NEW_TEXT), modified_time=123.0),
+            "nouveau",
+            "course:test",
+            "2026-01-01T00:00:00",
+        )
+        return service
+
+    @pytest.mark.asyncio
+    async def test_edited_file_replaces_its_chunks(self, indexing):
+        """Un fichier lié modifié est réindexé même s'il avait déjà des embeddings."""
+        indexing_service, stored, _ = indexing
+
+        service = await self._update(indexing_service)
+
+        assert [row["chunk_text"] for row in stored["rows"]] == self.NEW_TEXT.split("\n\n")
+        service.merge.assert_awaited_with("document:note", {"indexed": True})
+        update = indexing_service.keyword_index_registry.update_document.call_args.kwargs
+        assert [chunk.chunk_text for chunk in update["chunks"]][1] == "Deuxième paragraphe, corrigé."
+
+    @pytest.mark.asyncio
+    async def test_only_changed_paragraph_is_embedded(self, indexing):
+        """Les chunks inchangés reprennent leurs embeddings: seul le paragraphe modifié est calculé."""
+        indexing_service, stored, embedded = indexing
+
+        await self._update(indexing_service)
+
+        assert embedded == ["Deuxième paragraphe, corrigé."]
+        assert len(stored["rows"]) == 3
@@ -0,0 +1,99 @@
+"""
+Tests pour l'OCR de livres numérisés.
+
+Ce module teste:
+- Les points de reprise par page des travaux OCR
+- Le rendu des pages en mémoire
+"""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+
+class TestOCRCheckpoint:
+    """Tests des points de reprise OCR (sans serveur ni modèle)."""
+
+    def test_checkpoint_roundtrip(self, tmp_path: Path):
+        """Les pages sauvegardées sont relues à la reprise du travail."""
+        from models.ocr_models import OCRPageResult
+        from services.ocr_checkpoint import OCRCheckpoint
+
+        checkpoint = OCRCheckpoint(tmp_path / "job")
+        checkpoint.save(OCRPageResult(page_num=3, text="Page trois"))
+        checkpoint.save(OCRPageResult(page_num=1, text="Page un", images=["images/p1.jpg"]))
+        (checkpoint.pages_dir / "page_00002.json").write_text("{tronqué")
+
+        results = OCRCheckpoint(tmp_path / "job").load()
+
+        assert sorted(results) == [1, 3]
+        assert results[1].images == ["images/p1.jpg"]
+        assert results[3].text == "Page trois"
+
+        checkpoint.clear()
+        assert not (tmp_path / "job").exists()
+
+    def test_job_key_depends_on_content_and_options(self, tmp_path: Path):
+        """La clé d'un travail change avec le contenu du fichier ou les options."""
+        from services.ocr_checkpoint import ocr_job_key
+
+        source = tmp_path / "scan.zip"
+        source.write_bytes(b"pages")
+        key = ocr_job_key(source, engine="docling", start_page=1)
+
+        assert ocr_job_key(source, start_page=1, engine="docling") == key
+        assert ocr_job_key(source, engine="docling", start_page=2) != key
+
+        source.write_bytes(b"autres pages")
+        assert ocr_job_key(source, engine="docling", start_page=1) != key
+
+    def test_purge_stale_checkpoints(self, tmp_path: Path):
+        """Les travaux abandonnés sont supprimés, les travaux récents conservés."""
+        from services.ocr_checkpoint import purge_stale_checkpoints
+
+        stale = tmp_path / "stale"
+        recent = tmp_path / "recent"
+        stale.mkdir()
+        recent.mkdir()
+        old = time.time() - 3600
+        os.utime(stale, (old, old))
+
+        assert purge_stale_checkpoints(tmp_path, max_age_seconds=60) == 1
+        assert not stale.exists()
+        assert recent.exists()
+
+
+class TestPageRasterization:
+    """Tests du rendu des pages en mémoire (sans modèle OCR)."""
+
+    @pytest.mark.asyncio
+    async def test_rasterize_streams_with_bounded_lookahead(self, monkeypatch):
+        """Les pages sont rendues dans l'ordre, au plus RENDER_LOOKAHEAD pages d'avance."""
+        from services import ocr_service
+
+        rendered = []
+
+        def fake_render(self, source):
+            rendered.append(source.pdf_page)
+            if source.pdf_page == 2:
+                raise ValueError("page illisible")
+            return f"image {source.pdf_page}"
+
+        monkeypatch.setattr(ocr_service.PageRasterizer, "render", fake_render)
+        service = ocr_service.OCRService()
+        pages = [
+            (i + 1, ocr_service.PageSource(Path("livre.pdf"), i)) for i in range(6)
+        ]
+
+        received = []
+        async for page_num, image in service._rasterize(pages):
+            await asyncio.sleep(0.01)
+            assert len(rendered) - page_num <= ocr_service.OCRConfig.RENDER_LOOKAHEAD + 1
+            received.append((page_num, image))
+
+        assert [page_num for page_num, _ in received] == [1, 2, 3, 4, 5, 6]
+        assert isinstance(received[2][1], ValueError)
+        assert received[0][1] == "image 0"
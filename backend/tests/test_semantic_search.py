@@ -14,6 +14,8 @@ from httpx import AsyncClient
 from fastapi import status
 
 from services.document_indexing_service import DocumentIndexingService
+from services.embedding_service import EmbeddingCache, EmbeddingService
+from services.text_chunker import iter_chunks
 
 # Note: client fixture is now provided by conftest.py
 # and uses a real test server instead of ASGITransport
@@ -364,3 +366,764 @@ class TestChunking:
 
         except Exception as e:
             pytest.skip(f"Chunk creation test skipped: {e}")
+
+
+class TestTextChunker:
+    """Tests pour le découpage structuré des textes."""
+
+    SAMPLE = (
+        "# Responsabilité civile\n\n"
+        + "La faute doit être prouvée par la victime. " * 30
+        + "\n\n## Préjudice\n"
+        + "Le préjudice doit être direct et certain. " * 30
+    )
+
+    def test_offsets_point_into_source(self):
+        """Chaque chunk correspond exactement à sa tranche du texte source."""
+        chunks = list(iter_chunks(self.SAMPLE, max_tokens=80, overlap_tokens=20))
+
+        assert len(chunks) > 2
+        for chunk in chunks:
+            assert self.SAMPLE[chunk.start:chunk.end] == chunk.text
+            assert chunk.token_count <= 80
+
+    def test_headings_close_sections(self):
+        """Un titre Markdown démarre un nouveau chunk avec son propre titre."""
+        chunks = list(iter_chunks(self.SAMPLE, max_tokens=400, overlap_tokens=20))
+
+        assert [chunk.heading for chunk in chunks] == ["Responsabilité civile", "Préjudice"]
+        assert chunks[1].text.startswith("## Préjudice")
+
+    def test_long_sentence_split_into_word_windows(self):
+        """Une phrase plus longue que le budget est découpée entre les mots."""
+        chunks = list(iter_chunks("mot " * 1000, max_tokens=50, overlap_tokens=0))
+
+        assert all(chunk.token_count <= 50 for chunk in chunks)
+        assert chunks[0].start == 0 and chunks[-1].end == len("mot " * 1000) - 1
+
+    def test_chunk_result_offsets(self):
+        """chunk_text expose les positions de chaque chunk."""
+        service = EmbeddingService(provider="ollama", model="bge-m3")
+
+        result = service.chunk_text(self.SAMPLE, chunk_size=80, overlap=20)
+
+        assert len(result.offsets) == len(result.chunks)
+        assert [self.SAMPLE[start:end] for start, end in result.offsets] == result.chunks
+
+
+class TestEmbeddingBatching:
+    """Tests pour le regroupement des embeddings par lots."""
+
+    def test_batches_respect_batch_size(self):
+        """Les lots ne dépassent pas la taille maximale."""
+        service = EmbeddingService(provider="local", model="BAAI/bge-m3", batch_size=3)
+        items = list(enumerate(["texte"] * 7))
+
+        batches = service._build_batches(items, service.batch_size)
+
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+        assert [idx for batch in batches for idx, _ in batch] == list(range(7))
+
+    def test_batches_respect_token_budget(self):
+        """Un lot est coupé dès que le budget de tokens est atteint."""
+        service = EmbeddingService(
+            provider="local", model="BAAI/bge-m3", batch_size=100, max_batch_tokens=250
+        )
+        items = list(enumerate(["x" * 400] * 4))  # ~100 tokens chacun
+
+        batches = service._build_batches(items, service.batch_size)
+
+        assert [len(batch) for batch in batches] == [2, 2]
+
+    @pytest.mark.asyncio
+    async def test_empty_texts_reported_per_item(self):
+        """Les textes vides échouent individuellement sans bloquer le lot."""
+        service = EmbeddingService(provider="inconnu", model="x")
+
+        results = await service.generate_embeddings_batch(["", "   ", "texte"])
+
+        assert len(results) == 3
+        assert results[0].error == "Texte vide"
+        assert results[1].error == "Texte vide"
+        assert results[2].success is False
+        assert "Provider non supporte" in results[2].error
+
+    @pytest.mark.asyncio
+    async def test_ollama_calls_share_pooled_client(self, monkeypatch):
+        """Les appels Ollama passent par le client partagé de l'hôte."""
+        import json
+
+        import httpx
+
+        import services.embedding_service as embedding_module
+        from services.http_clients import HttpClientRegistry
+
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append((request.url.path, request.extensions["timeout"]["read"]))
+            if request.url.path == "/api/tags":
+                return httpx.Response(200, json={"models": []})
+            texts = json.loads(request.content)["input"]
+            return httpx.Response(200, json={"embeddings": [[0.1, 0.2]] * len(texts)})
+
+        registry = HttpClientRegistry(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(embedding_module, "http_client", registry.client)
+        service = EmbeddingService(provider="ollama", model="bge-m3")
+
+        for texts in (["a", "b"], ["c"]):
+            results, error = await service._generate_ollama_batch(texts)
+            assert error is None and len(results) == len(texts)
+        assert await service.is_ollama_available()
+
+        assert seen == [("/api/embed", 300.0), ("/api/embed", 300.0), ("/api/tags", 5.0)]
+        assert len(registry.stats()["hosts"]) == 1
+        await registry.aclose()
+
+
+class TestVectorStore:
+    """Tests pour l'index vectoriel exact en mémoire (NumPy)."""
+
+    @pytest.fixture
+    def store(self):
+        np = pytest.importorskip("numpy")
+        from services.vector_index import IndexedChunk, VectorStore
+
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(50, 16)).astype(np.float32)
+        chunks = [
+            IndexedChunk(
+                document_id=f"document:{i // 10}",
+                course_id="course:test",
+                chunk_index=i % 10,
+                chunk_text=f"chunk {i}",
+            )
+            for i in range(50)
+        ]
+        store = VectorStore(16)
+        store.add(chunks, vectors.tolist())
+        return store, vectors
+
+    def test_search_returns_exact_top_k(self, store):
+        """Le top-k correspond au calcul exact de similarité cosinus."""
+        import numpy as np
+
+        index, vectors = store
+        query = vectors[7] + 0.1
+
+        hits = index.search(query.tolist(), 5)
+
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+        assert [chunk.chunk_text for chunk, _ in hits] == [f"chunk {i}" for i in expected]
+        assert hits[0][1] >= hits[-1][1]
+
+    def test_remove_and_filter_by_document(self, store):
+        """Les chunks supprimés disparaissent et le filtre par document s'applique."""
+        index, vectors = store
+
+        index.remove_document("document:0")
+        hits = index.search(vectors[3].tolist(), 50)
+        assert len(index) == 40
+        assert all(chunk.document_id != "document:0" for chunk, _ in hits)
+
+        hits = index.search(vectors[3].tolist(), 5, document_id="document:2")
+        assert {chunk.document_id for chunk, _ in hits} == {"document:2"}
+
+    def test_sidecar_roundtrip(self, store, tmp_path):
+        """Le sidecar .npy est rouvert en mmap et donne les mêmes résultats."""
+        from services.vector_index import VectorStore
+
+        index, vectors = store
+        key = ("course:test", "local:test")
+        VectorStore.write_snapshot(tmp_path / "sidecar", index.snapshot(), key)
+
+        loaded = VectorStore.load(tmp_path / "sidecar")
+
+        assert loaded is not None
+        assert loaded.key == key
+        assert not loaded._matrix.flags.writeable
+        query = vectors[11].tolist()
+        assert [c.chunk_text for c, _ in loaded.search(query, 5)] == \
+            [c.chunk_text for c, _ in index.search(query, 5)]
+
+    def test_registry_update_leaves_document_in_one_index(self, store):
+        """Réindexé avec un autre modèle, le document quitte l'index de l'ancien modèle du même cours."""
+        from services.vector_index import IndexedChunk, VectorIndexRegistry, VectorStore
+
+        old_index, vectors = store
+        new_index = VectorStore(16)
+        registry = VectorIndexRegistry(backend="numpy")
+        registry._indexes = {
+            ("course:test", "local:old"): old_index,
+            ("course:test", "local:new"): new_index,
+        }
+        chunk = IndexedChunk(document_id="document:0", course_id="course:test", chunk_index=0, chunk_text="chunk 0")
+
+        registry.update_document("course:test", "local:new", "document:0", [chunk], [vectors[0].tolist()])
+
+        assert len(old_index) == 40
+        assert len(new_index) == 1
+
+
+class TestHNSWVectorIndex:
+    """Tests pour l'index vectoriel approximatif HNSW (hnswlib)."""
+
+    @staticmethod
+    def _chunks(document_id, count, prefix="chunk"):
+        from services.vector_index import IndexedChunk
+
+        return [
+            IndexedChunk(
+                document_id=document_id,
+                course_id="course:test",
+                chunk_index=i,
+                chunk_text=f"{prefix} {document_id} {i}",
+            )
+            for i in range(count)
+        ]
+
+    @pytest.fixture
+    def hnsw(self):
+        pytest.importorskip("hnswlib")
+        np = pytest.importorskip("numpy")
+        from services.vector_index import HNSWVectorIndex
+
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(50, 16)).astype(np.float32)
+        index = HNSWVectorIndex(16, initial_capacity=32)
+        for doc in range(5):
+            index.add(self._chunks(f"document:{doc}", 10), vectors[doc * 10:doc * 10 + 10].tolist())
+        return index, vectors, rng
+
+    def test_add_grows_capacity_and_finds_nearest(self, hnsw):
+        """L'index s'agrandit au-delà de sa capacité initiale et retrouve un vecteur indexé."""
+        index, vectors, _ = hnsw
+
+        hits = index.search(vectors[23].tolist(), 3)
+
+        assert len(index) == 50
+        assert index._index.get_max_elements() >= 50
+        assert hits[0][0].chunk_text == "chunk document:2 3"
+        assert hits[0][1] == pytest.approx(1.0, abs=1e-4)
+
+    def test_remove_and_replace_reuse_deleted_slots(self, hnsw):
+        """Les chunks retirés sont marqués supprimés puis leurs places réutilisées."""
+        index, vectors, rng = hnsw
+
+        assert index.remove_document("document:0") == 10
+        hits = index.search(vectors[3].tolist(), 10)
+        assert len(index) == 40
+        assert all(chunk.document_id != "document:0" for chunk, _ in hits)
+
+        new_vectors = rng.normal(size=(5, 16))
+        index.replace_document("document:1", self._chunks("document:1", 5, "nouveau"), new_vectors.tolist())
+
+        # 40 - 10 anciens chunks de document:1 + 5 nouveaux
+        assert len(index) == 35
+        assert index._index.get_current_count() == 50
+        hits = index.search(new_vectors[2].tolist(), 1)
+        assert hits[0][0].chunk_text == "nouveau document:1 2"
+        assert index.search(vectors[15].tolist(), 1, document_id="document:1")[0][0].chunk_text.startswith("nouveau")
+
+    def test_search_filtered_by_document(self, hnsw):
+        """Le filtre par document s'applique pendant le parcours du graphe."""
+        index, vectors, _ = hnsw
+
+        hits = index.search(vectors[3].tolist(), 5, document_id="document:2")
+
+        assert len(hits) == 5
+        assert {chunk.document_id for chunk, _ in hits} == {"document:2"}
+        assert index.search(vectors[3].tolist(), 5, document_id="document:inconnu") == []
+
+    def test_sidecar_roundtrip(self, hnsw, tmp_path):
+        """Le sidecar hnswlib restitue les mêmes résultats et accepte de nouveaux remplacements."""
+        from services.vector_index import HNSWVectorIndex
+
+        index, vectors, rng = hnsw
+        index.remove_document("document:4")
+        key = ("course:test", "local:test")
+        HNSWVectorIndex.write_snapshot(tmp_path / "sidecar", index.snapshot(), key)
+
+        loaded = HNSWVectorIndex.load(tmp_path / "sidecar")
+
+        assert loaded is not None
+        assert loaded.key == key
+        assert len(loaded) == 40
+        assert loaded.document_ids() == {f"document:{doc}" for doc in range(4)}
+        query = vectors[11].tolist()
+        assert [c.chunk_text for c, _ in loaded.search(query, 5)] == \
+            [c.chunk_text for c, _ in index.search(query, 5)]
+
+        loaded.add(self._chunks("document:5", 10), rng.normal(size=(10, 16)).tolist())
+        assert len(loaded) == 50
+        assert loaded._index.get_current_count() == 50
+        assert HNSWVectorIndex.load(tmp_path / "absent") is None
+
+    def test_registry_falls_back_without_hnswlib(self, monkeypatch):
+        """Sans hnswlib, le registre se replie sur NumPy, puis sur le scan SurrealDB."""
+        from services import vector_index
+
+        monkeypatch.setitem(
+            vector_index.INDEX_BACKENDS, "hnsw", (vector_index.HNSWVectorIndex, False)
+        )
+        monkeypatch.setitem(vector_index.INDEX_BACKENDS, "numpy", (vector_index.VectorStore, True))
+        monkeypatch.setattr(vector_index, "NUMPY_AVAILABLE", True)
+
+        registry = vector_index.VectorIndexRegistry(backend="hnsw")
+        assert registry.backend == "numpy"
+        assert registry._index_class is vector_index.VectorStore
+
+        monkeypatch.setitem(vector_index.INDEX_BACKENDS, "numpy", (vector_index.VectorStore, False))
+        monkeypatch.setattr(vector_index, "NUMPY_AVAILABLE", False)
+
+        registry = vector_index.VectorIndexRegistry(backend="hnsw")
+        assert not registry.enabled
+        assert registry.stats()["backend"] == "scan"
+
+
+class TestKeywordIndex:
+    """Tests pour l'index BM25 et la fusion des rangs."""
+
+    @pytest.fixture
+    def index(self):
+        from services.keyword_index import BM25Index
+        from services.vector_index import IndexedChunk
+
+        texts = [
+            "L'art. 1726 C.c.Q. impose au vendeur la garantie contre les vices cachés.",
+            "Le vendeur doit délivrer le bien et garantir le droit de propriété.",
+            "Les obligations de l'acheteur comprennent le paiement du prix.",
+        ]
+        index = BM25Index()
+        index.add([
+            IndexedChunk(
+                document_id=f"document:{i}",
+                course_id="course:test",
+                chunk_index=0,
+                chunk_text=text,
+            )
+            for i, text in enumerate(texts)
+        ])
+        return index
+
+    def test_tokenize_folds_accents_and_plurals(self):
+        """Accents, casse, pluriels et mots vides sont normalisés."""
+        from services.keyword_index import tokenize
+
+        assert tokenize("Les Vices CACHÉS de l'art. 1726") == ["vice", "cache", "art", "1726"]
+
+    def test_exact_reference_ranks_first(self, index):
+        """Une référence d'article retrouve le passage qui la contient."""
+        hits = index.search_text("art. 1726", 3)
+
+        assert hits[0][0].document_id == "document:0"
+        assert len(hits) == 1
+
+    def test_remove_document_and_sidecar(self, index, tmp_path):
+        """Les postings d'un document retiré disparaissent; le sidecar restitue l'index."""
+        from services.keyword_index import BM25Index
+
+        index.remove_document("document:0")
+        assert index.search_text("1726", 3) == []
+
+        path = tmp_path / "course_test"
+        BM25Index.write_snapshot(path, index.snapshot(), ("course:test", "local:BAAI/bge-m3"))
+        reopened = BM25Index.load(path)
+
+        assert len(reopened) == 2
+        assert reopened.key == ("course:test", "local:BAAI/bge-m3")
+        assert [c.document_id for c, _ in reopened.search_text("vendeur", 3)] == ["document:1"]
+
+    def test_candidate_documents_match_substrings(self, index):
+        """Le préfiltre garde les documents où le mot-clé n'est qu'une partie d'un mot."""
+        assert index.candidate_documents("vend") == {"document:0", "document:1"}
+        assert index.candidate_documents("Cachés") == {"document:0"}
+        assert index.candidate_documents("vices") == {"document:0"}
+        assert index.candidate_documents("obligations de l'acheteur") == {"document:2"}
+        assert index.candidate_documents("locataire") == set()
+
+    def test_candidate_documents_cannot_filter_stopwords(self, index):
+        """Un mot-clé sans terme indexable ne permet pas d'écarter de document."""
+        assert index.candidate_documents("les") is None
+        assert index.candidate_documents("vo") is None
+        assert index.candidate_documents("...") is None
+
+    def test_reciprocal_rank_fusion(self):
+        """Un passage trouvé par les deux recherches passe devant."""
+        from services.keyword_index import reciprocal_rank_fusion
+
+        vector = [
+            {"document_id": "document:a", "chunk_index": 0, "similarity_score": 0.8},
+            {"document_id": "document:b", "chunk_index": 0, "similarity_score": 0.7},
+        ]
+        keyword = [
+            {"document_id": "document:b", "chunk_index": 0, "bm25_score": 4.2},
+            {"document_id": "document:c", "chunk_index": 1, "bm25_score": 1.3},
+        ]
+
+        fused = reciprocal_rank_fusion([vector, keyword], top_k=3)
+
+        assert [r["document_id"] for r in fused] == ["document:b", "document:a", "document:c"]
+        assert fused[0]["similarity_score"] == 0.7 and fused[0]["bm25_score"] == 4.2
+
+
+class TestEmbeddingCache:
+    """Tests pour le cache LRU + TTL des embeddings de requêtes."""
+
+    def test_normalized_key_and_counters(self):
+        """Les requêtes quasi identiques partagent la même entrée."""
+        cache = EmbeddingCache(max_entries=10)
+        cache.put("local:m", "Article 1726  C.c.Q.", [0.1, 0.2])
+
+        assert cache.get("local:m", "  article 1726 c.c.q. ") == [0.1, 0.2]
+        assert cache.get("local:autre", "article 1726 c.c.q.") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction_and_ttl(self):
+        """L'entrée la moins récente est évincée et les entrées expirées ignorées."""
+        cache = EmbeddingCache(max_entries=2)
+        cache.put("m", "a", [1.0])
+        cache.put("m", "b", [2.0])
+        cache.get("m", "a")
+        cache.put("m", "c", [3.0])
+
+        assert cache.get("m", "b") is None
+        assert cache.get("m", "a") == [1.0]
+
+        expired = EmbeddingCache(ttl_seconds=-1)
+        expired.put("m", "a", [1.0])
+        assert expired.get("m", "a") is None
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """Le niveau disque restitue les embeddings après un redémarrage."""
+        path = tmp_path / "cache.sqlite"
+        EmbeddingCache(disk_path=path).put("m", "question", [0.5, 0.25])
+
+        restarted = EmbeddingCache(disk_path=path)
+
+        assert restarted.get("m", "question") == [0.5, 0.25]
+        assert restarted.stats()["disk_hits"] == 1
+
+
+class TestChunkEmbeddingReuse:
+    """Tests pour la réutilisation des embeddings de chunks inchangés."""
+
+    @pytest.mark.asyncio
+    async def test_cached_embeddings_by_chunk_hash(self):
+        """Les anciens chunks (avec ou sans empreinte) sont retrouvés par hash."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        service = DocumentIndexingService.__new__(DocumentIndexingService)
+        service.embedding_service = EmbeddingService(provider="local", model="BAAI/bge-m3")
+        model = service.embedding_service.full_model_name
+        kept, moved, new = "Paragraphe inchangé.", "Paragraphe d'un autre document.", "Nouveau."
+        service.surreal_service = MagicMock(db=object())
+        service.surreal_service.query = AsyncMock(side_effect=[
+            # Anciens embeddings du document, enregistrés sans chunk_hash
+            [{"chunk_text": kept, "embedding": [1.0, 0.0]}],
+            # Recherche globale par empreinte
+            [{"chunk_hash": service.chunk_hash(moved), "embedding": [0.0, 1.0]}],
+        ])
+
+        hashes = [service.chunk_hash(text) for text in (kept, moved, new)]
+        cached = await service._get_cached_embeddings("document:abc", hashes)
+
+        assert cached == {hashes[0]: [1.0, 0.0], hashes[1]: [0.0, 1.0]}
+        second_call = service.surreal_service.query.await_args_list[1]
+        assert set(second_call.args[1]["hashes"]) == {hashes[1], hashes[2]}
+        assert second_call.args[1]["model"] == model
+
+
+class TestTransactionalIndexing:
+    """Tests pour l'écriture transactionnelle et les tentatives d'embeddings."""
+
+    MODEL = "local:BAAI/bge-m3"
+
+    @pytest.fixture
+    def service(self):
+        from unittest.mock import AsyncMock, MagicMock
+
+        service = DocumentIndexingService.__new__(DocumentIndexingService)
+        service.embedding_service = MagicMock(full_model_name=self.MODEL, model="BAAI/bge-m3")
+        service.surreal_service = MagicMock(db=object())
+        service.surreal_service.query = AsyncMock()
+        service.vector_index_registry = MagicMock()
+        service.keyword_index_registry = MagicMock()
+        service.max_retries = 3
+        service.retry_delay = 2.0
+        service.chunk_size = 512
+        service.chunk_overlap = 64
+        return service
+
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        """Remplace asyncio.sleep du service et enregistre les délais demandés."""
+        import asyncio
+        from types import SimpleNamespace
+
+        import services.document_indexing_service as indexing_module
+
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(
+            indexing_module, "asyncio", SimpleNamespace(sleep=fake_sleep, to_thread=asyncio.to_thread)
+        )
+        return delays
+
+    def _records(self, count):
+        return [
+            {
+                "chunk_index": i,
+                "chunk_text": f"Chunk numéro {i}",
+                "chunk_hash": f"hash-{i}",
+                "char_start": i * 20,
+                "char_end": i * 20 + 15,
+                "embedding": [float(i), 1.0],
+                "embedding_model": self.MODEL,
+                "embedding_dimensions": 2,
+            }
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def _ok(value):
+        from services.embedding_service import EmbeddingResult
+
+        return EmbeddingResult(success=True, embedding=[value, 1.0], model="local:BAAI/bge-m3", dimensions=2)
+
+    @staticmethod
+    def _failed():
+        from services.embedding_service import EmbeddingResult
+
+        return EmbeddingResult(success=False, error="timeout")
+
+    @pytest.mark.asyncio
+    async def test_store_replaces_embeddings_in_one_transaction(self, service):
+        """Suppression et insertion multi-enregistrements partent dans une seule requête."""
+        service.surreal_service.query.side_effect = [None, [{"total": 3}]]
+
+        stored = await service._store_embeddings("document:a", "course:c", self._records(3))
+
+        assert stored == 3
+        assert service.surreal_service.query.await_count == 2
+        query, params = service.surreal_service.query.await_args_list[0].args
+        statements = [line.strip() for line in query.strip().splitlines()]
+        assert statements == [
+            "BEGIN TRANSACTION;",
+            "DELETE document_embedding WHERE document_id = $document_id;",
+            "INSERT INTO document_embedding $rows RETURN NONE;",
+            "COMMIT TRANSACTION;",
+        ]
+        assert params["document_id"] == "document:a"
+        assert [row["chunk_index"] for row in params["rows"]] == [0, 1, 2]
+        assert params["rows"][1]["word_count"] == 3
+        assert params["rows"][1]["course_id"] == "course:c"
+
+        update = service.vector_index_registry.update_document.call_args.kwargs
+        assert update["vectors"] == [[0.0, 1.0], [1.0, 1.0], [2.0, 1.0]]
+        service.keyword_index_registry.update_document.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_store_checks_count_after_write(self, service):
+        """Un nombre d'embeddings différent après la transaction est une erreur."""
+        service.surreal_service.query.side_effect = [None, [{"total": 1}]]
+
+        with pytest.raises(RuntimeError, match="1/3"):
+            await service._store_embeddings("document:a", "course:c", self._records(3))
+
+        count_query, params = service.surreal_service.query.await_args_list[1].args
+        assert "count()" in count_query and params == {"document_id": "document:a"}
+        service.vector_index_registry.update_document.assert_not_called()
+        service.keyword_index_registry.update_document.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_only_failed_chunks_are_retried(self, service, sleeps):
+        """Seuls les chunks en échec sont renvoyés, avec un délai croissant."""
+        from unittest.mock import AsyncMock
+
+        chunks = ["a", "b", "c"]
+        service.embedding_service.generate_embeddings_batch = AsyncMock(side_effect=[
+            [self._ok(0.0), self._failed(), self._failed()],
+            [self._ok(1.0), self._failed()],
+            [self._ok(2.0)],
+        ])
+
+        results = await service._embed_chunks(chunks)
+
+        calls = service.embedding_service.generate_embeddings_batch.await_args_list
+        assert [call.args[0] for call in calls] == [["a", "b", "c"], ["b", "c"], ["c"]]
+        assert sleeps == [2.0, 4.0]
+        assert [result.embedding[0] for result in results] == [0.0, 1.0, 2.0]
+
+    @pytest.mark.asyncio
+    async def test_nothing_written_when_retries_run_out(self, service, sleeps):
+        """Si aucun embedding n'aboutit, les anciens embeddings du document restent intacts."""
+        from unittest.mock import AsyncMock
+
+        from services.embedding_service import ChunkResult
+
+        service.embedding_service.chunk_text.return_value = ChunkResult(
+            chunks=["Premier chunk", "Second chunk"], offsets=[(0, 13), (14, 26)]
+        )
+        service.embedding_service.generate_embeddings_batch = AsyncMock(
+            side_effect=lambda texts: [self._failed() for _ in texts]
+        )
+        service._get_cached_embeddings = AsyncMock(return_value={})
+
+        result = await service.index_document(
+            "document:a", "course:c", "Premier chunk Second chunk", force_reindex=True
+        )
+
+        assert result["success"] is False
+        assert service.embedding_service.generate_embeddings_batch.await_count == service.max_retries
+        assert sleeps == [2.0, 4.0]
+        service.surreal_service.query.assert_not_awaited()
+        service.vector_index_registry.update_document.assert_not_called()
+
+
+class TestNativeKnnSearch:
+    """Tests pour la recherche par l'opérateur KNN natif de SurrealDB."""
+
+    HNSW_1024 = "DEFINE INDEX idx_embedding_hnsw_1024 ON document_embedding FIELDS embedding HNSW DIMENSION 1024 DIST COSINE"
+    COURSE_MODEL = "DEFINE INDEX idx_course_model ON document_embedding FIELDS course_id, embedding_model"
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        from unittest.mock import AsyncMock, MagicMock
+
+        monkeypatch.setattr(DocumentIndexingService, "_knn_support", {})
+        monkeypatch.setattr(DocumentIndexingService, "_vector_index_dimensions", None)
+        service = DocumentIndexingService.__new__(DocumentIndexingService)
+        service.embedding_service = MagicMock(dimensions=1024, full_model_name="local:BAAI/bge-m3")
+        service.surreal_service = MagicMock(db=object())
+        service.surreal_service.query = AsyncMock()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_knn_query_filters_course_and_document(self, service):
+        """La requête <|k,ef|> porte les filtres et la similarité minimum est appliquée."""
+        service.surreal_service.query.return_value = [
+            {"document_id": "document:a", "chunk_index": 0, "chunk_text": "Vices cachés", "similarity_score": 0.9},
+            {"document_id": "document:a", "chunk_index": 3, "chunk_text": "Prix", "similarity_score": 0.2},
+        ]
+
+        results = await service._knn_similar(
+            [0.1, 0.2],
+            "local:BAAI/bge-m3",
+            course_id="course:c",
+            document_id="document:a",
+            top_k=5,
+            min_similarity=0.35
+        )
+
+        query, params = service.surreal_service.query.await_args.args
+        assert "embedding <|5,40|> $query_embedding" in query
+        assert "course_id = $course_id" in query and "document_id = $document_id" in query
+        assert params["course_id"] == "course:c"
+        assert params["document_id"] == "document:a"
+        assert params["embedding_model"] == "local:BAAI/bge-m3"
+        assert [(r["chunk_index"], r["similarity_score"]) for r in results] == [(0, 0.9)]
+
+    @pytest.mark.asyncio
+    async def test_knn_support_cached_per_dimension(self, service, monkeypatch):
+        """La détection de l'index est faite une fois par dimension d'embedding."""
+        import services.document_indexing_service as indexing_module
+
+        monkeypatch.setattr(indexing_module.settings, "vector_index_backend", "numpy")
+        service.surreal_service.query.return_value = [
+            {"indexes": {"idx_embedding_hnsw_1024": self.HNSW_1024, "idx_course_model": self.COURSE_MODEL}}
+        ]
+
+        assert await service._knn_index_available()
+        assert await service._knn_index_available()
+        assert service.surreal_service.query.await_count == 1
+
+        service.embedding_service.dimensions = 768
+        assert not await service._knn_index_available()
+        assert service.surreal_service.query.await_count == 2
+        assert DocumentIndexingService._knn_support == {1024: True, 768: False}
+
+    @pytest.mark.asyncio
+    async def test_failed_knn_falls_back_to_scan(self, service):
+        """Une erreur de l'opérateur KNN bascule sur le scan et désactive KNN pour la dimension."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        service.embedding_service.generate_embedding = AsyncMock(
+            return_value=MagicMock(success=True, embedding=[0.1, 0.2])
+        )
+        service.vector_index_registry = MagicMock(get_index=AsyncMock(return_value=None))
+        service._knn_index_available = AsyncMock(return_value=True)
+        service._knn_similar = AsyncMock(side_effect=RuntimeError("unknown operator"))
+        service._scan_similar = AsyncMock(return_value=[{"document_id": "document:a"}])
+
+        results = await service.search_similar("garantie", course_id="c", top_k=3)
+
+        assert results == [{"document_id": "document:a"}]
+        assert service._scan_similar.await_args.kwargs["course_id"] == "course:c"
+        assert DocumentIndexingService._knn_support[1024] is False
+
+    @pytest.mark.asyncio
+    async def test_ensure_vector_index_replaces_other_dimension(self, service):
+        """L'index d'une autre dimension est supprimé et celui du modèle courant défini."""
+        DocumentIndexingService._knn_support[1024] = True
+        service.surreal_service.query.side_effect = [
+            [{"indexes": {"idx_embedding_hnsw_1024": self.HNSW_1024, "idx_course_model": self.COURSE_MODEL}}],
+            [],
+            [],
+        ]
+
+        assert await service.ensure_vector_index(768) == "idx_embedding_hnsw_768"
+
+        statements = [call.args[0] for call in service.surreal_service.query.await_args_list]
+        assert statements[1] == "REMOVE INDEX idx_embedding_hnsw_1024 ON document_embedding"
+        assert statements[2].startswith("DEFINE INDEX IF NOT EXISTS idx_embedding_hnsw_768 ")
+        assert "HNSW DIMENSION 768" in statements[2]
+        assert not any("idx_course_model" in statement for statement in statements)
+        assert DocumentIndexingService._knn_support == {768: True}
+
+    @pytest.mark.asyncio
+    async def test_search_path_never_changes_schema(self, service, monkeypatch):
+        """La détection de l'index ne fait que lire le schéma, même avec le backend surreal."""
+        import services.document_indexing_service as indexing_module
+
+        monkeypatch.setattr(indexing_module.settings, "vector_index_backend", "surreal")
+        service.surreal_service.query.return_value = [{"indexes": {"idx_course_model": self.COURSE_MODEL}}]
+
+        assert not await service._knn_index_available()
+
+        statements = [call.args[0] for call in service.surreal_service.query.await_args_list]
+        assert statements == ["INFO FOR TABLE document_embedding"]
+
+    @pytest.mark.asyncio
+    async def test_indexing_defines_index_for_new_dimension(self, service, monkeypatch):
+        """Avec le backend surreal, l'index est défini avant le premier stockage d'une dimension."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        import services.document_indexing_service as indexing_module
+
+        monkeypatch.setattr(indexing_module.settings, "vector_index_backend", "surreal")
+        service.vector_index_registry = MagicMock()
+        service.keyword_index_registry = MagicMock()
+        service.ensure_vector_index = AsyncMock(
+            side_effect=lambda dimensions: setattr(
+                DocumentIndexingService, "_vector_index_dimensions", dimensions
+            )
+        )
+        service.surreal_service.query.side_effect = lambda query, params=None: (
+            [{"total": 1}] if "count()" in query else None
+        )
+        record = {
+            "chunk_index": 0, "chunk_text": "Texte", "chunk_hash": "h", "char_start": 0,
+            "char_end": 5, "embedding": [0.1] * 768, "embedding_model": "ollama:nomic-embed-text",
+            "embedding_dimensions": 768,
+        }
+
+        await service._store_embeddings("document:a", "course:c", [record])
+        await service._store_embeddings("document:b", "course:c", [{**record}])
+
+        service.ensure_vector_index.assert_awaited_once_with(768)
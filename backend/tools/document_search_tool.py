@@ -11,6 +11,7 @@ from pathlib import Path
 
 from agno.tools import tool
 
+from services.document_indexing_service import get_document_indexing_service
 from services.surreal_service import get_surreal_service
 
 logger = logging.getLogger(__name__)
@@ -18,13 +19,16 @@ logger = logging.getLogger(__name__)
 
 async def _get_course_documents(course_id: str) -> List[dict]:
     """
-    Get all documents for a course with their content.
+    Get the documents of a course that have extracted text.
+
+    Only the fields needed to locate and name documents are read; the
+    text itself is fetched on demand with `_get_documents_text`.
 
     Args:
         course_id: ID of the course
 
     Returns:
-        List of document dicts with texte_extrait
+        List of document dicts with id and nom_fichier
     """
     service = get_surreal_service()
     if not service.db:
@@ -36,7 +40,11 @@ async def _get_course_documents(course_id: str) -> List[dict]:
 
     # Get documents for this course
     docs_result = await service.query(
-        "SELECT * FROM document WHERE course_id = $course_id ORDER BY created_at DESC",
+        """
+        SELECT id, nom_fichier, created_at FROM document
+        WHERE course_id = $course_id AND texte_extrait != NONE AND texte_extrait != NULL AND texte_extrait != ""
+        ORDER BY created_at DESC
+        """,
         {"course_id": course_id}
     )
 
@@ -51,13 +59,49 @@ async def _get_course_documents(course_id: str) -> List[dict]:
         elif isinstance(first_item, list):
             documents = first_item
 
-    # Filter documents with texte_extrait
-    docs_with_content = [
-        doc for doc in documents
-        if doc.get("texte_extrait") and len(doc.get("texte_extrait", "").strip()) > 0
-    ]
+    return documents
+
+
+async def _get_documents_text(course_id: str, document_ids: List[str]) -> dict:
+    """
+    Get the extracted text of several documents of a course in one query.
+
+    Args:
+        course_id: ID of the course (ex: "course:abc123")
+        document_ids: IDs of the documents (ex: ["document:abc123"])
 
-    return docs_with_content
+    Returns:
+        Dict document_id -> texte_extrait
+    """
+    if not document_ids:
+        return {}
+
+    service = get_surreal_service()
+    if not service.db:
+        await service.connect()
+
+    if not course_id.startswith("course:"):
+        course_id = f"course:{course_id}"
+
+    result = await service.query(
+        """
+        SELECT id, texte_extrait FROM document
+        WHERE course_id = $course_id AND record::id(id) IN $ids
+        """,
+        {"course_id": course_id, "ids": [doc_id.replace("document:", "") for doc_id in document_ids]}
+    )
+
+    rows = []
+    if result and len(result) > 0:
+        first_item = result[0]
+        if isinstance(first_item, dict) and "result" in first_item:
+            rows = first_item["result"] if isinstance(first_item["result"], list) else []
+        elif isinstance(first_item, list):
+            rows = first_item
+        elif isinstance(first_item, dict):
+            rows = result
+
+    return {str(row.get("id", "")): row.get("texte_extrait") or "" for row in rows}
 
 
 def _search_in_text(text: str, keywords: List[str], context_chars: int = 200) -> List[dict]:
@@ -150,19 +194,29 @@ async def search_documents(
         if not documents:
             return "Aucun document avec du contenu extractible trouve dans ce cours. Les documents doivent etre transcrits ou avoir du texte extrait pour etre recherches."
 
-        # Search in each document
+        # The BM25 vocabulary rules out indexed documents that cannot contain
+        # any keyword; the exact search itself always runs on the full text
+        indexing_service = get_document_indexing_service()
+        indexed_ids = await indexing_service.indexed_document_ids(course_id)
+        candidate_ids = await indexing_service.keyword_candidate_documents(keyword_list, course_id)
+
+        documents = [
+            doc for doc in documents
+            if candidate_ids is None
+            or str(doc.get("id", "")) not in indexed_ids
+            or str(doc.get("id", "")) in candidate_ids
+        ]
+        texts = await _get_documents_text(course_id, [str(doc.get("id", "")) for doc in documents])
+
         all_results = []
         total_matches = 0
 
         for doc in documents:
             doc_name = doc.get("nom_fichier", "Document sans nom")
-            doc_id = doc.get("id", "")
-            texte = doc.get("texte_extrait", "")
-
-            if not texte:
-                continue
+            doc_id = str(doc.get("id", ""))
 
-            matches = _search_in_text(texte, keyword_list, context_chars=150)
+            texte = texts.get(doc_id, "")
+            matches = _search_in_text(texte, keyword_list, context_chars=150) if texte else []
 
             if matches:
                 all_results.append({
@@ -247,7 +301,10 @@ async def list_documents(course_id: str) -> str:
 
         # Get documents for this course
         docs_result = await service.query(
-            "SELECT * FROM document WHERE course_id = $course_id ORDER BY created_at DESC",
+            """SELECT id, nom_fichier, type_fichier, taille, is_transcription, source_audio, created_at,
+                (texte_extrait != NONE AND texte_extrait != NULL AND texte_extrait != "") AS has_text,
+                array::len(string::words(texte_extrait ?? "")) AS word_count
+            FROM document WHERE course_id = $course_id ORDER BY created_at DESC""",
             {"course_id": course_id}
         )
 
@@ -307,7 +364,7 @@ async def list_documents(course_id: str) -> str:
             doc_name = doc.get("nom_fichier", "Document sans nom")
             doc_type = doc.get("type_fichier", "").upper()
             doc_size = doc.get("taille", 0)
-            texte_extrait = doc.get("texte_extrait", "")
+            has_text = bool(doc.get("has_text"))
             is_transcription = doc.get("is_transcription", False)
             source_audio = doc.get("source_audio", "")
 
@@ -327,7 +384,7 @@ async def list_documents(course_id: str) -> str:
             # Check if this markdown is a PDF extraction
             is_pdf_extraction = False
             source_pdf = ""
-            if ext == ".md" and not is_transcription and texte_extrait:
+            if ext == ".md" and not is_transcription and has_text:
                 # Find matching PDF
                 md_base = Path(doc_name).stem
                 for pdf_name in pdf_extraction_map.keys():
@@ -340,12 +397,12 @@ async def list_documents(course_id: str) -> str:
                 "name": doc_name,
                 "type": doc_type,
                 "size": size_str,
-                "has_content": bool(texte_extrait),
+                "has_content": has_text,
                 "is_transcription": is_transcription,
                 "is_audio": is_audio,
                 "is_pdf": is_pdf,
                 "is_pdf_extraction": is_pdf_extraction,
-                "word_count": len(texte_extrait.split()) if texte_extrait else 0,
+                "word_count": doc.get("word_count") or 0,
                 "source_audio": source_audio,
                 "source_pdf": source_pdf,
                 "transcription_file": source_map.get(doc_name, ""),
@@ -360,7 +417,7 @@ async def list_documents(course_id: str) -> str:
                 pdf_files.append(doc_info)
             elif is_audio:
                 audio_files.append(doc_info)
-            elif texte_extrait:
+            elif has_text:
                 with_content.append(doc_info)
             else:
                 without_content.append(doc_info)
@@ -80,9 +80,9 @@ Pour utiliser la recherche sémantique:
 
 En attendant, je ne peux pas répondre à votre question car je n'ai pas accès au contenu des documents."""
 
-        # Effectuer la recherche sémantique
+        # Effectuer la recherche hybride (vectorielle + BM25)
         logger.info(f"[semantic_search] Searching with query='{query}', top_k={top_k}...")
-        results = await indexing_service.search_similar(
+        results = await indexing_service.hybrid_search(
             query_text=query,
             course_id=course_id,
             top_k=top_k,
@@ -140,16 +140,19 @@ Vous pouvez:
             chunk_text = result["chunk_text"]
             similarity = result["similarity_score"]
 
-            # Convertir le score en pourcentage
-            similarity_pct = int(similarity * 100)
+            # Convertir le score en pourcentage (0 si trouvé uniquement par mots-clés)
+            if similarity > 0:
+                relevance = f"Pertinence: {int(similarity * 100)}%"
+            else:
+                relevance = "Correspondance par mots-clés"
 
-            response += f"### Résultat {idx}: {doc_name} (Pertinence: {similarity_pct}%)\n"
+            response += f"### Résultat {idx}: {doc_name} ({relevance})\n"
             response += f"{chunk_text}\n\n"
             response += "---\n\n"
 
         # Ajouter une note explicative
         response += f"""*Note: La recherche sémantique utilise l'intelligence artificielle pour comprendre le sens de votre question.*
-*Les passages sont classés par ordre de pertinence (similarité vectorielle).*
+*Les passages sont classés par ordre de pertinence (similarité vectorielle combinée aux mots-clés).*
 *Modèle utilisé: {stats.get('embedding_model', 'inconnu')}*"""
 
         return response.strip()
@@ -2,8 +2,10 @@
 
 import hashlib
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Iterable, List, Set
 
 logger = logging.getLogger(__name__)
 
@@ -111,6 +113,33 @@ def calculate_file_hash(file_path: Path) -> str:
     return sha256_hash.hexdigest()
 
 
+def find_existing_paths(paths: Iterable[str], max_workers: int = 16) -> Set[str]:
+    """
+    Check which of the given paths exist on disk.
+
+    The stat calls run in a thread pool, which matters on network and
+    synced folders where each call can take milliseconds.
+
+    Args:
+        paths: File paths to check (empty values are ignored)
+        max_workers: Maximum number of concurrent stat calls
+
+    Returns:
+        Set of the paths that exist
+    """
+    unique_paths = list({path for path in paths if path})
+    if not unique_paths:
+        return set()
+
+    workers = min(max_workers, len(unique_paths))
+    if workers == 1:
+        return {path for path in unique_paths if os.path.exists(path)}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        exists = executor.map(os.path.exists, unique_paths)
+        return {path for path, found in zip(unique_paths, exists) if found}
+
+
 def get_file_extension(filename: str) -> str:
     """
     Get file extension from filename.
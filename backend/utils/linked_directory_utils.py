@@ -8,10 +8,12 @@ Ce module contient les fonctions de scan et d'extraction partagées entre :
 
 import json
 import logging
+import os
+import stat
 import unicodedata
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -33,6 +35,8 @@ class FileInfo(BaseModel):
     modified_time: float
     extension: str
     parent_folder: str  # Chemin relatif du dossier parent
+    mtime_ns: int = 0  # Date de modification en nanosecondes (détection des changements)
+    inode: int = 0
 
 
 class DirectoryScanResult(BaseModel):
@@ -69,6 +73,59 @@ def normalize_linked_source(linked_source) -> dict:
     return {}
 
 
+def is_ignored_name(name: str) -> bool:
+    """Fichiers et dossiers ignorés dans les répertoires liés (cachés, node_modules)."""
+    return name.startswith(".") or name == "node_modules"
+
+
+def build_file_info(file_path: Path, base_path: Path) -> Optional[FileInfo]:
+    """
+    Construit le FileInfo d'un fichier d'un répertoire lié.
+
+    Args:
+        file_path: Chemin du fichier
+        base_path: Racine du répertoire lié
+
+    Returns:
+        FileInfo, ou None si le fichier est ignoré (caché, extension non
+        supportée, hors du répertoire) ou n'existe pas
+
+    Raises:
+        OSError: Si le fichier existe mais ne peut pas être lu
+    """
+    try:
+        relative = file_path.relative_to(base_path)
+    except ValueError:
+        return None
+
+    if any(is_ignored_name(part) for part in relative.parts):
+        return None
+
+    extension = file_path.suffix.lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        return None
+
+    try:
+        file_stat = file_path.stat()
+    except FileNotFoundError:
+        return None
+    if not stat.S_ISREG(file_stat.st_mode):
+        return None
+
+    parent_folder = str(relative.parent) if str(relative.parent) != "." else "root"
+    return FileInfo(
+        absolute_path=str(file_path),
+        relative_path=str(relative),
+        filename=file_path.name,
+        size=file_stat.st_size,
+        modified_time=file_stat.st_mtime,
+        extension=extension.lstrip("."),
+        parent_folder=parent_folder,
+        mtime_ns=file_stat.st_mtime_ns,
+        inode=file_stat.st_ino,
+    )
+
+
 def scan_directory(directory_path: str) -> DirectoryScanResult:
     """
     Scanne un répertoire et retourne les statistiques.
@@ -95,45 +152,25 @@ def scan_directory(directory_path: str) -> DirectoryScanResult:
     files_by_type = defaultdict(int)
     folder_structure = defaultdict(int)
 
-    # Parcourir récursivement le répertoire
-    for file_path in base_path.rglob("*"):
-        # Ignorer les dossiers cachés et node_modules
-        if any(
-            part.startswith(".") or part == "node_modules" for part in file_path.parts
-        ):
-            continue
-
-        # Ignorer les dossiers
-        if file_path.is_dir():
-            continue
-
-        # Vérifier l'extension
-        extension = file_path.suffix.lower()
-        if extension not in SUPPORTED_EXTENSIONS:
-            continue
-
-        try:
-            stat = file_path.stat()
-            relative = file_path.relative_to(base_path)
-            parent_folder = str(relative.parent) if str(relative.parent) != "." else "root"
-
-            file_info = FileInfo(
-                absolute_path=str(file_path),
-                relative_path=str(relative),
-                filename=file_path.name,
-                size=stat.st_size,
-                modified_time=stat.st_mtime,
-                extension=extension.lstrip("."),
-                parent_folder=parent_folder,
-            )
+    # Parcourir récursivement le répertoire, sans descendre dans les dossiers
+    # cachés et node_modules (un seul stat par fichier retenu)
+    for dir_path, dir_names, file_names in os.walk(base_path):
+        dir_names[:] = [name for name in dir_names if not is_ignored_name(name)]
+
+        for name in file_names:
+            file_path = Path(dir_path) / name
+            try:
+                file_info = build_file_info(file_path, base_path)
+            except Exception as e:
+                logger.warning(f"Erreur lors de la lecture du fichier {file_path}: {e}")
+                continue
+            if file_info is None:
+                continue
 
             files.append(file_info)
-            total_size += stat.st_size
-            files_by_type[extension.lstrip(".")] += 1
-            folder_structure[parent_folder] += 1
-
-        except Exception as e:
-            logger.warning(f"Erreur lors de la lecture du fichier {file_path}: {e}")
+            total_size += file_info.size
+            files_by_type[file_info.extension] += 1
+            folder_structure[file_info.parent_folder] += 1
 
     # Trier les fichiers par chemin relatif
     files.sort(key=lambda f: f.relative_path)
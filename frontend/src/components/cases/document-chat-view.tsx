@@ -9,6 +9,7 @@ import { MarkdownViewer, type MarkdownViewerHandle } from "./markdown-viewer";
 import { AssistantPanel, type Message } from "./assistant-panel";
 import { SourceNavigator } from "./source-navigator";
 import { useCitationDetection } from "@/hooks/use-citation-detection";
+import { useExtractedText } from "@/hooks/use-extracted-text";
 import type { Document } from "@/types";
 import { cn } from "@/lib/utils";
 
@@ -60,6 +61,9 @@ export function DocumentChatView({
     setActiveDocument(document);
   }, [document]);
 
+  // Extracted text is not part of document listings: load it on demand
+  const { extractedText } = useExtractedText(caseId, activeDocument);
+
   // Determine file type
   const ext = activeDocument.filename?.split(".").pop()?.toLowerCase() || "";
   const isPdf =
@@ -164,10 +168,10 @@ export function DocumentChatView({
                 highlightPage={highlightPage}
               />
             )}
-            {isMarkdown && activeDocument.extracted_text && (
+            {isMarkdown && extractedText && (
               <MarkdownViewer
                 ref={markdownViewerRef}
-                content={activeDocument.extracted_text}
+                content={extractedText}
                 fileName={activeDocument.filename || ""}
               />
             )}
@@ -185,10 +189,10 @@ export function DocumentChatView({
                   highlightPage={highlightPage}
                 />
               )}
-              {isMarkdown && activeDocument.extracted_text && (
+              {isMarkdown && extractedText && (
                 <MarkdownViewer
                   ref={markdownViewerRef}
-                  content={activeDocument.extracted_text}
+                  content={extractedText}
                   fileName={activeDocument.filename || ""}
                 />
               )}
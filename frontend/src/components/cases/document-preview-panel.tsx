@@ -14,6 +14,7 @@ import {
 } from "@/components/ui/dropdown-menu";
 import type { Document } from "@/types";
 import { useActivityTracker } from "@/lib/activity-tracker";
+import { useExtractedText } from "@/hooks/use-extracted-text";
 
 interface DocumentPreviewPanelProps {
   document: Document;
@@ -46,6 +47,9 @@ export function DocumentPreviewPanel({
   // Activity tracking
   const trackActivity = useActivityTracker(caseId);
 
+  // Extracted text is not part of document listings: load it on demand
+  const { extractedText, loading: extractedTextLoading } = useExtractedText(caseId, document);
+
   // Remove YAML frontmatter from markdown content
   const removeFrontmatter = (content: string): string => {
     // Check if content starts with ---
@@ -73,6 +77,9 @@ export function DocumentPreviewPanel({
   };
 
   useEffect(() => {
+    // Wait for the extracted text before choosing between it and the raw file
+    if (isMarkdown && extractedTextLoading) return;
+
     const loadDocument = async () => {
       setLoading(true);
       // Reset state
@@ -92,8 +99,8 @@ export function DocumentPreviewPanel({
           }
         } else if (isMarkdown) {
           // For markdown files: use extracted_text (cleaned content) if available
-          if (document.extracted_text && document.extracted_text.trim()) {
-            const cleanedContent = removeFrontmatter(document.extracted_text);
+          if (extractedText && extractedText.trim()) {
+            const cleanedContent = removeFrontmatter(extractedText);
             setMarkdownContent(cleanedContent);
           } else {
             // Fallback to downloading the file if extracted_text is not available
@@ -126,7 +133,7 @@ export function DocumentPreviewPanel({
       document_id: document.id,
       document_name: document.filename,
     });
-  }, [document.id, isPdf, isAudio, isMarkdown, cleanCaseId, cleanDocId, document.extracted_text, trackActivity, document.filename]);
+  }, [document.id, isPdf, isAudio, isMarkdown, cleanCaseId, cleanDocId, extractedText, extractedTextLoading, trackActivity, document.filename]);
 
   const handleOpenExternal = () => {
     if (document.file_path) {
@@ -224,7 +231,7 @@ export function DocumentPreviewPanel({
         </div>
         <div className="flex items-center gap-1 shrink-0 ml-4">
           {/* TTS Button - Show for markdown files or documents with extracted text */}
-          {(isMarkdown || document.extracted_text) && !isAudio && (
+          {(isMarkdown || extractedText) && !isAudio && (
             <DropdownMenu>
               <DropdownMenuTrigger asChild>
                 <Button
@@ -356,11 +363,11 @@ export function DocumentPreviewPanel({
                 </audio>
 
                 {/* Show transcription if available */}
-                {document.extracted_text && (
+                {extractedText && (
                   <div className="w-full max-w-2xl mt-4">
                     <h5 className="font-medium text-sm mb-2">Transcription</h5>
                     <div className="p-4 bg-muted rounded-lg text-sm max-h-64 overflow-y-auto">
-                      {document.extracted_text}
+                      {extractedText}
                     </div>
                   </div>
                 )}
@@ -368,18 +375,18 @@ export function DocumentPreviewPanel({
             )}
 
             {/* Text/Other file with extracted content */}
-            {!isPdf && !isMarkdown && !isAudio && document.extracted_text && (
+            {!isPdf && !isMarkdown && !isAudio && extractedText && (
               <div className="p-4">
                 <div className="prose prose-sm dark:prose-invert max-w-none">
                   <pre className="whitespace-pre-wrap text-sm bg-muted p-4 rounded-lg">
-                    {document.extracted_text}
+                    {extractedText}
                   </pre>
                 </div>
               </div>
             )}
 
             {/* No content available */}
-            {!isPdf && !isAudio && !markdownContent && !document.extracted_text && (
+            {!isPdf && !isAudio && !markdownContent && !extractedText && (
               <div className="flex flex-col items-center justify-center h-full gap-4 p-8 text-center">
                 <FileText className="h-16 w-16 text-muted-foreground/50" />
                 <div>
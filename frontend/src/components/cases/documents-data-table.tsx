@@ -39,6 +39,7 @@ import {
 import { GenericDataTable } from "@/components/ui/generic-data-table";
 import { SortableHeader, DateCell } from "@/components/ui/column-helpers";
 import type { Document } from "@/types";
+import { hasExtractedText } from "@/lib/utils";
 
 interface DocumentsDataTableProps {
   documents: Document[];
@@ -143,7 +144,7 @@ export function DocumentsDataTable({
                   </Tooltip>
                 </TooltipProvider>
               )}
-              {doc.extracted_text && (
+              {hasExtractedText(doc) && (
                 <Database
                   className="h-4 w-4 text-muted-foreground shrink-0"
                   aria-label={t("documents.indexed")}
@@ -214,7 +215,7 @@ export function DocumentsDataTable({
                   </DropdownMenuItem>
 
                   {/* INDEXATION (RAG) */}
-                  {(needsExtraction(doc) || doc.extracted_text) && (
+                  {(needsExtraction(doc) || hasExtractedText(doc)) && (
                     <>
                       <DropdownMenuSeparator />
                       {needsExtraction(doc) && (
@@ -230,7 +231,7 @@ export function DocumentsDataTable({
                           {t("documents.indexInDb")}
                         </DropdownMenuItem>
                       )}
-                      {doc.extracted_text && (
+                      {hasExtractedText(doc) && (
                         <>
                           {!doc.filename?.endsWith(".md") && (
                             <DropdownMenuItem
@@ -273,7 +274,7 @@ export function DocumentsDataTable({
                   )}
 
                   {/* AUDIO */}
-                  {isAudioFile(doc) && !doc.extracted_text && (
+                  {isAudioFile(doc) && !hasExtractedText(doc) && (
                     <>
                       <DropdownMenuSeparator />
                       <DropdownMenuItem
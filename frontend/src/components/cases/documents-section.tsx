@@ -16,6 +16,7 @@ import {
 } from "@/components/ui/alert-dialog";
 import { DocumentsDataTable } from "./documents-data-table";
 import { documentsApi } from "@/lib/api";
+import { hasExtractedText } from "@/lib/utils";
 import { toast } from "sonner";
 import type { Document } from "@/types";
 
@@ -76,7 +77,7 @@ export function DocumentsSection({
   };
 
   const needsExtraction = (doc: Document) => {
-    return canExtractText(doc) && !doc.extracted_text;
+    return canExtractText(doc) && !hasExtractedText(doc);
   };
 
   // Handlers
@@ -167,7 +168,7 @@ export function DocumentsSection({
   const handleConfirmDelete = async () => {
     if (docToDelete) {
       const isMarkdown = docToDelete.filename?.endsWith(".md");
-      if (docToDelete.extracted_text && !isMarkdown) {
+      if (hasExtractedText(docToDelete) && !isMarkdown) {
         try {
           await documentsApi.clearText(courseId, docToDelete.id);
         } catch (err) {
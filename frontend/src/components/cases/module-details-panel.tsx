@@ -17,6 +17,7 @@ import {
 } from "@/components/ui/alert-dialog";
 import { DocumentsDataTable } from "./documents-data-table";
 import { documentsApi } from "@/lib/api";
+import { hasExtractedText } from "@/lib/utils";
 import { toast } from "sonner";
 import type { Module, Document } from "@/types";
 
@@ -103,7 +104,7 @@ export function ModuleDetailsPanel({
 
   // Check if a document needs text extraction
   const needsExtraction = (doc: Document) => {
-    return canExtractText(doc) && !doc.extracted_text;
+    return canExtractText(doc) && !hasExtractedText(doc);
   };
 
   const handleExtractText = async (doc: Document) => {
@@ -205,7 +206,7 @@ export function ModuleDetailsPanel({
   const handleConfirmDelete = async () => {
     if (docToDelete) {
       const isMarkdown = docToDelete.filename?.endsWith('.md');
-      if (docToDelete.extracted_text && !isMarkdown) {
+      if (hasExtractedText(docToDelete) && !isMarkdown) {
         try {
           await documentsApi.clearText(courseId, docToDelete.id);
         } catch (err) {
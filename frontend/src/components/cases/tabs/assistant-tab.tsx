@@ -20,6 +20,7 @@ import type { Course, Document } from "@/types";
 import { TranscriptionProgress, useTranscriptionProgress } from "../transcription-progress";
 import { useLLMSettings } from "@/hooks/use-llm-settings";
 import { useActivityTracker } from "@/lib/activity-tracker";
+import { hasExtractedText } from "@/lib/utils";
 import { useTranslations, useLocale } from "next-intl";
 
 // Import SVG logos for LLM providers
@@ -238,7 +239,7 @@ export function AssistantTab({ caseData }: AssistantTabProps) {
     if (!doc) {
       // Look for any untranscribed audio file if no specific filename found
       const audioDoc = currentDocs.find(d =>
-        isAudioFile(d.filename) && !d.extracted_text
+        isAudioFile(d.filename) && !hasExtractedText(d)
       );
 
       if (!audioDoc) {
@@ -0,0 +1,42 @@
+"use client";
+
+import { useState, useEffect } from "react";
+import { documentsApi } from "@/lib/api";
+import type { Document } from "@/types";
+
+/**
+ * Extracted text of a document, fetched on demand.
+ *
+ * Document listings only carry has_extracted_text; the text itself is
+ * loaded by id when a document is opened.
+ */
+export function useExtractedText(caseId: string, document: Document) {
+  const [fetched, setFetched] = useState<{ id: string; text?: string } | null>(null);
+
+  const needsFetch = !document.extracted_text && !!document.has_extracted_text;
+
+  useEffect(() => {
+    if (!needsFetch) return;
+
+    let cancelled = false;
+    documentsApi
+      .get(caseId, document.id)
+      .then((doc) => {
+        if (!cancelled) setFetched({ id: document.id, text: doc.extracted_text });
+      })
+      .catch((error) => {
+        console.error("Error loading extracted text:", error);
+        if (!cancelled) setFetched({ id: document.id });
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [caseId, document.id, needsFetch]);
+
+  const isFetched = fetched?.id === document.id;
+  return {
+    extractedText: document.extracted_text ?? (isFetched ? fetched?.text : undefined),
+    loading: needsFetch && !isFetched,
+  };
+}
@@ -427,6 +427,15 @@ export const documentsApi = {
     return response.documents;
   },
 
+  // Get a single document, including its extracted text
+  async get(caseId: string, documentId: string): Promise<Document> {
+    const cleanCaseId = caseId.replace("course:", "").replace("judgment:", "");
+    const cleanDocId = documentId.replace("document:", "");
+    return fetchApi<Document>(
+      `/api/courses/${encodeURIComponent(cleanCaseId)}/documents/${encodeURIComponent(cleanDocId)}`
+    );
+  },
+
   // Sync documents - auto-discover orphaned files in uploads directory
   async sync(caseId: string): Promise<{ documents: Document[]; discovered: number }> {
     const cleanId = caseId.replace("course:", "").replace("judgment:", "");
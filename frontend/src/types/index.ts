@@ -53,7 +53,8 @@ export interface Document {
   created_at?: string;        // Creation timestamp
 
   // Extraction and transcription
-  extracted_text?: string;    // Extracted text
+  extracted_text?: string;    // Extracted text (omitted from listings, see has_extracted_text)
+  has_extracted_text?: boolean; // Extracted text is available (fetch the document to get it)
   transcription?: string;     // Audio transcription
   extraction_status?: "pending" | "processing" | "completed" | "error";
 
@@ -126,9 +127,11 @@ export interface LinkedDirectoryScanResult {
 
 export interface LinkedDirectoryProgressEvent {
   indexed: number;
+  processed: number;     // Files finished (indexed or failed), in completion order
   total: number;
-  current_file: string;
+  current_file: string;  // Last file finished
   percentage: number;
+  error?: string;        // Set when current_file failed
 }
 
 // Extracted data from documents
@@ -380,6 +383,9 @@ export interface FlashcardGenerationProgress {
   status: "starting" | "loading" | "generating" | "parsing" | "saving" | "completed" | "error";
   message: string;
   cards_generated?: number;
+  chunks_completed?: number;
+  total_chunks?: number;
+  cards?: { front: string; back: string; theme?: string | null; document_name: string }[];
 }
 
 // ============================================